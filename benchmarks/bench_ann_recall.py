@@ -0,0 +1,88 @@
+"""Recall@k and latency of the HNSW / IVFFlat index against an exact sequential scan.
+
+Requires a migrated database reachable through ``DATABASE_URL``. ``--seed`` inserts a synthetic corpus first:
+
+    PYTHONPATH=. python benchmarks/bench_ann_recall.py --seed 20000 --queries 200 --k 10
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+from src.domain.document import Document, DocumentChunk
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
+
+DIMS = 768
+SWEEPS = {"hnsw.ef_search": [10, 20, 40, 80, 160, 320], "ivfflat.probes": [1, 2, 5, 10, 20, 50]}
+QUERY = text(
+    """
+    SELECT c.id FROM document_chunks c
+    ORDER BY c.embedding <=> CAST(:query AS vector)
+    LIMIT :k
+    """
+)
+
+
+def seed(count: int, rng: np.random.Generator) -> None:
+    repo = PostgresDocumentRepository()
+    batch = 1000
+    for start in range(0, count, batch):
+        vectors = rng.standard_normal((min(batch, count - start), DIMS))
+        chunks = [
+            DocumentChunk(content=f"synthetic chunk {start + i}", embedding=v.tolist()) for i, v in enumerate(vectors)
+        ]
+        repo.save_document_with_chunks(Document(title="ann benchmark", content="synthetic corpus"), chunks)
+    with SessionLocal() as db:
+        db.execute(text("ANALYZE document_chunks"))
+        db.commit()
+
+
+def run(queries: list[str], k: int, settings: dict[str, str]) -> tuple[list[set[int]], list[float]]:
+    results, latencies = [], []
+    with SessionLocal() as db:
+        for query in queries:
+            for name, value in settings.items():
+                db.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+            start = time.perf_counter()
+            ids = db.execute(QUERY, {"query": query, "k": k}).scalars().all()
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(set(ids))
+            db.commit()
+    return results, latencies
+
+
+def report(label: str, truth: list[set[int]], results: list[set[int]], latencies: list[float], k: int) -> None:
+    recall = statistics.fmean(len(t & r) / k for t, r in zip(truth, results))
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{label:<28}{recall:>10.3f}{p50:>10.2f}{p99:>10.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic chunks to insert before measuring")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    if args.seed:
+        seed(args.seed, rng)
+
+    queries = [str(rng.standard_normal(DIMS).tolist()) for _ in range(args.queries)]
+    truth, exact_latencies = run(queries, args.k, {"enable_indexscan": "off"})
+
+    print(f"{'mode':<28}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    report("exact (seq scan)", truth, truth, exact_latencies, args.k)
+    for name, values in SWEEPS.items():
+        for value in values:
+            results, latencies = run(queries, args.k, {name: str(value)})
+            report(f"{name}={value}", truth, results, latencies, args.k)
+
+
+if __name__ == "__main__":
+    main()
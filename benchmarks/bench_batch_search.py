@@ -0,0 +1,94 @@
+"""Latency of answering N related queries with N sequential ``/v1/search/`` calls vs one ``/v1/search/batch`` call.
+
+Runs against an already running API (with the database and embedding provider it is configured with). Each round
+draws ``--batch`` distinct queries, times the sequential calls and the single batch call, and checks both return the
+same chunks:
+
+    PYTHONPATH=. python benchmarks/bench_batch_search.py --url http://localhost:8000 --batch 24 --rounds 50
+
+Every timed call uses query texts not searched before, so the query-embedding cache does not serve them.
+"""
+
+import argparse
+import statistics
+import time
+
+import httpx
+
+TOPICS = [
+    "python",
+    "vector search",
+    "postgres index",
+    "embeddings",
+    "fastapi",
+    "semantic search",
+    "ollama",
+    "chunking",
+    "hnsw recall",
+    "cosine distance",
+    "text splitter",
+    "batch ingestion",
+]
+
+
+def queries_for_round(round_number: int, batch: int) -> list[str]:
+    return [f"{TOPICS[i % len(TOPICS)]} {round_number}-{i}" for i in range(batch)]
+
+
+def sequential(client: httpx.Client, queries: list[str], limit: int) -> list[list[int]]:
+    results = []
+    for query in queries:
+        response = client.get("/v1/search/", params={"query": query, "limit": limit, "min_similarity": 0.0})
+        response.raise_for_status()
+        results.append([item["chunk_id"] for item in response.json()["results"]])
+    return results
+
+
+def batched(client: httpx.Client, queries: list[str], limit: int) -> list[list[int]]:
+    body = {"queries": [{"query": query, "limit": limit} for query in queries]}
+    response = client.post("/v1/search/batch", json=body)
+    response.raise_for_status()
+    return [[item["chunk_id"] for item in result["results"]] for result in response.json()["results"]]
+
+
+def report(label: str, latencies: list[float], batch: int) -> None:
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else p50
+    print(f"{label:<14}{p50:>10.1f}{p99:>10.1f}{p50 / batch:>14.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--batch", type=int, default=24, help="queries per page render")
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=5)
+    args = parser.parse_args()
+
+    timings: dict[str, list[float]] = {"sequential": [], "batch": []}
+    mismatches = 0
+    with httpx.Client(base_url=args.url, timeout=120) as client:
+        for round_number in range(args.rounds):
+            queries = queries_for_round(round_number, args.batch)
+
+            start = time.perf_counter()
+            together = batched(client, queries, args.limit)
+            timings["batch"].append((time.perf_counter() - start) * 1000)
+
+            # The same texts with a different suffix, so the sequential side does not reuse the batch's embeddings
+            start = time.perf_counter()
+            sequential(client, [f"{query}b" for query in queries], args.limit)
+            timings["sequential"].append((time.perf_counter() - start) * 1000)
+
+            mismatches += sum(a != b for a, b in zip(sequential(client, queries, args.limit), together))
+
+    print(f"{args.batch} queries per round, {args.rounds} rounds, limit={args.limit}\n")
+    print(f"{'mode':<14}{'p50 ms':>10}{'p99 ms':>10}{'ms / query':>14}")
+    for label, latencies in timings.items():
+        report(label, latencies, args.batch)
+    speedup = statistics.median(timings["sequential"]) / statistics.median(timings["batch"])
+    print(f"\nspeedup (p50): {speedup:.1f}x; queries whose batch results differ from /v1/search/: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Commits and statements per ingested document: per-chunk ``save_chunk`` vs ``save_document_with_chunks``.
+
+Requires a migrated database reachable through ``DATABASE_URL``:
+
+    PYTHONPATH=. python benchmarks/bench_chunk_persistence.py --size-kb 50
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sqlalchemy import event
+
+from src.domain.document import Document, DocumentChunk
+from src.infrastructure.database import engine
+from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
+from src.infrastructure.splitter.langchain_text_splitter import LangchainTextSplitter
+
+DIMS = 768
+
+
+class Counters:
+    def __init__(self):
+        self.commits = 0
+        self.statements = 0
+
+    def reset(self) -> None:
+        self.commits = 0
+        self.statements = 0
+
+
+def build_chunks(size_kb: int) -> tuple[Document, list[DocumentChunk]]:
+    sentence = "Semantic search stores one embedding per chunk of text. "
+    content = (sentence * (size_kb * 1024 // len(sentence) + 1))[: size_kb * 1024]
+    rng = np.random.default_rng(0)
+    chunks = [
+        DocumentChunk(content=piece, embedding=rng.standard_normal(DIMS).astype(float).tolist())
+        for piece in LangchainTextSplitter().split(content)
+    ]
+    return Document(title="benchmark", content=content), chunks
+
+
+def per_chunk(repo: PostgresDocumentRepository, doc: Document, chunks: list[DocumentChunk]) -> int:
+    saved = repo.save_document(doc)
+    for chunk in chunks:
+        chunk.document_id = saved.id
+        repo.save_chunk(chunk)
+    return saved.id
+
+
+def bulk(repo: PostgresDocumentRepository, doc: Document, chunks: list[DocumentChunk]) -> int:
+    saved, _ = repo.save_document_with_chunks(doc, chunks)
+    return saved.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=50)
+    args = parser.parse_args()
+
+    counters = Counters()
+    event.listen(engine, "commit", lambda conn: setattr(counters, "commits", counters.commits + 1))
+    event.listen(engine, "before_cursor_execute", lambda *a: setattr(counters, "statements", counters.statements + 1))
+
+    repo = PostgresDocumentRepository()
+    print(f"{'strategy':<12}{'chunks':>8}{'commits':>10}{'statements':>12}{'seconds':>10}")
+    for name, strategy in (("per-chunk", per_chunk), ("bulk", bulk)):
+        doc, chunks = build_chunks(args.size_kb)
+        counters.reset()
+        start = time.perf_counter()
+        doc_id = strategy(repo, doc, chunks)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12}{len(chunks):>8}{counters.commits:>10}{counters.statements:>12}{elapsed:>10.3f}")
+        repo.delete_document(doc_id)
+
+
+if __name__ == "__main__":
+    main()
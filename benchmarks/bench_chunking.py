@@ -0,0 +1,113 @@
+"""Chunks per MB, embedding calls and retrieval recall@k of each chunking strategy on text_examples.json.
+
+Every strategy splits the same corpus (the examples repeated ``--copies`` times, each copy a separate document). The
+queries are sentences of the examples with a share of their words dropped (``--keep``), and a query is answered when
+one of its top-k chunks contains the whole sentence or lies inside it (sentences longer than a chunk). Embedding calls
+are the provider requests the ingest batch engine would send under EMBEDDING_REQUEST_MAX_INPUTS / _MAX_TOKENS.
+
+``--embedder hashing`` (default) needs nothing running: a bag-of-words hashing embedding, so recall there is lexical.
+``--embedder ollama`` embeds with the configured Ollama model:
+
+    PYTHONPATH=. python benchmarks/bench_chunking.py --copies 20 --k 5
+    PYTHONPATH=. python benchmarks/bench_chunking.py --embedder ollama --max-tokens 256 512
+"""
+
+import argparse
+import json
+import random
+import re
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from src.config import settings
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.infrastructure.embeddings.batch_engine import plan_batches
+from src.infrastructure.splitter.native_text_splitter import NativeTextSplitter
+from src.infrastructure.splitter.sentence_text_splitter import SENTENCE_END, SentenceTextSplitter
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "text_examples.json"
+WORD = re.compile(r"\w+")
+
+
+def hashing_embed(texts: list[str], dims: int = 1024) -> np.ndarray:
+    vectors = np.zeros((len(texts), dims), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in WORD.findall(text.lower()):
+            vectors[row, zlib.crc32(word.encode()) % dims] += 1.0
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def ollama_embed(texts: list[str]) -> np.ndarray:
+    from src.infrastructure.embeddings.ollama_generator import OllamaEmbeddingGenerator
+
+    vectors = np.asarray(OllamaEmbeddingGenerator().embed(texts), dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+def build_queries(documents: list[str], keep: float, rng: random.Random) -> list[tuple[str, str]]:
+    """(query, sentence it was drawn from) for every sentence of a few words or more"""
+    queries = []
+    for document in documents:
+        for sentence in SENTENCE_END.split(document):
+            words = sentence.split()
+            if len(words) >= 6:
+                kept = [word for word in words if rng.random() < keep] or words[:1]
+                queries.append((" ".join(kept), sentence.strip()))
+    return queries
+
+
+def evaluate(splitter: ContentTextSplitter, documents: list[str], queries, embed, k: int) -> dict:
+    chunks = [chunk for document in documents for chunk in splitter.split(document)]
+    size_mb = sum(len(document.encode("utf-8")) for document in documents) / 2**20
+    calls = len(plan_batches(chunks, settings.embedding_request_max_inputs, settings.embedding_request_max_tokens))
+
+    chunk_vectors = embed(chunks)
+    query_vectors = embed([query for query, _ in queries])
+    top = np.argsort(-(query_vectors @ chunk_vectors.T), axis=1)[:, :k]
+    found = sum(
+        any(sentence in chunks[i] or chunks[i] in sentence for i in row) for row, (_, sentence) in zip(top, queries)
+    )
+    return {
+        "chunks": len(chunks),
+        "chunks_per_mb": len(chunks) / size_mb,
+        "avg_chars": sum(map(len, chunks)) / len(chunks),
+        "calls": calls,
+        "recall": found / len(queries),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--copies", type=int, default=20, help="copies of each example, as separate documents")
+    parser.add_argument("--max-tokens", type=int, nargs="+", default=[256, 512], help="sentence chunk budgets")
+    parser.add_argument("--overlap-tokens", type=int, default=settings.chunk_overlap_tokens)
+    parser.add_argument("--keep", type=float, default=0.6, help="share of a sentence's words kept in its query")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--embedder", choices=["hashing", "ollama"], default="hashing")
+    args = parser.parse_args()
+
+    examples = [example["text"] for example in json.loads(EXAMPLES.read_text(encoding="utf-8"))]
+    documents = examples * args.copies
+    queries = build_queries(examples, args.keep, random.Random(42))
+    embed = hashing_embed if args.embedder == "hashing" else ollama_embed
+
+    strategies: dict[str, ContentTextSplitter] = {"native (100 chars)": NativeTextSplitter()}
+    for max_tokens in args.max_tokens:
+        strategies[f"sentence {max_tokens // 2}-{max_tokens} tok"] = SentenceTextSplitter(
+            max_tokens, max_tokens // 2, min(args.overlap_tokens, max_tokens - 1)
+        )
+
+    print(f"{len(documents)} documents, {len(queries)} queries, recall@{args.k} with the {args.embedder} embedder\n")
+    print(f"{'strategy':<26}{'chunks':>8}{'chunks/MB':>11}{'avg chars':>11}{'embed calls':>13}{'recall':>8}")
+    for name, splitter in strategies.items():
+        result = evaluate(splitter, documents, queries, embed, args.k)
+        print(
+            f"{name:<26}{result['chunks']:>8}{result['chunks_per_mb']:>11.0f}{result['avg_chars']:>11.0f}"
+            f"{result['calls']:>13}{result['recall']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Near-duplicate linking on text_examples.json: dedup ratio, false links and signature + lookup cost per chunk.
+
+The examples are split with the native splitter and stored as canonical chunks. The ingested corpus then holds
+``--copies`` variants of every chunk: a reformatted copy (case and punctuation changed, linkable) and a copy with one
+word replaced (a genuine edit, which must stay distinct at the default distance). Nothing needs to be running.
+
+    PYTHONPATH=. python benchmarks/bench_dedup.py --copies 20 --max-distance 3
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from src.domain.near_duplicate_index import nearest_canonical, simhash
+from src.infrastructure.splitter.native_text_splitter import NativeTextSplitter
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "text_examples.json"
+
+
+def reformatted(text: str, rng: random.Random) -> str:
+    words = [word.upper() if rng.random() < 0.3 else word for word in text.split()]
+    return " ".join(words).replace(".", ";").replace(",", "")
+
+
+def edited(text: str, rng: random.Random) -> str:
+    words = text.split()
+    words[rng.randrange(len(words))] = "zyzzyva"
+    return " ".join(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=10)
+    parser.add_argument("--max-distance", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    splitter = NativeTextSplitter()
+    stored = [
+        c for example in json.loads(EXAMPLES.read_text(encoding="utf-8")) for c in splitter.split(example["text"])
+    ]
+    canonical = [(chunk_id, simhash(text)) for chunk_id, text in enumerate(stored, start=1)]
+
+    copies = [reformatted(text, rng) for text in stored for _ in range(args.copies)]
+    edits = [edited(text, rng) for text in stored for _ in range(args.copies)]
+
+    start = time.perf_counter()
+    links = nearest_canonical([simhash(text) for text in copies + edits], canonical, args.max_distance)
+    elapsed = time.perf_counter() - start
+
+    copy_links, edit_links = links[: len(copies)], links[len(copies) :]
+    linked = sum(link is not None for link in copy_links)
+    print(f"stored chunks:         {len(stored)}")
+    print(f"ingested chunks:       {len(links)} ({len(copies)} reformatted, {len(edits)} edited)")
+    print(f"reformatted linked:    {linked / len(copies):.1%}")
+    print(f"edited linked:         {sum(link is not None for link in edit_links) / len(edits):.1%}")
+    print(f"dedup ratio:           {linked / len(links):.1%} of embedding calls saved")
+    print(f"signature + lookup:    {elapsed / len(links) * 1e6:.1f} us per chunk")
+
+
+if __name__ == "__main__":
+    main()
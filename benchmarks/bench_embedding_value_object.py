@@ -0,0 +1,83 @@
+"""Embedding value object cost at typical model sizes: the pure-Python list version vs the NumPy float32 one.
+
+Construction runs for every chunk at ingest and for every query; similarity for every in-memory comparison:
+
+    PYTHONPATH=. python benchmarks/bench_embedding_value_object.py --dims 768 3072
+"""
+
+import argparse
+import math
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+from pgvector.utils import Vector
+
+from src.domain.value_objects import Embedding
+
+
+class ListEmbedding:
+    """The previous implementation, kept here as the baseline"""
+
+    def __init__(self, values: list[float]):
+        if not values:
+            raise ValueError("empty")
+        if any(not isinstance(v, (int, float)) for v in values):
+            raise ValueError("All values must be numbers")
+        self.values = values
+
+    def cosine_similarity(self, other: "ListEmbedding") -> float:
+        dot_product = sum(a * b for a, b in zip(self.values, other.values))
+        magnitude_a = math.sqrt(sum(a * a for a in self.values))
+        magnitude_b = math.sqrt(sum(b * b for b in other.values))
+        return dot_product / (magnitude_a * magnitude_b)
+
+    def to_list(self) -> list[float]:
+        return self.values.copy()
+
+
+def microseconds(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dims", type=int, nargs="+", default=[768, 3072])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'dims':>6}  {'operation':<28}{'list (us)':>12}{'numpy (us)':>12}{'speedup':>9}")
+    for dims in args.dims:
+        a, b = rng.standard_normal(dims).tolist(), rng.standard_normal(dims).tolist()
+        list_a, list_b = ListEmbedding(a), ListEmbedding(b)
+        numpy_a, numpy_b = Embedding(a), Embedding(b)
+        binary = bytes(numpy_a.to_pgvector_binary())
+        rows = [
+            ("construct from list", lambda: ListEmbedding(a), lambda: Embedding(a)),
+            (
+                "cosine (fresh objects)",
+                lambda: list_a.cosine_similarity(list_b),
+                lambda: Embedding(a).cosine_similarity(Embedding(b)),
+            ),
+            (
+                "cosine (cached norms)",
+                lambda: list_a.cosine_similarity(list_b),
+                lambda: numpy_a.cosine_similarity(numpy_b),
+            ),
+            ("to_list", list_a.to_list, numpy_a.to_list),
+            ("to pgvector binary", lambda: Vector(a).to_binary(), numpy_a.to_pgvector_binary),
+            (
+                "from pgvector binary",
+                lambda: Vector.from_binary(binary).to_list(),
+                lambda: Embedding.from_pgvector_binary(binary),
+            ),
+        ]
+        for name, baseline, candidate in rows:
+            before = microseconds(baseline, args.number)
+            after = microseconds(candidate, args.number)
+            print(f"{dims:>6}  {name:<28}{before:>12.1f}{after:>12.1f}{before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
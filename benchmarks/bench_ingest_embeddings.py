@@ -0,0 +1,112 @@
+"""Ingest embedding throughput against a local fake provider: one request per document vs the batch engine.
+
+The fake server speaks both the OpenAI (``POST /v1/embeddings``) and the Ollama (``POST /api/embed``) protocols.
+It adds a fixed round-trip plus a per-input cost, rejects requests with more than ``--server-max-inputs`` inputs
+(HTTP 400), and answers a fraction of requests with 429/503:
+
+    PYTHONPATH=. python benchmarks/bench_ingest_embeddings.py --chunks 50 500 3000 --provider openai
+    PYTHONPATH=. python benchmarks/bench_ingest_embeddings.py --chunks 500 --provider ollama
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.domain.embeddings import EmbeddingGenerator
+from src.infrastructure.embeddings.batch_engine import BatchLimits, EmbeddingBatchEngine, RetryPolicy
+from src.infrastructure.embeddings.ollama_generator import OllamaEmbeddingGenerator
+from src.infrastructure.embeddings.openai_generator import OpenAIEmbeddingGenerator
+
+DIMS = 8
+
+
+def make_handler(round_trip: float, per_input: float, max_inputs: int, error_rate: float) -> type:
+    class FakeEmbeddingsHandler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+
+            if len(inputs) > max_inputs:
+                return self.reply(400, {"error": f"too many inputs ({len(inputs)} > {max_inputs})"})
+            if random.random() < error_rate:
+                return self.reply(random.choice([429, 503]), {"error": "try again"})
+
+            time.sleep(round_trip + per_input * len(inputs))
+            vectors = [[float(len(text) % 7)] * DIMS for text in inputs]
+            if self.path.startswith("/api/embed"):
+                return self.reply(200, {"model": body["model"], "embeddings": vectors})
+            data = [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)]
+            usage = {"prompt_tokens": 0, "total_tokens": 0}
+            return self.reply(200, {"object": "list", "data": data, "model": body["model"], "usage": usage})
+
+        def reply(self, status: int, payload: dict) -> None:
+            encoded = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            pass
+
+    return FakeEmbeddingsHandler
+
+
+def make_generator(provider: str, url: str, engine: EmbeddingBatchEngine) -> EmbeddingGenerator:
+    if provider == "ollama":
+        return OllamaEmbeddingGenerator(model="fake", base_url=url, batch_engine=engine)
+    return OpenAIEmbeddingGenerator(api_key="fake", base_url=f"{url}/v1", batch_engine=engine)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--provider", choices=["openai", "ollama"], default="openai")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[50, 500, 3000])
+    parser.add_argument("--chunk-chars", type=int, default=1000)
+    parser.add_argument("--round-trip-ms", type=float, default=60.0)
+    parser.add_argument("--per-input-ms", type=float, default=1.0)
+    parser.add_argument("--server-max-inputs", type=int, default=2048)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--max-inputs", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    handler = make_handler(args.round_trip_ms / 1000, args.per_input_ms / 1000, args.server_max_inputs, args.error_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    engines = {
+        # The previous behaviour: the whole document in one request, no retries
+        "single request": EmbeddingBatchEngine(
+            BatchLimits(max_inputs=10**9, max_tokens=10**12, max_concurrency=1), RetryPolicy(max_attempts=1)
+        ),
+        "batch engine": EmbeddingBatchEngine(
+            BatchLimits(max_inputs=args.max_inputs, max_tokens=250_000, max_concurrency=args.concurrency),
+            RetryPolicy(max_attempts=6, base_delay=0.05, max_delay=1.0),
+        ),
+    }
+
+    print(f"{'mode':<16}{'chunks':>8}{'seconds':>10}{'chunks/s':>12}  result")
+    for chunks in args.chunks:
+        texts = [f"{i} " + "x" * args.chunk_chars for i in range(chunks)]
+        for name, engine in engines.items():
+            generator = make_generator(args.provider, url, engine)
+            start = time.perf_counter()
+            try:
+                generator.embed(texts)
+                outcome = "ok"
+            except Exception as exc:
+                outcome = f"failed: {exc!s}"[:60]
+            elapsed = time.perf_counter() - start
+            print(f"{name:<16}{chunks:>8}{elapsed:>10.2f}{chunks / elapsed:>12.1f}  {outcome}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
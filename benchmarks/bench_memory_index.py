@@ -0,0 +1,136 @@
+"""Latency and recall@k of the in-memory search backend (brute force and HNSW) against pgvector.
+
+Against a migrated database reachable through ``DATABASE_URL`` the chunks are loaded from ``document_chunks`` and the
+exact ground truth is a pgvector sequential scan, also reported next to pgvector's own index:
+
+    PYTHONPATH=. python benchmarks/bench_memory_index.py --queries 200 --k 10
+
+``--synthetic N`` needs no database: it compares the memory indexes on N clustered random vectors, with brute force
+as the ground truth:
+
+    PYTHONPATH=. python benchmarks/bench_memory_index.py --synthetic 50000 --dims 768
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+import numpy as np
+from sqlalchemy import text
+
+from src.infrastructure.memory_index.indexes import BruteForceVectorIndex, HNSWVectorIndex, VectorIndex
+
+EF_SWEEP = [16, 32, 64, 128, 256]
+QUERY = text(
+    """
+    SELECT c.id FROM document_chunks c
+    ORDER BY c.embedding <=> CAST(:query AS vector)
+    LIMIT :k
+    """
+)
+
+
+def synthetic_vectors(count: int, dims: int, rng: np.random.Generator) -> np.ndarray:
+    # Real embeddings concentrate near a low-dimensional subspace; isotropic noise would understate graph recall
+    basis = rng.standard_normal((32, dims))
+    return (rng.standard_normal((count, 32)) @ basis + 0.1 * rng.standard_normal((count, dims))).astype(np.float32)
+
+
+def load_chunks() -> tuple[list[int], np.ndarray]:
+    from src.infrastructure.database import SessionLocal
+    from src.infrastructure.memory_index.repositories import embedded_chunks_statement
+
+    with SessionLocal() as db:
+        rows = db.execute(embedded_chunks_statement()).all()
+    return [row.id for row in rows], np.asarray([row.embedding for row in rows], dtype=np.float32)
+
+
+def run_pgvector(queries: np.ndarray, k: int, settings: dict[str, str]) -> tuple[list[set[int]], list[float]]:
+    from src.infrastructure.database import SessionLocal
+
+    results, latencies = [], []
+    with SessionLocal() as db:
+        for query in queries:
+            for name, value in settings.items():
+                db.execute(text("SELECT set_config(:name, :value, true)"), {"name": name, "value": value})
+            start = time.perf_counter()
+            ids = db.execute(QUERY, {"query": str(query.tolist()), "k": k}).scalars().all()
+            latencies.append((time.perf_counter() - start) * 1000)
+            results.append(set(ids))
+            db.commit()
+    return results, latencies
+
+
+def run_index(
+    search: Callable[[np.ndarray], list[tuple[int, float]]], queries: np.ndarray
+) -> tuple[list[set[int]], list[float]]:
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({chunk_id for chunk_id, _ in hits})
+    return results, latencies
+
+
+def build(index: VectorIndex, ids: list[int], vectors: np.ndarray) -> tuple[VectorIndex, float]:
+    start = time.perf_counter()
+    for offset in range(0, len(ids), 1024):
+        index.add(ids[offset : offset + 1024], vectors[offset : offset + 1024])
+    return index, time.perf_counter() - start
+
+
+def report(label: str, truth: list[set[int]], results: list[set[int]], latencies: list[float], k: int) -> None:
+    recall = statistics.fmean(len(t & r) / k for t, r in zip(truth, results))
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{label:<28}{recall:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="benchmark N random vectors instead of the database")
+    parser.add_argument("--dims", type=int, default=768, help="dimensions of the synthetic vectors")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16, help="HNSW links per node")
+    parser.add_argument("--ef-construction", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    if args.synthetic:
+        vectors = synthetic_vectors(args.synthetic + args.queries, args.dims, rng)
+        vectors, queries = vectors[: args.synthetic], vectors[args.synthetic :]
+        ids = list(range(args.synthetic))
+    else:
+        ids, vectors = load_chunks()
+        queries = vectors[rng.choice(len(ids), args.queries)] + 0.01 * rng.standard_normal(
+            (args.queries, vectors.shape[1])
+        )
+    dims = vectors.shape[1]
+
+    brute, brute_seconds = build(BruteForceVectorIndex(dims), ids, vectors)
+    hnsw, hnsw_seconds = build(HNSWVectorIndex(dims, args.m, args.ef_construction), ids, vectors)
+    print(f"{len(ids)} vectors x {dims} dims; build brute {brute_seconds:.1f}s, hnsw {hnsw_seconds:.1f}s\n")
+
+    brute_results, brute_latencies = run_index(lambda q: brute.search(q, args.k), queries)
+    if args.synthetic:
+        truth = brute_results
+    else:
+        truth, exact_latencies = run_pgvector(queries, args.k, {"enable_indexscan": "off"})
+
+    print(f"{'backend':<28}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    if not args.synthetic:
+        report("pgvector exact (seq scan)", truth, truth, exact_latencies, args.k)
+        for ef in EF_SWEEP:
+            results, latencies = run_pgvector(queries, args.k, {"hnsw.ef_search": str(ef)})
+            report(f"pgvector ef_search={ef}", truth, results, latencies, args.k)
+    report("memory brute force", truth, brute_results, brute_latencies, args.k)
+    for ef in EF_SWEEP:
+        results, latencies = run_index(lambda q: hnsw.search(q, args.k, ef), queries)
+        report(f"memory hnsw ef_search={ef}", truth, results, latencies, args.k)
+
+
+if __name__ == "__main__":
+    main()
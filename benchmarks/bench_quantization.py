@@ -0,0 +1,145 @@
+"""Size and recall@k of quantized candidate search (halfvec / binary codes) re-ranked with the full vectors.
+
+Against a migrated database reachable through ``DATABASE_URL`` it reports the on-disk size of every vector index, their
+total (what quantization is meant to shrink) and, for each quantized index that exists (created by the migration when VECTOR_QUANTIZATION is set, or by running
+``create_quantized_index_sql``), recall and latency per re-rank factor against an exact sequential scan:
+
+    PYTHONPATH=. python benchmarks/bench_quantization.py --queries 200 --k 10
+
+``--synthetic N`` needs no database: it simulates the same codes with NumPy on N clustered random vectors:
+
+    PYTHONPATH=. python benchmarks/bench_quantization.py --synthetic 100000 --dims 768
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+from sqlalchemy import text
+
+FACTORS = [1, 2, 4, 8, 16]
+EXACT = text(
+    """
+    SELECT c.id FROM document_chunks c
+    ORDER BY c.embedding <=> CAST(:query AS vector)
+    LIMIT :k
+    """
+)
+INDEX_SIZES = text(
+    """
+    SELECT indexrelname AS name, pg_relation_size(indexrelid) AS bytes
+    FROM pg_stat_user_indexes
+    WHERE relname = 'document_chunks' AND indexrelname LIKE 'ix_document_chunks_embedding%'
+    ORDER BY indexrelname
+    """
+)
+
+
+def recall(truth: list[set[int]], results: list[set[int]], k: int) -> float:
+    return statistics.fmean(len(t & r) / k for t, r in zip(truth, results))
+
+
+def report(label: str, bytes_per_vector: float, value: float, latencies: list[float] | None = None) -> None:
+    if latencies is None:
+        print(f"{label:<28}{bytes_per_vector:>12.0f}{value:>10.3f}")
+        return
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f"{label:<28}{bytes_per_vector:>12.0f}{value:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+
+
+# -------- Synthetic (NumPy) ----------
+def synthetic(count: int, dims: int, queries: int, k: int) -> None:
+    rng = np.random.default_rng(42)
+    basis = rng.standard_normal((64, dims))
+    vectors = rng.standard_normal((count + queries, 64)) @ basis + 0.3 * rng.standard_normal((count + queries, dims))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+    vectors, query_vectors = vectors[:count], vectors[count:]
+
+    exact = vectors @ query_vectors.T
+    truth = [set(np.argsort(-exact[:, i])[:k].tolist()) for i in range(queries)]
+
+    # halfvec keeps cosine on float16 values; binary keeps the sign bits and ranks by Hamming distance, which for
+    # +/-1 vectors is (dims - s . q) / 2, so a dot product of the signs ranks identically
+    codes = {
+        "halfvec": (vectors.astype(np.float16).astype(np.float32), lambda q: q.astype(np.float16).astype(np.float32)),
+        "binary": (np.where(vectors > 0, 1.0, -1.0).astype(np.float32), lambda q: np.where(q > 0, 1.0, -1.0)),
+    }
+    sizes = {"vector": 4 * dims + 8, "halfvec": 2 * dims + 8, "binary": dims / 8 + 8}
+
+    # Latency is only meaningful against the real indexes: NumPy has no half-precision or popcount fast path
+    print(f"{count} vectors x {dims} dims, {queries} queries, k={k}\n")
+    print(f"{'mode':<28}{'bytes/vec':>12}{'recall@k':>10}")
+    report("vector (exact)", sizes["vector"], 1.0)
+    for name, (matrix, encode) in codes.items():
+        for factor in FACTORS:
+            results = []
+            for query in query_vectors:
+                candidates = np.argpartition(-(matrix @ encode(query)), k * factor)[: k * factor]
+                results.append(set(candidates[np.argsort(-(vectors[candidates] @ query))[:k]].tolist()))
+            report(f"{name} rerank x{factor}", sizes[name], recall(truth, results, k))
+
+
+# -------- Database ----------
+def database(queries: int, k: int) -> None:
+    from src.config import settings
+    from src.infrastructure.database import SessionLocal
+    from src.infrastructure.postgresql.repositories import reranked_candidates_statement
+    from src.infrastructure.postgresql.vector_index import QUANTIZED_INDEX_NAMES
+
+    rng = np.random.default_rng(42)
+    dims = settings.embedding_dimensions
+    query_vectors = [rng.standard_normal(dims).tolist() for _ in range(queries)]
+
+    with SessionLocal() as db:
+        sizes = {row.name: row.bytes for row in db.execute(INDEX_SIZES)}
+        count = db.scalar(text("SELECT count(*) FROM document_chunks WHERE embedding IS NOT NULL")) or 1
+        print(f"{count} embedded chunks\n\n{'index':<44}{'MB':>10}{'bytes/vec':>12}")
+        for name, size in sizes.items():
+            print(f"{name:<44}{size / 2**20:>10.1f}{size / count:>12.0f}")
+        total = sum(sizes.values())
+        print(f"{'total':<44}{total / 2**20:>10.1f}{total / count:>12.0f}")
+
+        truth = []
+        for query in query_vectors:
+            db.execute(text("SET LOCAL enable_indexscan = off"))
+            truth.append(set(db.execute(EXACT, {"query": str(query), "k": k}).scalars().all()))
+            db.commit()
+
+        print(f"\n{'mode':<28}{'bytes/vec':>12}{'recall@k':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for quantization, index_name in QUANTIZED_INDEX_NAMES.items():
+            if index_name not in sizes:
+                print(f"{quantization:<28}{'(no index)':>12}")
+                continue
+            for factor in FACTORS:
+                results, latencies = [], []
+                for query in query_vectors:
+                    # The HNSW scan returns at most ef_search rows; keep it above the candidate count
+                    db.execute(text("SELECT set_config('hnsw.ef_search', :v, true)"), {"v": str(max(40, k * factor))})
+                    start = time.perf_counter()
+                    rows = db.execute(reranked_candidates_statement(query, k, quantization, factor)).all()
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    results.append({row.id for row in rows})
+                    db.commit()
+                report(
+                    f"{quantization} rerank x{factor}", sizes[index_name] / count, recall(truth, results, k), latencies
+                )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="simulate on N random vectors instead of the database")
+    parser.add_argument("--dims", type=int, default=768, help="dimensions of the synthetic vectors")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        synthetic(args.synthetic, args.dims, args.queries, args.k)
+    else:
+        database(args.queries, args.k)
+
+
+if __name__ == "__main__":
+    main()
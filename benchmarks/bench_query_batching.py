@@ -0,0 +1,82 @@
+"""Search-style query embedding throughput with and without micro-batching, against a simulated provider.
+
+The fake provider charges a fixed round-trip per HTTP call plus a small per-input cost and only serves a few
+requests at a time (like a rate-limited API or a single Ollama instance):
+
+    PYTHONPATH=. python benchmarks/bench_query_batching.py --threads 64 --requests 2000
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from src.domain.embeddings import EmbeddingGenerator
+from src.infrastructure.embeddings.batching_generator import MicroBatchingEmbeddingGenerator
+
+
+class SimulatedProvider(EmbeddingGenerator):
+    def __init__(self, round_trip_ms: float, per_input_ms: float, max_concurrent: int):
+        self.round_trip = round_trip_ms / 1000
+        self.per_input = per_input_ms / 1000
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.calls = 0
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        with self.slots:
+            self.calls += 1
+            time.sleep(self.round_trip + self.per_input * len(texts))
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed([text])[0]
+
+
+def run(generator: EmbeddingGenerator, threads: int, requests: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker() -> None:
+        for i in counter:
+            start = time.perf_counter()
+            generator.embed_query(f"query {i}")
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--round-trip-ms", type=float, default=40.0)
+    parser.add_argument("--per-input-ms", type=float, default=0.2)
+    parser.add_argument("--provider-concurrency", type=int, default=4)
+    parser.add_argument("--window-ms", type=float, default=3.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+
+    print(f"{'mode':<12}{'queries/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'provider calls':>16}")
+    for mode in ("direct", "batched"):
+        provider = SimulatedProvider(args.round_trip_ms, args.per_input_ms, args.provider_concurrency)
+        generator: EmbeddingGenerator = provider
+        if mode == "batched":
+            generator = MicroBatchingEmbeddingGenerator(provider, args.window_ms, args.max_batch)
+        elapsed, latencies = run(generator, args.threads, args.requests)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(
+            f"{mode:<12}{len(latencies) / elapsed:>12.1f}{statistics.median(latencies):>10.1f}{p99:>10.1f}"
+            f"{provider.calls:>16}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Throughput (MB/s) of NativeTextSplitter vs LangchainTextSplitter on the same texts, and whether their chunks match.
+
+Needs no database. Each corpus is ``--size-kb`` of text built from text_examples.json (prose whose paragraphs are
+longer than a chunk), the same text with one sentence per line, and the same text without newlines:
+
+    PYTHONPATH=. python benchmarks/bench_text_splitter.py --size-kb 512 --rounds 5
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.infrastructure.splitter.langchain_text_splitter import LangchainTextSplitter
+from src.infrastructure.splitter.native_text_splitter import NativeTextSplitter
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "text_examples.json"
+
+
+def corpora(size_kb: int) -> dict[str, str]:
+    prose = "\n\n".join(example["text"] for example in json.loads(EXAMPLES.read_text(encoding="utf-8")))
+    prose = (prose * (size_kb * 1024 // len(prose) + 1))[: size_kb * 1024]
+    return {
+        "examples": prose,
+        "sentence per line": prose.replace(". ", ".\n"),
+        "no newlines": prose.replace("\n", " "),
+    }
+
+
+def throughput(splitter: ContentTextSplitter, text: str, rounds: int) -> tuple[float, list[str]]:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        chunks = splitter.split(text)
+        timings.append(time.perf_counter() - start)
+    return len(text.encode("utf-8")) / 2**20 / statistics.median(timings), chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    native, langchain = NativeTextSplitter(), LangchainTextSplitter()
+    print(f"{args.size_kb} KB per corpus, median of {args.rounds} rounds\n")
+    print(f"{'corpus':<20}{'chunks':>8}{'langchain MB/s':>16}{'native MB/s':>14}{'speedup':>10}{'same chunks':>13}")
+    for name, text in corpora(args.size_kb).items():
+        langchain_rate, expected = throughput(langchain, text, args.rounds)
+        native_rate, chunks = throughput(native, text, args.rounds)
+        print(
+            f"{name:<20}{len(chunks):>8}{langchain_rate:>16.1f}{native_rate:>14.1f}"
+            f"{native_rate / langchain_rate:>9.1f}x{str(chunks == expected):>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Requests/sec at high concurrency against ``/v1/search/``, sync (threadpool) vs async request path.
+
+With ``--compare`` the script starts uvicorn twice (``USE_ASYNC=false`` then ``USE_ASYNC=true``) against the database
+and embedding provider configured in the environment; otherwise it load-tests an already running ``--url``:
+
+    PYTHONPATH=. python benchmarks/load_test.py --compare --concurrency 256 --duration 20
+    PYTHONPATH=. python benchmarks/load_test.py --url http://localhost:8000 --concurrency 256
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+QUERIES = ["python", "vector search", "postgres index", "embeddings", "fastapi", "semantic search", "ollama"]
+
+
+async def worker(client: httpx.AsyncClient, deadline: float, latencies: list[float], errors: list[int]) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        query = QUERIES[i % len(QUERIES)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get("/v1/search/", params={"query": query, "limit": 5})
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def load(url: str, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors: list[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(worker(client, deadline, latencies, errors) for _ in range(concurrency)))
+
+    return {
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p99": statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else float("nan"),
+        "errors": len(errors),
+    }
+
+
+def wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/v1/health").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {url} did not become healthy")
+
+
+def run_server_and_load(use_async: bool, port: int, concurrency: int, duration: float) -> dict:
+    env = {**os.environ, "USE_ASYNC": str(use_async).lower()}
+    command = [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"]
+    server = subprocess.Popen(command, env=env)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        wait_until_healthy(url)
+        return asyncio.run(load(url, concurrency, duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--compare", action="store_true", help="start uvicorn in sync and async mode and compare")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    if args.compare:
+        results = {
+            mode: run_server_and_load(mode == "async", args.port, args.concurrency, args.duration)
+            for mode in ("sync", "async")
+        }
+    else:
+        results = {args.url: asyncio.run(load(args.url, args.concurrency, args.duration))}
+
+    print(f"{'target':<28}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['rps']:>10.1f}{r['p50']:>10.1f}{r['p99']:>10.1f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
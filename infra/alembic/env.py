@@ -25,6 +25,7 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 from src.infrastructure.database import Base  # noqa: E402
 from src.infrastructure.postgresql.repositories import DocumentORM, DocumentChunkORM  # noqa: F401,E402
+from src.infrastructure.postgresql.embedding_store import ChunkEmbeddingORM  # noqa: F401,E402
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,35 @@
+"""
+Revision ID: 4d8a2b6c1e07
+Revises: 9c3e1f2a7b41
+Create Date: 2025-09-16 09:41:12.503918
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+# revision identifiers, used by Alembic.
+revision = "4d8a2b6c1e07"
+down_revision = "9c3e1f2a7b41"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Content-addressed embedding store: sha256(model, dims, chunk text) -> embedding
+    op.create_table(
+        "chunk_embeddings",
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=False),
+        sa.Column("dims", sa.Integer(), nullable=False),
+        sa.Column("embedding", Vector(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.PrimaryKeyConstraint("content_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chunk_embeddings")
@@ -0,0 +1,30 @@
+"""
+Revision ID: 9c3e1f2a7b41
+Revises: 546a776504ea
+Create Date: 2025-09-15 10:02:37.118204
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from src.infrastructure.postgresql.vector_index import create_vector_index_sql, drop_vector_index_sql
+
+# revision identifiers, used by Alembic.
+revision = "9c3e1f2a7b41"
+down_revision = "546a776504ea"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # HNSW or IVFFlat cosine index, chosen by VECTOR_INDEX_TYPE (see src/config.py).
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.execute(create_vector_index_sql(concurrently=True))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(drop_vector_index_sql(concurrently=True))
@@ -0,0 +1,40 @@
+"""
+Revision ID: a6d3c9f1b824
+Revises: f5c8e2a4b713
+Create Date: 2025-10-01 11:05:48.219364
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a6d3c9f1b824"
+down_revision = "f5c8e2a4b713"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Order of each chunk within its document. Ids stop reflecting it once an update keeps some chunks and inserts
+    # others between them; existing chunks were inserted in order, so their ids give the initial positions
+    op.execute("ALTER TABLE document_chunks ADD COLUMN position integer")
+    op.execute(
+        """
+        UPDATE document_chunks c
+        SET position = ordered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY document_id ORDER BY id) - 1 AS position
+            FROM document_chunks
+        ) ordered
+        WHERE c.id = ordered.id
+        """
+    )
+    # Serves the per-document chunk reads of the update diff (and the ON DELETE CASCADE from documents)
+    op.execute("CREATE INDEX ix_document_chunks_document_position ON document_chunks (document_id, position)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_document_position")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS position")
@@ -0,0 +1,31 @@
+"""
+Revision ID: b7e5f0c93a12
+Revises: 4d8a2b6c1e07
+Create Date: 2025-09-18 11:05:54.871230
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7e5f0c93a12"
+down_revision = "4d8a2b6c1e07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index over the embedding backlog: claiming a batch (ORDER BY id ... FOR UPDATE SKIP LOCKED) and
+    # counting what is left stay cheap however large the embedded part of the table grows
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_pending "
+            "ON document_chunks (id) WHERE embedding IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_pending")
@@ -0,0 +1,64 @@
+"""
+Revision ID: c2f7a8e4d519
+Revises: a6d3c9f1b824
+Create Date: 2025-10-06 09:42:17.503846
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c2f7a8e4d519"
+down_revision = "a6d3c9f1b824"
+branch_labels = None
+depends_on = None
+
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = 16
+
+
+def upgrade() -> None:
+    # SimHash signature of each chunk and, on near-duplicates, the canonical chunk they were linked to instead of
+    # being embedded. Chunks stored before this revision have no signature and are never matched against
+    op.execute("ALTER TABLE document_chunks ADD COLUMN simhash bigint")
+    op.execute(
+        "ALTER TABLE document_chunks ADD COLUMN canonical_chunk_id integer "
+        "REFERENCES document_chunks (id) ON DELETE SET NULL"
+    )
+    with op.get_context().autocommit_block():
+        # One expression index per 16-bit band of the canonical signatures: a signature within 3 bits of another
+        # shares at least one band with it, so the lookup is four index scans rather than a sequential Hamming
+        # distance scan
+        for band in range(SIMHASH_BANDS):
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_simhash_band{band} ON document_chunks "
+                f"(((simhash >> {band * SIMHASH_BAND_BITS}) & 65535)) WHERE canonical_chunk_id IS NULL"
+            )
+        # Serves ON DELETE SET NULL when a canonical chunk is deleted
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_canonical ON document_chunks "
+            "(canonical_chunk_id) WHERE canonical_chunk_id IS NOT NULL"
+        )
+        # Linked near-duplicates are never embedded, so they leave the backlog index
+        _replace_pending_index("embedding IS NULL AND canonical_chunk_id IS NULL")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Linked near-duplicates go back to the embedding backlog
+        _replace_pending_index("embedding IS NULL")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_canonical")
+        for band in range(SIMHASH_BANDS):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_simhash_band{band}")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS canonical_chunk_id")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS simhash")
+
+
+def _replace_pending_index(predicate: str) -> None:
+    # Built next to the old one and swapped in by name, so claims never run without a backlog index
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_pending_new")
+    op.execute(f"CREATE INDEX CONCURRENTLY ix_document_chunks_pending_new ON document_chunks (id) WHERE {predicate}")
+    op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_pending")
+    op.execute("ALTER INDEX ix_document_chunks_pending_new RENAME TO ix_document_chunks_pending")
@@ -0,0 +1,50 @@
+"""
+Revision ID: c4a9d2e8f150
+Revises: b7e5f0c93a12
+Create Date: 2025-09-22 10:17:36.408215
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a9d2e8f150"
+down_revision = "b7e5f0c93a12"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Monotonic change number per chunk: new on insert and on every embedding change, so an embedding snapshot only
+    # needs the chunks with change_seq above its high-water mark to catch up
+    op.execute("CREATE SEQUENCE IF NOT EXISTS document_chunks_change_seq")
+    op.execute(
+        "ALTER TABLE document_chunks "
+        "ADD COLUMN change_seq bigint NOT NULL DEFAULT nextval('document_chunks_change_seq')"
+    )
+    op.execute("ALTER SEQUENCE document_chunks_change_seq OWNED BY document_chunks.change_seq")
+    op.execute(
+        """
+        CREATE FUNCTION document_chunks_bump_change_seq() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_seq := nextval('document_chunks_change_seq');
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER document_chunks_change_seq BEFORE UPDATE OF embedding, content ON document_chunks "
+        "FOR EACH ROW WHEN (OLD.embedding IS DISTINCT FROM NEW.embedding OR OLD.content IS DISTINCT FROM NEW.content) "
+        "EXECUTE FUNCTION document_chunks_bump_change_seq()"
+    )
+    op.execute("CREATE INDEX ix_document_chunks_change_seq ON document_chunks (change_seq)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_change_seq")
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_change_seq ON document_chunks")
+    op.execute("DROP FUNCTION IF EXISTS document_chunks_bump_change_seq()")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS change_seq")
@@ -0,0 +1,44 @@
+"""
+Revision ID: d81f6b3a9c24
+Revises: c4a9d2e8f150
+Create Date: 2025-09-24 15:48:03.772641
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from src.config import settings
+from src.infrastructure.postgresql.vector_index import (
+    QUANTIZED_INDEX_NAMES,
+    create_quantized_index_sql,
+    create_vector_index_sql,
+    drop_quantized_index_sql,
+    drop_vector_index_sql,
+)
+
+# revision identifiers, used by Alembic.
+revision = "d81f6b3a9c24"
+down_revision = "c4a9d2e8f150"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Expression index over halfvec / binary codes, chosen by VECTOR_QUANTIZATION (see src/config.py); requires
+    # pgvector >= 0.7. With "none" nothing is created: switching later means running the DDL from vector_index.py.
+    if settings.vector_quantization == "none":
+        return
+    with op.get_context().autocommit_block():
+        op.execute(create_quantized_index_sql(concurrently=True))
+        # Every search path then scans the quantized index and re-ranks on the heap column, so the full-precision
+        # index would only add its size: it replaces it rather than sitting next to it
+        op.execute(drop_vector_index_sql(concurrently=True))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(create_vector_index_sql(concurrently=True))
+        for quantization in QUANTIZED_INDEX_NAMES:
+            op.execute(drop_quantized_index_sql(quantization, concurrently=True))
@@ -0,0 +1,38 @@
+"""
+Revision ID: e3b7a1c5d962
+Revises: d81f6b3a9c24
+Create Date: 2025-09-26 12:31:48.950127
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+from src.config import settings
+
+# revision identifiers, used by Alembic.
+revision = "e3b7a1c5d962"
+down_revision = "d81f6b3a9c24"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated tsvector, so every insert path (ORM, bulk INSERT, COPY) and content update keeps it current.
+    # LEXICAL_SEARCH_CONFIG picks the text search configuration; changing it later means recreating the column.
+    op.execute(
+        "ALTER TABLE document_chunks ADD COLUMN content_tsv tsvector GENERATED ALWAYS AS "
+        f"(to_tsvector('{settings.lexical_search_config}'::regconfig, content)) STORED"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_document_chunks_content_tsv "
+            "ON document_chunks USING gin (content_tsv)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_document_chunks_content_tsv")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS content_tsv")
@@ -0,0 +1,65 @@
+"""
+Revision ID: e7a2c5f9b036
+Revises: c2f7a8e4d519
+Create Date: 2025-10-08 14:21:36.904512
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e7a2c5f9b036"
+down_revision = "c2f7a8e4d519"
+branch_labels = None
+depends_on = None
+
+STATEMENT_TRIGGERS = [
+    "CREATE TRIGGER document_chunks_corpus_version AFTER INSERT OR DELETE OR UPDATE OF embedding, content "
+    "ON document_chunks FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()",
+    "CREATE TRIGGER documents_corpus_version AFTER DELETE OR UPDATE OF title ON documents "
+    "FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()",
+]
+
+
+def upgrade() -> None:
+    # The statement-level triggers locked the corpus_version row at the first write of a transaction and held it to
+    # the end, so every writer queued on it, and a writer waiting on chunk row locks (an update deleting chunks a
+    # worker has claimed) deadlocked with the lock holder (that worker writing its embeddings). Deferred constraint
+    # triggers bump the version at commit instead: the row is the last lock any writer takes and is held only while
+    # committing. The bump still commits atomically with the write, so no cached result outlives it.
+    op.execute(
+        """
+        CREATE FUNCTION bump_corpus_version_at_commit() RETURNS trigger AS $$
+        BEGIN
+            -- Constraint triggers fire once per row: bump once per transaction
+            IF current_setting('corpus_version.bumped', true) IS DISTINCT FROM 'on' THEN
+                UPDATE corpus_version SET version = version + 1 WHERE id = 1;
+                PERFORM set_config('corpus_version.bumped', 'on', true);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_corpus_version ON document_chunks")
+    op.execute("DROP TRIGGER IF EXISTS documents_corpus_version ON documents")
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER document_chunks_corpus_version "
+        "AFTER INSERT OR DELETE OR UPDATE OF embedding, content ON document_chunks "
+        "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_corpus_version_at_commit()"
+    )
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER documents_corpus_version AFTER DELETE OR UPDATE OF title ON documents "
+        "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION bump_corpus_version_at_commit()"
+    )
+    # TRUNCATE cannot have constraint triggers; it locks the whole table anyway, so it keeps the immediate bump
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS documents_corpus_version ON documents")
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_corpus_version ON document_chunks")
+    op.execute("DROP FUNCTION IF EXISTS bump_corpus_version_at_commit()")
+    for statement in STATEMENT_TRIGGERS:
+        op.execute(statement)
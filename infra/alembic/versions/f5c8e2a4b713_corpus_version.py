@@ -0,0 +1,59 @@
+"""
+Revision ID: f5c8e2a4b713
+Revises: e3b7a1c5d962
+Create Date: 2025-09-29 09:42:15.337104
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f5c8e2a4b713"
+down_revision = "e3b7a1c5d962"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row, bumped in the writing transaction by every statement that can change a search result, so a cached
+    # result tagged with the version read before its query is never served once a later write has committed
+    op.execute(
+        "CREATE TABLE corpus_version ("
+        "id smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1), "
+        "version bigint NOT NULL DEFAULT 0)"
+    )
+    op.execute("INSERT INTO corpus_version (id, version) VALUES (1, 0)")
+    op.execute(
+        """
+        CREATE FUNCTION bump_corpus_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE corpus_version SET version = version + 1 WHERE id = 1;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Statement-level: a bulk insert bumps once, not once per row
+    op.execute(
+        "CREATE TRIGGER document_chunks_corpus_version AFTER INSERT OR DELETE OR UPDATE OF embedding, content "
+        "ON document_chunks FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()"
+    )
+    op.execute(
+        "CREATE TRIGGER document_chunks_truncate_corpus_version AFTER TRUNCATE ON document_chunks "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()"
+    )
+    # Results carry the document title
+    op.execute(
+        "CREATE TRIGGER documents_corpus_version AFTER DELETE OR UPDATE OF title ON documents "
+        "FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS documents_corpus_version ON documents")
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_truncate_corpus_version ON document_chunks")
+    op.execute("DROP TRIGGER IF EXISTS document_chunks_corpus_version ON document_chunks")
+    op.execute("DROP FUNCTION IF EXISTS bump_corpus_version()")
+    op.execute("DROP TABLE IF EXISTS corpus_version")
@@ -0,0 +1,31 @@
+"""Dispatch sync and async use cases from async endpoints"""
+
+import inspect
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from typing import ParamSpec, TypeVar
+
+from anyio import from_thread
+from fastapi.concurrency import run_in_threadpool
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+async def run_use_case(func: Callable[P, T | Awaitable[T]], *args: P.args, **kwargs: P.kwargs) -> T:
+    """Await async use cases on the event loop; run blocking ones in the threadpool as FastAPI would"""
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
+def iterate_from_threadpool(stream: AsyncIterator[T]) -> Iterator[T]:
+    """Consume an async iterator (e.g. a request body) from blocking code running under `run_use_case`"""
+
+    async def next_item() -> T:
+        return await stream.__anext__()
+
+    while True:
+        try:
+            yield from_thread.run(next_item)
+        except StopAsyncIteration:
+            return
@@ -1,29 +1,155 @@
 import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
-from src.application.create_document import CreateDocumentUseCase
-from src.application.search_document import SearchDocumentsUseCase
+from src.application.bulk_ingest import BulkIngestBatchUseCase, BulkRecord
+from src.application.create_document import AsyncCreateDocumentUseCase, CreateDocumentUseCase
+from src.application.ingest_document import (
+    AsyncGetDocumentStatusUseCase,
+    AsyncIngestDocumentUseCase,
+    EmbedPendingChunksUseCase,
+    GetDocumentStatusUseCase,
+    IngestDocumentUseCase,
+)
+from src.application.search_document import AsyncSearchDocumentsUseCase, SearchDocumentsUseCase
+from src.application.update_document import AsyncUpdateDocumentUseCase, UpdateDocumentUseCase
 from src.config import settings
-from src.domain.embeddings import EmbeddingGenerator
-from src.domain.services.document_processing_service import DocumentProcessingService
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.domain.embedding_store import AsyncEmbeddingStore, EmbeddingStore
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+from src.domain.near_duplicate_index import AsyncNearDuplicateIndex, NearDuplicateIndex
+from src.domain.services.document_processing_service import (
+    AsyncDocumentProcessingService,
+    DocumentProcessingService,
+)
+from src.infrastructure.bulk_ingest import BulkIngestPipeline
+from src.infrastructure.database import SessionLocal, get_async_db_session, get_db_session
+from src.infrastructure.embeddings.batching_generator import (
+    AsyncMicroBatchingEmbeddingGenerator,
+    MicroBatchingEmbeddingGenerator,
+)
+from src.infrastructure.embeddings.cached_generator import AsyncCachingEmbeddingGenerator, CachingEmbeddingGenerator
 from src.infrastructure.embeddings.mock_generator import MockEmbeddingGenerator
-from src.infrastructure.embeddings.ollama_generator import OllamaEmbeddingGenerator
+from src.infrastructure.embeddings.ollama_generator import AsyncOllamaEmbeddingGenerator, OllamaEmbeddingGenerator
 from src.infrastructure.embeddings.openai_generator import OpenAIEmbeddingGenerator
+from src.infrastructure.embeddings.query_cache import QueryEmbeddingCache, RedisEmbeddingCache, SharedEmbeddingCache
+from src.infrastructure.ingest_workers import EmbeddingWorkerPool
+from src.infrastructure.memory_index.indexes import VectorIndex, build_vector_index
+from src.infrastructure.memory_index.repositories import (
+    AsyncMemoryIndexedDocumentRepository,
+    MemoryIndexedDocumentRepository,
+    load_vector_store,
+)
+from src.infrastructure.memory_index.store import MemoryVectorStore
+from src.infrastructure.postgresql.async_repositories import AsyncPostgresDocumentRepository
+from src.infrastructure.postgresql.embedding_store import AsyncPostgresEmbeddingStore, PostgresEmbeddingStore
+from src.infrastructure.postgresql.near_duplicate_index import (
+    AsyncPostgresNearDuplicateIndex,
+    PostgresNearDuplicateIndex,
+)
 from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
-from src.infrastructure.splitter.langchain_text_splitter import LangchainTextSplitter
+from src.infrastructure.search_result_cache import InMemorySearchResultCache
+from src.infrastructure.splitter.native_text_splitter import build_text_splitter
 
 
-def get_postgresql_document_repository() -> PostgresDocumentRepository:
-    return PostgresDocumentRepository()
+# -------- Search backend (settings.search_backend) ----------
+@lru_cache
+def get_memory_vector_store() -> MemoryVectorStore:
+    # One index per process, loaded at startup and kept in sync by the writes this process makes
+    def index_factory(mapped: bool) -> Callable[[int, int], VectorIndex]:
+        return lambda dims, size: build_vector_index(
+            settings.memory_index_type,
+            dims,
+            size,
+            settings.memory_index_hnsw_threshold,
+            settings.memory_index_hnsw_m,
+            settings.memory_index_hnsw_ef_construction,
+            settings.memory_index_hnsw_ef_search,
+            mapped,
+        )
 
+    return MemoryVectorStore(index_factory(mapped=False), index_factory(mapped=True))
 
-def get_text_splitter() -> LangchainTextSplitter:
-    return LangchainTextSplitter()
+
+def load_memory_vector_store() -> None:
+    with SessionLocal() as session:
+        load_vector_store(
+            get_memory_vector_store(), session, settings.embedding_dimensions, settings.memory_snapshot_dir
+        )
+
+
+def document_repository(session: Session) -> PostgresDocumentRepository:
+    if settings.search_backend == "memory":
+        return MemoryIndexedDocumentRepository(session, get_memory_vector_store())
+    return PostgresDocumentRepository(session)
+
+
+def get_postgresql_document_repository(session: Session = Depends(get_db_session)) -> PostgresDocumentRepository:
+    return document_repository(session)
+
+
+def get_text_splitter() -> ContentTextSplitter:
+    return build_text_splitter(settings.text_splitter)
+
+
+@lru_cache
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    # Shared by the sync and async generators of this worker process
+    return QueryEmbeddingCache(maxsize=settings.embedding_cache_size, ttl_seconds=settings.embedding_cache_ttl_seconds)
+
+
+@lru_cache
+def get_search_result_cache() -> InMemorySearchResultCache:
+    return InMemorySearchResultCache(maxsize=settings.search_result_cache_size)
+
+
+def search_result_cache() -> InMemorySearchResultCache | None:
+    return get_search_result_cache() if settings.search_result_cache_enabled else None
+
+
+@lru_cache
+def get_query_embedding_executor() -> ThreadPoolExecutor:
+    # Hybrid searches of this worker process embed their query here while the lexical query runs
+    return ThreadPoolExecutor(max_workers=settings.search_query_workers, thread_name_prefix="search-query")
+
+
+def shutdown_query_embedding_executor() -> None:
+    if get_query_embedding_executor.cache_info().currsize:
+        get_query_embedding_executor().shutdown(cancel_futures=True)
+        get_query_embedding_executor.cache_clear()
+
+
+@lru_cache
+def _shared_embedding_cache() -> SharedEmbeddingCache | None:
+    if not settings.embedding_cache_url:
+        return None
+    return RedisEmbeddingCache(settings.embedding_cache_url, ttl_seconds=settings.embedding_cache_ttl_seconds)
+
+
+@lru_cache
+def _ollama_embedding_generator() -> EmbeddingGenerator:
+    # One client per process, so the query cache and the batcher outlive the request.
+    # Cache hits never wait for a batch: cache -> micro-batcher -> provider
+    client = OllamaEmbeddingGenerator()
+    generator: EmbeddingGenerator = client
+    if settings.embedding_batching_enabled:
+        generator = MicroBatchingEmbeddingGenerator(
+            generator, settings.embedding_batch_window_ms, settings.embedding_batch_max_size
+        )
+    if settings.embedding_cache_enabled:
+        generator = CachingEmbeddingGenerator(
+            generator, client.model, get_query_embedding_cache(), _shared_embedding_cache()
+        )
+    return generator
 
 
 def get_ollama_embedding_generator() -> EmbeddingGenerator:
-    return OllamaEmbeddingGenerator()
+    return _ollama_embedding_generator()
 
 
 def get_embedding_generator() -> EmbeddingGenerator:
@@ -36,11 +162,25 @@ def get_embedding_generator() -> EmbeddingGenerator:
     return OpenAIEmbeddingGenerator(api_key=api_key)
 
 
+def get_embedding_store(session: Session = Depends(get_db_session)) -> EmbeddingStore | None:
+    if not settings.embedding_store_enabled:
+        return None
+    return PostgresEmbeddingStore(session, settings.ollama_model_name, settings.embedding_dimensions)
+
+
+def get_near_duplicate_index(session: Session = Depends(get_db_session)) -> NearDuplicateIndex | None:
+    if not settings.chunk_dedup_enabled:
+        return None
+    return PostgresNearDuplicateIndex(session, settings.chunk_dedup_max_distance)
+
+
 def get_document_processing_service(
-    splitter: LangchainTextSplitter = Depends(get_text_splitter),
+    splitter: ContentTextSplitter = Depends(get_text_splitter),
     embeddings: EmbeddingGenerator = Depends(get_ollama_embedding_generator),
+    embedding_store: EmbeddingStore | None = Depends(get_embedding_store),
+    duplicate_index: NearDuplicateIndex | None = Depends(get_near_duplicate_index),
 ) -> DocumentProcessingService:
-    return DocumentProcessingService(splitter, embeddings)
+    return DocumentProcessingService(splitter, embeddings, embedding_store, build_text_splitter, duplicate_index)
 
 
 def get_create_document_use_case(
@@ -50,8 +190,180 @@ def get_create_document_use_case(
     return CreateDocumentUseCase(repository, processing_service)
 
 
+def get_update_document_use_case(
+    repository: PostgresDocumentRepository = Depends(get_postgresql_document_repository),
+    processing_service: DocumentProcessingService = Depends(get_document_processing_service),
+) -> UpdateDocumentUseCase:
+    return UpdateDocumentUseCase(repository, processing_service)
+
+
 def get_search_documents_use_case(
     repository: PostgresDocumentRepository = Depends(get_postgresql_document_repository),
     processing_service: DocumentProcessingService = Depends(get_document_processing_service),
 ) -> SearchDocumentsUseCase:
-    return SearchDocumentsUseCase(repository, processing_service)
+    return SearchDocumentsUseCase(
+        repository,
+        processing_service,
+        settings.rrf_k,
+        settings.hybrid_candidates_factor,
+        settings.search_batch_max_queries,
+        search_result_cache(),
+        settings.chunk_dedup_max_distance,
+        get_query_embedding_executor(),
+    )
+
+
+def get_ingest_document_use_case(
+    repository: PostgresDocumentRepository = Depends(get_postgresql_document_repository),
+    processing_service: DocumentProcessingService = Depends(get_document_processing_service),
+) -> IngestDocumentUseCase:
+    return IngestDocumentUseCase(repository, processing_service)
+
+
+def get_document_status_use_case(
+    repository: PostgresDocumentRepository = Depends(get_postgresql_document_repository),
+) -> GetDocumentStatusUseCase:
+    return GetDocumentStatusUseCase(repository)
+
+
+# -------- Background ingest workers ----------
+def embed_pending_chunks_batch() -> int:
+    """One worker iteration, with its own sessions (workers run outside any request)"""
+    # The store commits on its own session so the claim's row locks are held until the batch is written
+    with SessionLocal() as session, SessionLocal() as store_session:
+        embedding_store = get_embedding_store(store_session)
+        processing_service = DocumentProcessingService(
+            get_text_splitter(), _ollama_embedding_generator(), embedding_store
+        )
+        use_case = EmbedPendingChunksUseCase(
+            document_repository(session), processing_service, settings.ingest_batch_size
+        )
+        return use_case.execute()
+
+
+@lru_cache
+def get_embedding_worker_pool() -> EmbeddingWorkerPool:
+    return EmbeddingWorkerPool(embed_pending_chunks_batch, settings.ingest_workers, settings.ingest_poll_interval)
+
+
+# -------- Bulk ingest ----------
+def ingest_bulk_batch(records: list[BulkRecord]) -> dict:
+    """One bulk-ingest batch, with its own sessions (batches run on the pipeline's worker threads)"""
+    with SessionLocal() as session, SessionLocal() as store_session:
+        processing_service = DocumentProcessingService(
+            get_text_splitter(),
+            _ollama_embedding_generator(),
+            get_embedding_store(store_session),
+            duplicate_index=get_near_duplicate_index(store_session),
+        )
+        return BulkIngestBatchUseCase(document_repository(session), processing_service).execute(records)
+
+
+def get_bulk_ingest_pipeline() -> BulkIngestPipeline:
+    # Sync on both request paths: the batches run on their own worker threads and sessions
+    return BulkIngestPipeline(ingest_bulk_batch, settings.bulk_ingest_batch_size, settings.bulk_ingest_workers)
+
+
+# -------- Async request path (settings.use_async) ----------
+async def get_async_document_repository(
+    session: AsyncSession = Depends(get_async_db_session),
+) -> AsyncPostgresDocumentRepository:
+    if settings.search_backend == "memory":
+        return AsyncMemoryIndexedDocumentRepository(session, get_memory_vector_store())
+    return AsyncPostgresDocumentRepository(session)
+
+
+async def get_async_embedding_store(
+    session: AsyncSession = Depends(get_async_db_session),
+) -> AsyncEmbeddingStore | None:
+    if not settings.embedding_store_enabled:
+        return None
+    return AsyncPostgresEmbeddingStore(session, settings.ollama_model_name, settings.embedding_dimensions)
+
+
+async def get_async_near_duplicate_index(
+    session: AsyncSession = Depends(get_async_db_session),
+) -> AsyncNearDuplicateIndex | None:
+    if not settings.chunk_dedup_enabled:
+        return None
+    return AsyncPostgresNearDuplicateIndex(session, settings.chunk_dedup_max_distance)
+
+
+@lru_cache
+def _async_ollama_embedding_generator() -> AsyncEmbeddingGenerator:
+    # One client (and HTTP connection pool) per process
+    client = AsyncOllamaEmbeddingGenerator()
+    generator: AsyncEmbeddingGenerator = client
+    if settings.embedding_batching_enabled:
+        generator = AsyncMicroBatchingEmbeddingGenerator(
+            generator, settings.embedding_batch_window_ms, settings.embedding_batch_max_size
+        )
+    if settings.embedding_cache_enabled:
+        generator = AsyncCachingEmbeddingGenerator(
+            generator, client.model, get_query_embedding_cache(), _shared_embedding_cache()
+        )
+    return generator
+
+
+async def get_async_embedding_generator() -> AsyncEmbeddingGenerator:
+    return _async_ollama_embedding_generator()
+
+
+async def get_async_document_processing_service(
+    embeddings: AsyncEmbeddingGenerator = Depends(get_async_embedding_generator),
+    embedding_store: AsyncEmbeddingStore | None = Depends(get_async_embedding_store),
+    duplicate_index: AsyncNearDuplicateIndex | None = Depends(get_async_near_duplicate_index),
+) -> AsyncDocumentProcessingService:
+    return AsyncDocumentProcessingService(
+        get_text_splitter(), embeddings, embedding_store, build_text_splitter, duplicate_index
+    )
+
+
+async def get_async_create_document_use_case(
+    repository: AsyncPostgresDocumentRepository = Depends(get_async_document_repository),
+    processing_service: AsyncDocumentProcessingService = Depends(get_async_document_processing_service),
+) -> AsyncCreateDocumentUseCase:
+    return AsyncCreateDocumentUseCase(repository, processing_service)
+
+
+async def get_async_update_document_use_case(
+    repository: AsyncPostgresDocumentRepository = Depends(get_async_document_repository),
+    processing_service: AsyncDocumentProcessingService = Depends(get_async_document_processing_service),
+) -> AsyncUpdateDocumentUseCase:
+    return AsyncUpdateDocumentUseCase(repository, processing_service)
+
+
+async def get_async_search_documents_use_case(
+    repository: AsyncPostgresDocumentRepository = Depends(get_async_document_repository),
+    processing_service: AsyncDocumentProcessingService = Depends(get_async_document_processing_service),
+) -> AsyncSearchDocumentsUseCase:
+    return AsyncSearchDocumentsUseCase(
+        repository,
+        processing_service,
+        settings.rrf_k,
+        settings.hybrid_candidates_factor,
+        settings.search_batch_max_queries,
+        search_result_cache(),
+        settings.chunk_dedup_max_distance,
+    )
+
+
+async def get_async_ingest_document_use_case(
+    repository: AsyncPostgresDocumentRepository = Depends(get_async_document_repository),
+    processing_service: AsyncDocumentProcessingService = Depends(get_async_document_processing_service),
+) -> AsyncIngestDocumentUseCase:
+    return AsyncIngestDocumentUseCase(repository, processing_service)
+
+
+async def get_async_document_status_use_case(
+    repository: AsyncPostgresDocumentRepository = Depends(get_async_document_repository),
+) -> AsyncGetDocumentStatusUseCase:
+    return AsyncGetDocumentStatusUseCase(repository)
+
+
+# Request path selected by configuration: threadpool + psycopg2, or event loop + asyncpg and async clients
+create_document_use_case = get_async_create_document_use_case if settings.use_async else get_create_document_use_case
+update_document_use_case = get_async_update_document_use_case if settings.use_async else get_update_document_use_case
+search_documents_use_case = get_async_search_documents_use_case if settings.use_async else get_search_documents_use_case
+ingest_document_use_case = get_async_ingest_document_use_case if settings.use_async else get_ingest_document_use_case
+document_status_use_case = get_async_document_status_use_case if settings.use_async else get_document_status_use_case
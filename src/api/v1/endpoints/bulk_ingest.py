@@ -0,0 +1,55 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+
+from src.api.v1.concurrency import iterate_from_threadpool, run_use_case
+from src.api.v1.dependencies import get_bulk_ingest_pipeline
+from src.api.v1.schemas import BulkIngestResponse
+from src.infrastructure.bulk_ingest import (
+    BulkIngestPipeline,
+    BulkIngestReport,
+    iter_lines,
+    parse_line_range,
+    parse_ndjson,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post(
+    "/documents/bulk",
+    response_model=BulkIngestResponse,
+    summary="Bulk-ingest an NDJSON stream of documents",
+    description=(
+        'Stream one `{"title": ..., "text": ...}` object per line (`application/x-ndjson`). The body is read as it '
+        "arrives and ingested in batches: split, embedded and written with COPY, each batch in its own transaction. "
+        "Invalid lines are reported and skipped. If ingestion fails the response is a 500 whose `lines_committed` and "
+        "`committed_ranges` are the resume point: send the same body again with `?skip=<lines_committed>` and one "
+        "`skip_ranges=<range>` per committed range."
+    ),
+    response_description="Counts, rejected lines and per-stage throughput",
+)
+async def bulk_ingest_documents(
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Input lines to skip, e.g. `lines_committed` of a failed run"),
+    skip_ranges: list[str] = Query(
+        [], description="Line ranges to skip (`first-last`), e.g. the `committed_ranges` of a failed run"
+    ),
+    pipeline: BulkIngestPipeline = Depends(get_bulk_ingest_pipeline),
+) -> BulkIngestResponse:
+    try:
+        ranges = [parse_line_range(value) for value in skip_ranges]
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+
+    def ingest() -> BulkIngestReport:
+        records = parse_ndjson(iter_lines(iterate_from_threadpool(request.stream())), skip=skip, skip_ranges=ranges)
+        return pipeline.run(records, start_line=skip, committed_ranges=ranges)
+
+    report = await run_use_case(ingest)
+    if report.error:
+        logger.error(f"Bulk ingest stopped at line {report.lines_committed}: {report.error}")
+        response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    return BulkIngestResponse.model_validate(report.to_dict())
@@ -2,10 +2,11 @@ import logging
 
 from fastapi import APIRouter, Depends, HTTPException
 
-from src.api.v1.dependencies import get_create_document_use_case
+from src.api.v1.concurrency import run_use_case
+from src.api.v1.dependencies import create_document_use_case
 from src.api.v1.exceptions import handle_domain_exception
 from src.api.v1.schemas import DocumentCreateRequest, DocumentCreateResponse
-from src.application.create_document import CreateDocumentUseCase
+from src.application.create_document import AsyncCreateDocumentUseCase, CreateDocumentUseCase
 from src.domain.exceptions import DomainException
 
 router = APIRouter()
@@ -17,17 +18,19 @@ logger = logging.getLogger(__name__)
     response_model=DocumentCreateResponse,
     summary="Create and index a document",
     description=(
-        "Ingest a document by title and long text. The text is split into chunks with LangChain, "
-        "each chunk is embedded, and both the document and its chunk embeddings are persisted in PostgreSQL (pgvector)."
+        "Ingest a document by title and long text. The text is split into chunks with the `chunking` strategy "
+        "(default: the configured TEXT_SPLITTER), each chunk is embedded, and both the document and its chunk "
+        "embeddings are persisted in PostgreSQL (pgvector)."
     ),
     response_description="Created document with stored chunk identifiers",
 )
-def add_document(
-    payload: DocumentCreateRequest, use_case: CreateDocumentUseCase = Depends(get_create_document_use_case)
+async def add_document(
+    payload: DocumentCreateRequest,
+    use_case: CreateDocumentUseCase | AsyncCreateDocumentUseCase = Depends(create_document_use_case),
 ) -> DocumentCreateResponse:
     """Create a document, split content, embed chunks, and persist everything."""
     try:
-        result = use_case.execute(payload.title, payload.text)
+        result = await run_use_case(use_case.execute, payload.title, payload.text, payload.chunking)
         logger.info(f"Document created successfully: {result['document']['id']}")
         return DocumentCreateResponse.model_validate(result)
     except DomainException as exc:
@@ -0,0 +1,69 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from src.api.v1.concurrency import run_use_case
+from src.api.v1.dependencies import document_status_use_case, get_embedding_worker_pool, ingest_document_use_case
+from src.api.v1.exceptions import handle_domain_exception
+from src.api.v1.schemas import DocumentCreateRequest, IngestJobResponse
+from src.application.ingest_document import (
+    AsyncGetDocumentStatusUseCase,
+    AsyncIngestDocumentUseCase,
+    GetDocumentStatusUseCase,
+    IngestDocumentUseCase,
+)
+from src.domain.exceptions import DomainException
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post(
+    "/documents/background",
+    response_model=IngestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue a document for background embedding",
+    description=(
+        "Split the document and store it with its chunks immediately, without embeddings. Background workers embed "
+        "the chunks in batches; poll `GET /v1/documents/{document_id}/status` (see the `Location` header) for progress."
+    ),
+    response_description="Ingestion job, identified by the document id",
+)
+async def add_document_in_background(
+    payload: DocumentCreateRequest,
+    response: Response,
+    use_case: IngestDocumentUseCase | AsyncIngestDocumentUseCase = Depends(ingest_document_use_case),
+) -> IngestJobResponse:
+    """Store a document and its raw chunks and hand the embedding work to the ingest workers."""
+    try:
+        result = await run_use_case(use_case.execute, payload.title, payload.text, payload.chunking)
+    except DomainException as exc:
+        logger.warning(f"Domain exception: {exc!s}")
+        raise handle_domain_exception(exc) from exc
+    except Exception as exc:
+        logger.error(f"Unexpected error: {exc!s}")
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
+
+    get_embedding_worker_pool().notify()
+    response.headers["Location"] = f"/v1/documents/{result['document_id']}/status"
+    return IngestJobResponse.model_validate(result)
+
+
+@router.get(
+    "/documents/{document_id}/status",
+    response_model=IngestJobResponse,
+    summary="Embedding progress of a document",
+    description="Chunks embedded so far and whether the document is fully processed and searchable.",
+)
+async def get_document_status(
+    document_id: int,
+    use_case: GetDocumentStatusUseCase | AsyncGetDocumentStatusUseCase = Depends(document_status_use_case),
+) -> IngestJobResponse:
+    try:
+        result = await run_use_case(use_case.execute, document_id)
+    except DomainException as exc:
+        raise handle_domain_exception(exc) from exc
+    except Exception as exc:
+        logger.error(f"Unexpected error: {exc!s}")
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
+    return IngestJobResponse.model_validate(result)
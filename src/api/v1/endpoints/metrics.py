@@ -0,0 +1,43 @@
+from fastapi import APIRouter
+
+from src.api.v1.dependencies import get_query_embedding_cache, get_search_result_cache
+from src.api.v1.schemas import EmbeddingCacheMetricsResponse, PoolMetricsResponse, SearchResultCacheMetricsResponse
+from src.config import settings
+from src.infrastructure.database import get_pool_metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics/pool",
+    response_model=PoolMetricsResponse,
+    summary="Database connection pool metrics",
+    description="Pool occupancy (checked out, overflow) and accumulated checkout wait time for this worker process.",
+)
+def pool_metrics() -> PoolMetricsResponse:
+    return PoolMetricsResponse.model_validate(get_pool_metrics())
+
+
+@router.get(
+    "/metrics/embedding-cache",
+    response_model=EmbeddingCacheMetricsResponse,
+    summary="Query-embedding cache metrics",
+    description="Hit, miss and eviction counters of this worker's query-embedding cache.",
+)
+def embedding_cache_metrics() -> EmbeddingCacheMetricsResponse:
+    return EmbeddingCacheMetricsResponse.model_validate(get_query_embedding_cache().stats())
+
+
+@router.get(
+    "/metrics/search-cache",
+    response_model=SearchResultCacheMetricsResponse,
+    summary="Search result cache metrics",
+    description=(
+        "Hit ratio, invalidations (corpus version changes) and the search time saved by this worker's search "
+        "result cache."
+    ),
+)
+def search_cache_metrics() -> SearchResultCacheMetricsResponse:
+    return SearchResultCacheMetricsResponse.model_validate(
+        {"enabled": settings.search_result_cache_enabled, **get_search_result_cache().stats()}
+    )
@@ -1,11 +1,13 @@
 import logging
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from src.api.v1.dependencies import get_search_documents_use_case
+from src.api.v1.concurrency import run_use_case
+from src.api.v1.dependencies import search_documents_use_case
 from src.api.v1.exceptions import handle_domain_exception
-from src.api.v1.schemas import SearchDocumentsResponse
-from src.application.search_document import SearchDocumentsUseCase
+from src.api.v1.schemas import BatchSearchRequest, BatchSearchResponse, SearchDocumentsResponse
+from src.application.search_document import AsyncSearchDocumentsUseCase, SearchDocumentsUseCase
 from src.domain.exceptions import DomainException
 
 router = APIRouter()
@@ -18,19 +20,42 @@ logger = logging.getLogger(__name__)
     summary="Semantic search over document chunks",
     description=(
         "Compute the embedding of the query and return the most similar chunks stored in PostgreSQL (pgvector) "
-        "using the `<->` distance operator."
+        "using the `<=>` cosine distance operator. `ef_search` / `probes` trade recall for latency when the "
+        "HNSW / IVFFlat index serves the query. `mode=lexical` ranks chunks by PostgreSQL full-text search instead "
+        "(no embedding call; `similarity` then holds the text rank) and `mode=hybrid` fuses both rankings with "
+        "Reciprocal Rank Fusion (`score`, with `matched_by` naming the rankings a chunk came from). "
+        "`collapse_duplicates` keeps only the best-ranked of near-identical chunks, counting the rest in `duplicates`."
     ),
     response_description="Search results with metadata",
 )
-def search_documents(
+async def search_documents(
     query: str,
     limit: int = 5,
     min_similarity: float = Query(0.0, ge=0.0, le=1.0, description="Filter out results below this similarity [0..1]"),
-    use_case: SearchDocumentsUseCase = Depends(get_search_documents_use_case),
+    ef_search: Optional[int] = Query(
+        None, ge=1, le=1000, description="HNSW candidate list size; higher improves recall at the cost of latency"
+    ),
+    probes: Optional[int] = Query(
+        None, ge=1, description="IVFFlat lists to probe; higher improves recall at the cost of latency"
+    ),
+    mode: Literal["vector", "lexical", "hybrid"] = Query(
+        "vector", description="Rank by embedding similarity, full-text relevance, or both fused"
+    ),
+    collapse_duplicates: bool = Query(False, description="Fold near-duplicate chunks into the best-ranked one"),
+    use_case: SearchDocumentsUseCase | AsyncSearchDocumentsUseCase = Depends(search_documents_use_case),
 ) -> SearchDocumentsResponse:
     """Search for top-N similar chunks to the given query (limit default = 5)."""
     try:
-        result = use_case.execute(query, limit, min_similarity)
+        result = await run_use_case(
+            use_case.execute,
+            query,
+            limit,
+            min_similarity,
+            ef_search=ef_search,
+            probes=probes,
+            mode=mode,
+            collapse_duplicates=collapse_duplicates,
+        )
         logger.info(f"Search completed: {result.get('total_results', 0)} results found")
         return SearchDocumentsResponse.model_validate(result)
     except DomainException as exc:
@@ -39,3 +64,37 @@ def search_documents(
     except Exception as exc:
         logger.error(f"Unexpected error: {exc!s}")
         raise HTTPException(status_code=500, detail="Internal server error") from exc
+
+
+@router.post(
+    "/search/batch",
+    response_model=BatchSearchResponse,
+    summary="Semantic search for many queries in one request",
+    description=(
+        "Embed every query with a single embedding call and search them all in one SQL statement (a LATERAL top-k "
+        "per query). Each query carries its own `limit` / `min_similarity`; `ef_search` / `probes` apply to the "
+        "whole batch. Results come back in query order, each shaped like a `/v1/search/` response."
+    ),
+    response_description="One search result per query, in request order",
+)
+async def search_documents_batch(
+    request: BatchSearchRequest,
+    use_case: SearchDocumentsUseCase | AsyncSearchDocumentsUseCase = Depends(search_documents_use_case),
+) -> BatchSearchResponse:
+    """Search for the top-N similar chunks of each query in the batch."""
+    try:
+        result = await run_use_case(
+            use_case.execute_batch,
+            [query.model_dump() for query in request.queries],
+            ef_search=request.ef_search,
+            probes=request.probes,
+            collapse_duplicates=request.collapse_duplicates,
+        )
+        logger.info(f"Batch search completed for {result['total_queries']} queries")
+        return BatchSearchResponse.model_validate(result)
+    except DomainException as exc:
+        logger.warning(f"Domain exception: {exc!s}")
+        raise handle_domain_exception(exc) from exc
+    except Exception as exc:
+        logger.error(f"Unexpected error: {exc!s}")
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
@@ -0,0 +1,43 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from src.api.v1.concurrency import run_use_case
+from src.api.v1.dependencies import update_document_use_case
+from src.api.v1.exceptions import handle_domain_exception
+from src.api.v1.schemas import DocumentCreateRequest, DocumentUpdateResponse
+from src.application.update_document import AsyncUpdateDocumentUseCase, UpdateDocumentUseCase
+from src.domain.exceptions import DomainException
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.put(
+    "/documents/{document_id}",
+    response_model=DocumentUpdateResponse,
+    summary="Replace a document and re-index only its changed chunks",
+    description=(
+        "Replace the title and text of a document. The new text is split again and its chunks are matched by content "
+        "against the stored ones: unchanged chunks keep their rows and embeddings, chunks no longer in the text are "
+        "deleted and only the new ones are embedded, all in one transaction. Answers 409 when the document was "
+        "updated concurrently."
+    ),
+    response_description="Updated document with its chunks and the chunk diff",
+)
+async def update_document(
+    document_id: int,
+    payload: DocumentCreateRequest,
+    use_case: UpdateDocumentUseCase | AsyncUpdateDocumentUseCase = Depends(update_document_use_case),
+) -> DocumentUpdateResponse:
+    """Re-split a document, embed its new chunks and apply the chunk diff."""
+    try:
+        result = await run_use_case(use_case.execute, document_id, payload.title, payload.text, payload.chunking)
+        logger.info(f"Document updated successfully: {document_id}")
+        return DocumentUpdateResponse.model_validate(result)
+    except DomainException as exc:
+        logger.warning(f"Domain exception: {exc!s}")
+        raise handle_domain_exception(exc) from exc
+    except Exception as exc:
+        logger.error(f"Unexpected error: {exc!s}")
+        raise HTTPException(status_code=500, detail="Internal server error") from exc
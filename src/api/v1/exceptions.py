@@ -6,6 +6,7 @@ from src.domain.exceptions import (
     ChunkContentEmptyException,
     ChunkNotBelongsToDocumentException,
     ChunkSaveException,
+    DocumentConflictException,
     DocumentContentEmptyException,
     DocumentNotFoundError,
     DocumentProcessingException,
@@ -51,7 +52,7 @@ def handle_domain_exception(exception: DomainException) -> HTTPException:
         return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exception))
 
     # Business logic errors (409 Conflict)
-    if isinstance(exception, ChunkNotBelongsToDocumentException):
+    if isinstance(exception, (ChunkNotBelongsToDocumentException, DocumentConflictException)):
         return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exception))
 
     # Generic domain error (400 Bad Request)
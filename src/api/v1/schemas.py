@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class HealthResponse(BaseModel):
@@ -11,6 +11,8 @@ class HealthResponse(BaseModel):
 class DocumentCreateRequest(BaseModel):
     title: str
     text: str
+    # Chunking strategy for this document instead of the configured TEXT_SPLITTER
+    chunking: Optional[Literal["native", "langchain", "sentence"]] = None
 
 
 class DocumentResponse(BaseModel):
@@ -27,20 +29,88 @@ class DocumentChunkResponse(BaseModel):
     content: str
     has_embedding: bool
     word_count: int
+    # Stored chunk this near-duplicate was linked to instead of being embedded
+    canonical_chunk_id: Optional[int] = None
 
 
 class ProcessingStatusResponse(BaseModel):
     total_chunks: int
     chunks_with_embeddings: int
     chunks_without_embeddings: int
+    # Near-duplicates of stored chunks, linked to them instead of embedded
+    duplicate_chunks: int = 0
     is_fully_processed: bool
     total_words: int
 
 
+class EmbeddingReuseResponse(BaseModel):
+    total_chunks: int
+    reused_chunks: int
+    embedded_chunks: int
+    hit_ratio: float
+
+
+class DeduplicationResponse(BaseModel):
+    duplicate_chunks: int
+    dedup_ratio: float
+
+
 class DocumentCreateResponse(BaseModel):
     document: DocumentResponse
     chunks: list[DocumentChunkResponse]
     processing_status: ProcessingStatusResponse
+    embedding_reuse: EmbeddingReuseResponse
+    deduplication: DeduplicationResponse
+
+
+class ChunkDiffResponse(BaseModel):
+    unchanged_chunks: int
+    added_chunks: int
+    removed_chunks: int
+
+
+class DocumentUpdateResponse(DocumentCreateResponse):
+    chunk_diff: ChunkDiffResponse
+
+
+class IngestJobResponse(BaseModel):
+    job_id: int
+    document_id: int
+    status: Literal["pending", "processing", "completed"]
+    processing_status: ProcessingStatusResponse
+
+
+class StageThroughputResponse(BaseModel):
+    items: int
+    seconds: float
+    items_per_second: float
+
+
+class BulkIngestRejectionResponse(BaseModel):
+    line: int
+    error: str
+
+
+class BulkIngestResponse(BaseModel):
+    completed: bool
+    documents: int
+    chunks: int
+    reused_chunks: int
+    duplicate_chunks: int
+    dedup_ratio: float
+    rejected_count: int
+    rejected: list[BulkIngestRejectionResponse]
+    lines_committed: int = Field(
+        ..., description="Input lines fully stored; resend the body with ?skip=<this> to resume"
+    )
+    committed_ranges: list[str] = Field(
+        ..., description="Line ranges stored past lines_committed; resend them as skip_ranges to resume"
+    )
+    elapsed_seconds: float
+    documents_per_second: float
+    chunks_per_second: float
+    stages: dict[str, StageThroughputResponse]
+    error: Optional[str] = None
 
 
 class SearchResultItem(BaseModel):
@@ -49,11 +119,19 @@ class SearchResultItem(BaseModel):
     content: str
     similarity: str
     similarity_value: float
+    score: float
+    matched_by: list[str]
+    # Near-duplicate results folded into this one (collapse_duplicates)
+    duplicates: int = 0
 
 
 class SearchParametersResponse(BaseModel):
     limit: int
     min_similarity: float
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    mode: str = "vector"
+    collapse_duplicates: bool = False
 
 
 class SearchDocumentsResponse(BaseModel):
@@ -61,3 +139,62 @@ class SearchDocumentsResponse(BaseModel):
     results: list[SearchResultItem]
     total_results: int
     search_parameters: SearchParametersResponse
+
+
+class BatchSearchQuery(BaseModel):
+    query: str
+    limit: int = Field(5, ge=1)
+    min_similarity: float = Field(0.0, ge=0.0, le=1.0)
+
+
+class BatchSearchRequest(BaseModel):
+    queries: list[BatchSearchQuery] = Field(..., min_length=1)
+    ef_search: Optional[int] = Field(None, ge=1, le=1000)
+    probes: Optional[int] = Field(None, ge=1)
+    collapse_duplicates: bool = False
+
+
+class BatchSearchResponse(BaseModel):
+    results: list[SearchDocumentsResponse]
+    total_queries: int
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class EmbeddingCacheMetricsResponse(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    shared_hits: int
+    hit_ratio: float
+
+
+class SearchResultCacheMetricsResponse(BaseModel):
+    enabled: bool
+    size: int
+    maxsize: int
+    corpus_version: Optional[int] = None
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    hit_ratio: float
+    saved_seconds: float = Field(..., description="Search time (SQL and result building) not spent thanks to hits")
+
+
+class PoolMetricsResponse(BaseModel):
+    sync: PoolStatsResponse
+    # Only present once the async engine has been created (USE_ASYNC=true)
+    async_: Optional[PoolStatsResponse] = Field(default=None, alias="async")
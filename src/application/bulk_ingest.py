@@ -0,0 +1,102 @@
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from src.domain.content_text_spliter import SplitText
+from src.domain.document import Document, DocumentChunk
+from src.domain.document_repository import DocumentRepository
+from src.domain.exceptions import DocumentException, DocumentSaveException
+from src.domain.services.document_processing_service import DocumentProcessingService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BulkRecord:
+    """One document of a bulk-ingest input; `line` is its 1-based position, `error` is set when it could not be read"""
+
+    line: int
+    title: str = ""
+    text: str = ""
+    error: Optional[str] = None
+
+
+class BulkIngestBatchUseCase:
+    """Split, embed and store a batch of bulk-ingested documents in a single transaction
+
+    Invalid documents are rejected individually; an embedding or database failure fails the whole batch, so nothing
+    of it is stored and it can be ingested again.
+    """
+
+    def __init__(self, repository: DocumentRepository, processing_service: DocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    def execute(self, records: list[BulkRecord]) -> dict[str, Any]:
+        """Execute bulk ingestion of one batch"""
+        started = time.perf_counter()
+        rejected: list[dict[str, Any]] = []
+        split: list[tuple[Document, SplitText]] = []
+        for record in records:
+            if record.error:
+                rejected.append({"line": record.line, "error": record.error})
+                continue
+            try:
+                document = Document(title=record.title, content=record.text)
+                split.append((document, self.processing_service.prepare_document(document)))
+            except DocumentException as exc:
+                rejected.append({"line": record.line, "error": str(exc)})
+        split_done = time.perf_counter()
+
+        # One near-duplicate lookup and one embedding call for every chunk of the batch; the batch engine fans the
+        # embeddings out to provider-sized requests
+        all_chunks = [text_chunk for _, document_split in split for text_chunk in document_split.chunks]
+        # Large documents were signed in the preprocessing pool while they were split
+        signatures = [
+            signature
+            for _, document_split in split
+            for signature in (
+                document_split.chunk_signatures
+                if document_split.chunk_signatures is not None
+                else self.processing_service.signatures(document_split.chunks)
+            )
+        ]
+        signatures, canonical_ids = self.processing_service.find_duplicates(all_chunks, signatures)
+        embeddings, reuse = self.processing_service.embed_chunks(
+            self.processing_service.unlinked(all_chunks, canonical_ids)
+        )
+        reuse = self.processing_service.with_duplicates(reuse, canonical_ids)
+        documents: list[tuple[Document, list[DocumentChunk]]] = []
+        position = embedded = 0
+        for document, document_split in split:
+            text_chunks = document_split.chunks
+            end = position + len(text_chunks)
+            document_links = canonical_ids[position:end]
+            document_embeddings = embeddings[embedded : embedded + document_links.count(None)]
+            chunks = self.processing_service.build_chunks(
+                document, text_chunks, document_embeddings, None, signatures[position:end], document_links
+            )
+            documents.append((document, chunks))
+            position, embedded = end, embedded + len(document_embeddings)
+        embed_done = time.perf_counter()
+
+        try:
+            self.repository.save_documents_with_chunks(documents)
+        except Exception as exc:
+            logger.error(f"Error saving bulk batch: {exc!s}")
+            raise DocumentSaveException(f"Error saving bulk batch: {exc!s}") from exc
+        write_done = time.perf_counter()
+
+        return {
+            "documents": len(documents),
+            "chunks": position,
+            "reused_chunks": reuse.reused_chunks,
+            "duplicate_chunks": reuse.duplicate_chunks,
+            "rejected": rejected,
+            "stage_seconds": {
+                "split": split_done - started,
+                "embed": embed_done - split_done,
+                "write": write_done - embed_done,
+            },
+        }
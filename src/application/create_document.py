@@ -1,14 +1,15 @@
 import logging
-from typing import Any
+from typing import Any, Optional
 
 from src.domain.aggregates.document_aggregate import DocumentAggregate
-from src.domain.document import Document
-from src.domain.document_repository import DocumentRepository
-from src.domain.exceptions import (
-    ChunkSaveException,
-    DocumentSaveException,
+from src.domain.document import Document, DocumentChunk
+from src.domain.document_repository import AsyncDocumentRepository, DocumentRepository
+from src.domain.exceptions import DocumentSaveException
+from src.domain.services.document_processing_service import (
+    AsyncDocumentProcessingService,
+    DocumentProcessingService,
+    EmbeddingReuse,
 )
-from src.domain.services.document_processing_service import DocumentProcessingService
 
 logger = logging.getLogger(__name__)
 
@@ -20,60 +21,86 @@ class CreateDocumentUseCase:
         self.repository = repository
         self.processing_service = processing_service
 
-    def execute(self, title: str, content: str) -> dict[str, Any]:
-        """Execute document creation use case"""
+    def execute(self, title: str, content: str, chunking: Optional[str] = None) -> dict[str, Any]:
+        """Execute document creation use case; `chunking` overrides the configured chunking strategy"""
 
         # Create domain entity
         document = Document(title=title, content=content)
 
+        # Process document (split and generate embeddings) before touching the database,
+        # so the document and all of its chunks can be persisted in a single transaction
+        chunks, embedding_reuse = self.processing_service.process_document_with_reuse(document, chunking)
+
+        try:
+            saved_document, saved_chunks = self.repository.save_document_with_chunks(document, chunks)
+            logger.info(f"Document created: {saved_document.id}")
+        except Exception as exc:
+            logger.error(f"Error saving document: {exc!s}")
+            raise DocumentSaveException(f"Error saving document: {exc!s}") from exc
+
+        return build_document_result(saved_document, saved_chunks, embedding_reuse)
+
+
+class AsyncCreateDocumentUseCase:
+    """Use case for creating documents on the async request path"""
+
+    def __init__(self, repository: AsyncDocumentRepository, processing_service: AsyncDocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    async def execute(self, title: str, content: str, chunking: Optional[str] = None) -> dict[str, Any]:
+        """Execute document creation use case; `chunking` overrides the configured chunking strategy"""
+        document = Document(title=title, content=content)
+
+        chunks, embedding_reuse = await self.processing_service.process_document_with_reuse(document, chunking)
+
         try:
-            saved_document = self.repository.save_document(document)
+            saved_document, saved_chunks = await self.repository.save_document_with_chunks(document, chunks)
             logger.info(f"Document created: {saved_document.id}")
         except Exception as exc:
             logger.error(f"Error saving document: {exc!s}")
             raise DocumentSaveException(f"Error saving document: {exc!s}") from exc
 
-        document_aggregate = DocumentAggregate(saved_document)
-
-        # Process document (split and generate embeddings)
-        chunks = self.processing_service.process_document(saved_document)
-
-        # Add chunks to aggregate
-        document_aggregate.add_chunks(chunks)
-
-        # Persist chunks
-        saved_chunks = []
-        for chunk in chunks:
-            try:
-                chunk.document_id = saved_document.id
-                saved_chunk = self.repository.save_chunk(chunk)
-                saved_chunks.append(saved_chunk)
-            except Exception as exc:
-                logger.error(f"Error saving chunk: {exc!s}")
-                raise ChunkSaveException(f"Error saving chunk: {exc!s}") from exc
-
-        logger.info(f"Document processed with {len(saved_chunks)} chunks")
-
-        # Get processing status
-        processing_status = document_aggregate.get_processing_status()
-
-        return {
-            "document": {
-                "id": saved_document.id,
-                "title": saved_document.title,
-                "content": saved_document.content,
-                "created_at": saved_document.created_at,
-                "updated_at": saved_document.updated_at,
-                "word_count": saved_document.word_count(),
-            },
-            "chunks": [
-                {
-                    "id": chunk.id,
-                    "content": chunk.content,
-                    "has_embedding": chunk.has_embedding(),
-                    "word_count": chunk.word_count(),
-                }
-                for chunk in saved_chunks
-            ],
-            "processing_status": processing_status,
-        }
+        return build_document_result(saved_document, saved_chunks, embedding_reuse)
+
+
+def build_document_result(
+    saved_document: Document, saved_chunks: list[DocumentChunk], embedding_reuse: EmbeddingReuse
+) -> dict[str, Any]:
+    document_aggregate = DocumentAggregate(saved_document)
+
+    # Add chunks to aggregate
+    document_aggregate.add_chunks(saved_chunks)
+
+    logger.info(
+        f"Document processed with {len(saved_chunks)} chunks "
+        f"({embedding_reuse.reused_chunks} embeddings reused, hit ratio {embedding_reuse.hit_ratio:.2f}, "
+        f"{embedding_reuse.duplicate_chunks} near-duplicates linked)"
+    )
+
+    # Get processing status
+    processing_status = document_aggregate.get_processing_status()
+
+    return {
+        "document": {
+            "id": saved_document.id,
+            "title": saved_document.title,
+            "content": saved_document.content,
+            "created_at": saved_document.created_at,
+            "updated_at": saved_document.updated_at,
+            "word_count": saved_document.word_count(),
+        },
+        "chunks": [
+            {
+                "id": chunk.id,
+                "content": chunk.content,
+                "has_embedding": chunk.has_embedding(),
+                "word_count": chunk.word_count(),
+                "canonical_chunk_id": chunk.canonical_chunk_id,
+            }
+            for chunk in saved_chunks
+        ],
+        "processing_status": processing_status,
+        "embedding_reuse": embedding_reuse.to_dict(),
+        "deduplication": embedding_reuse.deduplication_dict(),
+    }
@@ -0,0 +1,143 @@
+import logging
+from typing import Any, Optional
+
+from src.domain.aggregates.document_aggregate import DocumentAggregate
+from src.domain.document import Document, DocumentChunk
+from src.domain.document_repository import AsyncDocumentRepository, DocumentRepository
+from src.domain.exceptions import DocumentNotFoundError, DocumentSaveException
+from src.domain.services.document_processing_service import (
+    AsyncDocumentProcessingService,
+    DocumentProcessingService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class IngestDocumentUseCase:
+    """Store a document and its raw chunks right away; embeddings are generated later by background workers"""
+
+    def __init__(self, repository: DocumentRepository, processing_service: DocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    def execute(self, title: str, content: str, chunking: Optional[str] = None) -> dict[str, Any]:
+        """Execute background ingestion use case; `chunking` overrides the configured chunking strategy"""
+        document = Document(title=title, content=content)
+        split = self.processing_service.prepare_document(document, chunking)
+        signatures, canonical_ids = self.processing_service.find_duplicates(split.chunks, split.chunk_signatures)
+        chunks = self.processing_service.build_pending_chunks(
+            document, split.chunks, split.chunk_word_counts, signatures, canonical_ids
+        )
+
+        try:
+            saved_document, saved_chunks = self.repository.save_document_with_chunks(document, chunks)
+            logger.info(f"Document {saved_document.id} queued for embedding ({len(saved_chunks)} chunks)")
+        except Exception as exc:
+            logger.error(f"Error saving document: {exc!s}")
+            raise DocumentSaveException(f"Error saving document: {exc!s}") from exc
+
+        return _build_status(saved_document, saved_chunks)
+
+
+class AsyncIngestDocumentUseCase:
+    """Background ingestion use case on the async request path"""
+
+    def __init__(self, repository: AsyncDocumentRepository, processing_service: AsyncDocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    async def execute(self, title: str, content: str, chunking: Optional[str] = None) -> dict[str, Any]:
+        """Execute background ingestion use case; `chunking` overrides the configured chunking strategy"""
+        document = Document(title=title, content=content)
+        split = await self.processing_service.prepare_document_in_thread(document, chunking)
+        signatures, canonical_ids = await self.processing_service.find_duplicates(split.chunks, split.chunk_signatures)
+        chunks = self.processing_service.build_pending_chunks(
+            document, split.chunks, split.chunk_word_counts, signatures, canonical_ids
+        )
+
+        try:
+            saved_document, saved_chunks = await self.repository.save_document_with_chunks(document, chunks)
+            logger.info(f"Document {saved_document.id} queued for embedding ({len(saved_chunks)} chunks)")
+        except Exception as exc:
+            logger.error(f"Error saving document: {exc!s}")
+            raise DocumentSaveException(f"Error saving document: {exc!s}") from exc
+
+        return _build_status(saved_document, saved_chunks)
+
+
+class EmbedPendingChunksUseCase:
+    """Embed one batch of stored chunks that have no embedding yet; run repeatedly by the ingest workers"""
+
+    def __init__(
+        self, repository: DocumentRepository, processing_service: DocumentProcessingService, batch_size: int = 64
+    ):
+        self.repository = repository
+        self.processing_service = processing_service
+        self.batch_size = batch_size
+
+    def execute(self) -> int:
+        """Embed the next batch and return how many chunks were updated (0 when nothing is pending)"""
+        # The claim keeps concurrent workers (threads or processes) off these chunks until they are written back
+        with self.repository.claim_chunks_without_embeddings(limit=self.batch_size) as chunks:
+            if not chunks:
+                return 0
+            embeddings, reuse = self.processing_service.embed_chunks([chunk.content for chunk in chunks])
+            updated = self.repository.update_chunk_embeddings(
+                {chunk.id: embedding for chunk, embedding in zip(chunks, embeddings)}
+            )
+
+        logger.info(f"Embedded {updated} pending chunks ({reuse.reused_chunks} reused from the embedding store)")
+        return updated
+
+    def pending(self) -> int:
+        """Chunks still waiting for an embedding"""
+        return self.repository.count_chunks_without_embeddings()
+
+
+class GetDocumentStatusUseCase:
+    """Embedding progress of a document ingested in the background"""
+
+    def __init__(self, repository: DocumentRepository):
+        self.repository = repository
+
+    def execute(self, document_id: int) -> dict[str, Any]:
+        """Execute document status use case"""
+        document = self.repository.get_document(document_id)
+        if document is None:
+            raise DocumentNotFoundError(document_id)
+        return _build_status(document, self.repository.get_chunks_by_document(document_id))
+
+
+class AsyncGetDocumentStatusUseCase:
+    """Document status use case on the async request path"""
+
+    def __init__(self, repository: AsyncDocumentRepository):
+        self.repository = repository
+
+    async def execute(self, document_id: int) -> dict[str, Any]:
+        """Execute document status use case"""
+        document = await self.repository.get_document(document_id)
+        if document is None:
+            raise DocumentNotFoundError(document_id)
+        return _build_status(document, await self.repository.get_chunks_by_document(document_id))
+
+
+def _build_status(document: Document, chunks: list[DocumentChunk]) -> dict[str, Any]:
+    document_aggregate = DocumentAggregate(document)
+    document_aggregate.add_chunks(chunks)
+    processing_status = document_aggregate.get_processing_status()
+
+    if processing_status["is_fully_processed"]:
+        status = "completed"
+    elif processing_status["chunks_with_embeddings"]:
+        status = "processing"
+    else:
+        status = "pending"
+
+    # The document id doubles as the job id: a document has exactly one ingestion job
+    return {
+        "job_id": document.id,
+        "document_id": document.id,
+        "status": status,
+        "processing_status": processing_status,
+    }
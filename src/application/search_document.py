@@ -1,33 +1,70 @@
+import asyncio
+import hashlib
 import logging
-from typing import Any
+import time
+from concurrent.futures import Executor
+from typing import Any, Optional
 
-from src.domain.document_repository import DocumentRepository
-from src.domain.services.document_processing_service import DocumentProcessingService
-from src.domain.value_objects import SearchQuery
+from src.domain.document_repository import AsyncDocumentRepository, DocumentRepository
+from src.domain.exceptions import SearchQueryInvalidException
+from src.domain.near_duplicate_index import hamming_distance, simhash
+from src.domain.search_result_cache import SearchResultCache
+from src.domain.services.document_processing_service import (
+    AsyncDocumentProcessingService,
+    DocumentProcessingService,
+)
+from src.domain.value_objects import Embedding, SearchQuery
 
 logger = logging.getLogger(__name__)
 
 
-class SearchDocumentsUseCase:
-    """Use case for searching documents"""
+def reciprocal_rank_fusion(rankings: dict[str, list[dict]], k: int, limit: int) -> list[dict]:
+    """Merge rankings of rows keyed by "id": each contributes 1 / (k + position), so agreeing rankings add up
 
-    def __init__(self, repository: DocumentRepository, processing_service: DocumentProcessingService):
-        self.repository = repository
-        self.processing_service = processing_service
+    Only positions matter, never the scores, which is what makes a text rank and a cosine similarity comparable.
+    Merged rows keep every key of their sources plus "score" and "matched_by" (the rankings they appear in).
+    """
+    fused: dict[int, dict] = {}
+    for source, rows in rankings.items():
+        for position, row in enumerate(rows, start=1):
+            entry = fused.setdefault(row["id"], {"score": 0.0, "matched_by": []})
+            entry.update(row)
+            entry["score"] += 1 / (k + position)
+            entry["matched_by"].append(source)
+    return sorted(fused.values(), key=lambda row: row["score"], reverse=True)[:limit]
 
-    def execute(self, query: str, limit: int = 5, min_similarity: float = 0.0) -> dict[str, Any]:
-        """Execute document search use case"""
-        search_query = SearchQuery(text=query, limit=limit, min_similarity=min_similarity)
 
-        # Generate query embedding (may throw EmbeddingGenerationException)
-        query_embedding = self.processing_service.process_query(search_query.text)
-        logger.info(f"Query embedding generated for: {search_query.text}")
+def collapse_near_duplicates(results: list[dict], max_distance: int) -> list[dict]:
+    """Keep the best-ranked of each group of results whose contents are within max_distance SimHash bits
 
-        # Search in repository
-        rows = self.repository.search_similar(
-            query_embedding.to_list(), search_query.limit, search_query.min_similarity
-        )
+    `results` must be sorted best first; each kept result counts the ones folded into it in "duplicates". Results too
+    short to sign are never folded.
+    """
+    kept: list[tuple[Optional[int], dict]] = []
+    for result in results:
+        signature = simhash(result["content"])
+        if signature is None:
+            kept.append((None, result))
+            continue
+        for kept_signature, kept_result in kept:
+            if kept_signature is not None and hamming_distance(signature, kept_signature) <= max_distance:
+                kept_result["duplicates"] += 1
+                break
+        else:
+            kept.append((signature, result))
+    return [result for _, result in kept]
+
+
+class _SearchDocumentsBase:
+    """Result formatting and rank fusion shared by the sync and async search use cases"""
 
+    rrf_k: int
+    hybrid_candidates_factor: int
+    max_batch_queries: int
+    result_cache: Optional[SearchResultCache]
+    collapse_max_distance: int
+
+    def _build_result(self, search_query: SearchQuery, rows: list[dict]) -> dict[str, Any]:
         logger.info(f"Found {len(rows)} search results")
 
         results = []
@@ -38,10 +75,13 @@ class SearchDocumentsUseCase:
                 title = self._extract_title(row)
                 chunk_id = self._extract_chunk_id(row)
                 content = self._extract_content(row)
+                matched_by = self._extract_matched_by(row, search_query.mode)
 
-                # Check minimum similarity
-                if similarity_val < search_query.min_similarity:
+                # Check minimum similarity (lexical-only matches have no vector similarity to check)
+                if "vector" in matched_by and similarity_val < search_query.min_similarity:
                     continue
+                if "vector" not in matched_by:
+                    similarity_val = self._extract_rank(row)
 
                 # Format result
                 similarity_pct = round(similarity_val * 100, 2)
@@ -52,6 +92,9 @@ class SearchDocumentsUseCase:
                         "content": content,
                         "similarity": f"{similarity_pct}%",
                         "similarity_value": similarity_val,
+                        "score": self._extract_score(row, similarity_val),
+                        "matched_by": matched_by,
+                        "duplicates": 0,
                     }
                 )
 
@@ -59,16 +102,105 @@ class SearchDocumentsUseCase:
                 logger.warning(f"Error processing search result: {e!s}")
                 continue
 
-        # Sort by similarity descending
-        results.sort(key=lambda x: x["similarity_value"], reverse=True)
+        # Sort by ranking score descending: similarity, text rank or fused score depending on the mode
+        results.sort(key=lambda x: x["score"], reverse=True)
+        if search_query.collapse_duplicates:
+            results = collapse_near_duplicates(results, self.collapse_max_distance)[: search_query.limit]
 
         return {
             "query": search_query.text,
             "results": results,
             "total_results": len(results),
-            "search_parameters": {"limit": search_query.limit, "min_similarity": search_query.min_similarity},
+            "search_parameters": {
+                "limit": search_query.limit,
+                "min_similarity": search_query.min_similarity,
+                "ef_search": search_query.ef_search,
+                "probes": search_query.probes,
+                "mode": search_query.mode,
+                "collapse_duplicates": search_query.collapse_duplicates,
+            },
         }
 
+    @staticmethod
+    def _result_cache_key(search_query: SearchQuery, query_embedding: Embedding) -> tuple:
+        # Keyed by the embedding, not the text, so queries the embedding cache normalizes to one vector share an entry
+        digest = hashlib.blake2b(query_embedding.to_numpy().tobytes(), digest_size=16).digest()
+        return (
+            digest,
+            search_query.limit,
+            search_query.min_similarity,
+            search_query.ef_search,
+            search_query.probes,
+            search_query.collapse_duplicates,
+        )
+
+    def _cached_result(self, search_query: SearchQuery, version: int, key: tuple) -> Optional[dict[str, Any]]:
+        cached = self.result_cache.get(version, key)
+        if cached is None:
+            return None
+        logger.info(f"Search result served from cache for: {search_query.text}")
+        return {**cached, "query": search_query.text}
+
+    def _batch_queries(
+        self,
+        queries: list[dict[str, Any]],
+        ef_search: Optional[int],
+        probes: Optional[int],
+        collapse_duplicates: bool,
+    ) -> list[SearchQuery]:
+        if not queries:
+            raise SearchQueryInvalidException("A batch must hold at least one query")
+        if len(queries) > self.max_batch_queries:
+            raise SearchQueryInvalidException(f"A batch holds at most {self.max_batch_queries} queries")
+        return [
+            SearchQuery(
+                text=query["query"],
+                limit=query.get("limit", 5),
+                min_similarity=query.get("min_similarity", 0.0),
+                ef_search=ef_search,
+                probes=probes,
+                collapse_duplicates=collapse_duplicates,
+            )
+            for query in queries
+        ]
+
+    def _build_batch_result(self, search_queries: list[SearchQuery], rows: list[list[dict]]) -> dict[str, Any]:
+        return {
+            "results": [self._build_result(query, query_rows) for query, query_rows in zip(search_queries, rows)],
+            "total_queries": len(search_queries),
+        }
+
+    def _fuse(self, search_query: SearchQuery, lexical_rows: list[dict], vector_rows: list[dict]) -> list[dict]:
+        return reciprocal_rank_fusion(
+            {"lexical": lexical_rows, "vector": vector_rows}, self.rrf_k, self._fetch_limit(search_query)
+        )
+
+    def _candidates(self, search_query: SearchQuery) -> int:
+        return search_query.limit * self.hybrid_candidates_factor
+
+    def _fetch_limit(self, search_query: SearchQuery) -> int:
+        # Collapsing drops rows after ranking, so over-fetch to still fill the limit with distinct results
+        return self._candidates(search_query) if search_query.collapse_duplicates else search_query.limit
+
+    @staticmethod
+    def _extract_matched_by(row: dict, mode: str) -> list[str]:
+        if isinstance(row, dict) and "matched_by" in row:
+            return list(row["matched_by"])
+        return ["lexical"] if mode == "lexical" else ["vector"]
+
+    @staticmethod
+    def _extract_rank(row: dict) -> float:
+        """Extract the full-text rank from a lexical result"""
+        if isinstance(row, dict):
+            return float(row.get("rank", 0.0))
+        return float(getattr(row, "rank", 0.0))
+
+    @staticmethod
+    def _extract_score(row: dict, default: float) -> float:
+        if isinstance(row, dict) and "score" in row:
+            return float(row["score"])
+        return default
+
     @staticmethod
     def _extract_similarity(row: dict) -> float:
         """Extract similarity value from result"""
@@ -104,3 +236,240 @@ class SearchDocumentsUseCase:
         if hasattr(row, "content"):
             return str(row.content)
         return ""
+
+
+class SearchDocumentsUseCase(_SearchDocumentsBase):
+    """Use case for searching documents"""
+
+    def __init__(
+        self,
+        repository: DocumentRepository,
+        processing_service: DocumentProcessingService,
+        rrf_k: int = 60,
+        hybrid_candidates_factor: int = 2,
+        max_batch_queries: int = 100,
+        result_cache: Optional[SearchResultCache] = None,
+        collapse_max_distance: int = 3,
+        query_executor: Optional[Executor] = None,
+    ):
+        self.repository = repository
+        self.processing_service = processing_service
+        self.rrf_k = rrf_k
+        self.hybrid_candidates_factor = hybrid_candidates_factor
+        self.max_batch_queries = max_batch_queries
+        self.result_cache = result_cache
+        self.collapse_max_distance = collapse_max_distance
+        # Shared pool computing hybrid-mode query embeddings; without one they are computed before the lexical query
+        self.query_executor = query_executor
+
+    def execute(
+        self,
+        query: str,
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        mode: str = "vector",
+        collapse_duplicates: bool = False,
+    ) -> dict[str, Any]:
+        """Execute document search use case; `collapse_duplicates` folds near-duplicate results together"""
+        search_query = SearchQuery(
+            text=query,
+            limit=limit,
+            min_similarity=min_similarity,
+            ef_search=ef_search,
+            probes=probes,
+            mode=mode,
+            collapse_duplicates=collapse_duplicates,
+        )
+
+        if search_query.mode == "lexical":
+            # Full-text only: answered without calling the embedding provider
+            rows = self.repository.search_lexical(search_query.text, self._fetch_limit(search_query))
+        elif search_query.mode == "vector":
+            return self._vector_result(search_query)
+        else:
+            if self.query_executor is None:
+                embedding = self.processing_service.process_query(search_query.text)
+                lexical_rows = self.repository.search_lexical(search_query.text, self._candidates(search_query))
+            else:
+                # The lexical query runs on this thread's session while the query embedding is computed
+                future = self.query_executor.submit(self.processing_service.process_query, search_query.text)
+                lexical_rows = self.repository.search_lexical(search_query.text, self._candidates(search_query))
+                embedding = future.result()
+            vector_rows = self._search_vector(search_query, self._candidates(search_query), embedding)
+            rows = self._fuse(search_query, lexical_rows, vector_rows)
+
+        return self._build_result(search_query, rows)
+
+    def execute_batch(
+        self,
+        queries: list[dict[str, Any]],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        collapse_duplicates: bool = False,
+    ) -> dict[str, Any]:
+        """Search several queries with one embedding call and one repository round-trip; results in query order
+
+        Each query is a dict with "query" and optionally "limit" and "min_similarity".
+        """
+        search_queries = self._batch_queries(queries, ef_search, probes, collapse_duplicates)
+        embeddings = self.processing_service.process_queries([query.text for query in search_queries])
+        logger.info(f"Query embeddings generated for a batch of {len(search_queries)}")
+
+        rows = self.repository.search_similar_batch(
+            [embedding.to_list() for embedding in embeddings],
+            [self._fetch_limit(query) for query in search_queries],
+            [query.min_similarity for query in search_queries],
+            ef_search=ef_search,
+            probes=probes,
+        )
+        return self._build_batch_result(search_queries, rows)
+
+    def _vector_result(self, search_query: SearchQuery) -> dict[str, Any]:
+        query_embedding = self.processing_service.process_query(search_query.text)
+        if self.result_cache is None:
+            rows = self._search_vector(search_query, self._fetch_limit(search_query), query_embedding)
+            return self._build_result(search_query, rows)
+
+        # Read before searching: a write committed in between leaves the entry under a version no longer current
+        version = self.repository.corpus_version()
+        key = self._result_cache_key(search_query, query_embedding)
+        cached = self._cached_result(search_query, version, key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        rows = self._search_vector(search_query, self._fetch_limit(search_query), query_embedding)
+        result = self._build_result(search_query, rows)
+        self.result_cache.set(version, key, result, time.perf_counter() - start)
+        return result
+
+    def _search_vector(
+        self, search_query: SearchQuery, limit: int, query_embedding: Optional[Embedding] = None
+    ) -> list[dict]:
+        # Generate query embedding (may throw EmbeddingGenerationException)
+        if query_embedding is None:
+            query_embedding = self.processing_service.process_query(search_query.text)
+        logger.info(f"Query embedding generated for: {search_query.text}")
+
+        # Search in repository
+        return self.repository.search_similar(
+            query_embedding.to_list(),
+            limit,
+            search_query.min_similarity,
+            ef_search=search_query.ef_search,
+            probes=search_query.probes,
+        )
+
+
+class AsyncSearchDocumentsUseCase(_SearchDocumentsBase):
+    """Use case for searching documents on the async request path"""
+
+    def __init__(
+        self,
+        repository: AsyncDocumentRepository,
+        processing_service: AsyncDocumentProcessingService,
+        rrf_k: int = 60,
+        hybrid_candidates_factor: int = 2,
+        max_batch_queries: int = 100,
+        result_cache: Optional[SearchResultCache] = None,
+        collapse_max_distance: int = 3,
+    ):
+        self.repository = repository
+        self.processing_service = processing_service
+        self.rrf_k = rrf_k
+        self.hybrid_candidates_factor = hybrid_candidates_factor
+        self.max_batch_queries = max_batch_queries
+        self.result_cache = result_cache
+        self.collapse_max_distance = collapse_max_distance
+
+    async def execute(
+        self,
+        query: str,
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        mode: str = "vector",
+        collapse_duplicates: bool = False,
+    ) -> dict[str, Any]:
+        """Execute document search use case; `collapse_duplicates` folds near-duplicate results together"""
+        search_query = SearchQuery(
+            text=query,
+            limit=limit,
+            min_similarity=min_similarity,
+            ef_search=ef_search,
+            probes=probes,
+            mode=mode,
+            collapse_duplicates=collapse_duplicates,
+        )
+
+        if search_query.mode == "lexical":
+            rows = await self.repository.search_lexical(search_query.text, self._fetch_limit(search_query))
+        elif search_query.mode == "vector":
+            return await self._vector_result(search_query)
+        else:
+            # The embedding call and the lexical query overlap; the session itself only runs one query at a time
+            query_embedding, lexical_rows = await asyncio.gather(
+                self.processing_service.process_query(search_query.text),
+                self.repository.search_lexical(search_query.text, self._candidates(search_query)),
+            )
+            vector_rows = await self._search_vector(search_query, self._candidates(search_query), query_embedding)
+            rows = self._fuse(search_query, lexical_rows, vector_rows)
+
+        return self._build_result(search_query, rows)
+
+    async def execute_batch(
+        self,
+        queries: list[dict[str, Any]],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        collapse_duplicates: bool = False,
+    ) -> dict[str, Any]:
+        """Search several queries with one embedding call and one repository round-trip; results in query order"""
+        search_queries = self._batch_queries(queries, ef_search, probes, collapse_duplicates)
+        embeddings = await self.processing_service.process_queries([query.text for query in search_queries])
+        logger.info(f"Query embeddings generated for a batch of {len(search_queries)}")
+
+        rows = await self.repository.search_similar_batch(
+            [embedding.to_list() for embedding in embeddings],
+            [self._fetch_limit(query) for query in search_queries],
+            [query.min_similarity for query in search_queries],
+            ef_search=ef_search,
+            probes=probes,
+        )
+        return self._build_batch_result(search_queries, rows)
+
+    async def _vector_result(self, search_query: SearchQuery) -> dict[str, Any]:
+        query_embedding = await self.processing_service.process_query(search_query.text)
+        if self.result_cache is None:
+            rows = await self._search_vector(search_query, self._fetch_limit(search_query), query_embedding)
+            return self._build_result(search_query, rows)
+
+        version = await self.repository.corpus_version()
+        key = self._result_cache_key(search_query, query_embedding)
+        cached = self._cached_result(search_query, version, key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        rows = await self._search_vector(search_query, self._fetch_limit(search_query), query_embedding)
+        result = self._build_result(search_query, rows)
+        self.result_cache.set(version, key, result, time.perf_counter() - start)
+        return result
+
+    async def _search_vector(
+        self, search_query: SearchQuery, limit: int, query_embedding: Optional[Embedding] = None
+    ) -> list[dict]:
+        if query_embedding is None:
+            query_embedding = await self.processing_service.process_query(search_query.text)
+        logger.info(f"Query embedding generated for: {search_query.text}")
+
+        return await self.repository.search_similar(
+            query_embedding.to_list(),
+            limit,
+            search_query.min_similarity,
+            ef_search=search_query.ef_search,
+            probes=search_query.probes,
+        )
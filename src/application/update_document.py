@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Optional
+
+from src.application.create_document import build_document_result
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.document_repository import AsyncDocumentRepository, DocumentRepository
+from src.domain.exceptions import DocumentConflictException, DocumentNotFoundError, DocumentSaveException
+from src.domain.services.document_processing_service import (
+    AsyncDocumentProcessingService,
+    DocumentProcessingService,
+    EmbeddingReuse,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateDocumentUseCase:
+    """Replace the title and content of a document, re-embedding only the chunks whose text is new"""
+
+    def __init__(self, repository: DocumentRepository, processing_service: DocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    def execute(self, document_id: int, title: str, content: str, chunking: Optional[str] = None) -> dict[str, Any]:
+        """Execute document update use case; `chunking` overrides the configured chunking strategy"""
+        if not self.repository.document_exists(document_id):
+            raise DocumentNotFoundError(document_id)
+
+        document = Document(id=document_id, title=title, content=content)
+        stored = self.repository.get_chunks_by_document(document_id)
+        diff, embedding_reuse = self.processing_service.process_document_update(document, stored, chunking)
+
+        try:
+            saved_document, saved_chunks = self.repository.update_document_with_chunks(document, diff)
+            logger.info(f"Document updated: {saved_document.id}")
+        except (DocumentNotFoundError, DocumentConflictException):
+            raise
+        except Exception as exc:
+            logger.error(f"Error updating document: {exc!s}")
+            raise DocumentSaveException(f"Error updating document: {exc!s}") from exc
+
+        return _build_update_result(saved_document, diff, saved_chunks, embedding_reuse)
+
+
+class AsyncUpdateDocumentUseCase:
+    """Document update use case on the async request path"""
+
+    def __init__(self, repository: AsyncDocumentRepository, processing_service: AsyncDocumentProcessingService):
+        self.repository = repository
+        self.processing_service = processing_service
+
+    async def execute(
+        self, document_id: int, title: str, content: str, chunking: Optional[str] = None
+    ) -> dict[str, Any]:
+        """Execute document update use case; `chunking` overrides the configured chunking strategy"""
+        if not await self.repository.document_exists(document_id):
+            raise DocumentNotFoundError(document_id)
+
+        document = Document(id=document_id, title=title, content=content)
+        stored = await self.repository.get_chunks_by_document(document_id)
+        diff, embedding_reuse = await self.processing_service.process_document_update(document, stored, chunking)
+
+        try:
+            saved_document, saved_chunks = await self.repository.update_document_with_chunks(document, diff)
+            logger.info(f"Document updated: {saved_document.id}")
+        except (DocumentNotFoundError, DocumentConflictException):
+            raise
+        except Exception as exc:
+            logger.error(f"Error updating document: {exc!s}")
+            raise DocumentSaveException(f"Error updating document: {exc!s}") from exc
+
+        return _build_update_result(saved_document, diff, saved_chunks, embedding_reuse)
+
+
+def _build_update_result(
+    saved_document: Document, diff: ChunkDiff, saved_chunks: list[DocumentChunk], embedding_reuse: EmbeddingReuse
+) -> dict[str, Any]:
+    logger.info(
+        f"Document {saved_document.id} re-indexed: {len(diff.kept)} chunks unchanged, "
+        f"{len(diff.added)} added, {len(diff.removed)} removed"
+    )
+    chunks = sorted(diff.kept + saved_chunks, key=lambda chunk: chunk.position)
+    return {**build_document_result(saved_document, chunks, embedding_reuse), "chunk_diff": diff.to_dict()}
@@ -0,0 +1,138 @@
+"""Embed every chunk stored without an embedding, then exit (or keep following new ones with --follow).
+
+Each worker claims a batch with FOR UPDATE SKIP LOCKED, embeds it in one provider call and writes it back with a
+single UPDATE ... FROM (VALUES ...), so any number of workers and processes can run side by side:
+
+    python -m src.cli.backfill_embeddings --workers 4 --batch-size 64
+    python -m src.cli.backfill_embeddings --follow --report-every 30
+"""
+
+import argparse
+import logging
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from src.application.ingest_document import EmbedPendingChunksUseCase
+from src.config import settings
+from src.domain.embeddings import EmbeddingGenerator
+from src.domain.services.document_processing_service import DocumentProcessingService
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.embeddings.mock_generator import MockEmbeddingGenerator
+from src.infrastructure.embeddings.ollama_generator import OllamaEmbeddingGenerator
+from src.infrastructure.postgresql.embedding_store import PostgresEmbeddingStore
+from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
+from src.infrastructure.splitter.native_text_splitter import build_text_splitter
+
+logger = logging.getLogger("backfill_embeddings")
+
+
+class BackfillProgress:
+    """Chunks embedded so far, shared by the worker threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.perf_counter()
+        self.embedded = 0
+
+    def add(self, count: int) -> None:
+        with self._lock:
+            self.embedded += count
+
+    def rate(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return self.embedded / elapsed if elapsed else 0.0
+
+
+class Backfill:
+    def __init__(self, embedding_generator: EmbeddingGenerator, model: str, batch_size: int):
+        self.embedding_generator = embedding_generator
+        self.model = model
+        self.batch_size = batch_size
+        self.progress = BackfillProgress()
+        self.stopping = threading.Event()
+
+    def embed_batch(self) -> int:
+        # The store commits on its own session so the claim's row locks are held until the batch is written
+        with SessionLocal() as session, SessionLocal() as store_session:
+            return self._use_case(session, store_session).execute()
+
+    def pending(self) -> int:
+        with SessionLocal() as session:
+            return self._use_case(session, session).pending()
+
+    def _use_case(self, session: Session, store_session: Session) -> EmbedPendingChunksUseCase:
+        embedding_store = (
+            PostgresEmbeddingStore(store_session, self.model, settings.embedding_dimensions)
+            if settings.embedding_store_enabled
+            else None
+        )
+        processing_service = DocumentProcessingService(
+            build_text_splitter(settings.text_splitter), self.embedding_generator, embedding_store
+        )
+        return EmbedPendingChunksUseCase(PostgresDocumentRepository(session), processing_service, self.batch_size)
+
+    def work(self, follow: bool, poll_interval: float) -> None:
+        while not self.stopping.is_set():
+            try:
+                embedded = self.embed_batch()
+            except Exception as exc:
+                # The claimed chunks were released by the rollback; another attempt picks them up again
+                logger.error(f"Batch failed: {exc!s}")
+                self.stopping.wait(poll_interval)
+                continue
+            self.progress.add(embedded)
+            if embedded:
+                continue
+            if not follow:
+                return
+            self.stopping.wait(poll_interval)
+
+    def report(self) -> None:
+        logger.info(
+            f"embedded={self.progress.embedded} rate={self.progress.rate():.1f} chunks/s backlog={self.pending()}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="worker threads in this process")
+    parser.add_argument("--batch-size", type=int, default=settings.ingest_batch_size)
+    parser.add_argument("--follow", action="store_true", help="keep polling for new chunks instead of exiting")
+    parser.add_argument("--poll-interval", type=float, default=settings.ingest_poll_interval)
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress reports")
+    parser.add_argument("--mock", action="store_true", help="use deterministic mock embeddings (no provider calls)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    if args.mock:
+        backfill = Backfill(MockEmbeddingGenerator(dims=settings.embedding_dimensions), "mock", args.batch_size)
+    else:
+        generator = OllamaEmbeddingGenerator()
+        backfill = Backfill(generator, generator.model, args.batch_size)
+    logger.info(f"Starting {args.workers} workers, backlog={backfill.pending()}")
+
+    workers = [
+        threading.Thread(target=backfill.work, args=(args.follow, args.poll_interval), name=f"backfill-{i}")
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        last_report = time.monotonic()
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(0.5)
+            if time.monotonic() - last_report >= args.report_every:
+                backfill.report()
+                last_report = time.monotonic()
+    except KeyboardInterrupt:
+        logger.info("Stopping after the batches in flight")
+        backfill.stopping.set()
+        for worker in workers:
+            worker.join()
+    backfill.report()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Bulk-ingest an NDJSON corpus (one {"title": ..., "text": ...} object per line) and resume where a failed run stopped.
+
+Documents are read lazily and ingested in batches on a pool of workers: split, embedded and written with COPY, one
+transaction per batch. After every stored batch the number of input lines fully stored, and the line ranges stored
+past them, are written to the checkpoint file; a later run on the same input skips them (--restart ignores the
+checkpoint):
+
+    python -m src.cli.bulk_ingest corpus.ndjson --workers 4 --batch-size 32
+    jq -c '.[]' text_examples.json | python -m src.cli.bulk_ingest - --checkpoint examples.checkpoint
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from src.application.bulk_ingest import BulkIngestBatchUseCase, BulkRecord
+from src.config import settings
+from src.domain.embeddings import EmbeddingGenerator
+from src.domain.services.document_processing_service import DocumentProcessingService
+from src.infrastructure.bulk_ingest import BulkIngestPipeline, BulkIngestReport, parse_line_range, parse_ndjson
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.embeddings.mock_generator import MockEmbeddingGenerator
+from src.infrastructure.embeddings.ollama_generator import OllamaEmbeddingGenerator
+from src.infrastructure.postgresql.embedding_store import PostgresEmbeddingStore
+from src.infrastructure.postgresql.near_duplicate_index import PostgresNearDuplicateIndex
+from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
+from src.infrastructure.splitter.native_text_splitter import build_text_splitter
+
+logger = logging.getLogger("bulk_ingest")
+
+
+class Checkpoint:
+    """Input lines fully stored and the ranges stored past them, persisted atomically so a crash never leaves a torn
+    file"""
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+
+    def load(self) -> tuple[int, list[tuple[int, int]]]:
+        if self.path is None or not self.path.exists():
+            return 0, []
+        saved = json.loads(self.path.read_text())
+        return saved["lines_committed"], [parse_line_range(value) for value in saved.get("committed_ranges", [])]
+
+    def save(self, report: BulkIngestReport) -> None:
+        if self.path is None:
+            return
+        summary = report.to_dict()
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"lines_committed": summary["lines_committed"], "committed_ranges": summary["committed_ranges"]})
+        )
+        os.replace(tmp, self.path)
+
+
+class BulkIngest:
+    def __init__(self, embedding_generator: EmbeddingGenerator, model: str):
+        self.embedding_generator = embedding_generator
+        self.model = model
+
+    def ingest_batch(self, records: list[BulkRecord]) -> dict:
+        with SessionLocal() as session, SessionLocal() as store_session:
+            embedding_store = (
+                PostgresEmbeddingStore(store_session, self.model, settings.embedding_dimensions)
+                if settings.embedding_store_enabled
+                else None
+            )
+            duplicate_index = (
+                PostgresNearDuplicateIndex(store_session, settings.chunk_dedup_max_distance)
+                if settings.chunk_dedup_enabled
+                else None
+            )
+            processing_service = DocumentProcessingService(
+                build_text_splitter(settings.text_splitter),
+                self.embedding_generator,
+                embedding_store,
+                duplicate_index=duplicate_index,
+            )
+            return BulkIngestBatchUseCase(PostgresDocumentRepository(session), processing_service).execute(records)
+
+
+def log_report(report: BulkIngestReport) -> None:
+    summary = report.to_dict()
+    logger.info(
+        f"lines_committed={summary['lines_committed']} documents={summary['documents']} chunks={summary['chunks']} "
+        f"rejected={summary['rejected_count']} rate={summary['documents_per_second']:.1f} docs/s "
+        f"{summary['chunks_per_second']:.1f} chunks/s"
+    )
+    for name, stage in summary["stages"].items():
+        logger.info(
+            f"  {name:<5} {stage['items']:>8} items {stage['seconds']:8.2f}s {stage['items_per_second']:10.1f}/s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="NDJSON file, or - for stdin")
+    parser.add_argument("--workers", type=int, default=settings.bulk_ingest_workers)
+    parser.add_argument("--batch-size", type=int, default=settings.bulk_ingest_batch_size, help="documents per batch")
+    parser.add_argument("--checkpoint", type=Path, help="resume file (default: <input>.checkpoint, none for stdin)")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--report-every", type=float, default=10.0, help="seconds between progress reports")
+    parser.add_argument("--mock", action="store_true", help="use deterministic mock embeddings (no provider calls)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    checkpoint_path = args.checkpoint or (Path(f"{args.input}.checkpoint") if args.input != "-" else None)
+    checkpoint = Checkpoint(checkpoint_path)
+    skip, skip_ranges = (0, []) if args.restart else checkpoint.load()
+    if skip or skip_ranges:
+        logger.info(f"Resuming after line {skip}, skipping {len(skip_ranges)} stored ranges ({checkpoint_path})")
+
+    if args.mock:
+        bulk_ingest = BulkIngest(MockEmbeddingGenerator(dims=settings.embedding_dimensions), "mock")
+    else:
+        generator = OllamaEmbeddingGenerator()
+        bulk_ingest = BulkIngest(generator, generator.model)
+    pipeline = BulkIngestPipeline(bulk_ingest.ingest_batch, args.batch_size, args.workers)
+
+    last_report = time.monotonic()
+
+    def on_commit(report: BulkIngestReport) -> None:
+        nonlocal last_report
+        checkpoint.save(report)
+        if time.monotonic() - last_report >= args.report_every:
+            log_report(report)
+            last_report = time.monotonic()
+
+    with sys.stdin.buffer if args.input == "-" else open(args.input, "rb") as lines:
+        records = parse_ndjson(lines, skip=skip, skip_ranges=skip_ranges)
+        report = pipeline.run(records, start_line=skip, on_commit=on_commit, committed_ranges=skip_ranges)
+
+    log_report(report)
+    for rejection in report.rejected:
+        logger.warning(f"Rejected line {rejection['line']}: {rejection['error']}")
+    if report.error:
+        logger.error(f"Stopped at line {report.lines_committed}: {report.error}; run again to resume")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
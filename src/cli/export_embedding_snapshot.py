@@ -0,0 +1,35 @@
+"""Export every chunk embedding to a new memory-mapped snapshot for the in-memory search backend.
+
+API workers started with SEARCH_BACKEND=memory map the newest snapshot in MEMORY_SNAPSHOT_DIR and only read from
+Postgres the chunks changed since it was written, so run this periodically (e.g. from cron) to keep startup fast:
+
+    python -m src.cli.export_embedding_snapshot --dir /var/lib/semantic-poc/snapshots
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from src.config import settings
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.memory_index.repositories import export_snapshot
+
+logger = logging.getLogger("export_embedding_snapshot")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=settings.memory_snapshot_dir, help="snapshot directory")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    if args.dir is None:
+        logger.error("No snapshot directory: pass --dir or set MEMORY_SNAPSHOT_DIR")
+        sys.exit(2)
+    with SessionLocal() as session:
+        export_snapshot(session, Path(args.dir), settings.embedding_dimensions)
+
+
+if __name__ == "__main__":
+    main()
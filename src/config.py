@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -36,8 +36,100 @@ class Settings(CommonSettings, ServerSettings):
     debug: bool = False
     open_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     use_embedding_mock: bool = False
+    # Serve requests on the async path (asyncpg + async embedding clients) instead of the threadpool
+    use_async: bool = False
     ollama_api_url: str = ""
     ollama_model_name: str = ""
+    # Query-embedding cache in front of embed_query; set EMBEDDING_CACHE_URL (redis://...) to share it across workers
+    embedding_cache_enabled: bool = True
+    embedding_cache_size: int = 10_000
+    embedding_cache_ttl_seconds: float = 3600.0
+    embedding_cache_url: Optional[str] = None
+    # Per-worker cache of vector search results, checked against the corpus_version row (bumped by triggers on every
+    # write that can change a result) before each lookup
+    search_result_cache_enabled: bool = True
+    search_result_cache_size: int = 1000
+    # Coalesce concurrent query embeddings into one provider call per window (or per max batch size)
+    embedding_batching_enabled: bool = True
+    embedding_batch_window_ms: float = 3.0
+    embedding_batch_max_size: int = 32
+    # Ingest embedding requests: split by input count and (estimated) tokens, sent concurrently with retries
+    embedding_request_max_inputs: int = 64
+    embedding_request_max_tokens: int = 250_000
+    embedding_request_concurrency: int = 4
+    # Query embeddings have their own concurrent requests, so searches never queue behind ingest batches
+    embedding_query_concurrency: int = 4
+    embedding_retry_attempts: int = 5
+    embedding_retry_base_delay: float = 0.5
+    embedding_retry_max_delay: float = 30.0
+    # Persistent, content-addressed store of chunk embeddings consulted before embedding at ingest
+    embedding_store_enabled: bool = True
+    embedding_dimensions: int = 768
+    # Ingest-time near-duplicate detection: chunks whose SimHash is within max_distance bits (0-3) of a stored chunk
+    # are linked to it instead of being embedded; search can collapse near-duplicate results on request
+    chunk_dedup_enabled: bool = True
+    chunk_dedup_max_distance: int = 3
+    # Background ingestion (POST /v1/documents/background): worker threads per process that embed pending chunks
+    ingest_workers: int = 2
+    ingest_batch_size: int = 64
+    ingest_poll_interval: float = 1.0
+    # Bulk ingestion (POST /v1/documents/bulk, src.cli.bulk_ingest): documents per transaction and batches in flight
+    bulk_ingest_batch_size: int = 32
+    bulk_ingest_workers: int = 4
+    # Connection pool shared by every session of a worker process
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # Approximate nearest-neighbour index on document_chunks.embedding (applied by the migrations)
+    vector_index_type: Literal["hnsw", "ivfflat"] = "hnsw"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 64
+    ivfflat_lists: int = 100
+    # Retrieve candidates through a compact quantized index ("halfvec": 2 bytes per dimension, "binary": 1 bit),
+    # then re-rank vector_rerank_factor * limit of them with the full-precision vectors
+    vector_quantization: Literal["none", "halfvec", "binary"] = "none"
+    vector_rerank_factor: int = 4
+    # Full-text search (lexical and hybrid /v1/search/ modes): text search configuration of the generated
+    # document_chunks.content_tsv column, applied by the migrations ("simple" keeps identifiers and codes unstemmed)
+    lexical_search_config: str = "simple"
+    # Hybrid mode: each ranking contributes 1 / (rrf_k + rank); fetch hybrid_candidates_factor * limit from each
+    rrf_k: int = 60
+    hybrid_candidates_factor: int = 2
+    # Most queries one POST /v1/search/batch request may carry
+    search_batch_max_queries: int = 100
+    # Threads computing hybrid-mode query embeddings while the lexical query runs (shared by all sync requests)
+    search_query_workers: int = 32
+    # Let the ANN scan keep walking the index until `limit` rows are found (pgvector >= 0.8; older servers are
+    # detected on the first search and searched without it)
+    vector_iterative_scan: bool = True
+    # Chunking used at ingest unless a document asks for another: "native" (src.infrastructure.splitter.
+    # native_text_splitter) produces the same 100-character chunks as "langchain" (RecursiveCharacterTextSplitter)
+    # without importing LangChain; "sentence" packs whole sentences into chunks of chunk_min_tokens..chunk_max_tokens
+    # (estimated) tokens, closed at paragraph breaks, repeating up to chunk_overlap_tokens of sentences
+    text_splitter: Literal["native", "langchain", "sentence"] = "native"
+    chunk_max_tokens: int = 512
+    chunk_min_tokens: int = 256
+    chunk_overlap_tokens: int = 32
+    # Documents of preprocess_threshold_chars or more are split and word-counted in a pool of preprocess_workers
+    # processes (0 disables it), in shards of about preprocess_shard_chars cut at paragraph/line/word boundaries
+    preprocess_workers: int = 2
+    preprocess_threshold_chars: int = 1_000_000
+    preprocess_shard_chars: int = 250_000
+
+    # Serve search_similar from an in-process index loaded from document_chunks at startup instead of pgvector.
+    # "auto" uses the exact brute-force index up to memory_index_hnsw_threshold chunks, HNSW above (but always brute
+    # force when starting from a snapshot, which it searches in place)
+    search_backend: Literal["pgvector", "memory"] = "pgvector"
+    memory_index_type: Literal["auto", "brute", "hnsw"] = "auto"
+    memory_index_hnsw_threshold: int = 50_000
+    memory_index_hnsw_m: int = 16
+    memory_index_hnsw_ef_construction: int = 100
+    memory_index_hnsw_ef_search: int = 64
+    # Memory-mapped snapshot the memory backend starts from (written by src.cli.export_embedding_snapshot); only the
+    # chunks changed since its high-water mark are read from Postgres
+    memory_snapshot_dir: Optional[str] = None
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,5 +1,7 @@
 from typing import Optional
 
+import numpy as np
+
 from src.domain.document import Document, DocumentChunk
 from src.domain.value_objects import Embedding
 
@@ -10,6 +12,10 @@ class DocumentAggregate:
     def __init__(self, document: Document):
         self._document = document
         self._chunks: list[DocumentChunk] = []
+        # Unit-length embeddings of the chunks that have one, one row per entry of _embedded_chunks. Rows are
+        # appended as chunks are added (capacity doubles), so scoring never rebuilds the matrix
+        self._embedded_chunks: list[DocumentChunk] = []
+        self._matrix: Optional[np.ndarray] = None
 
     @property
     def document(self) -> Document:
@@ -28,33 +34,73 @@ class DocumentAggregate:
         if chunk.document_id != self._document.id:
             raise ValueError("Chunk must belong to this document")
 
+        if chunk.has_embedding():
+            self._append_embedding(chunk)
         self._chunks.append(chunk)
         self._document.add_chunk(chunk)
 
+    def _append_embedding(self, chunk: DocumentChunk) -> None:
+        embedding = chunk.get_embedding()
+        if self._matrix is None:
+            self._matrix = np.empty((16, embedding.dimensions), dtype=np.float32)
+        elif embedding.dimensions != self._matrix.shape[1]:
+            raise ValueError("Embeddings must have the same dimension")
+        rows = len(self._embedded_chunks)
+        if rows == self._matrix.shape[0]:
+            grown = np.empty((2 * rows, self._matrix.shape[1]), dtype=np.float32)
+            grown[:rows] = self._matrix
+            self._matrix = grown
+        # A zero vector stays zero and scores 0 against any query
+        self._matrix[rows] = embedding.to_numpy() / embedding.norm if embedding.norm else 0.0
+        self._embedded_chunks.append(chunk)
+
     def add_chunks(self, chunks: list[DocumentChunk]) -> None:
         """Add multiple chunks to aggregate"""
         for chunk in chunks:
             self.add_chunk(chunk)
 
-    def search_similar_chunks(self, query_embedding: Embedding, min_similarity: float = 0.0) -> list[DocumentChunk]:
-        """Search similar chunks within the document"""
-        similar_chunks = []
-        for chunk in self._chunks:
-            if chunk.has_embedding():
-                similarity = chunk.similarity_to(query_embedding.to_list())
-                if similarity >= min_similarity:
-                    similar_chunks.append(chunk)
-
-        # Sort by similarity descending
-        return sorted(similar_chunks, key=lambda c: c.similarity_to(query_embedding.to_list()), reverse=True)
+    def search_similar_chunks(
+        self, query_embedding: Embedding, min_similarity: float = 0.0, limit: Optional[int] = None
+    ) -> list[DocumentChunk]:
+        """Search similar chunks within the document, most similar first"""
+        return [chunk for chunk, _ in self.rank_chunks(query_embedding, min_similarity, limit)]
+
+    def rank_chunks(
+        self, query_embedding: Embedding, min_similarity: float = 0.0, limit: Optional[int] = None
+    ) -> list[tuple[DocumentChunk, float]]:
+        """Chunks with their cosine similarity to the query, most similar first
+
+        One matrix-vector product scores every embedded chunk; with a `limit` only the top k are sorted.
+        """
+        if self._matrix is None:
+            return []
+        if query_embedding.dimensions != self._matrix.shape[1]:
+            raise ValueError("Embeddings must have the same dimension")
+        if query_embedding.norm == 0:
+            scores = np.zeros(len(self._embedded_chunks), dtype=np.float32)
+        else:
+            query = query_embedding.to_numpy().astype(np.float32) / np.float32(query_embedding.norm)
+            scores = self._matrix[: len(self._embedded_chunks)] @ query
+
+        candidates = np.flatnonzero(scores >= min_similarity)
+        if limit is not None and limit < len(candidates):
+            top = np.argpartition(-scores[candidates], max(limit - 1, 0))[:limit]
+            candidates = np.sort(candidates[top])
+        # Stable, so equally similar chunks keep their document order
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._embedded_chunks[i], float(scores[i])) for i in ranked]
 
     def get_chunks_with_embeddings(self) -> list[DocumentChunk]:
         """Get only chunks that have embeddings"""
         return [chunk for chunk in self._chunks if chunk.has_embedding()]
 
     def get_chunks_without_embeddings(self) -> list[DocumentChunk]:
-        """Get only chunks that don't have embeddings"""
-        return [chunk for chunk in self._chunks if not chunk.has_embedding()]
+        """Get only chunks still waiting for an embedding (near-duplicates linked to a canonical chunk never get one)"""
+        return [chunk for chunk in self._chunks if not chunk.has_embedding() and not chunk.is_duplicate()]
+
+    def get_duplicate_chunks(self) -> list[DocumentChunk]:
+        """Get only chunks linked to a canonical chunk"""
+        return [chunk for chunk in self._chunks if chunk.is_duplicate()]
 
     def total_word_count(self) -> int:
         """Count total words in all chunks"""
@@ -68,12 +114,14 @@ class DocumentAggregate:
         """Get document processing status"""
         total_chunks = len(self._chunks)
         chunks_with_embeddings = len(self.get_chunks_with_embeddings())
+        chunks_without_embeddings = len(self.get_chunks_without_embeddings())
 
         return {
             "total_chunks": total_chunks,
             "chunks_with_embeddings": chunks_with_embeddings,
-            "chunks_without_embeddings": total_chunks - chunks_with_embeddings,
-            "is_fully_processed": total_chunks > 0 and chunks_with_embeddings == total_chunks,
+            "chunks_without_embeddings": chunks_without_embeddings,
+            "duplicate_chunks": len(self.get_duplicate_chunks()),
+            "is_fully_processed": total_chunks > 0 and chunks_without_embeddings == 0,
             "total_words": self.total_word_count(),
         }
 
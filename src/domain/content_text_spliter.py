@@ -1,4 +1,19 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional
+
+# Chunking strategies selectable globally (TEXT_SPLITTER) or per document
+TEXT_SPLITTERS = ("native", "langchain", "sentence")
+
+
+@dataclass(frozen=True)
+class SplitText:
+    """Chunks of a text with the word counts (and, when the splitter takes them, SimHash signatures) of its chunks"""
+
+    chunks: list[str]
+    chunk_word_counts: list[int]
+    word_count: int
+    chunk_signatures: Optional[list[Optional[int]]] = None
 
 
 class ContentTextSplitter(ABC):
@@ -6,3 +21,8 @@ class ContentTextSplitter(ABC):
     def split(self, text: str) -> list[str]:
         """Split raw text into chunks"""
         pass
+
+    def split_counted(self, text: str) -> SplitText:
+        """Split raw text into chunks and count the words of the text and of each chunk"""
+        chunks = self.split(text)
+        return SplitText(chunks, [len(chunk.split()) for chunk in chunks], len(text.split()))
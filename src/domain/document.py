@@ -18,6 +18,8 @@ class Document:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     chunks: list["DocumentChunk"] = field(default_factory=list)
+    # Set when the words were already counted while splitting the content (possibly in another process)
+    known_word_count: Optional[int] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.title.strip():
@@ -37,6 +39,8 @@ class Document:
 
     def word_count(self) -> int:
         """Count words in the document"""
+        if self.known_word_count is not None:
+            return self.known_word_count
         return len(self.content.split())
 
     def get_title(self) -> DocumentTitle:
@@ -56,6 +60,11 @@ class DocumentChunk:
     embedding: Optional[list[float]] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    position: Optional[int] = None  # order within the document
+    simhash: Optional[int] = None  # near-duplicate signature (see near_duplicate_index.simhash)
+    # Set on a near-duplicate of a stored chunk: stored without an embedding, its canonical chunk answers searches
+    canonical_chunk_id: Optional[int] = None
+    known_word_count: Optional[int] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if not self.content.strip():
@@ -65,6 +74,10 @@ class DocumentChunk:
         """Check if chunk has embedding"""
         return self.embedding is not None and len(self.embedding) > 0
 
+    def is_duplicate(self) -> bool:
+        """Check if chunk is linked to a canonical chunk instead of having an embedding of its own"""
+        return self.canonical_chunk_id is not None
+
     def get_embedding(self) -> Optional[Embedding]:
         """Get embedding as value object"""
         if self.has_embedding():
@@ -86,4 +99,22 @@ class DocumentChunk:
 
     def word_count(self) -> int:
         """Count words in the chunk"""
+        if self.known_word_count is not None:
+            return self.known_word_count
         return len(self.content.split())
+
+
+@dataclass
+class ChunkDiff:
+    """Stored chunks of a document against the chunks of its new content, matched by content"""
+
+    kept: list[DocumentChunk]  # stored chunks still in the content (embedding kept), with their new position
+    added: list[DocumentChunk]  # chunks of the new content not stored yet
+    removed: list[DocumentChunk]  # stored chunks no longer in the content
+
+    def to_dict(self) -> dict:
+        return {
+            "unchanged_chunks": len(self.kept),
+            "added_chunks": len(self.added),
+            "removed_chunks": len(self.removed),
+        }
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager, AbstractContextManager
 from typing import Optional
 
-from src.domain.document import Document, DocumentChunk
+from src.domain.document import ChunkDiff, Document, DocumentChunk
 
 
 class DocumentRepository(ABC):
@@ -37,9 +38,39 @@ class DocumentRepository(ABC):
         """Persistir un chunk asociado a un documento"""
         pass
 
+    @abstractmethod
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        """Persistir varios chunks en una única transacción"""
+        pass
+
+    @abstractmethod
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        """Persistir un documento y sus chunks en una única transacción"""
+        pass
+
+    @abstractmethod
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        """Persistir un lote de documentos con sus chunks en una única transacción (carga masiva).
+
+        Retorna los documentos almacenados en el mismo orden; si algo falla no se guarda ninguno.
+        """
+        pass
+
+    @abstractmethod
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        """Actualizar título y contenido de un documento aplicando el diff de sus chunks en una única transacción.
+
+        Conserva los chunks `kept` (con su embedding) en su nueva posición, borra los `removed` e inserta los `added`;
+        retorna el documento almacenado y los chunks insertados. Lanza DocumentConflictException si los chunks
+        almacenados cambiaron desde que se calculó el diff.
+        """
+        pass
+
     @abstractmethod
     def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
-        """Obtener todos los chunks de un documento"""
+        """Obtener todos los chunks de un documento, en orden"""
         pass
 
     @abstractmethod
@@ -53,8 +84,44 @@ class DocumentRepository(ABC):
         pass
 
     @abstractmethod
-    def search_similar(self, query_embedding: list[float], limit: int = 5, min_similarity: float = 0.0) -> list[dict]:
-        """Buscar chunks similares a un embedding dado; retorna filas con 'similarity' en [0..1]"""
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        """Buscar chunks similares a un embedding dado; retorna filas con 'similarity' en [0..1].
+
+        `ef_search` (HNSW) y `probes` (IVFFlat) ajustan el recall del índice aproximado para esta búsqueda.
+        """
+        pass
+
+    @abstractmethod
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        """Buscar chunks similares a varios embeddings en una sola ida y vuelta a la base de datos.
+
+        Retorna una lista de filas por consulta, en el orden de `query_embeddings`; cada consulta usa su propio límite
+        y similitud mínima.
+        """
+        pass
+
+    @abstractmethod
+    def corpus_version(self) -> int:
+        """Versión del corpus: cambia con cada escritura confirmada que pueda alterar un resultado de búsqueda"""
+        pass
+
+    @abstractmethod
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        """Buscar chunks por texto completo, sin embeddings; retorna filas con 'rank' (relevancia léxica en [0..1))"""
         pass
 
     @abstractmethod
@@ -62,7 +129,160 @@ class DocumentRepository(ABC):
         """Obtener chunks que no tienen embeddings"""
         pass
 
+    @abstractmethod
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> AbstractContextManager[list[DocumentChunk]]:
+        """Reservar chunks sin embedding mientras dure el bloque `with`.
+
+        Otros procesos que reclamen a la vez obtienen chunks distintos; si el bloque falla, los chunks vuelven a
+        quedar pendientes.
+        """
+        pass
+
+    @abstractmethod
+    def count_chunks_without_embeddings(self) -> int:
+        """Contar los chunks que aún no tienen embedding (backlog pendiente)"""
+        pass
+
     @abstractmethod
     def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
         """Actualizar el embedding de un chunk"""
         pass
+
+    @abstractmethod
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        """Actualizar los embeddings de varios chunks (chunk_id -> embedding) en una sola transacción"""
+        pass
+
+
+class AsyncDocumentRepository(ABC):
+    """Interfaz asíncrona del repositorio de documentos (misma semántica que DocumentRepository)"""
+
+    @abstractmethod
+    async def save_document(self, doc: Document) -> Document:
+        """Persistir un documento y retornar la entidad almacenada"""
+        pass
+
+    @abstractmethod
+    async def get_document(self, doc_id: int) -> Optional[Document]:
+        """Obtener un documento por su ID"""
+        pass
+
+    @abstractmethod
+    async def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        """Obtener todos los documentos con paginación"""
+        pass
+
+    @abstractmethod
+    async def delete_document(self, doc_id: int) -> bool:
+        """Eliminar un documento por su ID"""
+        pass
+
+    @abstractmethod
+    async def document_exists(self, doc_id: int) -> bool:
+        """Verificar si un documento existe"""
+        pass
+
+    @abstractmethod
+    async def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        """Persistir un chunk asociado a un documento"""
+        pass
+
+    @abstractmethod
+    async def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        """Persistir varios chunks en una única transacción"""
+        pass
+
+    @abstractmethod
+    async def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        """Persistir un documento y sus chunks en una única transacción"""
+        pass
+
+    @abstractmethod
+    async def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        """Actualizar título y contenido de un documento aplicando el diff de sus chunks en una única transacción.
+
+        Conserva los chunks `kept` (con su embedding) en su nueva posición, borra los `removed` e inserta los `added`;
+        retorna el documento almacenado y los chunks insertados. Lanza DocumentConflictException si los chunks
+        almacenados cambiaron desde que se calculó el diff.
+        """
+        pass
+
+    @abstractmethod
+    async def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        """Obtener todos los chunks de un documento, en orden"""
+        pass
+
+    @abstractmethod
+    async def get_chunk(self, chunk_id: int) -> Optional[DocumentChunk]:
+        """Obtener un chunk por su ID"""
+        pass
+
+    @abstractmethod
+    async def delete_chunk(self, chunk_id: int) -> bool:
+        """Eliminar un chunk por su ID"""
+        pass
+
+    @abstractmethod
+    async def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        """Buscar chunks similares a un embedding dado; retorna filas con 'similarity' en [0..1]"""
+        pass
+
+    @abstractmethod
+    async def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        """Buscar chunks similares a varios embeddings en una sola ida y vuelta a la base de datos.
+
+        Retorna una lista de filas por consulta, en el orden de `query_embeddings`; cada consulta usa su propio límite
+        y similitud mínima.
+        """
+        pass
+
+    @abstractmethod
+    async def corpus_version(self) -> int:
+        """Versión del corpus: cambia con cada escritura confirmada que pueda alterar un resultado de búsqueda"""
+        pass
+
+    @abstractmethod
+    async def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        """Buscar chunks por texto completo, sin embeddings; retorna filas con 'rank' (relevancia léxica en [0..1))"""
+        pass
+
+    @abstractmethod
+    async def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        """Obtener chunks que no tienen embeddings"""
+        pass
+
+    @abstractmethod
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> AbstractAsyncContextManager[list[DocumentChunk]]:
+        """Reservar chunks sin embedding mientras dure el bloque `async with`"""
+        pass
+
+    @abstractmethod
+    async def count_chunks_without_embeddings(self) -> int:
+        """Contar los chunks que aún no tienen embedding (backlog pendiente)"""
+        pass
+
+    @abstractmethod
+    async def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        """Actualizar el embedding de un chunk"""
+        pass
+
+    @abstractmethod
+    async def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        """Actualizar los embeddings de varios chunks (chunk_id -> embedding) en una sola transacción"""
+        pass
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+
+class EmbeddingStore(ABC):
+    """Persistent, content-addressed cache of chunk embeddings for one embedding model"""
+
+    @abstractmethod
+    def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """Return the stored embeddings for these texts, keyed by text; misses are left out"""
+        ...
+
+    @abstractmethod
+    def put_many(self, embeddings: dict[str, list[float]]) -> None:
+        """Store freshly generated embeddings, keyed by text"""
+        ...
+
+
+class AsyncEmbeddingStore(ABC):
+    @abstractmethod
+    async def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        """Return the stored embeddings for these texts, keyed by text; misses are left out"""
+        ...
+
+    @abstractmethod
+    async def put_many(self, embeddings: dict[str, list[float]]) -> None:
+        """Store freshly generated embeddings, keyed by text"""
+        ...
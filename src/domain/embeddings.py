@@ -11,3 +11,23 @@ class EmbeddingGenerator(ABC):
     def embed_query(self, text: str) -> list[float]:
         """Return embedding for a single query text"""
         ...
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Return one embedding per query text from a single provider call"""
+        return self.embed(texts)
+
+
+class AsyncEmbeddingGenerator(ABC):
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Return one embedding per input text without blocking the event loop"""
+        ...
+
+    @abstractmethod
+    async def embed_query(self, text: str) -> list[float]:
+        """Return embedding for a single query text without blocking the event loop"""
+        ...
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Return one embedding per query text from a single provider call without blocking the event loop"""
+        return await self.embed(texts)
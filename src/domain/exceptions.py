@@ -47,6 +47,13 @@ class DocumentNotFoundError(DocumentException):
         super().__init__(f"Document with ID {document_id} not found")
 
 
+class DocumentConflictException(DocumentException):
+    """Exception when a document changed between reading and writing it"""
+
+    def __init__(self, document_id: int):
+        super().__init__(f"Document with ID {document_id} was modified concurrently, retry the update")
+
+
 class ChunkException(DomainException):
     """Chunk-related exception"""
 
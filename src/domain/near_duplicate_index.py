@@ -0,0 +1,96 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+SIMHASH_BITS = 64
+# Signatures are indexed by band: two signatures at most SIMHASH_BANDS - 1 bits apart agree on at least one whole
+# band (pigeonhole), so looking up each band finds every neighbour within that distance
+SIMHASH_BANDS = 4
+SIMHASH_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+MAX_INDEXED_DISTANCE = SIMHASH_BANDS - 1
+
+_MASK = (1 << SIMHASH_BITS) - 1
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+_WORD = re.compile(r"\w+")
+_SHINGLE_WORDS = 3
+# Texts with fewer words have too few shingles for a stable signature (symbols, whitespace or a couple of words)
+MIN_SIMHASH_WORDS = 5
+
+
+def simhash(text: str) -> Optional[int]:
+    """64-bit SimHash of the word 3-shingles of a text, as a signed integer (it fits a Postgres bigint)
+
+    Each bit is the majority vote of that bit over the shingle hashes, so texts sharing most shingles get signatures
+    a few bits apart. Case and punctuation are ignored. A text of fewer than MIN_SIMHASH_WORDS words is not signed
+    (None): it is never matched as a near-duplicate.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) < MIN_SIMHASH_WORDS:
+        return None
+    shingles = {" ".join(words[i : i + _SHINGLE_WORDS]) for i in range(max(1, len(words) - _SHINGLE_WORDS + 1))}
+    hashes = np.frombuffer(
+        b"".join(hashlib.blake2b(shingle.encode(), digest_size=8).digest() for shingle in shingles), dtype="<u8"
+    )
+    bits = np.unpackbits(hashes.view(np.uint8), bitorder="little").reshape(len(hashes), SIMHASH_BITS)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(hashes)
+    value = int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+    return value - (1 << SIMHASH_BITS) if value >> (SIMHASH_BITS - 1) else value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return ((a ^ b) & _MASK).bit_count()
+
+
+def simhash_bands(signature: int) -> tuple[int, ...]:
+    """The SIMHASH_BANDS unsigned 16-bit slices of a signature, lowest bits first"""
+    return tuple((signature >> (band * SIMHASH_BAND_BITS)) & _BAND_MASK for band in range(SIMHASH_BANDS))
+
+
+def nearest_canonical(
+    signatures: list[int], candidates: Sequence[tuple[int, int]], max_distance: int
+) -> list[Optional[int]]:
+    """For each signature, the id of the closest (id, signature) candidate within max_distance bits, else None
+
+    Only candidates sharing a band are compared, which is exact for max_distance <= MAX_INDEXED_DISTANCE; ties go to
+    the lowest (oldest) id.
+    """
+    buckets: dict[tuple[int, int], list[tuple[int, int]]] = {}
+    for chunk_id, signature in candidates:
+        for band, value in enumerate(simhash_bands(signature)):
+            buckets.setdefault((band, value), []).append((chunk_id, signature))
+
+    nearest: list[Optional[int]] = []
+    for signature in signatures:
+        best: Optional[tuple[int, int]] = None
+        for band, value in enumerate(simhash_bands(signature)):
+            for chunk_id, candidate in buckets.get((band, value), ()):
+                distance = hamming_distance(signature, candidate)
+                if distance <= max_distance and (best is None or (distance, chunk_id) < best):
+                    best = (distance, chunk_id)
+        nearest.append(best[1] if best else None)
+    return nearest
+
+
+def check_max_distance(max_distance: int) -> None:
+    if not 0 <= max_distance <= MAX_INDEXED_DISTANCE:
+        raise ValueError(f"The band index finds neighbours up to {MAX_INDEXED_DISTANCE} bits apart, got {max_distance}")
+
+
+class NearDuplicateIndex(ABC):
+    """Locality-sensitive index of the SimHash signatures of the stored canonical chunks"""
+
+    @abstractmethod
+    def find_canonical(self, signatures: list[int]) -> list[Optional[int]]:
+        """For each signature, the id of the closest canonical chunk within the index's distance, else None"""
+        ...
+
+
+class AsyncNearDuplicateIndex(ABC):
+    @abstractmethod
+    async def find_canonical(self, signatures: list[int]) -> list[Optional[int]]:
+        """For each signature, the id of the closest canonical chunk within the index's distance, else None"""
+        ...
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+from typing import Any, Optional
+
+
+class SearchResultCache(ABC):
+    """Bounded cache of formatted search results, each valid only for the corpus version it was computed at"""
+
+    @abstractmethod
+    def get(self, corpus_version: int, key: Hashable) -> Optional[dict[str, Any]]:
+        """Return the result cached for this key at this corpus version; None on a miss"""
+        ...
+
+    @abstractmethod
+    def set(self, corpus_version: int, key: Hashable, result: dict[str, Any], cost_seconds: float) -> None:
+        """Store a result with the time it took to compute, credited as saved latency on every later hit"""
+        ...
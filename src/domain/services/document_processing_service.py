@@ -1,78 +1,479 @@
-from src.domain.content_text_spliter import ContentTextSplitter
-from src.domain.document import Document, DocumentChunk
-from src.domain.embeddings import EmbeddingGenerator
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+
+from src.domain.content_text_spliter import TEXT_SPLITTERS, ContentTextSplitter, SplitText
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.embedding_store import AsyncEmbeddingStore, EmbeddingStore
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
 from src.domain.exceptions import (
     DocumentProcessingException,
     DocumentTooShortException,
     EmbeddingGenerationException,
 )
+from src.domain.near_duplicate_index import AsyncNearDuplicateIndex, NearDuplicateIndex, simhash
 from src.domain.value_objects import Embedding
 
 
-class DocumentProcessingService:
-    """Domain service for document processing"""
+@dataclass(frozen=True)
+class EmbeddingReuse:
+    """How many chunks of one ingest were embedded by the provider vs. reused (stored or repeated in the document)
 
-    def __init__(self, splitter: ContentTextSplitter, embedding_generator: EmbeddingGenerator):
-        self.splitter = splitter
-        self.embedding_generator = embedding_generator
+    Near-duplicates linked to a stored canonical chunk are neither: they are stored without an embedding.
+    """
 
-    def process_document(self, document: Document) -> list[DocumentChunk]:
-        """Process document: split into chunks and generate embeddings"""
+    total_chunks: int
+    embedded_chunks: int
+    duplicate_chunks: int = 0
+
+    @property
+    def reused_chunks(self) -> int:
+        return self.total_chunks - self.embedded_chunks - self.duplicate_chunks
+
+    @property
+    def hit_ratio(self) -> float:
+        needed = self.total_chunks - self.duplicate_chunks
+        return self.reused_chunks / needed if needed else 0.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.duplicate_chunks / self.total_chunks if self.total_chunks else 0.0
+
+    def deduplication_dict(self) -> dict:
+        return {"duplicate_chunks": self.duplicate_chunks, "dedup_ratio": self.dedup_ratio}
+
+    def to_dict(self) -> dict:
+        return {
+            "total_chunks": self.total_chunks,
+            "reused_chunks": self.reused_chunks,
+            "embedded_chunks": self.embedded_chunks,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class _DocumentProcessingBase:
+    """Validation, splitting and chunk assembly shared by the sync and async processing services"""
+
+    splitter: ContentTextSplitter
+    splitter_for: Optional[Callable[[str], ContentTextSplitter]]
+
+    def split_document(self, document: Document, chunking: Optional[str] = None) -> list[str]:
+        """Validate the document and split its content into text chunks, with the default or the given strategy"""
+        return self.prepare_document(document, chunking).chunks
+
+    def prepare_document(self, document: Document, chunking: Optional[str] = None) -> SplitText:
+        """Validate and split the document, counting its words on the way (recorded on the document)"""
         if document.is_empty():
             raise DocumentProcessingException("Cannot process empty document")
 
         if not self.validate_document_for_processing(document):
             raise DocumentTooShortException
 
+        splitter = self.splitter
+        if chunking is not None:
+            if chunking not in TEXT_SPLITTERS or self.splitter_for is None:
+                raise DocumentProcessingException(f"Unsupported chunking strategy: {chunking}")
+            splitter = self.splitter_for(chunking)
+
         try:
-            # Split content
-            text_chunks = self.splitter.split(document.content)
+            split = splitter.split_counted(document.content)
+        except Exception as exc:
+            raise DocumentProcessingException(f"Error during processing: {exc!s}") from exc
+
+        if not split.chunks:
+            raise DocumentProcessingException("Could not generate chunks from document")
 
-            if not text_chunks:
-                raise DocumentProcessingException("Could not generate chunks from document")
+        document.known_word_count = split.word_count
+        return split
 
-            # Generate embeddings
-            embeddings = self.embedding_generator.embed(text_chunks)
+    @staticmethod
+    def build_chunks(
+        document: Document,
+        text_chunks: list[str],
+        embeddings: list[list[float]],
+        word_counts: Optional[list[int]] = None,
+        signatures: Optional[list[Optional[int]]] = None,
+        canonical_ids: Optional[list[Optional[int]]] = None,
+    ) -> list[DocumentChunk]:
+        """Pair text chunks with their embeddings (and word counts, when known) as domain chunks
 
-            if len(embeddings) != len(text_chunks):
-                raise DocumentProcessingException("Number of embeddings does not match number of chunks")
+        Chunks linked to a canonical chunk (`canonical_ids`) take no embedding: `embeddings` holds one per other chunk.
+        """
+        canonical_ids = canonical_ids or [None] * len(text_chunks)
+        if len(embeddings) != canonical_ids.count(None):
+            raise DocumentProcessingException("Number of embeddings does not match number of chunks")
 
-            # Create domain chunks
-            document_chunks = []
-            for i, (text_chunk, embedding) in enumerate(zip(text_chunks, embeddings)):
+        remaining = iter(embeddings)
+        document_chunks = []
+        for index, text_chunk in enumerate(text_chunks):
+            embedding = None
+            if canonical_ids[index] is None:
                 # Convert embedding to value object for validation
-                embedding_obj = Embedding(embedding)
+                embedding = Embedding(next(remaining)).to_list()
+
+            chunk = DocumentChunk(
+                document_id=document.id,
+                content=text_chunk,
+                embedding=embedding,
+                position=index,
+                simhash=signatures[index] if signatures else None,
+                canonical_chunk_id=canonical_ids[index],
+                known_word_count=word_counts[index] if word_counts else None,
+            )
+            document_chunks.append(chunk)
+
+        return document_chunks
+
+    @staticmethod
+    def build_pending_chunks(
+        document: Document,
+        text_chunks: list[str],
+        word_counts: Optional[list[int]] = None,
+        signatures: Optional[list[Optional[int]]] = None,
+        canonical_ids: Optional[list[Optional[int]]] = None,
+    ) -> list[DocumentChunk]:
+        """Chunks stored before they are embedded; background workers fill in the embeddings of those not linked"""
+        return [
+            DocumentChunk(
+                document_id=document.id,
+                content=text_chunk,
+                position=index,
+                simhash=signatures[index] if signatures else None,
+                canonical_chunk_id=canonical_ids[index] if canonical_ids else None,
+                known_word_count=word_counts[index] if word_counts else None,
+            )
+            for index, text_chunk in enumerate(text_chunks)
+        ]
+
+    @staticmethod
+    def signatures(text_chunks: list[str]) -> list[Optional[int]]:
+        return [simhash(text_chunk) for text_chunk in text_chunks]
+
+    @staticmethod
+    def added_signatures(split: SplitText, diff: ChunkDiff) -> Optional[list[Optional[int]]]:
+        """Signatures the splitter took for the chunks an update adds, if it took any"""
+        if split.chunk_signatures is None:
+            return None
+        return [split.chunk_signatures[chunk.position] for chunk in diff.added]
+
+    @staticmethod
+    def signed(signatures: list[Optional[int]]) -> list[int]:
+        """The signatures worth looking up: chunks too short to sign are never linked"""
+        return [signature for signature in signatures if signature is not None]
+
+    @staticmethod
+    def spread_canonical(signatures: list[Optional[int]], found: list[Optional[int]]) -> list[Optional[int]]:
+        """Canonical ids found for the signed chunks, back in chunk order (None for the unsigned ones)"""
+        remaining = iter(found)
+        return [None if signature is None else next(remaining) for signature in signatures]
+
+    @staticmethod
+    def unlinked(text_chunks: list[str], canonical_ids: list[Optional[int]]) -> list[str]:
+        """The chunk texts that need an embedding: those not linked to a canonical chunk"""
+        return [text_chunk for text_chunk, canonical_id in zip(text_chunks, canonical_ids) if canonical_id is None]
+
+    @staticmethod
+    def with_duplicates(reuse: EmbeddingReuse, canonical_ids: list[Optional[int]]) -> EmbeddingReuse:
+        """Reuse of the unlinked chunks, extended to every chunk of the ingest"""
+        duplicates = len(canonical_ids) - canonical_ids.count(None)
+        return EmbeddingReuse(reuse.total_chunks + duplicates, reuse.embedded_chunks, duplicates)
+
+    @staticmethod
+    def diff_chunks(document: Document, stored: list[DocumentChunk], split: SplitText) -> ChunkDiff:
+        """Match the new text chunks against the stored ones by content, in order; repeated texts pair up one to one"""
+        unmatched: dict[str, list[DocumentChunk]] = {}
+        for chunk in stored:
+            unmatched.setdefault(chunk.content, []).append(chunk)
+
+        kept, added = [], []
+        for position, text_chunk in enumerate(split.chunks):
+            word_count = split.chunk_word_counts[position] if split.chunk_word_counts else None
+            candidates = unmatched.get(text_chunk)
+            if candidates:
+                chunk = candidates.pop(0)
+                chunk.position, chunk.known_word_count = position, word_count
+                kept.append(chunk)
+            else:
+                added.append(
+                    DocumentChunk(
+                        document_id=document.id, content=text_chunk, position=position, known_word_count=word_count
+                    )
+                )
+
+        removed = [chunk for chunks in unmatched.values() for chunk in chunks]
+        return ChunkDiff(kept=kept, added=added, removed=removed)
+
+    @staticmethod
+    def unlink_removed(diff: ChunkDiff, canonical_ids: list[Optional[int]]) -> list[Optional[int]]:
+        """Never link an added chunk to a chunk the same update deletes"""
+        removed = {chunk.id for chunk in diff.removed}
+        return [None if canonical_id in removed else canonical_id for canonical_id in canonical_ids]
+
+    @classmethod
+    def apply_update_embeddings(
+        cls,
+        diff: ChunkDiff,
+        embeddings: list[list[float]],
+        reuse: EmbeddingReuse,
+        signatures: list[Optional[int]],
+        canonical_ids: list[Optional[int]],
+    ) -> tuple[ChunkDiff, EmbeddingReuse]:
+        """Set the signatures and links or embeddings of the added chunks; kept chunks count as reused"""
+        remaining = iter(embeddings)
+        for chunk, signature, canonical_id in zip(diff.added, signatures, canonical_ids):
+            chunk.simhash, chunk.canonical_chunk_id = signature, canonical_id
+            if canonical_id is None:
+                chunk.set_embedding(Embedding(next(remaining)))
+        reuse = cls.with_duplicates(reuse, canonical_ids)
+        return diff, EmbeddingReuse(len(diff.kept) + reuse.total_chunks, reuse.embedded_chunks, reuse.duplicate_chunks)
+
+    @staticmethod
+    def merge_embeddings(
+        text_chunks: list[str], known: dict[str, list[float]], misses: list[str], fresh: list[list[float]]
+    ) -> tuple[list[list[float]], EmbeddingReuse]:
+        """Embeddings in chunk order from the stored ones plus those just generated for the misses"""
+        if len(fresh) != len(misses):
+            raise DocumentProcessingException("Number of embeddings does not match number of chunks")
+
+        embeddings_by_text = {**known, **dict(zip(misses, fresh))}
+        embeddings = [embeddings_by_text[text_chunk] for text_chunk in text_chunks]
+        return embeddings, EmbeddingReuse(total_chunks=len(text_chunks), embedded_chunks=len(misses))
+
+    @staticmethod
+    def build_query_embedding(query_embedding: list[float]) -> Embedding:
+        """Validate a raw query embedding and wrap it as a value object"""
+        if not query_embedding:
+            raise EmbeddingGenerationException("Could not generate embedding for query")
+
+        return Embedding(query_embedding)
+
+    def validate_document_for_processing(self, document: Document) -> bool:
+        """Validate if document can be processed"""
+        # Non-blank content has at least one word: no need to count them all here, before splitting
+        return not document.is_empty() and len(document.content.strip()) > 10  # Minimum 10 characters
+
+
+class DocumentProcessingService(_DocumentProcessingBase):
+    """Domain service for document processing"""
+
+    def __init__(
+        self,
+        splitter: ContentTextSplitter,
+        embedding_generator: EmbeddingGenerator,
+        embedding_store: Optional[EmbeddingStore] = None,
+        splitter_for: Optional[Callable[[str], ContentTextSplitter]] = None,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+    ):
+        self.splitter = splitter
+        self.embedding_generator = embedding_generator
+        self.embedding_store = embedding_store
+        self.splitter_for = splitter_for
+        self.duplicate_index = duplicate_index
+
+    def process_document(self, document: Document) -> list[DocumentChunk]:
+        """Process document: split into chunks and generate embeddings"""
+        chunks, _ = self.process_document_with_reuse(document)
+        return chunks
+
+    def process_document_with_reuse(
+        self, document: Document, chunking: Optional[str] = None
+    ) -> tuple[list[DocumentChunk], EmbeddingReuse]:
+        """Process document, embedding only chunk texts not already stored, and report the reuse"""
+        split = self.prepare_document(document, chunking)
+
+        try:
+            signatures, canonical_ids = self.find_duplicates(split.chunks, split.chunk_signatures)
+            embeddings, reuse = self.embed_chunks(self.unlinked(split.chunks, canonical_ids))
+            chunks = self.build_chunks(
+                document, split.chunks, embeddings, split.chunk_word_counts, signatures, canonical_ids
+            )
+            return chunks, self.with_duplicates(reuse, canonical_ids)
+
+        except Exception as exc:
+            if isinstance(exc, DocumentProcessingException):
+                raise
+            raise DocumentProcessingException(f"Error during processing: {exc!s}") from exc
 
-                chunk = DocumentChunk(document_id=document.id, content=text_chunk, embedding=embedding_obj.to_list())
-                document_chunks.append(chunk)
+    def process_document_update(
+        self, document: Document, stored: list[DocumentChunk], chunking: Optional[str] = None
+    ) -> tuple[ChunkDiff, EmbeddingReuse]:
+        """Re-split an edited document and diff it against its stored chunks, embedding only the added chunks"""
+        split = self.prepare_document(document, chunking)
+        diff = self.diff_chunks(document, stored, split)
 
-            return document_chunks
+        try:
+            added = [chunk.content for chunk in diff.added]
+            signatures, canonical_ids = self.find_duplicates(added, self.added_signatures(split, diff))
+            canonical_ids = self.unlink_removed(diff, canonical_ids)
+            embeddings, reuse = self.embed_chunks(self.unlinked(added, canonical_ids))
+            return self.apply_update_embeddings(diff, embeddings, reuse, signatures, canonical_ids)
 
         except Exception as exc:
             if isinstance(exc, DocumentProcessingException):
                 raise
             raise DocumentProcessingException(f"Error during processing: {exc!s}") from exc
 
+    def find_duplicates(
+        self, text_chunks: list[str], signatures: Optional[list[Optional[int]]] = None
+    ) -> tuple[list[Optional[int]], list[Optional[int]]]:
+        """SimHash signatures of the chunks and, for each, the stored canonical chunk it nearly duplicates (or None)
+
+        `signatures` already taken by the splitter (see SplitText.chunk_signatures) are used instead of recomputing.
+        """
+        if signatures is None:
+            signatures = self.signatures(text_chunks)
+        signed = self.signed(signatures)
+        if self.duplicate_index is None or not signed:
+            return signatures, [None] * len(signatures)
+        return signatures, self.spread_canonical(signatures, self.duplicate_index.find_canonical(signed))
+
+    def embed_chunks(self, text_chunks: list[str]) -> tuple[list[list[float]], EmbeddingReuse]:
+        """Embed each distinct chunk text once, skipping texts found in the embedding store"""
+        unique_texts = list(dict.fromkeys(text_chunks))
+        known = self.embedding_store.get_many(unique_texts) if self.embedding_store else {}
+        misses = [text_chunk for text_chunk in unique_texts if text_chunk not in known]
+
+        fresh = self.embedding_generator.embed(misses) if misses else []
+        if self.embedding_store and misses:
+            self.embedding_store.put_many(dict(zip(misses, fresh)))
+
+        return self.merge_embeddings(text_chunks, known, misses, fresh)
+
     def process_query(self, query: str) -> Embedding:
         """Process query and generate its embedding"""
         try:
             # embed_query now returns list[float] directly
             query_embedding = self.embedding_generator.embed_query(query)
+            return self.build_query_embedding(query_embedding)
+
+        except Exception as exc:
+            if isinstance(exc, EmbeddingGenerationException):
+                raise
+            raise EmbeddingGenerationException(f"Error generating embedding for query: {exc!s}") from exc
+
+    def process_queries(self, queries: list[str]) -> list[Embedding]:
+        """Generate the embeddings of several queries with one embedding call, in query order"""
+        unique_queries = list(dict.fromkeys(queries))
+        try:
+            embeddings = dict(zip(unique_queries, self.embedding_generator.embed_queries(unique_queries)))
+            return [self.build_query_embedding(embeddings.get(query, [])) for query in queries]
+
+        except Exception as exc:
+            if isinstance(exc, EmbeddingGenerationException):
+                raise
+            raise EmbeddingGenerationException(f"Error generating embeddings for queries: {exc!s}") from exc
+
+
+class AsyncDocumentProcessingService(_DocumentProcessingBase):
+    """Document processing with a non-blocking embedding generator; splitting and SimHash (CPU-bound) run in threads"""
+
+    def __init__(
+        self,
+        splitter: ContentTextSplitter,
+        embedding_generator: AsyncEmbeddingGenerator,
+        embedding_store: Optional[AsyncEmbeddingStore] = None,
+        splitter_for: Optional[Callable[[str], ContentTextSplitter]] = None,
+        duplicate_index: Optional[AsyncNearDuplicateIndex] = None,
+    ):
+        self.splitter = splitter
+        self.embedding_generator = embedding_generator
+        self.embedding_store = embedding_store
+        self.splitter_for = splitter_for
+        self.duplicate_index = duplicate_index
+
+    async def process_document(self, document: Document) -> list[DocumentChunk]:
+        """Process document: split into chunks and generate embeddings"""
+        chunks, _ = await self.process_document_with_reuse(document)
+        return chunks
+
+    async def process_document_with_reuse(
+        self, document: Document, chunking: Optional[str] = None
+    ) -> tuple[list[DocumentChunk], EmbeddingReuse]:
+        """Process document, embedding only chunk texts not already stored, and report the reuse"""
+        split = await self.prepare_document_in_thread(document, chunking)
+
+        try:
+            signatures, canonical_ids = await self.find_duplicates(split.chunks, split.chunk_signatures)
+            embeddings, reuse = await self.embed_chunks(self.unlinked(split.chunks, canonical_ids))
+            chunks = self.build_chunks(
+                document, split.chunks, embeddings, split.chunk_word_counts, signatures, canonical_ids
+            )
+            return chunks, self.with_duplicates(reuse, canonical_ids)
+
+        except Exception as exc:
+            if isinstance(exc, DocumentProcessingException):
+                raise
+            raise DocumentProcessingException(f"Error during processing: {exc!s}") from exc
+
+    async def process_document_update(
+        self, document: Document, stored: list[DocumentChunk], chunking: Optional[str] = None
+    ) -> tuple[ChunkDiff, EmbeddingReuse]:
+        """Re-split an edited document and diff it against its stored chunks, embedding only the added chunks"""
+        split = await self.prepare_document_in_thread(document, chunking)
+        diff = self.diff_chunks(document, stored, split)
+
+        try:
+            added = [chunk.content for chunk in diff.added]
+            signatures, canonical_ids = await self.find_duplicates(added, self.added_signatures(split, diff))
+            canonical_ids = self.unlink_removed(diff, canonical_ids)
+            embeddings, reuse = await self.embed_chunks(self.unlinked(added, canonical_ids))
+            return self.apply_update_embeddings(diff, embeddings, reuse, signatures, canonical_ids)
+
+        except Exception as exc:
+            if isinstance(exc, DocumentProcessingException):
+                raise
+            raise DocumentProcessingException(f"Error during processing: {exc!s}") from exc
 
-            if not query_embedding:
-                raise EmbeddingGenerationException("Could not generate embedding for query")
+    async def prepare_document_in_thread(self, document: Document, chunking: Optional[str] = None) -> SplitText:
+        """prepare_document in a worker thread, so splitting a large document does not stall the event loop"""
+        return await asyncio.to_thread(self.prepare_document, document, chunking)
 
-            return Embedding(query_embedding)
+    async def find_duplicates(
+        self, text_chunks: list[str], signatures: Optional[list[Optional[int]]] = None
+    ) -> tuple[list[Optional[int]], list[Optional[int]]]:
+        """SimHash signatures of the chunks and, for each, the stored canonical chunk it nearly duplicates (or None)
+
+        `signatures` already taken by the splitter (see SplitText.chunk_signatures) are used instead of recomputing.
+        """
+        if signatures is None:
+            signatures = await asyncio.to_thread(self.signatures, text_chunks)
+        signed = self.signed(signatures)
+        if self.duplicate_index is None or not signed:
+            return signatures, [None] * len(signatures)
+        return signatures, self.spread_canonical(signatures, await self.duplicate_index.find_canonical(signed))
+
+    async def embed_chunks(self, text_chunks: list[str]) -> tuple[list[list[float]], EmbeddingReuse]:
+        """Embed each distinct chunk text once, skipping texts found in the embedding store"""
+        unique_texts = list(dict.fromkeys(text_chunks))
+        known = await self.embedding_store.get_many(unique_texts) if self.embedding_store else {}
+        misses = [text_chunk for text_chunk in unique_texts if text_chunk not in known]
+
+        fresh = await self.embedding_generator.embed(misses) if misses else []
+        if self.embedding_store and misses:
+            await self.embedding_store.put_many(dict(zip(misses, fresh)))
+
+        return self.merge_embeddings(text_chunks, known, misses, fresh)
+
+    async def process_query(self, query: str) -> Embedding:
+        """Process query and generate its embedding"""
+        try:
+            query_embedding = await self.embedding_generator.embed_query(query)
+            return self.build_query_embedding(query_embedding)
 
         except Exception as exc:
             if isinstance(exc, EmbeddingGenerationException):
                 raise
             raise EmbeddingGenerationException(f"Error generating embedding for query: {exc!s}") from exc
 
-    def validate_document_for_processing(self, document: Document) -> bool:
-        """Validate if document can be processed"""
-        return (
-            not document.is_empty()
-            and document.word_count() > 0
-            and len(document.content.strip()) > 10  # Minimum 10 characters
-        )
+    async def process_queries(self, queries: list[str]) -> list[Embedding]:
+        """Generate the embeddings of several queries with one embedding call, in query order"""
+        unique_queries = list(dict.fromkeys(queries))
+        try:
+            embeddings = dict(zip(unique_queries, await self.embedding_generator.embed_queries(unique_queries)))
+            return [self.build_query_embedding(embeddings.get(query, [])) for query in queries]
+
+        except Exception as exc:
+            if isinstance(exc, EmbeddingGenerationException):
+                raise
+            raise EmbeddingGenerationException(f"Error generating embeddings for queries: {exc!s}") from exc
@@ -1,5 +1,10 @@
-import math
-from dataclasses import dataclass
+import struct
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Optional
+
+import numpy as np
+from numpy.typing import DTypeLike
 
 from .exceptions import (
     DocumentTitleEmptyException,
@@ -8,36 +13,93 @@ from .exceptions import (
     SearchQueryInvalidException,
 )
 
+# pgvector's binary wire format: uint16 dimensions, uint16 unused, then big-endian float32 values
+_PGVECTOR_HEADER = struct.Struct(">HH")
+_PGVECTOR_DTYPE = np.dtype(">f4")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, eq=False)
 class Embedding:
-    """Value Object for embeddings"""
+    """Value Object for embeddings, stored as a contiguous read-only NumPy array (float32 unless `dtype` is given)"""
 
-    values: list[float]
+    values: Any
+    dtype: DTypeLike = field(default=np.float32, repr=False)
 
     def __post_init__(self):
-        if not self.values:
+        if self.values is None:
+            raise EmbeddingEmptyException
+        array = self.values if isinstance(self.values, np.ndarray) else np.asarray(self.values)
+        if array.size == 0:
             raise EmbeddingEmptyException
-        if any(not isinstance(v, (int, float)) for v in self.values):
+        if array.dtype.kind not in "biuf":
             raise ValueError("All values must be numbers")
+        if array.ndim != 1:
+            raise ValueError("Embedding must be one-dimensional")
+
+        dtype = np.dtype(self.dtype)
+        # Any byte order of the target type is kept as is, so vectors read from pgvector's format are not copied
+        if array.dtype.newbyteorder("=") != dtype.newbyteorder("="):
+            array = array.astype(dtype)
+        if not np.isfinite(array).all():
+            raise ValueError("All values must be finite numbers")
+
+        # A read-only view: neither this value object nor the caller's array can change the other
+        array = np.ascontiguousarray(array).view()
+        array.flags.writeable = False
+        object.__setattr__(self, "values", array)
+
+    @classmethod
+    def from_pgvector_binary(cls, data: bytes) -> "Embedding":
+        """Wrap pgvector's binary representation without copying the values"""
+        dimensions, _ = _PGVECTOR_HEADER.unpack_from(data)
+        return cls(np.frombuffer(data, dtype=_PGVECTOR_DTYPE, count=dimensions, offset=_PGVECTOR_HEADER.size))
+
+    @property
+    def dimensions(self) -> int:
+        return self.values.shape[0]
+
+    @cached_property
+    def norm(self) -> float:
+        return float(np.linalg.norm(self.values))
+
+    def dot(self, other: "Embedding") -> float:
+        if self.dimensions != other.dimensions:
+            raise ValueError("Embeddings must have the same dimension")
+        return float(np.dot(self.values, other.values))
 
     def cosine_similarity(self, other: "Embedding") -> float:
         """Calculate cosine similarity with another embedding"""
-        if len(self.values) != len(other.values):
-            raise ValueError("Embeddings must have the same dimension")
-
-        dot_product = sum(a * b for a, b in zip(self.values, other.values))
-        magnitude_a = math.sqrt(sum(a * a for a in self.values))
-        magnitude_b = math.sqrt(sum(b * b for b in other.values))
-
-        if magnitude_a == 0 or magnitude_b == 0:
+        dot_product = self.dot(other)
+        if self.norm == 0 or other.norm == 0:
             return 0.0
 
-        return dot_product / (magnitude_a * magnitude_b)
+        return dot_product / (self.norm * other.norm)
 
     def to_list(self) -> list[float]:
         """Convert to list for database compatibility"""
-        return self.values.copy()
+        return self.values.tolist()
+
+    def to_numpy(self) -> np.ndarray:
+        """The underlying read-only array, without copying"""
+        return self.values
+
+    def to_pgvector_binary(self) -> bytearray:
+        """pgvector's binary representation, with the values converted straight into the output buffer"""
+        buffer = bytearray(_PGVECTOR_HEADER.size + self.dimensions * _PGVECTOR_DTYPE.itemsize)
+        _PGVECTOR_HEADER.pack_into(buffer, 0, self.dimensions, 0)
+        np.frombuffer(buffer, dtype=_PGVECTOR_DTYPE, offset=_PGVECTOR_HEADER.size)[:] = self.values
+        return buffer
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Embedding):
+            return NotImplemented
+        return np.array_equal(self.values, other.values)
+
+    def __hash__(self) -> int:
+        return hash(self.values.astype(_PGVECTOR_DTYPE, copy=False).tobytes())
+
+    def __len__(self) -> int:
+        return self.dimensions
 
 
 @dataclass(frozen=True)
@@ -56,6 +118,9 @@ class DocumentTitle:
         return self.value
 
 
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+
+
 @dataclass(frozen=True)
 class SearchQuery:
     """Value Object for search queries"""
@@ -63,6 +128,10 @@ class SearchQuery:
     text: str
     limit: int = 5
     min_similarity: float = 0.0
+    ef_search: Optional[int] = None  # HNSW candidate list size (higher = better recall, slower)
+    probes: Optional[int] = None  # IVFFlat lists visited (higher = better recall, slower)
+    mode: str = "vector"  # "vector", "lexical" (full-text only, no embedding) or "hybrid" (both, fused)
+    collapse_duplicates: bool = False  # fold near-duplicate results into the best-ranked one
 
     def __post_init__(self):
         if not self.text.strip():
@@ -71,6 +140,12 @@ class SearchQuery:
             raise SearchQueryInvalidException("Limit must be greater than 0")
         if not 0 <= self.min_similarity <= 1:
             raise SearchQueryInvalidException("Minimum similarity must be between 0 and 1")
+        if self.ef_search is not None and not 1 <= self.ef_search <= 1000:
+            raise SearchQueryInvalidException("ef_search must be between 1 and 1000")
+        if self.probes is not None and self.probes < 1:
+            raise SearchQueryInvalidException("Probes must be greater than 0")
+        if self.mode not in SEARCH_MODES:
+            raise SearchQueryInvalidException(f"Search mode must be one of: {', '.join(SEARCH_MODES)}")
 
     def __str__(self) -> str:
         return self.text
@@ -0,0 +1,270 @@
+"""Stream NDJSON documents through split -> embed -> COPY on a bounded pool of batch workers"""
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Optional
+
+from src.application.bulk_ingest import BulkRecord
+
+logger = logging.getLogger(__name__)
+
+# Rejections kept in the report; the count is always exact
+MAX_REPORTED_REJECTIONS = 100
+
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Re-split a stream of arbitrary byte chunks (e.g. an HTTP body) into lines, holding at most one partial line
+
+    Only the bytes of each new chunk are scanned for newlines, so a line arriving in many chunks costs linear time.
+    """
+    pending = bytearray()
+    for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end != -1:
+            if pending:
+                pending += chunk[start:end]
+                yield bytes(pending)
+                pending.clear()
+            else:
+                yield chunk[start:end]
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        pending += chunk[start:]
+    if pending:
+        yield bytes(pending)
+
+
+def parse_line_range(value: str) -> tuple[int, int]:
+    """`first-last` (as in `committed_ranges` of a report) as a pair of line numbers"""
+    first, separator, last = value.partition("-")
+    if not separator or not first.isdigit() or not last.isdigit() or int(first) > int(last):
+        raise ValueError(f"Expected a line range like 101-132, got {value!r}")
+    return int(first), int(last)
+
+
+def parse_ndjson(
+    lines: Iterable[bytes | str], skip: int = 0, skip_ranges: Sequence[tuple[int, int]] = ()
+) -> Iterator[BulkRecord]:
+    """Lazily read `{"title": ..., "text": ...}` objects, one per line, after skipping the first `skip` lines
+
+    Lines inside `skip_ranges` (inclusive, as in `committed_ranges` of a failed run) are skipped too. Blank lines are
+    ignored; malformed lines become records carrying an `error` so they are reported, not fatal.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if line_number <= skip or not line.strip():
+            continue
+        if any(first <= line_number <= last for first, last in skip_ranges):
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield BulkRecord(line=line_number, error=f"Invalid JSON: {exc.msg}")
+            continue
+        title = payload.get("title") if isinstance(payload, dict) else None
+        text = payload.get("text") if isinstance(payload, dict) else None
+        if not isinstance(title, str) or not isinstance(text, str):
+            yield BulkRecord(line=line_number, error="Expected an object with string 'title' and 'text' fields")
+            continue
+        yield BulkRecord(line=line_number, title=title, text=text)
+
+
+@dataclass
+class StageThroughput:
+    items: int = 0
+    seconds: float = 0.0
+
+    def add(self, items: int, seconds: float) -> None:
+        self.items += items
+        self.seconds += seconds
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "items": self.items,
+            "seconds": self.seconds,
+            "items_per_second": self.items / self.seconds if self.seconds else 0.0,
+        }
+
+
+class BulkIngestReport:
+    """Progress of one bulk ingest
+
+    `lines_committed` is the resume point: every document up to that input line is stored. Batches that were already
+    running when another one failed may still be stored after it; their line ranges are in `committed_ranges`, so a
+    failed run is continued by skipping `lines_committed` lines and those ranges. Stage seconds are summed over the
+    workers, so each stage's rate is the throughput of one worker; the top-level rates are wall clock.
+    """
+
+    def __init__(self, start_line: int = 0, committed_ranges: Sequence[tuple[int, int]] = ()):
+        self.started_at = time.perf_counter()
+        self.documents = 0
+        self.chunks = 0
+        self.reused_chunks = 0
+        self.duplicate_chunks = 0
+        self.rejected_count = 0
+        self.rejected: list[dict[str, Any]] = []
+        self.lines_committed = start_line
+        self.committed_ranges = list(committed_ranges)
+        self.error: Optional[str] = None
+        self.stages = {name: StageThroughput() for name in ("read", "split", "embed", "write")}
+
+    def add_batch(self, result: dict[str, Any]) -> None:
+        self.documents += result["documents"]
+        self.chunks += result["chunks"]
+        self.reused_chunks += result["reused_chunks"]
+        self.duplicate_chunks += result["duplicate_chunks"]
+        self.rejected_count += len(result["rejected"])
+        self.rejected.extend(result["rejected"][: MAX_REPORTED_REJECTIONS - len(self.rejected)])
+        self.stages["split"].add(result["documents"], result["stage_seconds"]["split"])
+        self.stages["embed"].add(result["chunks"], result["stage_seconds"]["embed"])
+        self.stages["write"].add(result["chunks"], result["stage_seconds"]["write"])
+
+    def to_dict(self) -> dict[str, Any]:
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "completed": self.error is None,
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "reused_chunks": self.reused_chunks,
+            "duplicate_chunks": self.duplicate_chunks,
+            "dedup_ratio": self.duplicate_chunks / self.chunks if self.chunks else 0.0,
+            "rejected_count": self.rejected_count,
+            "rejected": self.rejected,
+            "lines_committed": self.lines_committed,
+            "committed_ranges": [f"{first}-{last}" for first, last in self.committed_ranges],
+            "elapsed_seconds": elapsed,
+            "documents_per_second": self.documents / elapsed if elapsed else 0.0,
+            "chunks_per_second": self.chunks / elapsed if elapsed else 0.0,
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "error": self.error,
+        }
+
+
+class CommitTracker:
+    """Turns batches finishing out of order into a contiguous resume point and the stored ranges past it"""
+
+    def __init__(self, start_line: int = 0, committed_ranges: Sequence[tuple[int, int]] = ()):
+        self.lines_committed = start_line
+        self._next_batch = 0
+        self._finished: dict[int, tuple[int, int]] = {}
+        # Ranges stored by an earlier run, skipped by this one
+        self._resumed = list(committed_ranges)
+
+    @property
+    def committed_ranges(self) -> list[tuple[int, int]]:
+        """Line ranges stored past `lines_committed`, in input order"""
+        ranges = [*self._resumed, *self._finished.values()]
+        return sorted((first, last) for first, last in ranges if last > self.lines_committed)
+
+    def finish(self, batch_number: int, first_line: int, last_line: int) -> bool:
+        """Record a stored batch; True when the resume point moved forward"""
+        self._finished[batch_number] = (first_line, last_line)
+        advanced = False
+        while self._next_batch in self._finished:
+            self.lines_committed = self._finished.pop(self._next_batch)[1]
+            self._next_batch += 1
+            advanced = True
+        return advanced
+
+
+class BulkIngestPipeline:
+    """Reads records on the calling thread and ingests them in batches on `workers` threads
+
+    At most `max_pending_batches` batches are read but not yet stored: reading blocks until a worker frees a slot,
+    so memory stays bounded by batch size x pending batches whatever the size of the input. After a failed batch no
+    more batches are started, including those already queued; the report carries the error and the resume point.
+    """
+
+    def __init__(
+        self,
+        ingest_batch: Callable[[list[BulkRecord]], dict[str, Any]],
+        batch_size: int = 32,
+        workers: int = 4,
+        max_pending_batches: Optional[int] = None,
+    ):
+        self.ingest_batch = ingest_batch
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_pending_batches = max_pending_batches or 2 * workers
+
+    def run(
+        self,
+        records: Iterable[BulkRecord],
+        start_line: int = 0,
+        on_commit: Optional[Callable[[BulkIngestReport], None]] = None,
+        committed_ranges: Sequence[tuple[int, int]] = (),
+    ) -> BulkIngestReport:
+        """Ingest `records`, which skip the first `start_line` lines and the `committed_ranges` of an earlier run
+
+        `on_commit` is called after every stored batch, with the report's resume point and ranges up to date.
+        """
+        report = BulkIngestReport(start_line, committed_ranges)
+        tracker = CommitTracker(start_line, committed_ranges)
+        lock = threading.Lock()
+        slots = threading.BoundedSemaphore(self.max_pending_batches)
+        failed = threading.Event()
+
+        def ingest(batch: list[BulkRecord]) -> Optional[dict[str, Any]]:
+            # A batch queued before another one failed is dropped rather than stored past the resume point
+            return None if failed.is_set() else self.ingest_batch(batch)
+
+        def batch_done(batch_number: int, first_line: int, last_line: int, future: Future) -> None:
+            try:
+                result = future.result()
+            except Exception as exc:
+                logger.error(f"Bulk ingest batch ending at line {last_line} failed: {exc!s}")
+                with lock:
+                    report.error = report.error or str(exc)
+                failed.set()
+                return
+            else:
+                if result is None:
+                    return
+                with lock:
+                    report.add_batch(result)
+                    tracker.finish(batch_number, first_line, last_line)
+                    report.lines_committed = tracker.lines_committed
+                    report.committed_ranges = tracker.committed_ranges
+                    if on_commit:
+                        on_commit(report)
+            finally:
+                # Released last, so the reader sees a failure before it can start another batch
+                slots.release()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk-ingest") as executor:
+            try:
+                for batch_number, batch in enumerate(self._batches(records, report)):
+                    slots.acquire()
+                    if failed.is_set():
+                        slots.release()
+                        break
+                    future = executor.submit(ingest, batch)
+                    future.add_done_callback(partial(batch_done, batch_number, batch[0].line, batch[-1].line))
+            except Exception as exc:
+                # The input itself failed (client disconnected, unreadable file); batches already read still finish
+                logger.error(f"Bulk ingest input failed: {exc!s}")
+                with lock:
+                    report.error = report.error or f"Input error: {exc!s}"
+        return report
+
+    def _batches(self, records: Iterable[BulkRecord], report: BulkIngestReport) -> Iterator[list[BulkRecord]]:
+        batch: list[BulkRecord] = []
+        iterator = iter(records)
+        while True:
+            started = time.perf_counter()
+            record = next(iterator, None)
+            report.stages["read"].add(int(record is not None), time.perf_counter() - started)
+            if record is None:
+                break
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
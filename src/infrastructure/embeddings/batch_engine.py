@@ -0,0 +1,240 @@
+"""Split embedding inputs into provider-sized requests, send them concurrently with retries, reassemble in order"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+import openai
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Throttling, timeouts and transient server errors; anything else (bad input, auth) fails fast
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+
+
+def approximate_token_count(text: str) -> int:
+    """Conservative token estimate (~3 characters per token) that needs no model-specific tokenizer"""
+    return max(1, math.ceil(len(text) / 3))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status_code = getattr(exc, "status_code", None)
+    if isinstance(status_code, int) and status_code > 0:
+        return status_code in RETRYABLE_STATUS_CODES
+    return isinstance(exc, (openai.APIConnectionError, httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def plan_batches(
+    texts: list[str], max_inputs: int, max_tokens: int, count_tokens: Callable[[str], int] = approximate_token_count
+) -> list[list[int]]:
+    """Greedy, order-preserving split into index batches within both the input and the token budget
+
+    An input larger than the whole token budget gets a batch of its own, so the provider decides how to handle it.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        tokens = count_tokens(text)
+        if current and (len(current) >= max_inputs or current_tokens + tokens > max_tokens):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, exc: BaseException) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After when it sends one"""
+        retry_after = _retry_after_seconds(exc)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def _retry_after_seconds(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class BatchLimits:
+    max_inputs: int = 64
+    max_tokens: int = 250_000
+    max_concurrency: int = 4
+
+    @classmethod
+    def from_settings(cls) -> "BatchLimits":
+        return cls(
+            max_inputs=settings.embedding_request_max_inputs,
+            max_tokens=settings.embedding_request_max_tokens,
+            max_concurrency=settings.embedding_request_concurrency,
+        )
+
+    @classmethod
+    def for_queries(cls) -> "BatchLimits":
+        return replace(cls.from_settings(), max_concurrency=settings.embedding_query_concurrency)
+
+
+def _retry_policy_from_settings() -> RetryPolicy:
+    return RetryPolicy(
+        max_attempts=settings.embedding_retry_attempts,
+        base_delay=settings.embedding_retry_base_delay,
+        max_delay=settings.embedding_retry_max_delay,
+    )
+
+
+class EmbeddingBatchEngine:
+    """Thread-pool engine; the pool size bounds concurrent provider requests across all ingests of the process"""
+
+    def __init__(
+        self,
+        limits: Optional[BatchLimits] = None,
+        retry: Optional[RetryPolicy] = None,
+        count_tokens: Callable[[str], int] = approximate_token_count,
+        thread_name_prefix: str = "embed-request",
+    ):
+        self.limits = limits or BatchLimits.from_settings()
+        self.retry = retry or _retry_policy_from_settings()
+        self.count_tokens = count_tokens
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.limits.max_concurrency, thread_name_prefix=thread_name_prefix
+        )
+
+    def run(self, texts: list[str], embed_batch: Callable[[list[str]], list[list[float]]]) -> list[list[float]]:
+        if not texts:
+            return []
+        batches = plan_batches(texts, self.limits.max_inputs, self.limits.max_tokens, self.count_tokens)
+        futures = [
+            self._executor.submit(self._send_with_retry, [texts[i] for i in batch], embed_batch) for batch in batches
+        ]
+        return _reassemble(len(texts), batches, [future.result() for future in futures])
+
+    def _send_with_retry(
+        self, texts: list[str], embed_batch: Callable[[list[str]], list[list[float]]]
+    ) -> list[list[float]]:
+        attempt = 0
+        while True:
+            try:
+                return _checked(texts, embed_batch(texts))
+            except Exception as exc:
+                attempt += 1
+                if attempt >= self.retry.max_attempts or not is_retryable(exc):
+                    raise
+                delay = self.retry.delay(attempt - 1, exc)
+                logger.warning(f"Embedding request failed ({exc!s}), retry {attempt} in {delay:.2f}s")
+                time.sleep(delay)
+
+
+class AsyncEmbeddingBatchEngine:
+    """Event-loop engine; a semaphore bounds concurrent provider requests across all ingests on an event loop"""
+
+    def __init__(
+        self,
+        limits: Optional[BatchLimits] = None,
+        retry: Optional[RetryPolicy] = None,
+        count_tokens: Callable[[str], int] = approximate_token_count,
+    ):
+        self.limits = limits or BatchLimits.from_settings()
+        self.retry = retry or _retry_policy_from_settings()
+        self.count_tokens = count_tokens
+        # A semaphore binds to the loop it is first awaited on, and the process-wide engine outlives loops (tests,
+        # CLI runs calling asyncio.run repeatedly), so each running loop gets its own
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def run(
+        self, texts: list[str], embed_batch: Callable[[list[str]], Awaitable[list[list[float]]]]
+    ) -> list[list[float]]:
+        if not texts:
+            return []
+        batches = plan_batches(texts, self.limits.max_inputs, self.limits.max_tokens, self.count_tokens)
+        results = await asyncio.gather(
+            *(self._send_with_retry([texts[i] for i in batch], embed_batch) for batch in batches)
+        )
+        return _reassemble(len(texts), batches, results)
+
+    async def _send_with_retry(
+        self, texts: list[str], embed_batch: Callable[[list[str]], Awaitable[list[list[float]]]]
+    ) -> list[list[float]]:
+        attempt = 0
+        while True:
+            try:
+                # Hold a slot only while the request is in flight, not while backing off
+                async with self._semaphore():
+                    return _checked(texts, await embed_batch(texts))
+            except Exception as exc:
+                attempt += 1
+                if attempt >= self.retry.max_attempts or not is_retryable(exc):
+                    raise
+                delay = self.retry.delay(attempt - 1, exc)
+                logger.warning(f"Embedding request failed ({exc!s}), retry {attempt} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limits.max_concurrency)
+        return semaphore
+
+
+def _checked(texts: list[str], embeddings: list[list[float]]) -> list[list[float]]:
+    if len(embeddings) != len(texts):
+        raise ValueError(f"Embedding backend returned {len(embeddings)} vectors for {len(texts)} inputs")
+    return embeddings
+
+
+def _reassemble(total: int, batches: list[list[int]], results: list[list[list[float]]]) -> list[list[float]]:
+    ordered: list[list[float]] = [[] for _ in range(total)]
+    for batch, embeddings in zip(batches, results):
+        for index, embedding in zip(batch, embeddings):
+            ordered[index] = embedding
+    return ordered
+
+
+@lru_cache
+def default_batch_engine() -> EmbeddingBatchEngine:
+    # One engine per process, so the concurrency limit holds across generators and requests
+    return EmbeddingBatchEngine()
+
+
+@lru_cache
+def default_async_batch_engine() -> AsyncEmbeddingBatchEngine:
+    return AsyncEmbeddingBatchEngine()
+
+
+@lru_cache
+def default_query_batch_engine() -> EmbeddingBatchEngine:
+    # Separate from the ingest engine, so a large ingest never holds the slots a search needs
+    return EmbeddingBatchEngine(BatchLimits.for_queries(), thread_name_prefix="embed-query")
+
+
+@lru_cache
+def default_async_query_batch_engine() -> AsyncEmbeddingBatchEngine:
+    return AsyncEmbeddingBatchEngine(BatchLimits.for_queries())
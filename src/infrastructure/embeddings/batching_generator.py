@@ -0,0 +1,121 @@
+"""Coalesce concurrent `embed_query` calls into a single `embed_queries` request per short time window"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+
+
+def _embed_by_text(texts: list[str], embeddings: list[list[float]]) -> dict[str, list[float]]:
+    if len(embeddings) != len(texts):
+        raise ValueError(f"Embedding backend returned {len(embeddings)} vectors for {len(texts)} inputs")
+    return dict(zip(texts, embeddings))
+
+
+class MicroBatchingEmbeddingGenerator(EmbeddingGenerator):
+    """Queues query embeddings from request threads; a dispatcher thread sends them as one batch
+
+    A batch is sent when `max_batch_size` queries are waiting or `window_ms` after the first one arrived,
+    so a lone query waits at most one window. Up to `max_in_flight` batches are sent concurrently.
+    """
+
+    def __init__(
+        self,
+        generator: EmbeddingGenerator,
+        window_ms: float = 3.0,
+        max_batch_size: int = 32,
+        max_in_flight: int = 4,
+    ):
+        self.generator = generator
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._queue: queue.SimpleQueue[tuple[str, Future]] = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="embed-batch")
+        self._dispatcher = threading.Thread(target=self._dispatch, name="embed-batcher", daemon=True)
+        self._dispatcher.start()
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return self.generator.embed(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def _dispatch(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._send, batch)
+
+    def _send(self, batch: list[tuple[str, Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            by_text = _embed_by_text(texts, self.generator.embed_queries(texts))
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+
+class AsyncMicroBatchingEmbeddingGenerator(AsyncEmbeddingGenerator):
+    """Event-loop counterpart of MicroBatchingEmbeddingGenerator; batches are flushed by a loop timer"""
+
+    def __init__(self, generator: AsyncEmbeddingGenerator, window_ms: float = 3.0, max_batch_size: int = 32):
+        self.generator = generator
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._in_flight: set[asyncio.Task] = set()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await self.generator.embed(texts)
+
+    async def embed_query(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Keep a reference so the task is not garbage collected mid-flight
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            by_text = _embed_by_text(texts, await self.generator.embed_queries(texts))
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for text, future in batch:
+            # A caller may have been cancelled (client disconnected) while the batch was in flight
+            if not future.done():
+                future.set_result(by_text[text])
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import unicodedata
+from typing import Optional
+
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+
+from .query_cache import QueryEmbeddingCache, SharedEmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form of a query: Unicode NFC with whitespace runs collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str) -> str:
+    return f"{model}\x00{normalize_query(text)}"
+
+
+class CachingEmbeddingGenerator(EmbeddingGenerator):
+    """Decorator that serves repeated `embed_query` calls from cache; document embeddings pass straight through"""
+
+    def __init__(
+        self,
+        generator: EmbeddingGenerator,
+        model: str,
+        cache: QueryEmbeddingCache,
+        shared_cache: Optional[SharedEmbeddingCache] = None,
+    ):
+        self.generator = generator
+        self.model = model
+        self.cache = cache
+        self.shared_cache = shared_cache
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return self.generator.embed(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        key = cache_key(self.model, text)
+        embedding = self.cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = self._get_shared(key)
+        if embedding is None:
+            embedding = self.generator.embed_query(normalize_query(text))
+            self._set_shared(key, embedding)
+        self.cache.set(key, embedding)
+        return embedding
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys = [cache_key(self.model, text) for text in texts]
+        embeddings: dict[str, list[float]] = {}
+        # Only entries missing from the local cache are written back: re-setting a hit would push its TTL forward
+        local_misses: list[str] = []
+        for key in dict.fromkeys(keys):
+            embedding = self.cache.get(key)
+            if embedding is None:
+                local_misses.append(key)
+                embedding = self._get_shared(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+
+        # The misses of the whole batch go to the provider in one call
+        misses = {key: normalize_query(text) for key, text in zip(keys, texts) if key not in embeddings}
+        fresh = self.generator.embed_queries(list(misses.values())) if misses else []
+        for key, embedding in zip(misses, fresh):
+            self._set_shared(key, embedding)
+            embeddings[key] = embedding
+        for key in local_misses:
+            self.cache.set(key, embeddings[key])
+        return [embeddings[key] for key in keys]
+
+    def _get_shared(self, key: str) -> Optional[list[float]]:
+        if self.shared_cache is None:
+            return None
+        try:
+            embedding = self.shared_cache.get(key)
+        except Exception as exc:
+            # The shared cache is an optimisation; never fail a search because it is down
+            logger.warning(f"Shared embedding cache unavailable: {exc!s}")
+            return None
+        if embedding is not None:
+            self.cache.record_shared_hit()
+        return embedding
+
+    def _set_shared(self, key: str, embedding: list[float]) -> None:
+        if self.shared_cache is None:
+            return
+        try:
+            self.shared_cache.set(key, embedding)
+        except Exception as exc:
+            logger.warning(f"Shared embedding cache unavailable: {exc!s}")
+
+
+class AsyncCachingEmbeddingGenerator(AsyncEmbeddingGenerator):
+    """Async counterpart of CachingEmbeddingGenerator; shared-cache I/O runs in a worker thread"""
+
+    def __init__(
+        self,
+        generator: AsyncEmbeddingGenerator,
+        model: str,
+        cache: QueryEmbeddingCache,
+        shared_cache: Optional[SharedEmbeddingCache] = None,
+    ):
+        self.generator = generator
+        self.model = model
+        self.cache = cache
+        self.shared_cache = shared_cache
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await self.generator.embed(texts)
+
+    async def embed_query(self, text: str) -> list[float]:
+        key = cache_key(self.model, text)
+        embedding = self.cache.get(key)
+        if embedding is not None:
+            return embedding
+
+        embedding = await self._get_shared(key)
+        if embedding is None:
+            embedding = await self.generator.embed_query(normalize_query(text))
+            await self._set_shared(key, embedding)
+        self.cache.set(key, embedding)
+        return embedding
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        keys = [cache_key(self.model, text) for text in texts]
+        embeddings: dict[str, list[float]] = {}
+        # Only entries missing from the local cache are written back: re-setting a hit would push its TTL forward
+        local_misses: list[str] = []
+        for key in dict.fromkeys(keys):
+            embedding = self.cache.get(key)
+            if embedding is None:
+                local_misses.append(key)
+                embedding = await self._get_shared(key)
+            if embedding is not None:
+                embeddings[key] = embedding
+
+        misses = {key: normalize_query(text) for key, text in zip(keys, texts) if key not in embeddings}
+        fresh = await self.generator.embed_queries(list(misses.values())) if misses else []
+        for key, embedding in zip(misses, fresh):
+            await self._set_shared(key, embedding)
+            embeddings[key] = embedding
+        for key in local_misses:
+            self.cache.set(key, embeddings[key])
+        return [embeddings[key] for key in keys]
+
+    async def _get_shared(self, key: str) -> Optional[list[float]]:
+        if self.shared_cache is None:
+            return None
+        try:
+            embedding = await asyncio.to_thread(self.shared_cache.get, key)
+        except Exception as exc:
+            logger.warning(f"Shared embedding cache unavailable: {exc!s}")
+            return None
+        if embedding is not None:
+            self.cache.record_shared_hit()
+        return embedding
+
+    async def _set_shared(self, key: str, embedding: list[float]) -> None:
+        if self.shared_cache is None:
+            return
+        try:
+            await asyncio.to_thread(self.shared_cache.set, key, embedding)
+        except Exception as exc:
+            logger.warning(f"Shared embedding cache unavailable: {exc!s}")
@@ -2,7 +2,7 @@ import hashlib
 
 import numpy as np
 
-from src.domain.embeddings import EmbeddingGenerator
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
 
 
 class MockEmbeddingGenerator(EmbeddingGenerator):
@@ -27,3 +27,14 @@ class MockEmbeddingGenerator(EmbeddingGenerator):
         vec = rng.standard_normal(self.dims)
         norm = np.linalg.norm(vec) or 1.0
         return (vec / norm).astype(float).tolist()
+
+
+class AsyncMockEmbeddingGenerator(AsyncEmbeddingGenerator):
+    def __init__(self, dims: int = 3072):
+        self.generator = MockEmbeddingGenerator(dims=dims)
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return self.generator.embed(texts)
+
+    async def embed_query(self, text: str) -> list[float]:
+        return self.generator.embed_query(text)
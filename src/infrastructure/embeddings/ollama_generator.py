@@ -1,17 +1,63 @@
+from typing import Optional
+
 from langchain_ollama.embeddings import OllamaEmbeddings
 
 from src.config import settings
-from src.domain.embeddings import EmbeddingGenerator
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+
+from .batch_engine import (
+    AsyncEmbeddingBatchEngine,
+    EmbeddingBatchEngine,
+    default_async_batch_engine,
+    default_async_query_batch_engine,
+    default_batch_engine,
+    default_query_batch_engine,
+)
 
 
 class OllamaEmbeddingGenerator(EmbeddingGenerator):
-    def __init__(self, model: str = settings.ollama_model_name, base_url: str = settings.ollama_api_url):
+    def __init__(
+        self,
+        model: str = settings.ollama_model_name,
+        base_url: str = settings.ollama_api_url,
+        batch_engine: Optional[EmbeddingBatchEngine] = None,
+        query_engine: Optional[EmbeddingBatchEngine] = None,
+    ):
         self.model = model
         self.base_url = base_url
         self.client = OllamaEmbeddings(model=self.model, base_url=self.base_url)
+        self.batch_engine = batch_engine or default_batch_engine()
+        self.query_engine = query_engine or default_query_batch_engine()
 
     def embed(self, texts: list[str]) -> list[list[float]]:
-        return self.client.embed_documents(texts)
+        return self.batch_engine.run(texts, self.client.embed_documents)
 
     def embed_query(self, text: str) -> list[float]:
-        return self.client.embed_query(text)
+        return self.query_engine.run([text], self.client.embed_documents)[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return self.query_engine.run(texts, self.client.embed_documents)
+
+
+class AsyncOllamaEmbeddingGenerator(AsyncEmbeddingGenerator):
+    def __init__(
+        self,
+        model: str = settings.ollama_model_name,
+        base_url: str = settings.ollama_api_url,
+        batch_engine: Optional[AsyncEmbeddingBatchEngine] = None,
+        query_engine: Optional[AsyncEmbeddingBatchEngine] = None,
+    ):
+        self.model = model
+        self.base_url = base_url
+        self.client = OllamaEmbeddings(model=self.model, base_url=self.base_url)
+        self.batch_engine = batch_engine or default_async_batch_engine()
+        self.query_engine = query_engine or default_async_query_batch_engine()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await self.batch_engine.run(texts, self.client.aembed_documents)
+
+    async def embed_query(self, text: str) -> list[float]:
+        return (await self.query_engine.run([text], self.client.aembed_documents))[0]
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return await self.query_engine.run(texts, self.client.aembed_documents)
@@ -1,19 +1,71 @@
 from typing import Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from src.domain.embeddings import EmbeddingGenerator
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+
+from .batch_engine import (
+    AsyncEmbeddingBatchEngine,
+    EmbeddingBatchEngine,
+    default_async_batch_engine,
+    default_async_query_batch_engine,
+    default_batch_engine,
+    default_query_batch_engine,
+)
 
 
 class OpenAIEmbeddingGenerator(EmbeddingGenerator):
-    def __init__(self, api_key: Optional[str] = None, model: str = "text-embedding-3-large"):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "text-embedding-3-large",
+        base_url: Optional[str] = None,
+        batch_engine: Optional[EmbeddingBatchEngine] = None,
+        query_engine: Optional[EmbeddingBatchEngine] = None,
+    ):
+        # Retries are handled by the batch engine, per batch, with jittered backoff
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
         self.model = model
+        self.batch_engine = batch_engine or default_batch_engine()
+        self.query_engine = query_engine or default_query_batch_engine()
 
     def embed(self, texts: list[str]) -> list[list[float]]:
+        return self.batch_engine.run(texts, self._embed_batch)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.query_engine.run([text], self._embed_batch)[0]
+
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return self.query_engine.run(texts, self._embed_batch)
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
         response = self.client.embeddings.create(model=self.model, input=texts)
         return [d.embedding for d in response.data]
 
-    def embed_query(self, text: str) -> list[float]:
-        response = self.client.embeddings.create(model=self.model, input=text)
-        return response.data[0].embedding
+
+class AsyncOpenAIEmbeddingGenerator(AsyncEmbeddingGenerator):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "text-embedding-3-large",
+        base_url: Optional[str] = None,
+        batch_engine: Optional[AsyncEmbeddingBatchEngine] = None,
+        query_engine: Optional[AsyncEmbeddingBatchEngine] = None,
+    ):
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.model = model
+        self.batch_engine = batch_engine or default_async_batch_engine()
+        self.query_engine = query_engine or default_async_query_batch_engine()
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await self.batch_engine.run(texts, self._embed_batch)
+
+    async def embed_query(self, text: str) -> list[float]:
+        return (await self.query_engine.run([text], self._embed_batch))[0]
+
+    async def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        return await self.query_engine.run(texts, self._embed_batch)
+
+    async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        response = await self.client.embeddings.create(model=self.model, input=texts)
+        return [d.embedding for d in response.data]
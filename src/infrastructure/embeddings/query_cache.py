@@ -0,0 +1,105 @@
+"""Caches for query embeddings: a bounded in-process LRU/TTL cache and an optional shared Redis backend"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Optional
+
+
+class SharedEmbeddingCache(ABC):
+    """Cache shared between worker processes, consulted after the in-process cache misses"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[list[float]]: ...
+
+    @abstractmethod
+    def set(self, key: str, embedding: list[float]) -> None: ...
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache with a per-entry time to live, counting hits, misses, evictions and expirations"""
+
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.shared_hits = 0
+
+    def get(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, embedding = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return embedding
+
+    def set(self, key: str, embedding: list[float]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def record_shared_hit(self) -> None:
+        with self._lock:
+            self.shared_hits += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "shared_hits": self.shared_hits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class RedisEmbeddingCache(SharedEmbeddingCache):
+    """Redis-backed cache so every gunicorn worker reuses the same query embeddings (requires the `redis` package)"""
+
+    def __init__(self, url: str, ttl_seconds: float = 3600.0, prefix: str = "query-embedding:"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImportError("RedisEmbeddingCache requires the 'redis' package: pip install redis") from exc
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[list[float]]:
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        return array("d", payload).tolist()
+
+    def set(self, key: str, embedding: list[float]) -> None:
+        # Packed float64 keeps the value bit-identical and ~3x smaller than JSON
+        self.client.set(self.prefix + key, array("d", embedding).tobytes(), px=int(self.ttl_seconds * 1000))
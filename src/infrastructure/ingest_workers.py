@@ -0,0 +1,58 @@
+"""Background threads that drain chunks stored without embeddings"""
+
+import logging
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingWorkerPool:
+    """Runs `embed_batch` in a loop on `workers` threads until it reports no pending work, then idles
+
+    `embed_batch` embeds one batch and returns the number of chunks it updated. Idle workers poll every
+    `poll_interval` seconds (picking up work queued by other processes) and wake immediately on `notify()`.
+    """
+
+    def __init__(self, embed_batch: Callable[[], int], workers: int = 2, poll_interval: float = 1.0):
+        self.embed_batch = embed_batch
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"ingest-worker-{i}", daemon=True) for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Started {self.workers} ingest workers")
+
+    def notify(self) -> None:
+        """New chunks were queued; wake the idle workers"""
+        self._wakeup.set()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = self.embed_batch()
+            except Exception as exc:
+                # Chunks stay pending and are retried on the next poll
+                logger.error(f"Ingest worker batch failed: {exc!s}")
+                processed = 0
+            if processed:
+                continue
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
@@ -0,0 +1,324 @@
+"""In-process cosine-similarity indexes over unit-normalized float32 vectors"""
+
+import heapq
+import math
+import random
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Sequence
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Unit-length float32 rows; zero vectors stay zero and score 0 against everything"""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class _GrowableMatrix:
+    """Row storage whose capacity doubles when full, so appends never copy the whole matrix each time"""
+
+    def __init__(self, dims: int, capacity: int = 1024):
+        self.rows = np.empty((capacity, dims), dtype=np.float32)
+
+    def ensure(self, size: int) -> None:
+        if size > self.rows.shape[0]:
+            grown = np.empty((max(size, 2 * self.rows.shape[0]), self.rows.shape[1]), dtype=np.float32)
+            grown[: self.rows.shape[0]] = self.rows
+            self.rows = grown
+
+
+class VectorIndex(ABC):
+    """Maps chunk ids to vectors and answers top-k cosine-similarity queries"""
+
+    def __init__(self, dims: int):
+        self.dims = dims
+
+    @abstractmethod
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        """Insert vectors, replacing the vector of ids already present"""
+
+    @abstractmethod
+    def remove(self, ids: Iterable[int]) -> None:
+        """Forget ids; unknown ids are ignored"""
+
+    @abstractmethod
+    def search(self, query: np.ndarray, k: int, ef_search: Optional[int] = None) -> list[tuple[int, float]]:
+        """Up to k (id, similarity) pairs, most similar first"""
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    def load(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Bulk-load unit-normalized rows into the empty index (a snapshot); by default they are added in batches"""
+        for start in range(0, len(ids), 1024):
+            self.add(ids[start : start + 1024].tolist(), vectors[start : start + 1024])
+
+
+class BruteForceVectorIndex(VectorIndex):
+    """Exact search: one matrix-vector product over every vector, then an argpartition top-k
+
+    A loaded snapshot stays a read-only base segment (a memory map is never copied, so processes share its pages);
+    later writes go to a growable delta segment, and base rows they replace or remove are masked out.
+    """
+
+    def __init__(self, dims: int):
+        super().__init__(dims)
+        self._base = np.empty((0, dims), dtype=np.float32)
+        self._base_ids = np.empty(0, dtype=np.int64)
+        self._base_live = np.empty(0, dtype=bool)
+        self._base_dead = 0
+        self._matrix = _GrowableMatrix(dims)
+        self._ids: list[int] = []
+        self._positions: dict[int, int] = {}
+
+    def load(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        # Base ids are kept sorted so they are found with a binary search instead of a per-process dict
+        order = np.argsort(ids, kind="stable")
+        sorted_already = bool(np.all(order == np.arange(len(ids))))
+        self._base_ids = np.asarray(ids, dtype=np.int64) if sorted_already else np.asarray(ids, dtype=np.int64)[order]
+        self._base = vectors if sorted_already else vectors[order]
+        self._base_live = np.ones(len(ids), dtype=bool)
+        self._base_dead = 0
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        self._remove_from_base(ids)
+        for chunk_id, vector in zip(ids, normalize_rows(vectors)):
+            position = self._positions.get(chunk_id)
+            if position is None:
+                position = len(self._ids)
+                self._matrix.ensure(position + 1)
+                self._ids.append(chunk_id)
+                self._positions[chunk_id] = position
+            self._matrix.rows[position] = vector
+
+    def remove(self, ids: Iterable[int]) -> None:
+        ids = list(ids)
+        self._remove_from_base(ids)
+        for chunk_id in ids:
+            position = self._positions.pop(chunk_id, None)
+            if position is None:
+                continue
+            # Move the last row into the hole so the live rows stay contiguous
+            last = len(self._ids) - 1
+            if position != last:
+                moved = self._ids[last]
+                self._matrix.rows[position] = self._matrix.rows[last]
+                self._ids[position] = moved
+                self._positions[moved] = position
+            self._ids.pop()
+
+    def _remove_from_base(self, ids: Sequence[int]) -> None:
+        if not len(self._base_ids) or not len(ids):
+            return
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._base_ids, ids), len(self._base_ids) - 1)
+        positions = positions[(self._base_ids[positions] == ids) & self._base_live[positions]]
+        self._base_live[positions] = False
+        self._base_dead += len(positions)
+
+    def search(self, query: np.ndarray, k: int, ef_search: Optional[int] = None) -> list[tuple[int, float]]:
+        if not len(self) or k <= 0:
+            return []
+        query = normalize_rows(query)[0]
+        scores = np.concatenate([self._base @ query, self._matrix.rows[: len(self._ids)] @ query])
+        if self._base_dead:
+            scores[: len(self._base)][~self._base_live] = -np.inf
+        k = min(k, len(self))
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")[:k]
+        base_size = len(self._base)
+        return [(int(self._base_ids[i]) if i < base_size else self._ids[i - base_size], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._base_ids) - self._base_dead + len(self._ids)
+
+
+class HNSWVectorIndex(VectorIndex):
+    """Hierarchical navigable small-world graph (Malkov & Yashunin) for approximate search on large corpora
+
+    Each node links to at most `m` neighbours per layer (2 * m on the bottom layer); `ef_construction` and
+    `ef_search` are the candidate-list sizes used when inserting and querying. Removed nodes are tombstoned: they
+    keep routing searches but are never returned, and the graph is rebuilt once they outnumber the live ones.
+    """
+
+    def __init__(self, dims: int, m: int = 16, ef_construction: int = 100, ef_search: int = 64, seed: int = 0):
+        super().__init__(dims)
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._level_multiplier = 1 / math.log(m)
+        self._random = random.Random(seed)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._matrix = _GrowableMatrix(self.dims)
+        self._ids: list[int] = []
+        self._slots: dict[int, int] = {}
+        self._links: list[list[list[int]]] = []
+        self._deleted: set[int] = set()
+        self._entry: Optional[int] = None
+        self._max_level = -1
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray) -> None:
+        self.remove(chunk_id for chunk_id in ids if chunk_id in self._slots)
+        for chunk_id, vector in zip(ids, normalize_rows(vectors)):
+            self._insert(chunk_id, vector)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        for chunk_id in list(ids):
+            slot = self._slots.pop(chunk_id, None)
+            if slot is not None:
+                self._deleted.add(slot)
+        if self._deleted and len(self._deleted) > len(self._slots):
+            self._rebuild()
+
+    def search(self, query: np.ndarray, k: int, ef_search: Optional[int] = None) -> list[tuple[int, float]]:
+        if self._entry is None or k <= 0 or not self._slots:
+            return []
+        query = normalize_rows(query)[0]
+        entry = self._entry
+        for layer in range(self._max_level, 0, -1):
+            entry = self._greedy(query, entry, layer)
+        # Widen the candidate list by the tombstones so deletions do not starve the result
+        ef = max(ef_search or self.ef_search, k) + min(len(self._deleted), k)
+        found = self._search_layer(query, [entry], ef, 0)
+        live = [(self._ids[slot], similarity) for similarity, slot in found if slot not in self._deleted]
+        return live[:k]
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    # -------- Graph construction ----------
+    def _insert(self, chunk_id: int, vector: np.ndarray) -> None:
+        slot = len(self._ids)
+        self._matrix.ensure(slot + 1)
+        self._matrix.rows[slot] = vector
+        self._ids.append(chunk_id)
+        self._slots[chunk_id] = slot
+        level = int(-math.log(1.0 - self._random.random()) * self._level_multiplier)
+        self._links.append([[] for _ in range(level + 1)])
+
+        if self._entry is None:
+            self._entry, self._max_level = slot, level
+            return
+
+        entry = self._entry
+        for layer in range(self._max_level, level, -1):
+            entry = self._greedy(vector, entry, layer)
+        entries = [entry]
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(vector, entries, self.ef_construction, layer)
+            neighbours = self._select_neighbours(candidates, self.m)
+            self._links[slot][layer] = neighbours
+            for neighbour in neighbours:
+                self._connect(neighbour, slot, layer)
+            entries = [candidate for _, candidate in candidates]
+
+        if level > self._max_level:
+            self._entry, self._max_level = slot, level
+
+    def _connect(self, node: int, neighbour: int, layer: int) -> None:
+        links = self._links[node][layer]
+        links.append(neighbour)
+        limit = 2 * self.m if layer == 0 else self.m
+        if len(links) > limit:
+            similarities = (self._matrix.rows[links] @ self._matrix.rows[node]).tolist()
+            self._links[node][layer] = self._select_neighbours(sorted(zip(similarities, links), reverse=True), limit)
+
+    def _select_neighbours(self, candidates: list[tuple[float, int]], limit: int) -> list[int]:
+        """The paper's heuristic: skip a candidate that is closer to an already selected neighbour than to the node
+
+        Links then spread in different directions instead of clustering, which keeps the graph navigable.
+        `candidates` are (similarity to the node, slot), most similar first.
+        """
+        selected: list[int] = []
+        for similarity, candidate in candidates:
+            if len(selected) >= limit:
+                break
+            if not selected or float((self._matrix.rows[selected] @ self._matrix.rows[candidate]).max()) < similarity:
+                selected.append(candidate)
+        return selected
+
+    def _rebuild(self) -> None:
+        live = sorted(self._slots.items(), key=lambda item: item[1])
+        ids = [chunk_id for chunk_id, _ in live]
+        vectors = self._matrix.rows[[slot for _, slot in live]].copy()
+        self._reset()
+        for chunk_id, vector in zip(ids, vectors):
+            self._insert(chunk_id, vector)
+
+    # -------- Graph search ----------
+    def _greedy(self, query: np.ndarray, entry: int, layer: int) -> int:
+        best, best_similarity = entry, float(self._matrix.rows[entry] @ query)
+        improved = True
+        while improved:
+            improved = False
+            links = self._links[best][layer]
+            if not links:
+                break
+            similarities = self._matrix.rows[links] @ query
+            top = int(np.argmax(similarities))
+            if similarities[top] > best_similarity:
+                best, best_similarity = links[top], float(similarities[top])
+                improved = True
+        return best
+
+    def _search_layer(self, query: np.ndarray, entries: list[int], ef: int, layer: int) -> list[tuple[float, int]]:
+        """Best-first search; returns up to ef (similarity, slot) pairs, most similar first"""
+        visited = set(entries)
+        similarities = self._matrix.rows[entries] @ query
+        candidates = [(-float(s), slot) for s, slot in zip(similarities, entries)]
+        heapq.heapify(candidates)
+        results = [(float(s), slot) for s, slot in zip(similarities, entries)]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+
+        while candidates:
+            negative_similarity, slot = heapq.heappop(candidates)
+            if len(results) >= ef and -negative_similarity < results[0][0]:
+                break
+            if layer >= len(self._links[slot]):
+                continue
+            unvisited = [n for n in self._links[slot][layer] if n not in visited]
+            if not unvisited:
+                continue
+            visited.update(unvisited)
+            # One vectorized product per expanded node instead of one per neighbour
+            for similarity, neighbour in zip((self._matrix.rows[unvisited] @ query).tolist(), unvisited):
+                if len(results) < ef or similarity > results[0][0]:
+                    heapq.heappush(candidates, (-similarity, neighbour))
+                    heapq.heappush(results, (similarity, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+
+def build_vector_index(
+    index_type: str,
+    dims: int,
+    size: int,
+    hnsw_threshold: int,
+    m: int,
+    ef_construction: int,
+    ef_search: int,
+    mapped: bool = False,
+) -> VectorIndex:
+    """Brute force or HNSW; "auto" picks by the number of vectors about to be loaded
+
+    A `mapped` snapshot always gets brute force under "auto": it searches the shared mapping in place, whereas the
+    HNSW graph would be rebuilt one insert at a time in every process's private memory.
+    """
+    if index_type == "auto":
+        index_type = "hnsw" if size > hnsw_threshold and not mapped else "brute"
+    if index_type == "brute":
+        return BruteForceVectorIndex(dims)
+    if index_type == "hnsw":
+        return HNSWVectorIndex(dims, m=m, ef_construction=ef_construction, ef_search=ef_search)
+    raise ValueError(f"Unsupported memory index type: {index_type}")
@@ -0,0 +1,343 @@
+import logging
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import Row, RowMapping, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.infrastructure.postgresql.async_repositories import AsyncPostgresDocumentRepository
+from src.infrastructure.postgresql.repositories import DocumentChunkORM, DocumentORM, PostgresDocumentRepository
+
+from .snapshot import EmbeddingSnapshot, latest_snapshot, open_snapshot, write_snapshot
+from .store import MemoryVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+def embedded_chunks_statement(
+    chunk_ids: Optional[list[int]] = None,
+    document_ids: Optional[list[int]] = None,
+    changed_after: Optional[int] = None,
+) -> Select:
+    """(id, embedding) of embedded chunks, optionally restricted to some chunks, documents or recent changes"""
+    statement = select(DocumentChunkORM.id, DocumentChunkORM.embedding).where(DocumentChunkORM.embedding.is_not(None))
+    if chunk_ids is not None:
+        statement = statement.where(DocumentChunkORM.id.in_(chunk_ids))
+    if document_ids is not None:
+        statement = statement.where(DocumentChunkORM.document_id.in_(document_ids))
+    if changed_after is not None:
+        statement = statement.where(DocumentChunkORM.change_seq > changed_after)
+    return statement
+
+
+def binary_embeddings_statement() -> Select:
+    """Every embedded chunk in id order, embeddings in pgvector's binary format (no text parsing on either side)"""
+    return (
+        select(DocumentChunkORM.id, func.vector_send(DocumentChunkORM.embedding).label("embedding"))
+        .where(DocumentChunkORM.embedding.is_not(None))
+        .order_by(DocumentChunkORM.id)
+    )
+
+
+def embedding_batches(
+    rows: Iterable[Row], dims: int, batch_size: int = 4096
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """(ids, float32 matrix) batches from (id, vector_send bytea) rows"""
+    ids: list[int] = []
+    buffers: list[bytes] = []
+    for row in rows:
+        ids.append(row.id)
+        buffers.append(bytes(row.embedding))
+        if len(ids) >= batch_size:
+            yield _embedding_batch(ids, buffers, dims)
+            ids, buffers = [], []
+    if ids:
+        yield _embedding_batch(ids, buffers, dims)
+
+
+def _embedding_batch(ids: list[int], buffers: list[bytes], dims: int) -> tuple[np.ndarray, np.ndarray]:
+    # Each value is a 4-byte header (dimensions, unused) followed by big-endian float4s: viewed as one more float,
+    # the concatenation is a (rows, dims + 1) matrix whose first column is dropped
+    matrix = np.frombuffer(b"".join(buffers), dtype=">f4").reshape(len(ids), dims + 1)[:, 1:]
+    return np.asarray(ids, dtype=np.int64), matrix.astype(np.float32)
+
+
+def search_rows_statement(chunk_ids: list[int]) -> Select:
+    return (
+        select(DocumentChunkORM.id, DocumentChunkORM.document_id, DocumentChunkORM.content, DocumentORM.title)
+        .join(DocumentORM, DocumentORM.id == DocumentChunkORM.document_id)
+        .where(DocumentChunkORM.id.in_(chunk_ids))
+    )
+
+
+def search_rows(hits: list[tuple[int, float]], rows: Sequence[RowMapping]) -> list[dict]:
+    """Rows shaped like the pgvector search, in hit order; chunks deleted by another process are dropped"""
+    by_id = {row["id"]: row for row in rows}
+    return [{**by_id[chunk_id], "similarity": similarity} for chunk_id, similarity in hits if chunk_id in by_id]
+
+
+def export_snapshot(session: Session, directory: Path, dims: int) -> Path:
+    """Write every embedded chunk to a new snapshot version, read from one consistent database snapshot
+
+    A write still in flight during the export may have drawn a change_seq below the recorded high-water mark; the
+    process that made it indexes it itself, and the next export picks it up.
+    """
+    session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    count, high_water_mark = session.execute(
+        select(func.count(), func.coalesce(func.max(DocumentChunkORM.change_seq), 0)).where(
+            DocumentChunkORM.embedding.is_not(None)
+        )
+    ).one()
+    rows = session.execute(binary_embeddings_statement().execution_options(yield_per=4096))
+    path = write_snapshot(directory, embedding_batches(rows, dims), count, dims, high_water_mark)
+    session.commit()
+    logger.info(f"Exported {count} chunk embeddings to {path} (high-water mark {high_water_mark})")
+    return path
+
+
+def load_vector_store(
+    store: MemoryVectorStore, session: Session, dims: int, snapshot_dir: Optional[str] = None
+) -> None:
+    """Load the newest snapshot in `snapshot_dir` and catch up from Postgres, or stream everything from Postgres"""
+    path = latest_snapshot(Path(snapshot_dir)) if snapshot_dir else None
+    if path is None:
+        size = session.scalar(
+            select(func.count()).select_from(DocumentChunkORM).where(DocumentChunkORM.embedding.is_not(None))
+        )
+        rows = session.execute(binary_embeddings_statement().execution_options(yield_per=4096))
+        store.load(
+            (
+                (chunk_id, vector)
+                for ids, vectors in embedding_batches(rows, dims)
+                for chunk_id, vector in zip(ids.tolist(), vectors)
+            ),
+            dims,
+            size,
+        )
+        session.commit()
+        return
+
+    snapshot = open_snapshot(path)
+    if snapshot.dims != dims:
+        raise ValueError(f"Snapshot {path} has {snapshot.dims} dimensions, expected {dims}")
+    store.load_snapshot(snapshot)
+    catch_up(store, session, snapshot)
+
+
+def catch_up(store: MemoryVectorStore, session: Session, snapshot: EmbeddingSnapshot) -> None:
+    """Apply what changed in Postgres since the snapshot was exported"""
+    # Deletes leave no row behind, so compare ids (an index-only scan) instead of embeddings
+    live = np.fromiter(
+        session.scalars(select(DocumentChunkORM.id).where(DocumentChunkORM.embedding.is_not(None))), dtype=np.int64
+    )
+    removed = np.setdiff1d(snapshot.ids, live, assume_unique=True)
+    store.remove(removed.tolist())
+    changed = session.execute(embedded_chunks_statement(changed_after=snapshot.high_water_mark)).all()
+    store.upsert([row.id for row in changed], [row.embedding for row in changed])
+    session.commit()
+    logger.info(
+        f"Caught up snapshot v{snapshot.version}: {len(changed)} chunks changed, {len(removed)} removed since it"
+    )
+
+
+class MemoryIndexedDocumentRepository(PostgresDocumentRepository):
+    """Postgres repository whose search_similar is answered by an in-process index
+
+    Writes go to Postgres first; the embeddings they touch are then read back and applied to the store, so searches
+    in this process see them immediately. Until the store is loaded, searches go to pgvector.
+    """
+
+    def __init__(self, session: Session, store: MemoryVectorStore):
+        super().__init__(session)
+        self.store = store
+
+    def _refresh(self, chunk_ids: Optional[list[int]] = None, document_ids: Optional[list[int]] = None) -> None:
+        if not self.store.loaded or not (chunk_ids or document_ids):
+            return
+        rows = self.db.execute(embedded_chunks_statement(chunk_ids, document_ids)).all()
+        self.db.commit()
+        self.store.upsert([row.id for row in rows], [row.embedding for row in rows])
+
+    def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        saved = super().save_chunk(chunk)
+        self._refresh(chunk_ids=[saved.id])
+        return saved
+
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        saved = super().save_chunks(chunks)
+        self._refresh(chunk_ids=[chunk.id for chunk in saved])
+        return saved
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        saved_document, saved_chunks = super().save_document_with_chunks(doc, chunks)
+        self._refresh(document_ids=[saved_document.id])
+        return saved_document, saved_chunks
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        saved_document, saved_chunks = super().update_document_with_chunks(doc, diff)
+        self.store.remove([chunk.id for chunk in diff.removed])
+        self._refresh(chunk_ids=[chunk.id for chunk in saved_chunks])
+        return saved_document, saved_chunks
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        saved = super().save_documents_with_chunks(documents)
+        self._refresh(document_ids=[document.id for document in saved])
+        return saved
+
+    def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        updated = super().update_chunk_embedding(chunk_id, embedding)
+        self._refresh(chunk_ids=[chunk_id])
+        return updated
+
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        updated = super().update_chunk_embeddings(embeddings)
+        self._refresh(chunk_ids=list(embeddings))
+        return updated
+
+    def delete_chunk(self, chunk_id: int) -> bool:
+        deleted = super().delete_chunk(chunk_id)
+        if deleted:
+            self.store.remove([chunk_id])
+        return deleted
+
+    def delete_document(self, doc_id: int) -> bool:
+        chunk_ids = self.db.scalars(select(DocumentChunkORM.id).where(DocumentChunkORM.document_id == doc_id)).all()
+        deleted = super().delete_document(doc_id)
+        if deleted:
+            self.store.remove(chunk_ids)
+        return deleted
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.3,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        if not self.store.loaded:
+            return super().search_similar(query_embedding, limit, min_similarity, ef_search, probes)
+        hits = self.store.search(query_embedding, limit, min_similarity, ef_search)
+        if not hits:
+            return []
+        rows = self.db.execute(search_rows_statement([chunk_id for chunk_id, _ in hits])).mappings().all()
+        return search_rows(hits, rows)
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        if not self.store.loaded:
+            return super().search_similar_batch(query_embeddings, limits, min_similarities, ef_search, probes)
+        hits = self.store.search_batch(query_embeddings, limits, min_similarities, ef_search)
+        chunk_ids = sorted({chunk_id for query_hits in hits for chunk_id, _ in query_hits})
+        if not chunk_ids:
+            return [[] for _ in hits]
+        rows = self.db.execute(search_rows_statement(chunk_ids)).mappings().all()
+        return [search_rows(query_hits, rows) for query_hits in hits]
+
+
+class AsyncMemoryIndexedDocumentRepository(AsyncPostgresDocumentRepository):
+    """Async counterpart of MemoryIndexedDocumentRepository; the in-memory search itself runs inline"""
+
+    def __init__(self, session: AsyncSession, store: MemoryVectorStore):
+        super().__init__(session)
+        self.store = store
+
+    async def _refresh(self, chunk_ids: Optional[list[int]] = None, document_ids: Optional[list[int]] = None) -> None:
+        if not self.store.loaded or not (chunk_ids or document_ids):
+            return
+        rows = (await self.db.execute(embedded_chunks_statement(chunk_ids, document_ids))).all()
+        await self.db.commit()
+        self.store.upsert([row.id for row in rows], [row.embedding for row in rows])
+
+    async def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        saved = await super().save_chunk(chunk)
+        await self._refresh(chunk_ids=[saved.id])
+        return saved
+
+    async def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        saved = await super().save_chunks(chunks)
+        await self._refresh(chunk_ids=[chunk.id for chunk in saved])
+        return saved
+
+    async def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        saved_document, saved_chunks = await super().save_document_with_chunks(doc, chunks)
+        await self._refresh(document_ids=[saved_document.id])
+        return saved_document, saved_chunks
+
+    async def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        saved_document, saved_chunks = await super().update_document_with_chunks(doc, diff)
+        self.store.remove([chunk.id for chunk in diff.removed])
+        await self._refresh(chunk_ids=[chunk.id for chunk in saved_chunks])
+        return saved_document, saved_chunks
+
+    async def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        updated = await super().update_chunk_embedding(chunk_id, embedding)
+        await self._refresh(chunk_ids=[chunk_id])
+        return updated
+
+    async def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        updated = await super().update_chunk_embeddings(embeddings)
+        await self._refresh(chunk_ids=list(embeddings))
+        return updated
+
+    async def delete_chunk(self, chunk_id: int) -> bool:
+        deleted = await super().delete_chunk(chunk_id)
+        if deleted:
+            self.store.remove([chunk_id])
+        return deleted
+
+    async def delete_document(self, doc_id: int) -> bool:
+        chunk_ids = (
+            await self.db.scalars(select(DocumentChunkORM.id).where(DocumentChunkORM.document_id == doc_id))
+        ).all()
+        deleted = await super().delete_document(doc_id)
+        if deleted:
+            self.store.remove(chunk_ids)
+        return deleted
+
+    async def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.3,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        if not self.store.loaded:
+            return await super().search_similar(query_embedding, limit, min_similarity, ef_search, probes)
+        hits = self.store.search(query_embedding, limit, min_similarity, ef_search)
+        if not hits:
+            return []
+        rows = (await self.db.execute(search_rows_statement([chunk_id for chunk_id, _ in hits]))).mappings().all()
+        return search_rows(hits, rows)
+
+    async def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        if not self.store.loaded:
+            return await super().search_similar_batch(query_embeddings, limits, min_similarities, ef_search, probes)
+        hits = self.store.search_batch(query_embeddings, limits, min_similarities, ef_search)
+        chunk_ids = sorted({chunk_id for query_hits in hits for chunk_id, _ in query_hits})
+        if not chunk_ids:
+            return [[] for _ in hits]
+        rows = (await self.db.execute(search_rows_statement(chunk_ids))).mappings().all()
+        return [search_rows(query_hits, rows) for query_hits in hits]
@@ -0,0 +1,136 @@
+"""Versioned on-disk snapshots of the chunk embeddings, opened with np.memmap so worker processes share one copy
+
+A snapshot file is a fixed-size JSON header followed by the unit-normalized float32 matrix (one row per chunk) and
+the int64 chunk ids, ascending. `high_water_mark` is the largest `document_chunks.change_seq` the export saw: a
+worker maps the newest snapshot and only reads from Postgres the chunks changed after it.
+"""
+
+import json
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from .indexes import normalize_rows
+
+MAGIC = "semantic-poc embedding snapshot"
+FORMAT_VERSION = 1
+HEADER_BYTES = 4096
+SNAPSHOT_NAME = re.compile(r"^embeddings-v(\d+)\.snap$")
+
+
+@dataclass(frozen=True)
+class EmbeddingSnapshot:
+    path: Path
+    version: int
+    high_water_mark: int
+    dims: int
+    ids: np.ndarray
+    vectors: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def snapshot_path(directory: Path, version: int) -> Path:
+    return directory / f"embeddings-v{version:06d}.snap"
+
+
+def latest_snapshot(directory: Path) -> Optional[Path]:
+    if not directory.is_dir():
+        return None
+    versions = [
+        (int(match.group(1)), path)
+        for path in directory.iterdir()
+        if (match := SNAPSHOT_NAME.match(path.name)) is not None
+    ]
+    return max(versions)[1] if versions else None
+
+
+def write_snapshot(
+    directory: Path,
+    batches: Iterable[tuple[np.ndarray, np.ndarray]],
+    count: int,
+    dims: int,
+    high_water_mark: int,
+    keep: int = 2,
+) -> Path:
+    """Write `count` chunks given as (ids, vectors) batches in ascending id order; returns the new snapshot's path
+
+    The file is filled through a writable memory map and renamed into place only when complete, so readers never
+    see a partial snapshot. Older versions beyond `keep` are deleted; processes that still map them keep their pages.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    previous = latest_snapshot(directory)
+    version = int(SNAPSHOT_NAME.match(previous.name).group(1)) + 1 if previous else 1
+    path = snapshot_path(directory, version)
+    tmp = path.with_name(path.name + ".tmp")
+
+    matrix_bytes = count * dims * np.dtype(np.float32).itemsize
+    try:
+        with open(tmp, "wb") as file:
+            file.truncate(HEADER_BYTES + matrix_bytes + count * np.dtype(np.int64).itemsize)
+        written = 0
+        if count:
+            vectors = np.memmap(tmp, dtype=np.float32, mode="r+", offset=HEADER_BYTES, shape=(count, dims))
+            ids = np.memmap(tmp, dtype=np.int64, mode="r+", offset=HEADER_BYTES + matrix_bytes, shape=(count,))
+            for batch_ids, batch_vectors in batches:
+                if written + len(batch_ids) > count:
+                    raise ValueError(f"Snapshot export produced more than the {count} chunks counted")
+                vectors[written : written + len(batch_ids)] = normalize_rows(batch_vectors)
+                ids[written : written + len(batch_ids)] = batch_ids
+                written += len(batch_ids)
+            vectors.flush()
+            ids.flush()
+            del vectors, ids
+        if written != count:
+            raise ValueError(f"Snapshot export produced {written} chunks, expected {count}")
+
+        header = {
+            "magic": MAGIC,
+            "format": FORMAT_VERSION,
+            "version": version,
+            "high_water_mark": high_water_mark,
+            "dims": dims,
+            "count": count,
+            "created_at": datetime.now(UTC).isoformat(),
+        }
+        with open(tmp, "r+b") as file:
+            file.write(json.dumps(header).encode().ljust(HEADER_BYTES, b" "))
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+
+    for old_version in range(version - keep, 0, -1):
+        old = snapshot_path(directory, old_version)
+        if not old.exists():
+            break
+        old.unlink()
+    return path
+
+
+def open_snapshot(path: Path) -> EmbeddingSnapshot:
+    """Map a snapshot read-only; pages are loaded on first touch and shared through the OS page cache"""
+    with open(path, "rb") as file:
+        try:
+            header = json.loads(file.read(HEADER_BYTES))
+        except ValueError as exc:
+            raise ValueError(f"{path} has no snapshot header") from exc
+    if header.get("magic") != MAGIC or header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a format {FORMAT_VERSION} embedding snapshot")
+
+    count, dims = header["count"], header["dims"]
+    if count:
+        vectors = np.memmap(path, dtype=np.float32, mode="r", offset=HEADER_BYTES, shape=(count, dims))
+        ids = np.memmap(path, dtype=np.int64, mode="r", offset=HEADER_BYTES + vectors.nbytes, shape=(count,))
+    else:
+        vectors, ids = np.empty((0, dims), dtype=np.float32), np.empty(0, dtype=np.int64)
+    return EmbeddingSnapshot(path, header["version"], header["high_water_mark"], dims, ids, vectors)
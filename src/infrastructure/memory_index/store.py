@@ -0,0 +1,118 @@
+"""Chunk vectors kept in process memory, searched by id; result rows are completed from Postgres"""
+
+import logging
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Optional
+
+import numpy as np
+
+from .indexes import BruteForceVectorIndex, VectorIndex
+from .snapshot import EmbeddingSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryVectorStore:
+    """Serves search_similar from an in-process index once it is loaded; until then callers use pgvector
+
+    `index_factory(dims, size)` builds the index when the corpus is loaded, so the index type can depend on its size;
+    `snapshot_index_factory` (default: the same) builds it when a mapped snapshot is loaded.
+    Only ids and vectors are held: the content of the few chunks a search returns is read from Postgres, so worker
+    processes do not each keep a copy of the corpus text. Every read and write holds one lock: the indexes are not
+    safe for concurrent mutation.
+    """
+
+    def __init__(
+        self,
+        index_factory: Callable[[int, int], VectorIndex],
+        snapshot_index_factory: Optional[Callable[[int, int], VectorIndex]] = None,
+    ):
+        self.index_factory = index_factory
+        self.snapshot_index_factory = snapshot_index_factory or index_factory
+        self._index: Optional[VectorIndex] = None
+        self._snapshot: Optional[EmbeddingSnapshot] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._index is not None
+
+    def load(self, chunks: Iterable[tuple[int, Any]], dims: int, size: int) -> None:
+        """Replace the contents with (chunk id, embedding) pairs, streamed; `size` is the expected count"""
+        index = self.index_factory(dims, size)
+        ids: list[int] = []
+        vectors: list[Any] = []
+        for chunk_id, embedding in chunks:
+            ids.append(chunk_id)
+            vectors.append(embedding)
+            if len(ids) >= 1024:
+                index.add(ids, np.asarray(vectors, dtype=np.float32))
+                ids, vectors = [], []
+        if ids:
+            index.add(ids, np.asarray(vectors, dtype=np.float32))
+        self._replace(index, None)
+
+    def load_snapshot(self, snapshot: EmbeddingSnapshot) -> None:
+        """Replace the contents with a mapped snapshot; the brute-force index searches the mapping in place"""
+        index = self.snapshot_index_factory(snapshot.dims, len(snapshot))
+        if not isinstance(index, BruteForceVectorIndex):
+            logger.warning(
+                f"Building a {type(index).__name__} from snapshot v{snapshot.version}: the graph is rebuilt in this "
+                "process's private memory, so startup time grows with the corpus"
+            )
+        index.load(snapshot.ids, snapshot.vectors)
+        self._replace(index, snapshot)
+
+    def _replace(self, index: VectorIndex, snapshot: Optional[EmbeddingSnapshot]) -> None:
+        with self._lock:
+            self._index, self._snapshot = index, snapshot
+        source = f"snapshot v{snapshot.version}" if snapshot else "the database"
+        logger.info(f"Loaded {len(index)} chunk embeddings from {source} into a {type(index).__name__}")
+
+    def upsert(self, ids: Sequence[int], embeddings: Sequence[Any]) -> None:
+        if not ids or self._index is None:
+            return
+        with self._lock:
+            self._index.add(list(ids), np.asarray(embeddings, dtype=np.float32))
+
+    def remove(self, ids: Iterable[int]) -> None:
+        if self._index is None:
+            return
+        with self._lock:
+            self._index.remove(ids)
+
+    def search(
+        self, query_embedding: list[float], limit: int, min_similarity: float = 0.0, ef_search: Optional[int] = None
+    ) -> list[tuple[int, float]]:
+        """(chunk id, similarity) pairs at or above min_similarity, most similar first"""
+        with self._lock:
+            hits = self._index.search(np.asarray(query_embedding, dtype=np.float32), limit, ef_search)
+        return [(chunk_id, similarity) for chunk_id, similarity in hits if similarity >= min_similarity]
+
+    def search_batch(
+        self,
+        query_embeddings: Sequence[list[float]],
+        limits: Sequence[int],
+        min_similarities: Sequence[float],
+        ef_search: Optional[int] = None,
+    ) -> list[list[tuple[int, float]]]:
+        """search() for each query under one lock acquisition, in query order"""
+        with self._lock:
+            hits = [
+                self._index.search(np.asarray(query_embedding, dtype=np.float32), limit, ef_search)
+                for query_embedding, limit in zip(query_embeddings, limits)
+            ]
+        return [
+            [(chunk_id, similarity) for chunk_id, similarity in query_hits if similarity >= min_similarity]
+            for query_hits, min_similarity in zip(hits, min_similarities)
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "index": type(self._index).__name__ if self._index is not None else None,
+            "chunks": len(self._index) if self._index is not None else 0,
+            "snapshot_version": self._snapshot.version if self._snapshot else None,
+            "snapshot_high_water_mark": self._snapshot.high_water_mark if self._snapshot else None,
+        }
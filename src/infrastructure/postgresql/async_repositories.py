@@ -0,0 +1,305 @@
+import logging
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+
+from sqlalchemy import RowMapping, TextClause, delete, insert, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.document_repository import AsyncDocumentRepository
+from src.domain.exceptions import DocumentNotFoundError
+
+from .repositories import (
+    DocumentChunkORM,
+    DocumentORM,
+    batch_search_rows,
+    batch_similarity_statement,
+    check_chunk_diff,
+    chunk_embeddings_update_statement,
+    chunk_insert_rows,
+    chunk_insert_statement,
+    chunk_positions_update_statement,
+    chunks_delete_statement,
+    corpus_version_statement,
+    disable_iterative_scan,
+    document_chunk_ids_statement,
+    document_update_statement,
+    index_tuning_statements,
+    iterative_scan_enabled,
+    lexical_search_statement,
+    pending_chunks,
+    pending_chunks_count_statement,
+    pending_chunks_statement,
+    persisted_chunks,
+    saved_document,
+    search_candidates_statement,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPostgresDocumentRepository(AsyncDocumentRepository):
+    """asyncpg-backed repository; the session is owned (opened and closed) by the caller"""
+
+    def __init__(self, session: AsyncSession):
+        self.db = session
+
+    # -------- Documents ----------
+    async def save_document(self, doc: Document) -> Document:
+        db_doc = DocumentORM(title=doc.title, content=doc.content)
+        self.db.add(db_doc)
+        await self.db.commit()
+        await self.db.refresh(db_doc)
+        return self._to_document(db_doc)
+
+    async def get_document(self, doc_id: int) -> Document | None:
+        db_doc = await self.db.get(DocumentORM, doc_id)
+        return self._to_document(db_doc) if db_doc else None
+
+    async def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        result = await self.db.scalars(select(DocumentORM).order_by(DocumentORM.id).offset(offset).limit(limit))
+        return [self._to_document(doc) for doc in result]
+
+    async def delete_document(self, doc_id: int) -> bool:
+        try:
+            result = await self.db.execute(delete(DocumentORM).where(DocumentORM.id == doc_id))
+            await self.db.commit()
+            return result.rowcount > 0
+        except Exception:
+            await self.db.rollback()
+            return False
+
+    async def document_exists(self, doc_id: int) -> bool:
+        return await self.db.scalar(select(DocumentORM.id).where(DocumentORM.id == doc_id)) is not None
+
+    # -------- Chunks ----------
+    async def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        return (await self.save_chunks([chunk]))[0]
+
+    async def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        if not chunks:
+            return []
+        try:
+            result = await self.db.execute(chunk_insert_statement(), chunk_insert_rows(chunks))
+            saved_chunks = persisted_chunks(chunks, result.all())
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return saved_chunks
+
+    async def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        try:
+            result = await self.db.execute(
+                insert(DocumentORM).returning(DocumentORM.id, DocumentORM.created_at, DocumentORM.updated_at),
+                [{"title": doc.title, "content": doc.content}],
+            )
+            row = result.one()
+            for chunk in chunks:
+                chunk.document_id = row.id
+            saved_chunks: list[DocumentChunk] = []
+            if chunks:
+                result = await self.db.execute(chunk_insert_statement(), chunk_insert_rows(chunks))
+                saved_chunks = persisted_chunks(chunks, result.all())
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return saved_document(doc, row), saved_chunks
+
+    async def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        try:
+            row = (await self.db.execute(document_update_statement(doc))).one_or_none()
+            if row is None:
+                raise DocumentNotFoundError(doc.id)
+            check_chunk_diff(doc.id, await self.db.scalars(document_chunk_ids_statement(doc.id)), diff)
+            if diff.removed:
+                await self.db.execute(chunks_delete_statement([chunk.id for chunk in diff.removed]))
+            if diff.kept:
+                await self.db.execute(
+                    chunk_positions_update_statement({chunk.id: chunk.position for chunk in diff.kept})
+                )
+            for chunk in diff.added:
+                chunk.document_id = doc.id
+            saved_chunks: list[DocumentChunk] = []
+            if diff.added:
+                result = await self.db.execute(chunk_insert_statement(), chunk_insert_rows(diff.added))
+                saved_chunks = persisted_chunks(diff.added, result.all())
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return saved_document(doc, row), saved_chunks
+
+    async def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        result = await self.db.scalars(
+            select(DocumentChunkORM)
+            .where(DocumentChunkORM.document_id == document_id)
+            .order_by(DocumentChunkORM.position.asc().nulls_last(), DocumentChunkORM.id)
+        )
+        return [self._to_chunk(chunk) for chunk in result]
+
+    async def get_chunk(self, chunk_id: int) -> DocumentChunk | None:
+        db_chunk = await self.db.get(DocumentChunkORM, chunk_id)
+        return self._to_chunk(db_chunk) if db_chunk else None
+
+    async def delete_chunk(self, chunk_id: int) -> bool:
+        try:
+            result = await self.db.execute(delete(DocumentChunkORM).where(DocumentChunkORM.id == chunk_id))
+            await self.db.commit()
+            return result.rowcount > 0
+        except Exception:
+            await self.db.rollback()
+            return False
+
+    async def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return pending_chunks((await self.db.execute(pending_chunks_statement(limit))).all())
+
+    @asynccontextmanager
+    async def claim_chunks_without_embeddings(self, limit: int = 100) -> AsyncIterator[list[DocumentChunk]]:
+        try:
+            result = await self.db.execute(pending_chunks_statement(limit, skip_locked=True))
+            yield pending_chunks(result.all())
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+    async def count_chunks_without_embeddings(self) -> int:
+        count = await self.db.scalar(pending_chunks_count_statement())
+        await self.db.commit()
+        return count
+
+    async def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        try:
+            db_chunk = await self.db.get(DocumentChunkORM, chunk_id)
+            if db_chunk:
+                db_chunk.embedding = embedding
+                await self.db.commit()
+                return True
+            return False
+        except Exception:
+            await self.db.rollback()
+            return False
+
+    async def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        if not embeddings:
+            return 0
+        try:
+            result = await self.db.execute(chunk_embeddings_update_statement(embeddings))
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return result.rowcount
+
+    async def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.3,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[dict]:
+        # Same iterative index scan as PostgresDocumentRepository.search_similar
+        iterative = iterative_scan_enabled()
+        try:
+            rows = await self._search_candidates(query_embedding, limit, ef_search, probes, iterative)
+        except DBAPIError as exc:
+            if not (iterative and disable_iterative_scan(exc)):
+                raise
+            rows = await self._search_candidates(query_embedding, limit, ef_search, probes)
+
+        return [dict(row) for row in rows if row["similarity"] >= min_similarity]
+
+    async def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[dict]]:
+        statement = batch_similarity_statement(query_embeddings, limits)
+        iterative = iterative_scan_enabled()
+        try:
+            rows = await self._run_search(statement, ef_search, probes, iterative)
+        except DBAPIError as exc:
+            if not (iterative and disable_iterative_scan(exc)):
+                raise
+            rows = await self._run_search(statement, ef_search, probes)
+        grouped = batch_search_rows(rows, len(query_embeddings))
+
+        return [
+            [row for row in rows if row["similarity"] >= min_similarity]
+            for rows, min_similarity in zip(grouped, min_similarities)
+        ]
+
+    async def corpus_version(self) -> int:
+        try:
+            version = await self.db.scalar(corpus_version_statement())
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return version or 0
+
+    async def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        try:
+            rows = (await self.db.execute(lexical_search_statement(query, limit))).mappings().all()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return [dict(row) for row in rows]
+
+    async def _search_candidates(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        ef_search: int | None,
+        probes: int | None,
+        iterative: bool = False,
+    ) -> Sequence[RowMapping]:
+        return await self._run_search(search_candidates_statement(query_embedding, limit), ef_search, probes, iterative)
+
+    async def _run_search(
+        self, statement: TextClause, ef_search: int | None, probes: int | None, iterative: bool = False
+    ) -> Sequence[RowMapping]:
+        try:
+            for tuning in index_tuning_statements(ef_search, probes, iterative):
+                await self.db.execute(tuning)
+            result = await self.db.execute(statement)
+            rows = result.mappings().all()
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        return rows
+
+    @staticmethod
+    def _to_document(db_doc: DocumentORM) -> Document:
+        return Document(
+            id=db_doc.id,
+            title=db_doc.title,
+            content=db_doc.content,
+            created_at=db_doc.created_at,
+            updated_at=db_doc.updated_at,
+        )
+
+    @staticmethod
+    def _to_chunk(db_chunk: DocumentChunkORM) -> DocumentChunk:
+        return DocumentChunk(
+            id=db_chunk.id,
+            document_id=db_chunk.document_id,
+            content=db_chunk.content,
+            embedding=db_chunk.embedding,
+            created_at=db_chunk.created_at,
+            updated_at=db_chunk.updated_at,
+            position=db_chunk.position,
+            simhash=db_chunk.simhash,
+            canonical_chunk_id=db_chunk.canonical_chunk_id,
+        )
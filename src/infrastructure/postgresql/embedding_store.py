@@ -0,0 +1,119 @@
+import hashlib
+import logging
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, DateTime, Integer, Select, String, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+from src.domain.embedding_store import AsyncEmbeddingStore, EmbeddingStore
+
+from ..database import Base
+
+logger = logging.getLogger(__name__)
+
+
+# ORM: embeddings addressed by the hash of (model, dims, text), shared by every document
+class ChunkEmbeddingORM(Base):
+    __tablename__ = "chunk_embeddings"
+    content_hash = Column(String(64), primary_key=True)
+    model = Column(String(255), nullable=False)
+    dims = Column(Integer, nullable=False)
+    embedding = Column(Vector(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+def content_hash(model: str, dims: int, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{dims}\x00{text}".encode()).hexdigest()
+
+
+class _EmbeddingStoreStatements:
+    """Hashing and SQL shared by the sync and async stores"""
+
+    def __init__(self, model: str, dims: int):
+        self.model = model
+        self.dims = dims
+
+    def hashes(self, texts: list[str]) -> dict[str, str]:
+        return {content_hash(self.model, self.dims, text): text for text in texts}
+
+    @staticmethod
+    def lookup_statement(hashes: list[str]) -> Select:
+        return select(ChunkEmbeddingORM.content_hash, ChunkEmbeddingORM.embedding).where(
+            ChunkEmbeddingORM.content_hash.in_(hashes)
+        )
+
+    def upsert_statement(self, embeddings: dict[str, list[float]]) -> Insert:
+        rows = [
+            {
+                "content_hash": content_hash(self.model, self.dims, text),
+                "model": self.model,
+                "dims": len(embedding),
+                "embedding": embedding,
+            }
+            for text, embedding in embeddings.items()
+        ]
+        # Concurrent ingests of the same text race harmlessly: the first writer wins
+        return insert(ChunkEmbeddingORM).values(rows).on_conflict_do_nothing(index_elements=["content_hash"])
+
+
+class PostgresEmbeddingStore(_EmbeddingStoreStatements, EmbeddingStore):
+    """Embedding store in the `chunk_embeddings` table; failures degrade to cache misses"""
+
+    def __init__(self, session: Session, model: str, dims: int):
+        super().__init__(model, dims)
+        self.db = session
+
+    def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        if not texts:
+            return {}
+        by_hash = self.hashes(texts)
+        try:
+            rows = self.db.execute(self.lookup_statement(list(by_hash))).all()
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.warning(f"Embedding store lookup failed, embedding every chunk: {exc!s}")
+            return {}
+        return {by_hash[row.content_hash]: [float(v) for v in row.embedding] for row in rows}
+
+    def put_many(self, embeddings: dict[str, list[float]]) -> None:
+        if not embeddings:
+            return
+        try:
+            self.db.execute(self.upsert_statement(embeddings))
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.warning(f"Could not write embeddings back to the store: {exc!s}")
+
+
+class AsyncPostgresEmbeddingStore(_EmbeddingStoreStatements, AsyncEmbeddingStore):
+    def __init__(self, session: AsyncSession, model: str, dims: int):
+        super().__init__(model, dims)
+        self.db = session
+
+    async def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        if not texts:
+            return {}
+        by_hash = self.hashes(texts)
+        try:
+            rows = (await self.db.execute(self.lookup_statement(list(by_hash)))).all()
+            await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            logger.warning(f"Embedding store lookup failed, embedding every chunk: {exc!s}")
+            return {}
+        return {by_hash[row.content_hash]: [float(v) for v in row.embedding] for row in rows}
+
+    async def put_many(self, embeddings: dict[str, list[float]]) -> None:
+        if not embeddings:
+            return
+        try:
+            await self.db.execute(self.upsert_statement(embeddings))
+            await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            logger.warning(f"Could not write embeddings back to the store: {exc!s}")
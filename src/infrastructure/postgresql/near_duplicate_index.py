@@ -0,0 +1,100 @@
+import logging
+from typing import Optional
+
+from sqlalchemy import BigInteger, Integer, TextClause, bindparam, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.domain.near_duplicate_index import (
+    SIMHASH_BAND_BITS,
+    AsyncNearDuplicateIndex,
+    NearDuplicateIndex,
+    check_max_distance,
+    nearest_canonical,
+    simhash_bands,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Signatures looked up per statement (up to four (band, value) pairs each)
+LOOKUP_BATCH_SIZE = 256
+# Canonical chunks fetched per (band, value) pair: a band value shared by many chunks (boilerplate, very short
+# chunks) would otherwise pull all of them into Python for the Hamming distance check
+CANDIDATES_PER_BAND_VALUE = 32
+
+
+def band_candidates_statement(signatures: list[int]) -> TextClause:
+    """Canonical chunks sharing a (band, value) pair with one of the signatures, CANDIDATES_PER_BAND_VALUE at most
+
+    Each band joins its own VALUES list of the signatures' band values, with the band expression spelled exactly as in
+    its ix_document_chunks_simhash_band* index so every pair is one capped index scan.
+    """
+    values = [sorted(set(band)) for band in zip(*(simhash_bands(signature) for signature in signatures))]
+    branches = []
+    params = []
+    for band, band_values in enumerate(values):
+        rows = ", ".join(f"(:band{band}_{position})" for position in range(len(band_values)))
+        branches.append(
+            f"SELECT c.id, c.simhash FROM (VALUES {rows}) AS q(value) CROSS JOIN LATERAL ("
+            f"SELECT id, simhash FROM document_chunks WHERE canonical_chunk_id IS NULL "
+            f"AND ((simhash >> {band * SIMHASH_BAND_BITS}) & 65535) = q.value LIMIT :per_value) AS c"
+        )
+        params += [
+            bindparam(f"band{band}_{position}", value, type_=BigInteger) for position, value in enumerate(band_values)
+        ]
+    return text(" UNION ".join(branches)).bindparams(
+        *params, bindparam("per_value", CANDIDATES_PER_BAND_VALUE, type_=Integer)
+    )
+
+
+def band_candidates_statements(signatures: list[int]) -> list[TextClause]:
+    """band_candidates_statement over batches of LOOKUP_BATCH_SIZE signatures"""
+    return [
+        band_candidates_statement(signatures[start : start + LOOKUP_BATCH_SIZE])
+        for start in range(0, len(signatures), LOOKUP_BATCH_SIZE)
+    ]
+
+
+class PostgresNearDuplicateIndex(NearDuplicateIndex):
+    """Band index over `document_chunks.simhash`; failures degrade to no duplicates"""
+
+    def __init__(self, session: Session, max_distance: int):
+        check_max_distance(max_distance)
+        self.db = session
+        self.max_distance = max_distance
+
+    def find_canonical(self, signatures: list[int]) -> list[Optional[int]]:
+        if not signatures:
+            return []
+        try:
+            rows = [row for statement in band_candidates_statements(signatures) for row in self.db.execute(statement)]
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.warning(f"Near-duplicate lookup failed, storing every chunk: {exc!s}")
+            return [None] * len(signatures)
+        return nearest_canonical(signatures, [(row.id, row.simhash) for row in rows], self.max_distance)
+
+
+class AsyncPostgresNearDuplicateIndex(AsyncNearDuplicateIndex):
+    """Band index over `document_chunks.simhash` on an AsyncSession"""
+
+    def __init__(self, session: AsyncSession, max_distance: int):
+        check_max_distance(max_distance)
+        self.db = session
+        self.max_distance = max_distance
+
+    async def find_canonical(self, signatures: list[int]) -> list[Optional[int]]:
+        if not signatures:
+            return []
+        try:
+            rows = []
+            for statement in band_candidates_statements(signatures):
+                rows += (await self.db.execute(statement)).all()
+            await self.db.commit()
+        except Exception as exc:
+            await self.db.rollback()
+            logger.warning(f"Near-duplicate lookup failed, storing every chunk: {exc!s}")
+            return [None] * len(signatures)
+        return nearest_canonical(signatures, [(row.id, row.simhash) for row in rows], self.max_distance)
@@ -1,24 +1,53 @@
+import io
+import logging
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Computed,
     DateTime,
-    Float,
+    Delete,
     ForeignKey,
     Integer,
+    Row,
+    RowMapping,
+    Select,
+    SmallInteger,
     String,
     Text,
+    TextClause,
+    Update,
     bindparam,
+    cast,
+    column,
+    delete,
     func,
+    insert,
+    select,
     text,
+    update,
+    values,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, relationship
+from sqlalchemy.sql.dml import ReturningInsert
 
-from src.domain.document import Document, DocumentChunk
+from src.config import settings
+from src.domain.document import ChunkDiff, Document, DocumentChunk
 from src.domain.document_repository import (
     DocumentRepository as DocumentRepositoryInterface,
 )
+from src.domain.exceptions import DocumentConflictException, DocumentNotFoundError
 
 from ..database import Base, SessionLocal
+from .vector_index import quantized_distance_operator, quantized_expression
+
+logger = logging.getLogger(__name__)
 
 
 # ORM: Document
@@ -38,17 +67,400 @@ class DocumentChunkORM(Base):
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
+    # Order of the chunk within its document (ix_document_chunks_document_position)
+    position = Column(Integer)
     embedding = Column(Vector(768))
     # embedding = Column(Vector(3072), nullable=False)
+    # SimHash of the content, banded by the ix_document_chunks_simhash_band* indexes for near-duplicate lookups
+    simhash = Column(BigInteger)
+    # Set on near-duplicates, which are stored without an embedding; unlinked again if the canonical chunk goes away
+    canonical_chunk_id = Column(Integer, ForeignKey("document_chunks.id", ondelete="SET NULL"))
+    # Drawn from a sequence on insert and by a trigger whenever the embedding changes: the snapshot high-water mark
+    change_seq = Column(BigInteger, server_default=text("nextval('document_chunks_change_seq')"), nullable=False)
+    # Maintained by Postgres on every insert (COPY included) and content change; GIN-indexed for lexical search
+    content_tsv = Column(TSVECTOR, Computed(f"to_tsvector('{settings.lexical_search_config}'::regconfig, content)"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     document = relationship("DocumentORM", back_populates="chunks")
 
 
+# ORM: corpus version (single row)
+class CorpusVersionORM(Base):
+    __tablename__ = "corpus_version"
+    id = Column(SmallInteger, primary_key=True, default=1)
+    # Bumped by statement-level triggers on every committed write that can change a search result
+    version = Column(BigInteger, nullable=False, server_default=text("0"))
+
+
+def chunk_insert_statement() -> ReturningInsert:
+    """ORM bulk INSERT; SQLAlchemy batches it into multi-row INSERT ... RETURNING in parameter order"""
+    return insert(DocumentChunkORM).returning(
+        DocumentChunkORM.id,
+        DocumentChunkORM.created_at,
+        DocumentChunkORM.updated_at,
+        sort_by_parameter_order=True,
+    )
+
+
+def chunk_insert_rows(chunks: list[DocumentChunk]) -> list[dict]:
+    return [
+        {
+            "document_id": chunk.document_id,
+            "content": chunk.content,
+            "position": chunk.position,
+            "embedding": chunk.embedding,
+            "simhash": chunk.simhash,
+            "canonical_chunk_id": chunk.canonical_chunk_id,
+        }
+        for chunk in chunks
+    ]
+
+
+def persisted_chunks(chunks: list[DocumentChunk], rows: Sequence[Row]) -> list[DocumentChunk]:
+    """Combine the inserted chunks with the (id, created_at, updated_at) rows returned by the database"""
+    return [
+        DocumentChunk(
+            id=row.id,
+            document_id=chunk.document_id,
+            content=chunk.content,
+            embedding=chunk.embedding,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            position=chunk.position,
+            simhash=chunk.simhash,
+            canonical_chunk_id=chunk.canonical_chunk_id,
+            known_word_count=chunk.known_word_count,
+        )
+        for chunk, row in zip(chunks, rows)
+    ]
+
+
+# COPY ... FROM STDIN in text format: tab-separated columns, \\N for NULL, backslash escapes
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+DOCUMENTS_COPY = "COPY documents (id, title, content) FROM STDIN"
+CHUNKS_COPY = "COPY document_chunks (document_id, content, position, embedding, simhash, canonical_chunk_id) FROM STDIN"
+
+
+def vector_text(values: list[float]) -> str:
+    """pgvector's text input format"""
+    return "[" + ",".join(map(repr, values)) + "]"
+
+
+def copy_field(value: int | str | list[float] | None) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, list):
+        return vector_text(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def copy_buffer(rows: Iterable[tuple]) -> io.StringIO:
+    return io.StringIO("".join("\t".join(map(copy_field, row)) + "\n" for row in rows))
+
+
+def document_ids_statement(count: int) -> TextClause:
+    """Reserve ids from the documents sequence up front so chunk rows can reference them in the same COPY"""
+    return text("SELECT nextval(pg_get_serial_sequence('documents', 'id')) FROM generate_series(1, :count)").bindparams(
+        count=count
+    )
+
+
+def chunk_embeddings_update_statement(embeddings: dict[int, list[float]]) -> Update:
+    """A single UPDATE ... FROM (VALUES (id, embedding), ...) for the whole batch"""
+    batch = values(column("id", Integer), column("embedding", Vector(768)), name="batch").data(list(embeddings.items()))
+    return (
+        update(DocumentChunkORM)
+        .where(DocumentChunkORM.id == batch.c.id)
+        .values(embedding=cast(batch.c.embedding, Vector(768)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def document_update_statement(doc: Document) -> Update:
+    """Rewrite title and content, row-locking the document until commit (concurrent updates queue up behind it)"""
+    return (
+        update(DocumentORM)
+        .where(DocumentORM.id == doc.id)
+        .values(title=doc.title, content=doc.content, updated_at=func.now())
+        .returning(DocumentORM.id, DocumentORM.created_at, DocumentORM.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def document_chunk_ids_statement(document_id: int) -> Select:
+    return select(DocumentChunkORM.id).where(DocumentChunkORM.document_id == document_id)
+
+
+def chunk_positions_update_statement(positions: dict[int, int]) -> Update:
+    """A single UPDATE ... FROM (VALUES (id, position), ...); rows already in place are not rewritten"""
+    batch = values(column("id", Integer), column("position", Integer), name="batch").data(list(positions.items()))
+    return (
+        update(DocumentChunkORM)
+        .where(DocumentChunkORM.id == batch.c.id, DocumentChunkORM.position.is_distinct_from(batch.c.position))
+        .values(position=batch.c.position)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def chunks_delete_statement(chunk_ids: list[int]) -> Delete:
+    return (
+        delete(DocumentChunkORM).where(DocumentChunkORM.id.in_(chunk_ids)).execution_options(synchronize_session=False)
+    )
+
+
+def check_chunk_diff(document_id: int, stored_ids: Iterable[int], diff: ChunkDiff) -> None:
+    """The diff was computed against the chunks still stored, else another writer got in between"""
+    if set(stored_ids) != {chunk.id for chunk in diff.kept + diff.removed}:
+        raise DocumentConflictException(document_id)
+
+
+def saved_document(doc: Document, row: Row) -> Document:
+    return Document(
+        id=row.id,
+        title=doc.title,
+        content=doc.content,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        known_word_count=doc.known_word_count,
+    )
+
+
+def pending_chunks_statement(limit: int, skip_locked: bool = False) -> Select:
+    """Oldest chunks still waiting for an embedding (served by the partial index ix_document_chunks_pending)
+
+    Near-duplicates linked to a canonical chunk are never embedded.
+    """
+    statement = (
+        select(DocumentChunkORM.id, DocumentChunkORM.document_id, DocumentChunkORM.content)
+        .where(DocumentChunkORM.embedding.is_(None), DocumentChunkORM.canonical_chunk_id.is_(None))
+        .order_by(DocumentChunkORM.id)
+        .limit(limit)
+    )
+    # Rows locked by another worker are skipped, not waited for, so workers never claim the same chunk
+    return statement.with_for_update(skip_locked=True) if skip_locked else statement
+
+
+def pending_chunks_count_statement() -> Select:
+    return (
+        select(func.count())
+        .select_from(DocumentChunkORM)
+        .where(DocumentChunkORM.embedding.is_(None), DocumentChunkORM.canonical_chunk_id.is_(None))
+    )
+
+
+def pending_chunks(rows: Sequence[Row]) -> list[DocumentChunk]:
+    return [DocumentChunk(id=row.id, document_id=row.document_id, content=row.content) for row in rows]
+
+
+def similarity_candidates_statement(query_embedding: list[float], limit: int) -> TextClause:
+    """Top-k by distance in a bare ORDER BY ... LIMIT (servable by the vector index), then JOIN the small set"""
+    return text(
+        """
+        WITH candidates AS MATERIALIZED (
+            SELECT c.id, c.document_id, c.content, c.embedding <=> :query AS distance
+            FROM document_chunks c
+            WHERE c.embedding IS NOT NULL
+            ORDER BY c.embedding <=> :query
+            LIMIT :limit
+        )
+        SELECT cand.id AS id,
+               cand.document_id AS document_id,
+               cand.content AS content,
+               d.title AS title,
+               (1 - cand.distance) AS similarity
+        FROM candidates cand
+        JOIN documents d ON d.id = cand.document_id
+        ORDER BY cand.distance ASC
+        """
+    ).bindparams(
+        bindparam("query", value=query_embedding, type_=Vector(768)),
+        bindparam("limit", value=limit, type_=Integer),
+    )
+
+
+def reranked_candidates_statement(
+    query_embedding: list[float], limit: int, quantization: str, rerank_factor: int
+) -> TextClause:
+    """Two-phase search: rerank_factor * limit candidates from the quantized index, re-ranked by exact distance
+
+    Returns the same columns as similarity_candidates_statement. The candidate scan orders by the indexed expression
+    (see vector_index.quantized_expression) and never reads a full vector; only the candidates' vectors are compared.
+    """
+    code = quantized_expression(quantization, "c.embedding")
+    query_code = quantized_expression(quantization, "CAST(:query AS vector)")
+    return text(
+        f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT c.id, c.document_id, c.content, c.embedding
+            FROM document_chunks c
+            WHERE c.embedding IS NOT NULL
+            ORDER BY {code} {quantized_distance_operator(quantization)} {query_code}
+            LIMIT :candidates
+        ), reranked AS MATERIALIZED (
+            SELECT cand.id, cand.document_id, cand.content, cand.embedding <=> :query AS distance
+            FROM candidates cand
+            ORDER BY distance
+            LIMIT :limit
+        )
+        SELECT r.id AS id,
+               r.document_id AS document_id,
+               r.content AS content,
+               d.title AS title,
+               (1 - r.distance) AS similarity
+        FROM reranked r
+        JOIN documents d ON d.id = r.document_id
+        ORDER BY r.distance ASC
+        """
+    ).bindparams(
+        bindparam("query", value=query_embedding, type_=Vector(768)),
+        bindparam("limit", value=limit, type_=Integer),
+        bindparam("candidates", value=limit * rerank_factor, type_=Integer),
+    )
+
+
+def search_candidates_statement(query_embedding: list[float], limit: int) -> TextClause:
+    """The candidate query for the configured settings.vector_quantization"""
+    if settings.vector_quantization == "none":
+        return similarity_candidates_statement(query_embedding, limit)
+    return reranked_candidates_statement(
+        query_embedding, limit, settings.vector_quantization, settings.vector_rerank_factor
+    )
+
+
+def batch_similarity_statement(query_embeddings: list[list[float]], limits: list[int]) -> TextClause:
+    """Top-k for many queries in one round-trip: a LATERAL top-k for each row of unnest(queries, limits)
+
+    Each lateral subquery is the bare ORDER BY ... LIMIT of similarity_candidates_statement (or the candidate scan
+    plus re-rank of reranked_candidates_statement with settings.vector_quantization) with the query vector taken from
+    the outer row, so the vector index serves every query. Rows carry `query_index`, the 0-based query position.
+    """
+    if settings.vector_quantization == "none":
+        top_k = """
+            SELECT c.id, c.document_id, c.content, c.embedding <=> q.embedding AS distance
+            FROM document_chunks c
+            WHERE c.embedding IS NOT NULL
+            ORDER BY c.embedding <=> q.embedding
+            LIMIT q.k
+        """
+    else:
+        quantization = settings.vector_quantization
+        top_k = f"""
+            SELECT cand.id, cand.document_id, cand.content, cand.embedding <=> q.embedding AS distance
+            FROM (
+                SELECT c.id, c.document_id, c.content, c.embedding
+                FROM document_chunks c
+                WHERE c.embedding IS NOT NULL
+                ORDER BY {quantized_expression(quantization, "c.embedding")} {quantized_distance_operator(quantization)}
+                         {quantized_expression(quantization, "q.embedding")}
+                LIMIT q.k * {int(settings.vector_rerank_factor)}
+            ) cand
+            ORDER BY distance
+            LIMIT q.k
+        """
+    return text(
+        f"""
+        SELECT (q.ord - 1) AS query_index,
+               top.id AS id,
+               top.document_id AS document_id,
+               top.content AS content,
+               d.title AS title,
+               (1 - top.distance) AS similarity
+        FROM (
+            SELECT CAST(u.embedding AS vector) AS embedding, u.k, u.ord
+            FROM unnest(CAST(:queries AS text[]), CAST(:limits AS integer[])) WITH ORDINALITY AS u(embedding, k, ord)
+        ) q
+        CROSS JOIN LATERAL ({top_k}) top
+        JOIN documents d ON d.id = top.document_id
+        ORDER BY q.ord, top.distance
+        """
+    ).bindparams(
+        # Vectors travel as text and are cast in SQL, so neither driver needs an array codec for pgvector types
+        bindparam("queries", value=[vector_text(e) for e in query_embeddings], type_=ARRAY(Text)),
+        bindparam("limits", value=list(limits), type_=ARRAY(Integer)),
+    )
+
+
+def batch_search_rows(rows: Sequence[RowMapping], count: int) -> list[list[dict]]:
+    """The rows of batch_similarity_statement split per query, in query order"""
+    grouped: list[list[dict]] = [[] for _ in range(count)]
+    for row in rows:
+        values = dict(row)
+        grouped[values.pop("query_index")].append(values)
+    return grouped
+
+
+def lexical_search_statement(query: str, limit: int) -> TextClause:
+    """Full-text matches served by the GIN index on content_tsv, ranked by cover density
+
+    `websearch_to_tsquery` accepts what users type ("quoted phrases", OR, -exclusions) and never raises on syntax.
+    ts_rank_cd normalization 1 | 32 divides by 1 + log(length), so long chunks do not win by size, and scales the
+    rank to [0..1).
+    """
+    return text(
+        """
+        WITH matches AS MATERIALIZED (
+            SELECT c.id, c.document_id, c.content, ts_rank_cd(c.content_tsv, q.query, 1 | 32) AS rank
+            FROM document_chunks c, websearch_to_tsquery(CAST(:config AS regconfig), :query) AS q(query)
+            WHERE c.content_tsv @@ q.query
+            ORDER BY rank DESC, c.id
+            LIMIT :limit
+        )
+        SELECT m.id AS id,
+               m.document_id AS document_id,
+               m.content AS content,
+               d.title AS title,
+               m.rank AS rank
+        FROM matches m
+        JOIN documents d ON d.id = m.document_id
+        ORDER BY m.rank DESC, m.id
+        """
+    ).bindparams(
+        bindparam("config", value=settings.lexical_search_config, type_=String),
+        bindparam("query", value=query, type_=Text),
+        bindparam("limit", value=limit, type_=Integer),
+    )
+
+
+def corpus_version_statement() -> Select:
+    return select(CorpusVersionORM.version).where(CorpusVersionORM.id == 1)
+
+
+def index_tuning_statements(ef_search: int | None, probes: int | None, iterative: bool = False) -> list[TextClause]:
+    """Transaction-scoped recall/latency knobs for the HNSW / IVFFlat index"""
+    statements = []
+    if ef_search is not None:
+        statements.append(text("SELECT set_config('hnsw.ef_search', :value, true)").bindparams(value=str(ef_search)))
+    if probes is not None:
+        statements.append(text("SELECT set_config('ivfflat.probes', :value, true)").bindparams(value=str(probes)))
+    if iterative:
+        # pgvector >= 0.8
+        statements.append(text("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)"))
+        statements.append(text("SELECT set_config('ivfflat.iterative_scan', 'relaxed_order', true)"))
+    return statements
+
+
+# Set once the server rejects the iterative_scan settings (pgvector < 0.8), so later searches stop asking for them
+_iterative_scan_unavailable = threading.Event()
+
+
+def iterative_scan_enabled() -> bool:
+    return settings.vector_iterative_scan and not _iterative_scan_unavailable.is_set()
+
+
+def disable_iterative_scan(exc: DBAPIError) -> bool:
+    """True when `exc` is the server rejecting the iterative_scan settings; the search is then rerun without them"""
+    if "iterative_scan" not in str(exc):
+        return False
+    _iterative_scan_unavailable.set()
+    logger.warning(f"Iterative index scan unavailable, searching without it: {exc!s}")
+    return True
+
+
 class PostgresDocumentRepository(DocumentRepositoryInterface):
-    def __init__(self):
-        self.db = SessionLocal()
+    def __init__(self, session: Session | None = None):
+        # Request handlers inject a per-request session (see get_db_session); scripts may let it open its own
+        self.db = session or SessionLocal()
 
     # -------- Documents ----------
     def save_document(self, doc: Document) -> Document:
@@ -108,7 +520,10 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
         db_chunk = DocumentChunkORM(
             document_id=chunk.document_id,
             content=chunk.content,
+            position=chunk.position,
             embedding=chunk.embedding,
+            simhash=chunk.simhash,
+            canonical_chunk_id=chunk.canonical_chunk_id,
         )
         self.db.add(db_chunk)
         self.db.commit()
@@ -121,10 +536,112 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
             embedding=db_chunk.embedding,
             created_at=db_chunk.created_at,
             updated_at=db_chunk.updated_at,
+            position=db_chunk.position,
+            simhash=db_chunk.simhash,
+            canonical_chunk_id=db_chunk.canonical_chunk_id,
         )
 
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        if not chunks:
+            return []
+        try:
+            saved_chunks = self._insert_chunks(chunks)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return saved_chunks
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        try:
+            row = self.db.execute(
+                insert(DocumentORM).returning(DocumentORM.id, DocumentORM.created_at, DocumentORM.updated_at),
+                [{"title": doc.title, "content": doc.content}],
+            ).one()
+            for chunk in chunks:
+                chunk.document_id = row.id
+            saved_chunks = self._insert_chunks(chunks) if chunks else []
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return saved_document(doc, row), saved_chunks
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        try:
+            row = self.db.execute(document_update_statement(doc)).one_or_none()
+            if row is None:
+                raise DocumentNotFoundError(doc.id)
+            check_chunk_diff(doc.id, self.db.scalars(document_chunk_ids_statement(doc.id)), diff)
+            if diff.removed:
+                self.db.execute(chunks_delete_statement([chunk.id for chunk in diff.removed]))
+            if diff.kept:
+                self.db.execute(chunk_positions_update_statement({chunk.id: chunk.position for chunk in diff.kept}))
+            for chunk in diff.added:
+                chunk.document_id = doc.id
+            saved_chunks = self._insert_chunks(diff.added) if diff.added else []
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return saved_document(doc, row), saved_chunks
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        """Bulk load through COPY: one round trip per table for the whole batch, in a single transaction"""
+        if not documents:
+            return []
+        try:
+            ids = self.db.execute(document_ids_statement(len(documents))).scalars().all()
+            for document_id, (_, chunks) in zip(ids, documents):
+                for chunk in chunks:
+                    chunk.document_id = document_id
+            cursor = self.db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    DOCUMENTS_COPY,
+                    copy_buffer((document_id, doc.title, doc.content) for document_id, (doc, _) in zip(ids, documents)),
+                )
+                cursor.copy_expert(
+                    CHUNKS_COPY,
+                    copy_buffer(
+                        (
+                            chunk.document_id,
+                            chunk.content,
+                            chunk.position,
+                            chunk.embedding,
+                            chunk.simhash,
+                            chunk.canonical_chunk_id,
+                        )
+                        for _, chunks in documents
+                        for chunk in chunks
+                    ),
+                )
+            finally:
+                cursor.close()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return [
+            Document(id=document_id, title=doc.title, content=doc.content)
+            for document_id, (doc, _) in zip(ids, documents)
+        ]
+
+    def _insert_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        """Multi-row INSERT ... RETURNING without committing; the caller owns the transaction."""
+        result = self.db.execute(chunk_insert_statement(), chunk_insert_rows(chunks))
+        return persisted_chunks(chunks, result.all())
+
     def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
-        db_chunks = self.db.query(DocumentChunkORM).filter(DocumentChunkORM.document_id == document_id).all()
+        db_chunks = (
+            self.db.query(DocumentChunkORM)
+            .filter(DocumentChunkORM.document_id == document_id)
+            .order_by(DocumentChunkORM.position.asc().nulls_last(), DocumentChunkORM.id)
+            .all()
+        )
 
         return [
             DocumentChunk(
@@ -134,6 +651,9 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
                 embedding=chunk.embedding,
                 created_at=chunk.created_at,
                 updated_at=chunk.updated_at,
+                position=chunk.position,
+                simhash=chunk.simhash,
+                canonical_chunk_id=chunk.canonical_chunk_id,
             )
             for chunk in db_chunks
         ]
@@ -150,6 +670,9 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
             embedding=db_chunk.embedding,
             created_at=db_chunk.created_at,
             updated_at=db_chunk.updated_at,
+            position=db_chunk.position,
+            simhash=db_chunk.simhash,
+            canonical_chunk_id=db_chunk.canonical_chunk_id,
         )
 
     def delete_chunk(self, chunk_id: int) -> bool:
@@ -165,19 +688,22 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
             return False
 
     def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
-        db_chunks = self.db.query(DocumentChunkORM).filter(DocumentChunkORM.embedding.is_(None)).limit(limit).all()
+        return pending_chunks(self.db.execute(pending_chunks_statement(limit)).all())
 
-        return [
-            DocumentChunk(
-                id=chunk.id,
-                document_id=chunk.document_id,
-                content=chunk.content,
-                embedding=chunk.embedding,
-                created_at=chunk.created_at,
-                updated_at=chunk.updated_at,
-            )
-            for chunk in db_chunks
-        ]
+    @contextmanager
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> Iterator[list[DocumentChunk]]:
+        try:
+            claimed = pending_chunks(self.db.execute(pending_chunks_statement(limit, skip_locked=True)).all())
+            yield claimed
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def count_chunks_without_embeddings(self) -> int:
+        count = self.db.scalar(pending_chunks_count_statement())
+        self.db.commit()
+        return count
 
     def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
         try:
@@ -191,23 +717,103 @@ class PostgresDocumentRepository(DocumentRepositoryInterface):
             self.db.rollback()
             return False
 
-    def search_similar(self, query_embedding: list[float], limit: int = 5, min_similarity: float = 0.3) -> list[dict]:
-        sql = text(
-            """
-            SELECT c.id AS id,
-                   c.document_id AS document_id,
-                   c.content AS content,
-                   d.title AS title,
-                   (1 - (c.embedding <=> :query)) AS similarity
-            FROM document_chunks c
-            JOIN documents d ON d.id = c.document_id
-            WHERE (1 - (c.embedding <=> :query)) >= :min_similarity
-            ORDER BY (c.embedding <=> :query) ASC
-            LIMIT :limit
-            """
-        ).bindparams(
-            bindparam("query", value=query_embedding, type_=Vector(768)),
-            bindparam("min_similarity", value=min_similarity, type_=Float),
-            bindparam("limit", value=limit, type_=Integer),
-        )
-        return self.db.execute(sql).mappings().all()
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        if not embeddings:
+            return 0
+        try:
+            result = self.db.execute(chunk_embeddings_update_statement(embeddings))
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return result.rowcount
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.3,
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[dict]:
+        # An iterative index scan keeps walking the index until `limit` candidates are found, instead of stopping
+        # short when ef_search / probes are too small for this request
+        iterative = iterative_scan_enabled()
+        try:
+            rows = self._search_candidates(query_embedding, limit, ef_search, probes, iterative)
+        except DBAPIError as exc:
+            if not (iterative and disable_iterative_scan(exc)):
+                raise
+            rows = self._search_candidates(query_embedding, limit, ef_search, probes)
+
+        # The threshold is applied to the small candidate set, never inside the index scan
+        return [dict(row) for row in rows if row["similarity"] >= min_similarity]
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: int | None = None,
+        probes: int | None = None,
+    ) -> list[list[dict]]:
+        statement = batch_similarity_statement(query_embeddings, limits)
+        # Same iterative index scan as search_similar
+        iterative = iterative_scan_enabled()
+        try:
+            rows = self._run_search(statement, ef_search, probes, iterative)
+        except DBAPIError as exc:
+            if not (iterative and disable_iterative_scan(exc)):
+                raise
+            rows = self._run_search(statement, ef_search, probes)
+        grouped = batch_search_rows(rows, len(query_embeddings))
+
+        return [
+            [row for row in rows if row["similarity"] >= min_similarity]
+            for rows, min_similarity in zip(grouped, min_similarities)
+        ]
+
+    def corpus_version(self) -> int:
+        try:
+            version = self.db.scalar(corpus_version_statement())
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return version or 0
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        try:
+            rows = self.db.execute(lexical_search_statement(query, limit)).mappings().all()
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return [dict(row) for row in rows]
+
+    def _search_candidates(
+        self,
+        query_embedding: list[float],
+        limit: int,
+        ef_search: int | None,
+        probes: int | None,
+        iterative: bool = False,
+    ) -> Sequence[RowMapping]:
+        return self._run_search(search_candidates_statement(query_embedding, limit), ef_search, probes, iterative)
+
+    def _run_search(
+        self, statement: TextClause, ef_search: int | None, probes: int | None, iterative: bool = False
+    ) -> Sequence[RowMapping]:
+        try:
+            self._apply_index_tuning(ef_search, probes, iterative)
+            rows = self.db.execute(statement).mappings().all()
+            # End the read transaction so SET LOCAL index knobs do not leak into later statements
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return rows
+
+    def _apply_index_tuning(self, ef_search: int | None, probes: int | None, iterative: bool = False) -> None:
+        for statement in index_tuning_statements(ef_search, probes, iterative):
+            self.db.execute(statement)
@@ -0,0 +1,70 @@
+"""DDL for the approximate nearest-neighbour indexes on ``document_chunks.embedding``"""
+
+from src.config import settings
+
+VECTOR_INDEX_NAME = "ix_document_chunks_embedding"
+QUANTIZED_INDEX_NAMES = {
+    "halfvec": "ix_document_chunks_embedding_halfvec",
+    "binary": "ix_document_chunks_embedding_binary",
+}
+
+
+def create_vector_index_sql(index_type: str = settings.vector_index_type, concurrently: bool = False) -> str:
+    """Build the CREATE INDEX statement for the configured cosine index (HNSW or IVFFlat)"""
+    if index_type == "hnsw":
+        options = f"m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction}"
+    elif index_type == "ivfflat":
+        options = f"lists = {settings.ivfflat_lists}"
+    else:
+        raise ValueError(f"Unsupported vector index type: {index_type}")
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {VECTOR_INDEX_NAME} "
+        f"ON document_chunks USING {index_type} (embedding vector_cosine_ops) WITH ({options})"
+    )
+
+
+def drop_vector_index_sql(concurrently: bool = False) -> str:
+    return f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {VECTOR_INDEX_NAME}"
+
+
+def quantized_expression(quantization: str, vector: str, dims: int = settings.embedding_dimensions) -> str:
+    """SQL for the compact code of `vector`: a half-precision copy (2 bytes per dimension) or its sign bits (1 bit)"""
+    if quantization == "halfvec":
+        return f"CAST({vector} AS halfvec({dims}))"
+    if quantization == "binary":
+        return f"CAST(binary_quantize({vector}) AS bit({dims}))"
+    raise ValueError(f"Unsupported vector quantization: {quantization}")
+
+
+def quantized_distance_operator(quantization: str) -> str:
+    return "<~>" if quantization == "binary" else "<=>"
+
+
+def create_quantized_index_sql(
+    quantization: str = settings.vector_quantization,
+    index_type: str = settings.vector_index_type,
+    concurrently: bool = False,
+) -> str:
+    """Expression index over the quantized embedding: the codes live only in the index, the heap keeps full vectors
+
+    Queries must ORDER BY the same expression (see quantized_expression) for the planner to use it. It replaces the
+    full-precision index (drop_vector_index_sql), which no search path uses once quantization is on.
+    """
+    if index_type == "hnsw":
+        options = f"m = {settings.hnsw_m}, ef_construction = {settings.hnsw_ef_construction}"
+    elif index_type == "ivfflat":
+        options = f"lists = {settings.ivfflat_lists}"
+    else:
+        raise ValueError(f"Unsupported vector index type: {index_type}")
+    operator_class = "bit_hamming_ops" if quantization == "binary" else "halfvec_cosine_ops"
+
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {QUANTIZED_INDEX_NAMES[quantization]} "
+        f"ON document_chunks USING {index_type} (({quantized_expression(quantization, 'embedding')}) "
+        f"{operator_class}) WITH ({options})"
+    )
+
+
+def drop_quantized_index_sql(quantization: str, concurrently: bool = False) -> str:
+    return f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {QUANTIZED_INDEX_NAMES[quantization]}"
@@ -0,0 +1,78 @@
+"""In-process cache of search results, invalidated by the corpus version of the database"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from src.domain.search_result_cache import SearchResultCache
+
+
+class InMemorySearchResultCache(SearchResultCache):
+    """Thread-safe LRU cache holding the results of the newest corpus version seen
+
+    Entries are never served for another version than the one they were stored at. When a newer version shows up
+    every older entry is dropped at once, since no later lookup can match it.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[dict[str, Any], float]] = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.saved_seconds = 0.0
+
+    def get(self, corpus_version: int, key: Hashable) -> Optional[dict[str, Any]]:
+        with self._lock:
+            self._advance(corpus_version)
+            entry = self._entries.get(key) if corpus_version == self._version else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result, cost_seconds = entry
+            self.saved_seconds += cost_seconds
+            return result
+
+    def set(self, corpus_version: int, key: Hashable, result: dict[str, Any], cost_seconds: float) -> None:
+        with self._lock:
+            self._advance(corpus_version)
+            # A search that read an older version than another request already saw is stale before it is stored
+            if corpus_version != self._version:
+                return
+            self._entries[key] = (result, cost_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _advance(self, corpus_version: int) -> None:
+        if self._version is None or corpus_version > self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = corpus_version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "corpus_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
@@ -1,7 +1,7 @@
 import logging
 from typing import ClassVar
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.domain.content_text_spliter import ContentTextSplitter
 
@@ -13,10 +13,12 @@ class LangchainTextSplitter(ContentTextSplitter):
     OVERLAP: ClassVar[int] = 10  # chunk overlap length
     SEPARATORS: ClassVar[list[str]] = ["\n", "\n\n", "", " "]
 
-    def split(self, text: str) -> list[str]:
-        text_splitter = RecursiveCharacterTextSplitter(
+    def __init__(self):
+        self.text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=self.CHUNK_SIZE, chunk_overlap=self.OVERLAP, separators=self.SEPARATORS
         )
-        raw_chunks = text_splitter.split_text(text)
+
+    def split(self, text: str) -> list[str]:
+        raw_chunks = self.text_splitter.split_text(text)
         logger.info(f"Split text into {len(raw_chunks)} chunks")
         return raw_chunks
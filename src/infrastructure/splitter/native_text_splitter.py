@@ -0,0 +1,123 @@
+import logging
+from functools import lru_cache, partial
+from typing import ClassVar
+
+from src.config import settings
+from src.domain.content_text_spliter import ContentTextSplitter
+
+from .parallel_text_splitter import ParallelTextSplitter, preprocess_executor
+from .sentence_text_splitter import SentenceTextSplitter
+
+logger = logging.getLogger(__name__)
+
+
+class NativeTextSplitter(ContentTextSplitter):
+    """Drop-in replacement for LangchainTextSplitter producing the same chunks without LangChain
+
+    LangchainTextSplitter's separators ["\\n", "\\n\\n", "", " "] reduce to: split before every newline into lines,
+    merge consecutive lines shorter than CHUNK_SIZE into chunks of at most CHUNK_SIZE characters (keeping trailing
+    lines of up to OVERLAP characters as the start of the next chunk), and cut longer lines, or a text without
+    newlines, into CHUNK_SIZE-character windows overlapping by OVERLAP. Chunks are stripped; empty ones are dropped.
+
+    Every chunk is a contiguous span of the input, so the scan only tracks offsets and slices each chunk once;
+    `split_offsets` returns the spans without copying.
+    """
+
+    CHUNK_SIZE: ClassVar[int] = 100  # chunk length
+    OVERLAP: ClassVar[int] = 10  # chunk overlap length
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE, overlap: int = OVERLAP):
+        if chunk_size < 2:
+            # With one-character chunks LangChain emits separator characters unstripped; not worth mirroring
+            raise ValueError(f"chunk_size must be >= 2, got {chunk_size}")
+        if not 0 <= overlap <= chunk_size:
+            raise ValueError(f"overlap must be between 0 and chunk_size, got {overlap}")
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+
+    def split(self, text: str) -> list[str]:
+        chunks = [text[start:end] for start, end in self.split_offsets(text)]
+        logger.info(f"Split text into {len(chunks)} chunks")
+        return chunks
+
+    def split_offsets(self, text: str) -> list[tuple[int, int]]:
+        """(start, end) of every chunk in `text`, in order: text[start:end] is the chunk"""
+        spans: list[tuple[int, int]] = []
+        if "\n" not in text:
+            self._windows(text, 0, len(text), spans)
+            return spans
+
+        # Line i spans [bounds[i], bounds[i + 1]); every line but the first starts with its newline (and so does the
+        # first when the text does: searching from 1 keeps that newline from producing an empty line)
+        bounds = [0]
+        position = text.find("\n", 1)
+        while position != -1:
+            bounds.append(position)
+            position = text.find("\n", position + 1)
+        bounds.append(len(text))
+
+        first = 0  # first line of the chunk being built
+        for line in range(len(bounds) - 1):
+            start, end = bounds[line], bounds[line + 1]
+            if end - start >= self.chunk_size:
+                # Lines already merged are flushed without carrying an overlap into the long line
+                if first < line:
+                    self._emit(text, bounds[first], start, spans)
+                self._windows(text, start, end, spans)
+                first = line + 1
+                continue
+            if end - bounds[first] > self.chunk_size and first < line:
+                self._emit(text, bounds[first], start, spans)
+                # Keep trailing lines that fit in the overlap and leave room for this one
+                while first < line and (start - bounds[first] > self.overlap or end - bounds[first] > self.chunk_size):
+                    first += 1
+        if first < len(bounds) - 1:
+            self._emit(text, bounds[first], bounds[-1], spans)
+        return spans
+
+    def _windows(self, text: str, start: int, end: int, spans: list[tuple[int, int]]) -> None:
+        # Character-level merge: full windows restart min(overlap, chunk_size - 1) characters before their end
+        step_back = min(self.overlap, self.chunk_size - 1)
+        while start < end:
+            window_end = min(start + self.chunk_size, end)
+            self._emit(text, start, window_end, spans)
+            if window_end == end:
+                break
+            start = window_end - step_back
+
+    @staticmethod
+    def _emit(text: str, start: int, end: int, spans: list[tuple[int, int]]) -> None:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+
+
+@lru_cache
+def build_text_splitter(kind: str) -> ContentTextSplitter:
+    """Shared splitter for one of TEXT_SPLITTERS, handing large documents to the preprocessing pool when enabled"""
+    splitter = _text_splitter(kind)
+    if settings.preprocess_workers <= 0:
+        return splitter
+    return ParallelTextSplitter(
+        splitter,
+        partial(preprocess_executor, settings.preprocess_workers),
+        settings.preprocess_threshold_chars,
+        settings.preprocess_shard_chars,
+        sign_chunks=settings.chunk_dedup_enabled,
+    )
+
+
+def _text_splitter(kind: str) -> ContentTextSplitter:
+    # LangChain is only imported when it is selected
+    if kind == "native":
+        return NativeTextSplitter()
+    if kind == "sentence":
+        return SentenceTextSplitter(settings.chunk_max_tokens, settings.chunk_min_tokens, settings.chunk_overlap_tokens)
+    if kind == "langchain":
+        from .langchain_text_splitter import LangchainTextSplitter
+
+        return LangchainTextSplitter()
+    raise ValueError(f"Unknown text splitter: {kind}")
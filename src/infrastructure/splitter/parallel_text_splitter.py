@@ -0,0 +1,111 @@
+import logging
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import replace
+
+from src.domain.content_text_spliter import ContentTextSplitter, SplitText
+from src.domain.near_duplicate_index import simhash
+
+logger = logging.getLogger(__name__)
+
+# Preferred shard boundaries, best first: paragraph break, line break, any space
+SHARD_BOUNDARIES = ("\n\n", "\n", " ")
+
+
+def shard_bounds(text: str, shard_chars: int) -> list[tuple[int, int]]:
+    """Consecutive (start, end) spans of about shard_chars covering `text`, each ending at whitespace when possible
+
+    A boundary is looked for in the second half of each shard, so shards are at least half the target size. Without
+    whitespace there the shard is cut at the target, which may cut a word in two.
+    """
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    while len(text) - start > shard_chars:
+        target = start + shard_chars
+        end = target
+        for boundary in SHARD_BOUNDARIES:
+            found = text.rfind(boundary, start + shard_chars // 2, target)
+            if found != -1:
+                end = found + len(boundary)
+                break
+        bounds.append((start, end))
+        start = end
+    bounds.append((start, len(text)))
+    return bounds
+
+
+def split_shard(splitter: ContentTextSplitter, shard: str, sign: bool = False) -> SplitText:
+    """Runs in a pool process: split and count one shard, and sign its chunks when `sign`"""
+    split = splitter.split_counted(shard)
+    return replace(split, chunk_signatures=[simhash(chunk) for chunk in split.chunks]) if sign else split
+
+
+_executors: dict[int, ProcessPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def preprocess_executor(workers: int) -> ProcessPoolExecutor:
+    """The process pool of this process, created on first use (its workers start with the first shards)"""
+    with _executors_lock:
+        if workers not in _executors:
+            # Spawned rather than forked: API and CLI processes run threads
+            _executors[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executors[workers]
+
+
+def shutdown_preprocess_executors() -> None:
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(cancel_futures=True)
+        _executors.clear()
+
+
+class ParallelTextSplitter(ContentTextSplitter):
+    """Splits and word-counts documents of threshold_chars or more in a process pool, off the request thread's GIL
+
+    Large texts are cut into shards of about shard_chars at paragraph (else line, else word) boundaries, every shard
+    is split and counted by the wrapped splitter in a worker process, and the results are concatenated in order.
+    Chunks never span two shards, so they can differ from a single-pass split only where a shard ends. With
+    `sign_chunks` the workers also take the SimHash signature of every chunk for the near-duplicate lookup. Smaller
+    texts are split in-process and left unsigned.
+    """
+
+    def __init__(
+        self,
+        splitter: ContentTextSplitter,
+        executor: Callable[[], Executor],
+        threshold_chars: int = 1_000_000,
+        shard_chars: int = 250_000,
+        sign_chunks: bool = False,
+    ):
+        if shard_chars <= 0 or threshold_chars < shard_chars:
+            raise ValueError(f"Need 0 < shard_chars <= threshold_chars, got {shard_chars} and {threshold_chars}")
+        self.splitter = splitter
+        self.executor = executor
+        self.threshold_chars = threshold_chars
+        self.shard_chars = shard_chars
+        self.sign_chunks = sign_chunks
+
+    def split(self, text: str) -> list[str]:
+        return self.split_counted(text).chunks
+
+    def split_counted(self, text: str) -> SplitText:
+        if len(text) < self.threshold_chars:
+            return self.splitter.split_counted(text)
+
+        bounds = shard_bounds(text, self.shard_chars)
+        shards = [text[start:end] for start, end in bounds]
+        results = list(
+            self.executor().map(split_shard, [self.splitter] * len(shards), shards, [self.sign_chunks] * len(shards))
+        )
+        logger.info(f"Split {len(text)} characters in {len(shards)} shards into the process pool")
+        return SplitText(
+            [chunk for result in results for chunk in result.chunks],
+            [count for result in results for count in result.chunk_word_counts],
+            sum(result.word_count for result in results),
+            [signature for result in results for signature in result.chunk_signatures] if self.sign_chunks else None,
+        )
@@ -0,0 +1,122 @@
+import logging
+import re
+from collections.abc import Callable
+
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.infrastructure.embeddings.batch_engine import approximate_token_count
+
+logger = logging.getLogger(__name__)
+
+# End of a sentence (terminal punctuation, optional closing quote or bracket, then whitespace) or of a line
+SENTENCE_END = re.compile(r"[.!?\u2026][\"'\u201d\u2019)\]]*\s+|\n\s*")
+
+
+class SentenceTextSplitter(ContentTextSplitter):
+    """Packs whole sentences into chunks of up to max_tokens, preferring to end them at paragraph breaks
+
+    A chunk is closed at the first paragraph break once it holds min_tokens, or before the sentence that would push it
+    past max_tokens. The next chunk starts with the trailing sentences of the previous one that fit in overlap_tokens.
+    A sentence longer than max_tokens is cut at word boundaries. Every candidate chunk is counted as the whole span of
+    text it covers, whitespace between its sentences included, so no chunk exceeds max_tokens.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 512,
+        min_tokens: int = 256,
+        overlap_tokens: int = 32,
+        count_tokens: Callable[[str], int] = approximate_token_count,
+    ):
+        if max_tokens <= 0:
+            raise ValueError(f"max_tokens must be > 0, got {max_tokens}")
+        if not 0 <= min_tokens <= max_tokens:
+            raise ValueError(f"min_tokens must be between 0 and max_tokens, got {min_tokens}")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError(f"overlap_tokens must be between 0 and max_tokens - 1, got {overlap_tokens}")
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.overlap_tokens = overlap_tokens
+        self.count_tokens = count_tokens
+
+    def split(self, text: str) -> list[str]:
+        chunks = [text[start:end] for start, end in self.split_offsets(text)]
+        logger.info(f"Split text into {len(chunks)} chunks")
+        return chunks
+
+    def split_offsets(self, text: str) -> list[tuple[int, int]]:
+        """(start, end) of every chunk in `text`, in order: text[start:end] is the chunk"""
+        spans: list[tuple[int, int]] = []
+        units = self._units(text)
+        first, total = 0, 0  # first unit of the chunk being built and the token count of its span
+        for index, (_, end, tokens, paragraph_end) in enumerate(units):
+            if first < index:
+                # Count the span the chunk would cover: the whitespace between sentences is tokens too
+                total = self.count_tokens(text[units[first][0] : end])
+                if total > self.max_tokens:
+                    spans.append((units[first][0], units[index - 1][1]))
+                    first = self._overlap(text, units, first, index)
+                    total = self.count_tokens(text[units[first][0] : end]) if first < index else tokens
+            else:
+                total = tokens
+            if paragraph_end and total >= self.min_tokens:
+                spans.append((units[first][0], end))
+                first, total = index + 1, 0
+        if first < len(units):
+            spans.append((units[first][0], units[-1][1]))
+        return spans
+
+    def _overlap(self, text: str, units: list[tuple[int, int, int, bool]], first: int, index: int) -> int:
+        # Walk back from the end of the emitted chunk while the carried sentences fit the overlap and leave room
+        # for the sentence that opens the new chunk
+        start, emitted_end, end = index, units[index - 1][1], units[index][1]
+        while start - 1 > first:
+            opening = units[start - 1][0]
+            if (
+                self.count_tokens(text[opening:emitted_end]) > self.overlap_tokens
+                or self.count_tokens(text[opening:end]) > self.max_tokens
+            ):
+                break
+            start -= 1
+        return start
+
+    def _units(self, text: str) -> list[tuple[int, int, int, bool]]:
+        """(start, end, tokens, ends a paragraph) of every stripped sentence, long sentences cut into pieces"""
+        units: list[tuple[int, int, int, bool]] = []
+        start = 0
+        for match in SENTENCE_END.finditer(text):
+            gap = match.group()
+            self._add_sentence(text, start, match.start() + len(gap.rstrip()), gap.count("\n") > 1, units)
+            start = match.end()
+        self._add_sentence(text, start, len(text), True, units)
+        return units
+
+    def _add_sentence(
+        self, text: str, start: int, end: int, paragraph_end: bool, units: list[tuple[int, int, int, bool]]
+    ) -> None:
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start == end:
+            if paragraph_end and units:
+                units[-1] = (*units[-1][:3], True)
+            return
+        tokens = self.count_tokens(text[start:end])
+        if tokens <= self.max_tokens:
+            units.append((start, end, tokens, paragraph_end))
+            return
+        # Cut at the last whitespace that keeps each piece within the budget (mid-word only when there is none)
+        while start < end:
+            piece_end = end
+            while tokens > self.max_tokens:
+                # Shrink proportionally to the budget, then back to the nearest space
+                target = start + max(1, (piece_end - start) * self.max_tokens // tokens)
+                space = text.rfind(" ", start + 1, target + 1)
+                piece_end = space if space > start else target
+                tokens = self.count_tokens(text[start:piece_end])
+            units.append((start, piece_end, tokens, False))
+            start = piece_end
+            while start < end and text[start].isspace():
+                start += 1
+            tokens = self.count_tokens(text[start:end]) if start < end else 0
+        units[-1] = (*units[-1][:3], paragraph_end)
@@ -1,8 +1,47 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.api.v1.endpoints import create_document, health, search_document
+from src.api.v1.dependencies import (
+    get_embedding_worker_pool,
+    load_memory_vector_store,
+    shutdown_query_embedding_executor,
+)
+from src.api.v1.endpoints import (
+    bulk_ingest,
+    create_document,
+    health,
+    ingest_document,
+    metrics,
+    search_document,
+    update_document,
+)
+from src.config import settings
+from src.infrastructure.database import dispose_engines, init_database
+from src.infrastructure.splitter.parallel_text_splitter import shutdown_preprocess_executors
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    init_database()
+    if settings.search_backend == "memory":
+        load_memory_vector_store()
+    if settings.ingest_workers > 0:
+        get_embedding_worker_pool().start()
+    yield
+    if settings.ingest_workers > 0:
+        get_embedding_worker_pool().stop()
+    shutdown_query_embedding_executor()
+    shutdown_preprocess_executors()
+    await dispose_engines()
+
 
-app = FastAPI(title="Embeddings API with DDD + OpenAI + LangChain")
+app = FastAPI(title="Embeddings API with DDD + OpenAI + LangChain", lifespan=lifespan)
 app.include_router(health.router, prefix="/v1")
 app.include_router(create_document.router, prefix="/v1")
+app.include_router(update_document.router, prefix="/v1")
+app.include_router(ingest_document.router, prefix="/v1")
+app.include_router(bulk_ingest.router, prefix="/v1")
 app.include_router(search_document.router, prefix="/v1")
+app.include_router(metrics.router, prefix="/v1")
@@ -1,19 +1,38 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
 from fastapi.testclient import TestClient
 
 from src.main import app
-from src.api.v1.dependencies import get_create_document_use_case, get_search_documents_use_case
+from src.api.v1.dependencies import (
+    get_bulk_ingest_pipeline,
+    get_create_document_use_case,
+    get_document_status_use_case,
+    get_ingest_document_use_case,
+    get_search_documents_use_case,
+    get_update_document_use_case,
+)
+from src.application.bulk_ingest import BulkIngestBatchUseCase
 from src.application.create_document import CreateDocumentUseCase
+from src.application.ingest_document import GetDocumentStatusUseCase, IngestDocumentUseCase
 from src.application.search_document import SearchDocumentsUseCase
+from src.application.update_document import UpdateDocumentUseCase
 from src.domain.content_text_spliter import ContentTextSplitter
-from src.domain.document import Document, DocumentChunk
+from src.domain.document import ChunkDiff, Document, DocumentChunk
 from src.domain.document_repository import DocumentRepository
 from src.domain.embeddings import EmbeddingGenerator
+from src.domain.services.document_processing_service import DocumentProcessingService
+from src.infrastructure.bulk_ingest import BulkIngestPipeline
 
 
 class FakeEmbeddings(EmbeddingGenerator):
     def embed(self, texts: list[str]) -> list[list[float]]:
         return [[0.0] * 3072 for _ in texts]
 
+    def embed_query(self, text: str) -> list[float]:
+        return [0.0] * 3072
+
 
 class FakeSplitter(ContentTextSplitter):
     def split(self, text: str) -> list[str]:
@@ -33,6 +52,15 @@ class FakeRepo(DocumentRepository):
         self.docs.append(persisted)
         return persisted
 
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        return self.docs[offset : offset + limit]
+
+    def delete_document(self, doc_id: int) -> bool:
+        return False
+
+    def document_exists(self, doc_id: int) -> bool:
+        return self.get_document(doc_id) is not None
+
     def get_document(self, doc_id: int) -> Document | None:
         for d in self.docs:
             if d.id == doc_id:
@@ -42,12 +70,70 @@ class FakeRepo(DocumentRepository):
     def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
         self._chunk_id += 1
         persisted = DocumentChunk(
-            id=self._chunk_id, document_id=chunk.document_id, content=chunk.content, embedding=[0.0] * 3072
+            id=self._chunk_id,
+            document_id=chunk.document_id,
+            content=chunk.content,
+            embedding=[0.0] * 3072,
+            position=chunk.position,
         )
         self.chunks.append(persisted)
         return persisted
 
-    def search_similar(self, query_embedding: list[float], limit: int = 5, min_similarity: float = 0.0) -> list[dict]:
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        return [self.save_chunk(chunk) for chunk in chunks]
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        persisted = self.save_document(doc)
+        for chunk in chunks:
+            chunk.document_id = persisted.id
+        return persisted, self.save_chunks(chunks)
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        return [self.save_document_with_chunks(doc, chunks)[0] for doc, chunks in documents]
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        removed = {chunk.id for chunk in diff.removed}
+        self.chunks = [c for c in self.chunks if c.id not in removed]
+        self.docs = [doc if d.id == doc.id else d for d in self.docs]
+        for chunk in diff.added:
+            chunk.document_id = doc.id
+        return doc, self.save_chunks(diff.added)
+
+    def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        return [c for c in self.chunks if c.document_id == document_id]
+
+    def get_chunk(self, chunk_id: int) -> DocumentChunk | None:
+        return None
+
+    def delete_chunk(self, chunk_id: int) -> bool:
+        return False
+
+    def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return []
+
+    def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        return False
+
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        return 0
+
+    @contextmanager
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> Iterator[list[DocumentChunk]]:
+        yield []
+
+    def count_chunks_without_embeddings(self) -> int:
+        return 0
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
         # Return the last chunk as the top match
         if not self.chunks:
             return []
@@ -62,17 +148,78 @@ class FakeRepo(DocumentRepository):
             }
         ]
 
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        return [
+            self.search_similar(embedding, limit, min_similarity)
+            for embedding, limit, min_similarity in zip(query_embeddings, limits, min_similarities)
+        ]
+
+    def corpus_version(self) -> int:
+        return 0
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        titles = {d.id: d.title for d in self.docs}
+        words = query.lower().split()
+        return [
+            {
+                "id": c.id,
+                "document_id": c.document_id,
+                "content": c.content,
+                "title": titles.get(c.document_id, ""),
+                "rank": 0.5,
+            }
+            for c in self.chunks
+            if any(word in c.content.lower() for word in words)
+        ][:limit]
+
 
 def get_fake_create_uc() -> CreateDocumentUseCase:
-    return CreateDocumentUseCase(FakeRepo(), FakeSplitter(), FakeEmbeddings())
+    return CreateDocumentUseCase(FakeRepo(), DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+
+
+editing_repo = FakeRepo()
+
+
+def get_fake_update_uc() -> UpdateDocumentUseCase:
+    return UpdateDocumentUseCase(editing_repo, DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
 
 
 def get_fake_search_uc() -> SearchDocumentsUseCase:
-    return SearchDocumentsUseCase(FakeRepo(), FakeEmbeddings())
+    return SearchDocumentsUseCase(FakeRepo(), DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+
+
+background_repo = FakeRepo()
+
+
+def get_fake_ingest_uc() -> IngestDocumentUseCase:
+    return IngestDocumentUseCase(background_repo, DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+
+
+def get_fake_status_uc() -> GetDocumentStatusUseCase:
+    return GetDocumentStatusUseCase(background_repo)
+
+
+bulk_repo = FakeRepo()
+
+
+def get_fake_bulk_pipeline() -> BulkIngestPipeline:
+    use_case = BulkIngestBatchUseCase(bulk_repo, DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+    return BulkIngestPipeline(use_case.execute, batch_size=2, workers=2)
 
 
 app.dependency_overrides[get_create_document_use_case] = get_fake_create_uc
+app.dependency_overrides[get_update_document_use_case] = get_fake_update_uc
 app.dependency_overrides[get_search_documents_use_case] = get_fake_search_uc
+app.dependency_overrides[get_ingest_document_use_case] = get_fake_ingest_uc
+app.dependency_overrides[get_document_status_use_case] = get_fake_status_uc
+app.dependency_overrides[get_bulk_ingest_pipeline] = get_fake_bulk_pipeline
 
 client = TestClient(app)
 
@@ -80,7 +227,7 @@ client = TestClient(app)
 def test_create_document_endpoint():
     resp = client.post(
         "/v1/documents/",
-        json={"title": "T", "text": "content"},
+        json={"title": "T", "text": "some longer content"},
     )
     assert resp.status_code == 200
     data = resp.json()
@@ -88,13 +235,120 @@ def test_create_document_endpoint():
     assert isinstance(data["chunks"], list)
 
 
+def test_create_document_rejects_an_unknown_chunking_strategy():
+    resp = client.post("/v1/documents/", json={"title": "T", "text": "some longer content", "chunking": "paragraph"})
+
+    assert resp.status_code == 422
+
+
+def test_update_document_endpoint_returns_the_chunk_diff():
+    original = CreateDocumentUseCase(editing_repo, DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+    document_id = original.execute("T", "some longer content")["document"]["id"]
+
+    resp = client.put(f"/v1/documents/{document_id}", json={"title": "T2", "text": "some edited content"})
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["document"]["title"] == "T2"
+    assert data["chunk_diff"] == {"unchanged_chunks": 0, "added_chunks": 1, "removed_chunks": 1}
+    assert [c["content"] for c in data["chunks"]] == ["some edited content"]
+
+
+def test_update_of_unknown_document_is_404():
+    assert client.put("/v1/documents/999", json={"title": "T", "text": "some longer content"}).status_code == 404
+
+
 def test_search_endpoint():
     # Seed create to have something to search
-    client.post("/v1/documents/", json={"title": "Doc", "text": "hello world"})
+    client.post("/v1/documents/", json={"title": "Doc", "text": "hello world, again"})
     resp = client.get("/v1/search/?query=hello&limit=5")
     assert resp.status_code == 200
-    results = resp.json()
+    results = resp.json()["results"]
     assert isinstance(results, list)
     if results:
         assert "chunk_id" in results[0]
         assert "document_title" in results[0]
+
+
+def test_search_endpoint_forwards_index_tuning():
+    resp = client.get("/v1/search/?query=hello&limit=3&ef_search=80&probes=4")
+    assert resp.status_code == 200
+    params = resp.json()["search_parameters"]
+    assert params == {
+        "limit": 3,
+        "min_similarity": 0.0,
+        "ef_search": 80,
+        "probes": 4,
+        "mode": "vector",
+        "collapse_duplicates": False,
+    }
+
+
+def test_search_endpoint_rejects_out_of_range_ef_search():
+    resp = client.get("/v1/search/?query=hello&ef_search=5000")
+    assert resp.status_code == 422
+
+
+def test_search_endpoint_accepts_a_search_mode_and_rejects_unknown_ones():
+    resp = client.get("/v1/search/?query=hello&mode=hybrid")
+    assert resp.status_code == 200
+    assert resp.json()["search_parameters"]["mode"] == "hybrid"
+
+    assert client.get("/v1/search/?query=hello&mode=fuzzy").status_code == 422
+
+
+def test_batch_search_returns_one_result_per_query_in_order():
+    resp = client.post(
+        "/v1/search/batch",
+        json={"queries": [{"query": "hello", "limit": 2}, {"query": "world", "min_similarity": 0.5}], "ef_search": 40},
+    )
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total_queries"] == 2
+    assert [r["query"] for r in body["results"]] == ["hello", "world"]
+    assert body["results"][0]["search_parameters"]["limit"] == 2
+    assert body["results"][1]["search_parameters"]["ef_search"] == 40
+
+
+def test_batch_search_rejects_an_empty_batch():
+    assert client.post("/v1/search/batch", json={"queries": []}).status_code == 422
+
+
+def test_background_ingest_returns_202_with_status_location():
+    resp = client.post("/v1/documents/background", json={"title": "T", "text": "some longer content"})
+    assert resp.status_code == 202
+    job = resp.json()
+    assert job["job_id"] == job["document_id"]
+    assert resp.headers["location"] == f"/v1/documents/{job['job_id']}/status"
+
+    status_resp = client.get(resp.headers["location"])
+    assert status_resp.status_code == 200
+    assert status_resp.json()["job_id"] == job["job_id"]
+
+
+def test_status_of_unknown_document_is_404():
+    assert client.get("/v1/documents/999/status").status_code == 404
+
+
+def test_bulk_ingest_streams_ndjson_and_resumes_with_skip():
+    def body():
+        yield b'{"title": "One", "text": "first document body"}\n{"title": "Two", '
+        yield b'"text": "second document body"}\nnot json\n'
+        yield b'{"title": "Three", "text": "third document body"}\n'
+
+    resp = client.post("/v1/documents/bulk", content=body(), headers={"content-type": "application/x-ndjson"})
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["completed"] is True
+    assert (report["documents"], report["lines_committed"]) == (3, 4)
+    assert report["rejected"] == [{"line": 3, "error": "Invalid JSON: Expecting value"}]
+    assert set(report["stages"]) == {"read", "split", "embed", "write"}
+
+    resumed = client.post("/v1/documents/bulk?skip=3", content=b"".join(body()))
+    assert (resumed.json()["documents"], resumed.json()["rejected_count"]) == (1, 0)
+
+    skipped = client.post("/v1/documents/bulk?skip_ranges=1-1&skip_ranges=3-4", content=b"".join(body()))
+    assert (skipped.json()["documents"], skipped.json()["lines_committed"]) == (1, 2)
+    assert skipped.json()["committed_ranges"] == ["3-4"]
+    assert client.post("/v1/documents/bulk?skip_ranges=4-3", content=b"").status_code == 422
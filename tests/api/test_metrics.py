@@ -0,0 +1,29 @@
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+def test_pool_metrics_endpoint():
+    client = TestClient(app)
+    resp = client.get("/v1/metrics/pool")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["sync"]["checked_out"] == 0
+    assert "avg_wait_ms" in body["sync"]
+    assert "async" in body
+
+
+def test_embedding_cache_metrics_endpoint():
+    client = TestClient(app)
+    resp = client.get("/v1/metrics/embedding-cache")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {"hits", "misses", "evictions", "hit_ratio"} <= body.keys()
+
+
+def test_search_cache_metrics_endpoint():
+    client = TestClient(app)
+    resp = client.get("/v1/metrics/search-cache")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {"enabled", "hits", "misses", "invalidations", "hit_ratio", "saved_seconds"} <= body.keys()
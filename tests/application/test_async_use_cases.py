@@ -0,0 +1,196 @@
+import asyncio
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import pytest
+
+from src.application.create_document import AsyncCreateDocumentUseCase
+from src.application.ingest_document import AsyncIngestDocumentUseCase
+from src.application.search_document import AsyncSearchDocumentsUseCase
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.document_repository import AsyncDocumentRepository
+from src.domain.embeddings import AsyncEmbeddingGenerator
+from src.domain.services.document_processing_service import AsyncDocumentProcessingService
+
+
+class FakeAsyncEmbeddings(AsyncEmbeddingGenerator):
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(0)
+        return [[1.0, 0.0] for _ in texts]
+
+    async def embed_query(self, text: str) -> list[float]:
+        await asyncio.sleep(0)
+        return [1.0, 0.0]
+
+
+class FakeSplitter(ContentTextSplitter):
+    def split(self, text: str) -> list[str]:
+        return [text[:5], text[5:]]
+
+
+class LoopReleasedSplitter(ContentTextSplitter):
+    """Blocks until a task on the event loop releases it: a split run on the loop itself times out"""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def split(self, text: str) -> list[str]:
+        if not self.released.wait(timeout=2):
+            raise TimeoutError("the event loop was blocked while splitting")
+        return [text[:5], text[5:]]
+
+
+class FakeAsyncRepo(AsyncDocumentRepository):
+    def __init__(self):
+        self.documents: list[Document] = []
+        self.chunks: list[DocumentChunk] = []
+
+    async def save_document(self, doc: Document) -> Document:
+        persisted = Document(id=len(self.documents) + 1, title=doc.title, content=doc.content)
+        self.documents.append(persisted)
+        return persisted
+
+    async def get_document(self, doc_id: int) -> Optional[Document]:
+        return next((d for d in self.documents if d.id == doc_id), None)
+
+    async def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        return self.documents[offset : offset + limit]
+
+    async def delete_document(self, doc_id: int) -> bool:
+        return False
+
+    async def document_exists(self, doc_id: int) -> bool:
+        return await self.get_document(doc_id) is not None
+
+    async def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        persisted = DocumentChunk(
+            id=len(self.chunks) + 1, document_id=chunk.document_id, content=chunk.content, embedding=chunk.embedding
+        )
+        self.chunks.append(persisted)
+        return persisted
+
+    async def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        return [await self.save_chunk(chunk) for chunk in chunks]
+
+    async def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        persisted = await self.save_document(doc)
+        for chunk in chunks:
+            chunk.document_id = persisted.id
+        return persisted, await self.save_chunks(chunks)
+
+    async def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        removed = {chunk.id for chunk in diff.removed}
+        self.chunks = [c for c in self.chunks if c.id not in removed]
+        for chunk in diff.added:
+            chunk.document_id = doc.id
+        return doc, await self.save_chunks(diff.added)
+
+    async def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        return [c for c in self.chunks if c.document_id == document_id]
+
+    async def get_chunk(self, chunk_id: int) -> Optional[DocumentChunk]:
+        return None
+
+    async def delete_chunk(self, chunk_id: int) -> bool:
+        return False
+
+    async def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        return [
+            {"id": c.id, "document_id": c.document_id, "content": c.content, "title": "Title", "similarity": 1.0}
+            for c in self.chunks[:limit]
+        ]
+
+    async def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        return [await self.search_similar(embedding, limit) for embedding, limit in zip(query_embeddings, limits)]
+
+    async def corpus_version(self) -> int:
+        return 0
+
+    async def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        return [
+            {"id": c.id, "document_id": c.document_id, "content": c.content, "title": "Title", "rank": 0.5}
+            for c in self.chunks
+            if query.lower() in c.content.lower()
+        ][:limit]
+
+    async def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return []
+
+    async def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        return False
+
+    async def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        return 0
+
+    @asynccontextmanager
+    async def claim_chunks_without_embeddings(self, limit: int = 100) -> AsyncIterator[list[DocumentChunk]]:
+        yield []
+
+    async def count_chunks_without_embeddings(self) -> int:
+        return 0
+
+
+def test_async_create_then_search():
+    repo = FakeAsyncRepo()
+    service = AsyncDocumentProcessingService(FakeSplitter(), FakeAsyncEmbeddings())
+
+    async def scenario() -> tuple[dict, dict]:
+        created = await AsyncCreateDocumentUseCase(repo, service).execute("Title", "abcdefghijk")
+        found = await AsyncSearchDocumentsUseCase(repo, service).execute("abc", limit=1, ef_search=40)
+        return created, found
+
+    created, found = asyncio.run(scenario())
+
+    assert created["processing_status"]["total_chunks"] == 2
+    assert found["total_results"] == 1
+    assert found["results"][0]["chunk_id"] == created["chunks"][0]["id"]
+    assert found["search_parameters"]["ef_search"] == 40
+
+
+def test_async_hybrid_search_fuses_lexical_and_vector_matches():
+    repo = FakeAsyncRepo()
+    service = AsyncDocumentProcessingService(FakeSplitter(), FakeAsyncEmbeddings())
+
+    async def scenario() -> dict:
+        await AsyncCreateDocumentUseCase(repo, service).execute("Title", "abcdefghijk")
+        return await AsyncSearchDocumentsUseCase(repo, service).execute("fgh", limit=2, mode="hybrid")
+
+    found = asyncio.run(scenario())
+
+    assert [r["chunk_id"] for r in found["results"]] == [2, 1]
+    assert found["results"][0]["matched_by"] == ["lexical", "vector"]
+
+
+@pytest.mark.parametrize("use_case", [AsyncCreateDocumentUseCase, AsyncIngestDocumentUseCase])
+def test_async_ingestion_splits_off_the_event_loop(use_case):
+    splitter = LoopReleasedSplitter()
+    service = AsyncDocumentProcessingService(splitter, FakeAsyncEmbeddings())
+
+    async def release() -> None:
+        await asyncio.sleep(0.01)
+        splitter.released.set()
+
+    async def scenario() -> dict:
+        created, _ = await asyncio.gather(use_case(FakeAsyncRepo(), service).execute("Title", "abcdefghijk"), release())
+        return created
+
+    assert asyncio.run(scenario())["processing_status"]["total_chunks"] == 2
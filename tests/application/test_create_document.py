@@ -1,16 +1,59 @@
-from typing import List
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import List, Optional
+
+import pytest
 
 from src.application.create_document import CreateDocumentUseCase
-from src.domain.content_text_spliter import ContentTextSplitter
-from src.domain.document import Document, DocumentChunk
+from src.domain.content_text_spliter import ContentTextSplitter, SplitText
+from src.domain.document import ChunkDiff, Document, DocumentChunk
 from src.domain.document_repository import DocumentRepository
+from src.domain.embedding_store import EmbeddingStore
 from src.domain.embeddings import EmbeddingGenerator
+from src.domain.exceptions import DocumentProcessingException
+from src.domain.near_duplicate_index import NearDuplicateIndex, nearest_canonical
+from src.domain.services.document_processing_service import DocumentProcessingService
 
 
 class FakeEmbeddings(EmbeddingGenerator):
     def embed(self, texts: list[str]) -> list[list[float]]:
         return [[0.0] * 3072 for _ in texts]
 
+    def embed_query(self, text: str) -> list[float]:
+        return [0.0] * 3072
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+class FakeEmbeddingStore(EmbeddingStore):
+    def __init__(self):
+        self.entries: dict[str, list[float]] = {}
+
+    def get_many(self, texts: list[str]) -> dict[str, list[float]]:
+        return {t: self.entries[t] for t in texts if t in self.entries}
+
+    def put_many(self, embeddings: dict[str, list[float]]) -> None:
+        self.entries.update(embeddings)
+
+
+class FakeDuplicateIndex(NearDuplicateIndex):
+    """Band lookup over the canonical chunks of a FakeRepo"""
+
+    def __init__(self, repo: "FakeRepo"):
+        self.repo = repo
+
+    def find_canonical(self, signatures: list[int]) -> list[Optional[int]]:
+        canonical = [(c.id, c.simhash) for c in self.repo.chunks if c.simhash is not None and not c.is_duplicate()]
+        return nearest_canonical(signatures, canonical, max_distance=3)
+
 
 class FakeSplitter(ContentTextSplitter):
     def split(self, text: str) -> List[str]:
@@ -23,12 +66,11 @@ class FakeRepo(DocumentRepository):
         self.chunks: list[DocumentChunk] = []
         self._doc_id = 0
         self._chunk_id = 0
+        self.transactions = 0
 
     def save_document(self, doc: Document) -> Document:
-        self._doc_id += 1
-        persisted = Document(id=self._doc_id, title=doc.title, content=doc.content)
-        self.documents.append(persisted)
-        return persisted
+        self.transactions += 1
+        return self._persist_document(doc)
 
     def get_document(self, doc_id: int) -> Document | None:
         for d in self.documents:
@@ -36,27 +78,267 @@ class FakeRepo(DocumentRepository):
                 return d
         return None
 
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        return self.documents[offset : offset + limit]
+
+    def delete_document(self, doc_id: int) -> bool:
+        return False
+
+    def document_exists(self, doc_id: int) -> bool:
+        return self.get_document(doc_id) is not None
+
     def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        self.transactions += 1
+        return self._persist_chunk(chunk)
+
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        self.transactions += 1
+        return [self._persist_chunk(chunk) for chunk in chunks]
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        self.transactions += 1
+        persisted = self._persist_document(doc)
+        for chunk in chunks:
+            chunk.document_id = persisted.id
+        return persisted, [self._persist_chunk(chunk) for chunk in chunks]
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        return [self.save_document_with_chunks(doc, chunks)[0] for doc, chunks in documents]
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        self.transactions += 1
+        removed = {chunk.id for chunk in diff.removed}
+        self.chunks = [c for c in self.chunks if c.id not in removed]
+        self.documents = [doc if d.id == doc.id else d for d in self.documents]
+        for chunk in diff.added:
+            chunk.document_id = doc.id
+        return doc, [self._persist_chunk(chunk) for chunk in diff.added]
+
+    def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        return [c for c in self.chunks if c.document_id == document_id]
+
+    def get_chunk(self, chunk_id: int) -> Optional[DocumentChunk]:
+        return None
+
+    def delete_chunk(self, chunk_id: int) -> bool:
+        return False
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        return []
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        return [[] for _ in query_embeddings]
+
+    def corpus_version(self) -> int:
+        return 0
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        return []
+
+    def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return []
+
+    def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        return False
+
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        return 0
+
+    @contextmanager
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> Iterator[list[DocumentChunk]]:
+        yield []
+
+    def count_chunks_without_embeddings(self) -> int:
+        return 0
+
+    def _persist_document(self, doc: Document) -> Document:
+        self._doc_id += 1
+        persisted = Document(id=self._doc_id, title=doc.title, content=doc.content)
+        self.documents.append(persisted)
+        return persisted
+
+    def _persist_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
         self._chunk_id += 1
         persisted = DocumentChunk(
-            id=self._chunk_id, document_id=chunk.document_id, content=chunk.content, embedding=chunk.embedding
+            id=self._chunk_id,
+            document_id=chunk.document_id,
+            content=chunk.content,
+            embedding=chunk.embedding,
+            position=chunk.position,
+            simhash=chunk.simhash,
+            canonical_chunk_id=chunk.canonical_chunk_id,
         )
         self.chunks.append(persisted)
         return persisted
 
-    def search_similar(self, query_embedding: list[float], limit: int = 5) -> list[dict]:
-        return []
-
 
 def test_create_document_use_case():
     repo = FakeRepo()
     splitter = FakeSplitter()
     embeddings = FakeEmbeddings()
-    use_case = CreateDocumentUseCase(repo, splitter, embeddings)
+    use_case = CreateDocumentUseCase(repo, DocumentProcessingService(splitter, embeddings))
 
-    result = use_case.execute("Title", "abcdefghij")
+    result = use_case.execute("Title", "abcdefghijk")
 
     assert "document" in result
     assert "chunks" in result
     assert result["document"]["title"] == "Title"
     assert len(result["chunks"]) == 2
+
+
+def test_create_document_persists_document_and_chunks_in_one_transaction():
+    repo = FakeRepo()
+    use_case = CreateDocumentUseCase(repo, DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+
+    result = use_case.execute("Title", "abcdefghijk")
+
+    assert repo.transactions == 1
+    assert [c["id"] for c in result["chunks"]] == [1, 2]
+    assert all(c.document_id == result["document"]["id"] for c in repo.chunks)
+    assert result["processing_status"]["is_fully_processed"] is True
+
+
+def test_create_document_reuses_stored_embeddings():
+    embeddings = CountingEmbeddings()
+    service = DocumentProcessingService(FakeSplitter(), embeddings, FakeEmbeddingStore())
+    use_case = CreateDocumentUseCase(FakeRepo(), service)
+
+    first = use_case.execute("Title", "abcdefghijk")
+    second = use_case.execute("Copy", "abcdefghijk")
+
+    assert embeddings.embedded == ["abcde", "fghijk"]
+    assert first["embedding_reuse"]["hit_ratio"] == 0.0
+    assert second["embedding_reuse"] == {"total_chunks": 2, "reused_chunks": 2, "embedded_chunks": 0, "hit_ratio": 1.0}
+
+
+def test_repeated_chunks_are_embedded_once():
+    class LineSplitter(ContentTextSplitter):
+        def split(self, text: str) -> List[str]:
+            return text.splitlines()
+
+    embeddings = CountingEmbeddings()
+    use_case = CreateDocumentUseCase(FakeRepo(), DocumentProcessingService(LineSplitter(), embeddings))
+
+    result = use_case.execute("Title", "disclaimer\nbody text\ndisclaimer")
+
+    assert embeddings.embedded == ["disclaimer", "body text"]
+    assert len(result["chunks"]) == 3
+    assert result["embedding_reuse"]["reused_chunks"] == 1
+
+
+def test_chunking_strategy_can_be_chosen_per_document():
+    class LineSplitter(ContentTextSplitter):
+        def split(self, text: str) -> List[str]:
+            return text.splitlines()
+
+    requested: list[str] = []
+
+    def splitter_for(kind: str) -> ContentTextSplitter:
+        requested.append(kind)
+        return LineSplitter()
+
+    service = DocumentProcessingService(FakeSplitter(), FakeEmbeddings(), splitter_for=splitter_for)
+    use_case = CreateDocumentUseCase(FakeRepo(), service)
+
+    default = use_case.execute("Title", "first line\nsecond line")
+    chosen = use_case.execute("Title", "first line\nsecond line", chunking="sentence")
+
+    assert [c["content"] for c in default["chunks"]] == ["first", " line\nsecond line"]
+    assert [c["content"] for c in chosen["chunks"]] == ["first line", "second line"]
+    assert requested == ["sentence"]
+
+
+def test_unknown_chunking_strategy_is_a_processing_error():
+    service = DocumentProcessingService(FakeSplitter(), FakeEmbeddings(), splitter_for=lambda kind: FakeSplitter())
+
+    with pytest.raises(DocumentProcessingException):
+        CreateDocumentUseCase(FakeRepo(), service).execute("Title", "abcdefghijk", chunking="paragraph")
+
+
+def test_word_counts_taken_while_splitting_are_not_recounted():
+    class CountedSplitter(FakeSplitter):
+        def split_counted(self, text: str) -> SplitText:
+            return SplitText(self.split(text), [7, 8], 42)
+
+    document = Document(title="Title", content="abcdefghijk")
+    service = DocumentProcessingService(CountedSplitter(), FakeEmbeddings())
+
+    chunks, _ = service.process_document_with_reuse(document)
+
+    assert document.word_count() == 42
+    assert [chunk.word_count() for chunk in chunks] == [7, 8]
+
+
+class LineSplitter(ContentTextSplitter):
+    def split(self, text: str) -> List[str]:
+        return text.splitlines()
+
+
+def test_near_duplicates_of_stored_chunks_are_linked_instead_of_embedded():
+    repo = FakeRepo()
+    embeddings = CountingEmbeddings()
+    use_case = CreateDocumentUseCase(
+        repo, DocumentProcessingService(LineSplitter(), embeddings, duplicate_index=FakeDuplicateIndex(repo))
+    )
+    use_case.execute("Original", "All rights reserved by the publisher\nfirst body")
+    embeddings.embedded.clear()
+
+    result = use_case.execute("Copy", "ALL RIGHTS RESERVED, by the publisher.\nsecond body")
+
+    assert embeddings.embedded == ["second body"]
+    assert [(c["has_embedding"], c["canonical_chunk_id"]) for c in result["chunks"]] == [(False, 1), (True, None)]
+    assert result["deduplication"] == {"duplicate_chunks": 1, "dedup_ratio": 0.5}
+    assert result["processing_status"]["duplicate_chunks"] == 1
+    assert result["processing_status"]["is_fully_processed"] is True
+
+
+def test_chunks_too_short_to_sign_are_embedded_not_linked():
+    repo = FakeRepo()
+    embeddings = CountingEmbeddings()
+    use_case = CreateDocumentUseCase(
+        repo, DocumentProcessingService(LineSplitter(), embeddings, duplicate_index=FakeDuplicateIndex(repo))
+    )
+    use_case.execute("Original", "* * *\nfirst body")
+    embeddings.embedded.clear()
+
+    result = use_case.execute("Other", "---\nsecond body")
+
+    assert embeddings.embedded == ["---", "second body"]
+    assert [c["canonical_chunk_id"] for c in result["chunks"]] == [None, None]
+    assert result["deduplication"]["duplicate_chunks"] == 0
+
+
+def test_signatures_taken_while_splitting_are_not_recomputed(monkeypatch):
+    class SigningSplitter(LineSplitter):
+        def split_counted(self, text: str) -> SplitText:
+            split = super().split_counted(text)
+            return replace(split, chunk_signatures=[7 + position for position in range(len(split.chunks))])
+
+    def recompute(text_chunks: list[str]) -> list[Optional[int]]:
+        raise AssertionError("signed while splitting")
+
+    monkeypatch.setattr(DocumentProcessingService, "signatures", staticmethod(recompute))
+    repo = FakeRepo()
+    use_case = CreateDocumentUseCase(
+        repo, DocumentProcessingService(SigningSplitter(), FakeEmbeddings(), duplicate_index=FakeDuplicateIndex(repo))
+    )
+
+    use_case.execute("Title", "first line of the body\nsecond line of the body")
+
+    assert [chunk.simhash for chunk in repo.chunks] == [7, 8]
@@ -0,0 +1,226 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+import pytest
+
+from src.application.bulk_ingest import BulkIngestBatchUseCase, BulkRecord
+from src.application.ingest_document import EmbedPendingChunksUseCase, GetDocumentStatusUseCase, IngestDocumentUseCase
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.document_repository import DocumentRepository
+from src.domain.embeddings import EmbeddingGenerator
+from src.domain.exceptions import DocumentNotFoundError, EmbeddingGenerationException
+from src.domain.services.document_processing_service import DocumentProcessingService
+
+
+class FakeEmbeddings(EmbeddingGenerator):
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls += 1
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+
+class WordSplitter(ContentTextSplitter):
+    def split(self, text: str) -> list[str]:
+        return text.split()
+
+
+class InMemoryRepo(DocumentRepository):
+    def __init__(self):
+        self.documents: dict[int, Document] = {}
+        self.chunks: dict[int, DocumentChunk] = {}
+        self.claimed: set[int] = set()
+
+    def save_document(self, doc: Document) -> Document:
+        persisted = Document(id=len(self.documents) + 1, title=doc.title, content=doc.content)
+        self.documents[persisted.id] = persisted
+        return persisted
+
+    def get_document(self, doc_id: int) -> Optional[Document]:
+        return self.documents.get(doc_id)
+
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        return list(self.documents.values())[offset : offset + limit]
+
+    def delete_document(self, doc_id: int) -> bool:
+        return False
+
+    def document_exists(self, doc_id: int) -> bool:
+        return doc_id in self.documents
+
+    def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        persisted = DocumentChunk(
+            id=len(self.chunks) + 1, document_id=chunk.document_id, content=chunk.content, embedding=chunk.embedding
+        )
+        self.chunks[persisted.id] = persisted
+        return persisted
+
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        return [self.save_chunk(chunk) for chunk in chunks]
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        persisted = self.save_document(doc)
+        for chunk in chunks:
+            chunk.document_id = persisted.id
+        return persisted, self.save_chunks(chunks)
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        return [self.save_document_with_chunks(doc, chunks)[0] for doc, chunks in documents]
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        for chunk in diff.removed:
+            del self.chunks[chunk.id]
+        self.documents[doc.id] = doc
+        for chunk in diff.added:
+            chunk.document_id = doc.id
+        return doc, self.save_chunks(diff.added)
+
+    def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        return [c for c in self.chunks.values() if c.document_id == document_id]
+
+    def get_chunk(self, chunk_id: int) -> Optional[DocumentChunk]:
+        return self.chunks.get(chunk_id)
+
+    def delete_chunk(self, chunk_id: int) -> bool:
+        return False
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        return []
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        return [[] for _ in query_embeddings]
+
+    def corpus_version(self) -> int:
+        return 0
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        return []
+
+    def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return [c for c in self.chunks.values() if not c.has_embedding()][:limit]
+
+    @contextmanager
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> Iterator[list[DocumentChunk]]:
+        pending = self.get_chunks_without_embeddings(limit=len(self.chunks))
+        claimed = [c for c in pending if c.id not in self.claimed][:limit]
+        self.claimed.update(c.id for c in claimed)
+        try:
+            yield claimed
+        finally:
+            self.claimed.difference_update(c.id for c in claimed)
+
+    def count_chunks_without_embeddings(self) -> int:
+        return len(self.get_chunks_without_embeddings(limit=len(self.chunks)))
+
+    def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        return self.update_chunk_embeddings({chunk_id: embedding}) == 1
+
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        for chunk_id, embedding in embeddings.items():
+            self.chunks[chunk_id].embedding = embedding
+        return len(embeddings)
+
+
+def test_background_ingest_is_accepted_before_embedding():
+    repo = InMemoryRepo()
+    embeddings = FakeEmbeddings()
+    service = DocumentProcessingService(WordSplitter(), embeddings)
+
+    job = IngestDocumentUseCase(repo, service).execute("Title", "one two three four five")
+
+    assert embeddings.calls == 0
+    assert job["job_id"] == job["document_id"]
+    assert job["status"] == "pending"
+    assert job["processing_status"]["chunks_without_embeddings"] == 5
+
+
+def test_workers_drain_pending_chunks_in_batches():
+    repo = InMemoryRepo()
+    service = DocumentProcessingService(WordSplitter(), FakeEmbeddings())
+    job = IngestDocumentUseCase(repo, service).execute("Title", "one two three four five")
+    worker = EmbedPendingChunksUseCase(repo, service, batch_size=3)
+    status = GetDocumentStatusUseCase(repo)
+
+    assert worker.pending() == 5
+    assert worker.execute() == 3
+    assert worker.pending() == 2
+    assert status.execute(job["job_id"])["status"] == "processing"
+    assert worker.execute() == 2
+    assert worker.execute() == 0
+
+    final = status.execute(job["job_id"])
+    assert final["status"] == "completed"
+    assert final["processing_status"]["is_fully_processed"] is True
+
+
+def test_status_of_unknown_document():
+    with pytest.raises(DocumentNotFoundError):
+        GetDocumentStatusUseCase(InMemoryRepo()).execute(42)
+
+
+def test_concurrent_workers_never_claim_the_same_chunk():
+    repo = InMemoryRepo()
+    service = DocumentProcessingService(WordSplitter(), FakeEmbeddings())
+    IngestDocumentUseCase(repo, service).execute("Title", "one two three four five")
+
+    with (
+        repo.claim_chunks_without_embeddings(limit=3) as first,
+        repo.claim_chunks_without_embeddings(limit=3) as second,
+    ):
+        assert {c.id for c in first}.isdisjoint(c.id for c in second)
+        assert len(first) + len(second) == 5
+
+
+def test_bulk_batch_embeds_once_and_rejects_invalid_documents():
+    repo = InMemoryRepo()
+    embeddings = FakeEmbeddings()
+    records = [
+        BulkRecord(line=1, title="First", text="one two three four five"),
+        BulkRecord(line=2, title="", text="untitled documents are rejected"),
+        BulkRecord(line=4, error="Invalid JSON: Expecting value"),
+        BulkRecord(line=5, title="Second", text="six seven eight nine ten"),
+    ]
+
+    result = BulkIngestBatchUseCase(repo, DocumentProcessingService(WordSplitter(), embeddings)).execute(records)
+
+    assert embeddings.calls == 1
+    assert (result["documents"], result["chunks"]) == (2, 10)
+    assert [r["line"] for r in result["rejected"]] == [2, 4]
+    assert set(result["stage_seconds"]) == {"split", "embed", "write"}
+    assert all(chunk.has_embedding() for chunk in repo.chunks.values())
+    assert [d.title for d in repo.documents.values()] == ["First", "Second"]
+
+
+def test_bulk_batch_stores_nothing_when_embedding_fails():
+    class FailingEmbeddings(FakeEmbeddings):
+        def embed(self, texts: list[str]) -> list[list[float]]:
+            raise EmbeddingGenerationException("provider down")
+
+    repo = InMemoryRepo()
+    use_case = BulkIngestBatchUseCase(repo, DocumentProcessingService(WordSplitter(), FailingEmbeddings()))
+
+    with pytest.raises(EmbeddingGenerationException):
+        use_case.execute([BulkRecord(line=1, title="First", text="one two three four five")])
+    assert repo.documents == {}
@@ -0,0 +1,213 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import pytest
+
+from src.application.search_document import (
+    SearchDocumentsUseCase,
+    collapse_near_duplicates,
+    reciprocal_rank_fusion,
+)
+from src.domain.content_text_spliter import ContentTextSplitter
+from src.domain.embeddings import EmbeddingGenerator
+from src.domain.exceptions import SearchQueryInvalidException
+from src.domain.services.document_processing_service import DocumentProcessingService
+from src.infrastructure.search_result_cache import InMemorySearchResultCache
+
+
+class RecordingEmbeddings(EmbeddingGenerator):
+    def __init__(self):
+        self.queries: list[str] = []
+        self.batches: list[list[str]] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        return [[1.0, 0.0] for _ in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.queries.append(text)
+        return [1.0, 0.0]
+
+
+class FakeSplitter(ContentTextSplitter):
+    def split(self, text: str) -> list[str]:
+        return [text]
+
+
+class RankedRepo:
+    """Only the two search methods: vector hits 1, 2, 3 and lexical hits 3, 4 in that order"""
+
+    def __init__(self):
+        self.vector_limit: Optional[int] = None
+        self.batch_limits: list[int] = []
+        self.vector_searches = 0
+        self.version = 1
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        self.vector_limit = limit
+        self.vector_searches += 1
+        rows = [row(1, similarity=0.9), row(2, similarity=0.8), row(3, similarity=0.4)]
+        return [r for r in rows if r["similarity"] >= min_similarity][:limit]
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        self.batch_limits = limits
+        return [self.search_similar(e, limit, m) for e, limit, m in zip(query_embeddings, limits, min_similarities)]
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        return [row(3, rank=0.7), row(4, rank=0.2)][:limit]
+
+    def corpus_version(self) -> int:
+        return self.version
+
+
+def row(chunk_id: int, **scores: float) -> dict:
+    return {"id": chunk_id, "document_id": 1, "content": f"chunk {chunk_id}", "title": "Doc", **scores}
+
+
+def use_case() -> tuple[SearchDocumentsUseCase, RankedRepo, RecordingEmbeddings]:
+    repo, embeddings = RankedRepo(), RecordingEmbeddings()
+    return SearchDocumentsUseCase(repo, DocumentProcessingService(FakeSplitter(), embeddings)), repo, embeddings
+
+
+def test_reciprocal_rank_fusion_rewards_agreement_and_keeps_both_scores():
+    fused = reciprocal_rank_fusion(
+        {"lexical": [row(3, rank=0.7), row(4, rank=0.2)], "vector": [row(1, similarity=0.9), row(3, similarity=0.4)]},
+        k=60,
+        limit=2,
+    )
+
+    assert [r["id"] for r in fused] == [3, 1]
+    assert fused[0]["score"] == pytest.approx(1 / 61 + 1 / 62)
+    assert (fused[0]["rank"], fused[0]["similarity"], fused[0]["matched_by"]) == (0.7, 0.4, ["lexical", "vector"])
+
+
+def test_lexical_mode_never_embeds_the_query():
+    uc, _, embeddings = use_case()
+
+    result = uc.execute("chunk", limit=5, mode="lexical")
+
+    assert embeddings.queries == []
+    assert [(r["chunk_id"], r["matched_by"]) for r in result["results"]] == [(3, ["lexical"]), (4, ["lexical"])]
+    assert result["results"][0]["similarity_value"] == 0.7
+
+
+def test_hybrid_mode_fuses_both_rankings_over_a_wider_candidate_pool():
+    uc, repo, embeddings = use_case()
+
+    result = uc.execute("chunk", limit=2, min_similarity=0.3, mode="hybrid")
+
+    assert embeddings.queries == ["chunk"]
+    assert repo.vector_limit == 4
+    assert [r["chunk_id"] for r in result["results"]] == [3, 1]
+    assert result["results"][0]["matched_by"] == ["lexical", "vector"]
+    assert result["search_parameters"]["mode"] == "hybrid"
+
+
+def test_hybrid_mode_embeds_the_query_on_the_shared_executor():
+    repo, threads = RankedRepo(), []
+
+    class ThreadRecordingEmbeddings(RecordingEmbeddings):
+        def embed_query(self, text: str) -> list[float]:
+            threads.append(threading.current_thread().name)
+            return super().embed_query(text)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-query") as executor:
+        processing_service = DocumentProcessingService(FakeSplitter(), ThreadRecordingEmbeddings())
+        uc = SearchDocumentsUseCase(repo, processing_service, query_executor=executor)
+
+        first = uc.execute("chunk", limit=2, min_similarity=0.3, mode="hybrid")
+        second = uc.execute("chunk", limit=2, min_similarity=0.3, mode="hybrid")
+
+    assert [r["chunk_id"] for r in first["results"]] == [r["chunk_id"] for r in second["results"]] == [3, 1]
+    assert threads == ["search-query_0", "search-query_0"]
+
+
+def test_unknown_mode_is_rejected():
+    uc, _, _ = use_case()
+
+    with pytest.raises(SearchQueryInvalidException):
+        uc.execute("chunk", mode="fuzzy")
+
+
+def test_batch_embeds_all_queries_in_one_call_and_answers_in_query_order():
+    uc, repo, embeddings = use_case()
+
+    result = uc.execute_batch(
+        [{"query": "first", "limit": 1}, {"query": "second", "min_similarity": 0.5}, {"query": "first", "limit": 3}]
+    )
+
+    assert embeddings.batches == [["first", "second"]]
+    assert embeddings.queries == []
+    assert repo.batch_limits == [1, 5, 3]
+    assert result["total_queries"] == 3
+    assert [r["query"] for r in result["results"]] == ["first", "second", "first"]
+    assert [r["total_results"] for r in result["results"]] == [1, 2, 3]
+
+
+def test_batch_larger_than_the_maximum_is_rejected():
+    repo, embeddings = RankedRepo(), RecordingEmbeddings()
+    uc = SearchDocumentsUseCase(repo, DocumentProcessingService(FakeSplitter(), embeddings), max_batch_queries=2)
+
+    with pytest.raises(SearchQueryInvalidException):
+        uc.execute_batch([{"query": "a"}, {"query": "b"}, {"query": "c"}])
+    assert embeddings.batches == []
+
+
+def test_repeated_vector_searches_are_cached_until_the_corpus_changes():
+    repo, embeddings = RankedRepo(), RecordingEmbeddings()
+    cache = InMemorySearchResultCache(maxsize=10)
+    uc = SearchDocumentsUseCase(repo, DocumentProcessingService(FakeSplitter(), embeddings), result_cache=cache)
+
+    first = uc.execute("chunk", limit=2)
+    second = uc.execute("other words", limit=2)
+    assert repo.vector_searches == 1
+    assert second["results"] == first["results"]
+    assert second["query"] == "other words"
+
+    uc.execute("chunk", limit=3)
+    repo.version = 2
+    uc.execute("chunk", limit=2)
+
+    assert repo.vector_searches == 3
+    assert (cache.stats()["hits"], cache.stats()["invalidations"]) == (1, 1)
+
+
+def test_collapse_keeps_the_best_ranked_near_duplicate_and_over_fetches_to_fill_the_limit():
+    class MirroredRepo(RankedRepo):
+        def search_similar(self, query_embedding, limit=5, min_similarity=0.0, ef_search=None, probes=None):
+            self.vector_limit = limit
+            rows = [row(1, similarity=0.9), row(2, similarity=0.8), row(3, similarity=0.7)]
+            rows[0]["content"] = "Terms and conditions apply to every order placed online"
+            rows[1]["content"] = "TERMS AND CONDITIONS apply to every order, placed online."
+            return rows[:limit]
+
+    repo = MirroredRepo()
+    uc = SearchDocumentsUseCase(repo, DocumentProcessingService(FakeSplitter(), RecordingEmbeddings()))
+
+    result = uc.execute("terms", limit=2, collapse_duplicates=True)
+
+    assert repo.vector_limit == 4
+    assert [(r["chunk_id"], r["duplicates"]) for r in result["results"]] == [(1, 1), (3, 0)]
+    assert result["search_parameters"]["collapse_duplicates"] is True
+    assert [r["duplicates"] for r in uc.execute("terms", limit=2)["results"]] == [0, 0]
+
+
+def test_collapse_never_folds_results_too_short_to_sign():
+    results = [{"content": "...", "duplicates": 0}, {"content": "* * *", "duplicates": 0}]
+
+    assert collapse_near_duplicates(results, max_distance=3) == results
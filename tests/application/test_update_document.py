@@ -0,0 +1,215 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pytest
+
+from src.application.create_document import CreateDocumentUseCase
+from src.application.update_document import UpdateDocumentUseCase
+from src.domain.content_text_spliter import ContentTextSplitter, SplitText
+from src.domain.document import ChunkDiff, Document, DocumentChunk
+from src.domain.document_repository import DocumentRepository
+from src.domain.embeddings import EmbeddingGenerator
+from src.domain.exceptions import DocumentNotFoundError
+from src.domain.services.document_processing_service import DocumentProcessingService
+
+
+class FakeEmbeddings(EmbeddingGenerator):
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [[0.0] * 3072 for _ in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return [0.0] * 3072
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    def __init__(self):
+        self.embedded: list[str] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return super().embed(texts)
+
+
+class FakeSplitter(ContentTextSplitter):
+    def split(self, text: str) -> List[str]:
+        return [text[:5], text[5:]] if text else []
+
+
+class LineSplitter(ContentTextSplitter):
+    def split(self, text: str) -> List[str]:
+        return text.splitlines()
+
+
+class FakeRepo(DocumentRepository):
+    def __init__(self):
+        self.documents: list[Document] = []
+        self.chunks: list[DocumentChunk] = []
+        self._doc_id = 0
+        self._chunk_id = 0
+        self.transactions = 0
+
+    def save_document(self, doc: Document) -> Document:
+        self.transactions += 1
+        return self._persist_document(doc)
+
+    def get_document(self, doc_id: int) -> Document | None:
+        for d in self.documents:
+            if d.id == doc_id:
+                return d
+        return None
+
+    def get_all_documents(self, limit: int = 100, offset: int = 0) -> list[Document]:
+        return self.documents[offset : offset + limit]
+
+    def delete_document(self, doc_id: int) -> bool:
+        return False
+
+    def document_exists(self, doc_id: int) -> bool:
+        return self.get_document(doc_id) is not None
+
+    def save_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        self.transactions += 1
+        return self._persist_chunk(chunk)
+
+    def save_chunks(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        self.transactions += 1
+        return [self._persist_chunk(chunk) for chunk in chunks]
+
+    def save_document_with_chunks(
+        self, doc: Document, chunks: list[DocumentChunk]
+    ) -> tuple[Document, list[DocumentChunk]]:
+        self.transactions += 1
+        persisted = self._persist_document(doc)
+        for chunk in chunks:
+            chunk.document_id = persisted.id
+        return persisted, [self._persist_chunk(chunk) for chunk in chunks]
+
+    def save_documents_with_chunks(self, documents: list[tuple[Document, list[DocumentChunk]]]) -> list[Document]:
+        return [self.save_document_with_chunks(doc, chunks)[0] for doc, chunks in documents]
+
+    def update_document_with_chunks(self, doc: Document, diff: ChunkDiff) -> tuple[Document, list[DocumentChunk]]:
+        self.transactions += 1
+        removed = {chunk.id for chunk in diff.removed}
+        self.chunks = [c for c in self.chunks if c.id not in removed]
+        self.documents = [doc if d.id == doc.id else d for d in self.documents]
+        for chunk in diff.added:
+            chunk.document_id = doc.id
+        return doc, [self._persist_chunk(chunk) for chunk in diff.added]
+
+    def get_chunks_by_document(self, document_id: int) -> list[DocumentChunk]:
+        return [c for c in self.chunks if c.document_id == document_id]
+
+    def get_chunk(self, chunk_id: int) -> Optional[DocumentChunk]:
+        return None
+
+    def delete_chunk(self, chunk_id: int) -> bool:
+        return False
+
+    def search_similar(
+        self,
+        query_embedding: list[float],
+        limit: int = 5,
+        min_similarity: float = 0.0,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[dict]:
+        return []
+
+    def search_similar_batch(
+        self,
+        query_embeddings: list[list[float]],
+        limits: list[int],
+        min_similarities: list[float],
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> list[list[dict]]:
+        return [[] for _ in query_embeddings]
+
+    def corpus_version(self) -> int:
+        return 0
+
+    def search_lexical(self, query: str, limit: int = 5) -> list[dict]:
+        return []
+
+    def get_chunks_without_embeddings(self, limit: int = 100) -> list[DocumentChunk]:
+        return []
+
+    def update_chunk_embedding(self, chunk_id: int, embedding: list[float]) -> bool:
+        return False
+
+    def update_chunk_embeddings(self, embeddings: dict[int, list[float]]) -> int:
+        return 0
+
+    @contextmanager
+    def claim_chunks_without_embeddings(self, limit: int = 100) -> Iterator[list[DocumentChunk]]:
+        yield []
+
+    def count_chunks_without_embeddings(self) -> int:
+        return 0
+
+    def _persist_document(self, doc: Document) -> Document:
+        self._doc_id += 1
+        persisted = Document(id=self._doc_id, title=doc.title, content=doc.content)
+        self.documents.append(persisted)
+        return persisted
+
+    def _persist_chunk(self, chunk: DocumentChunk) -> DocumentChunk:
+        self._chunk_id += 1
+        persisted = DocumentChunk(
+            id=self._chunk_id,
+            document_id=chunk.document_id,
+            content=chunk.content,
+            embedding=chunk.embedding,
+            position=chunk.position,
+            simhash=chunk.simhash,
+            canonical_chunk_id=chunk.canonical_chunk_id,
+        )
+        self.chunks.append(persisted)
+        return persisted
+
+
+def test_update_embeds_only_new_chunks_and_keeps_unchanged_rows():
+    repo = FakeRepo()
+    embeddings = CountingEmbeddings()
+    service = DocumentProcessingService(LineSplitter(), embeddings)
+    created = CreateDocumentUseCase(repo, service).execute("Title", "intro line\nbody text\noutro line")
+    embeddings.embedded.clear()
+
+    result = UpdateDocumentUseCase(repo, service).execute(
+        created["document"]["id"], "Title", "intro line\nedited body\noutro line\nnew ending"
+    )
+
+    assert embeddings.embedded == ["edited body", "new ending"]
+    assert result["chunk_diff"] == {"unchanged_chunks": 2, "added_chunks": 2, "removed_chunks": 1}
+    assert [(c["id"], c["content"]) for c in result["chunks"]] == [
+        (1, "intro line"),
+        (4, "edited body"),
+        (3, "outro line"),
+        (5, "new ending"),
+    ]
+    stored = sorted(repo.get_chunks_by_document(created["document"]["id"]), key=lambda c: c.position)
+    assert [c.content for c in stored] == ["intro line", "edited body", "outro line", "new ending"]
+    assert result["embedding_reuse"]["reused_chunks"] == 2
+
+
+def test_chunk_diff_pairs_repeated_texts_one_to_one():
+    document = Document(id=1, title="Title", content="b\na\nc")
+    stored = [
+        DocumentChunk(id=1, document_id=1, content="a", position=0),
+        DocumentChunk(id=2, document_id=1, content="b", position=1),
+        DocumentChunk(id=3, document_id=1, content="a", position=2),
+    ]
+
+    diff = DocumentProcessingService.diff_chunks(document, stored, SplitText(["b", "a", "c"], [1, 1, 1], 3))
+
+    assert [(c.id, c.position) for c in diff.kept] == [(2, 0), (1, 1)]
+    assert [(c.content, c.position) for c in diff.added] == [("c", 2)]
+    assert [c.id for c in diff.removed] == [3]
+
+
+def test_update_of_missing_document_raises_not_found():
+    use_case = UpdateDocumentUseCase(FakeRepo(), DocumentProcessingService(FakeSplitter(), FakeEmbeddings()))
+
+    with pytest.raises(DocumentNotFoundError):
+        use_case.execute(42, "Title", "abcdefghijk")
@@ -9,4 +9,17 @@ class BadSplitter(ContentTextSplitter):
 
 def test_content_text_splitter_must_implement_split():
     with pytest.raises(TypeError):
-        BadSplitter() 
\ No newline at end of file
+        BadSplitter()
+
+
+class LineSplitter(ContentTextSplitter):
+    def split(self, text: str) -> list[str]:
+        return text.splitlines()
+
+
+def test_split_counted_counts_the_words_of_the_text_and_of_each_chunk():
+    split = LineSplitter().split_counted("one two\nthree\n four five six ")
+
+    assert split.chunks == ["one two", "three", " four five six "]
+    assert split.chunk_word_counts == [2, 1, 3]
+    assert split.word_count == 6
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from src.domain.aggregates.document_aggregate import DocumentAggregate
+from src.domain.document import Document, DocumentChunk
+from src.domain.value_objects import Embedding
+
+
+def aggregate_with(embeddings: list) -> DocumentAggregate:
+    aggregate = DocumentAggregate(Document(id=1, title="T", content="content"))
+    aggregate.add_chunks(
+        [DocumentChunk(id=i, document_id=1, content=f"chunk {i}", embedding=e) for i, e in enumerate(embeddings)]
+    )
+    return aggregate
+
+
+def test_ranking_matches_pairwise_cosine_similarity():
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((100, 32))
+    aggregate = aggregate_with([e.tolist() for e in embeddings])
+    query = rng.standard_normal(32)
+
+    ranked = aggregate.rank_chunks(Embedding(query), min_similarity=-1.0)
+
+    reference = {i: Embedding(embeddings[i], dtype=np.float64).cosine_similarity(Embedding(query)) for i in range(100)}
+    assert len(ranked) == 100
+    assert [score for _, score in ranked] == pytest.approx(sorted(reference.values(), reverse=True), abs=1e-5)
+    assert all(score == pytest.approx(reference[chunk.id], abs=1e-5) for chunk, score in ranked)
+
+
+def test_limit_and_threshold_select_the_top_chunks():
+    aggregate = aggregate_with([[1.0, 0.0], [0.0, 1.0], [0.8, 0.6], None, [0.6, 0.8], [-1.0, 0.0]])
+    query = Embedding([1.0, 0.0])
+
+    assert [c.id for c in aggregate.search_similar_chunks(query, limit=2)] == [0, 2]
+    assert [c.id for c in aggregate.search_similar_chunks(query, min_similarity=0.5)] == [0, 2, 4]
+    assert [c.id for c in aggregate.search_similar_chunks(query, min_similarity=0.7, limit=5)] == [0, 2]
+    assert aggregate.search_similar_chunks(query, limit=0) == []
+
+
+def test_ties_keep_document_order_and_zero_vectors_score_zero():
+    aggregate = aggregate_with([[0.0, 0.0], [2.0, 0.0], [1.0, 0.0], [3.0, 0.0]])
+
+    ranked = aggregate.rank_chunks(Embedding([5.0, 0.0]), limit=3)
+
+    assert [(chunk.id, round(score, 6)) for chunk, score in ranked] == [(1, 1.0), (2, 1.0), (3, 1.0)]
+    assert [score for _, score in aggregate.rank_chunks(Embedding([0.0, 0.0]))] == [0.0] * 4
+
+
+def test_matrix_grows_as_chunks_are_added_and_rejects_mixed_dimensions():
+    aggregate = aggregate_with([[float(i), 1.0] for i in range(40)])
+
+    assert len(aggregate.search_similar_chunks(Embedding([1.0, 0.0]))) == 40
+    with pytest.raises(ValueError):
+        aggregate.add_chunk(DocumentChunk(document_id=1, content="other", embedding=[1.0, 0.0, 0.0]))
+    assert aggregate_with([None]).search_similar_chunks(Embedding([1.0, 0.0])) == []
@@ -0,0 +1,65 @@
+import pytest
+
+from src.domain.near_duplicate_index import (
+    check_max_distance,
+    hamming_distance,
+    nearest_canonical,
+    simhash,
+    simhash_bands,
+)
+
+TEXT = "The quick brown fox jumps over the lazy dog while the farmer sleeps under the old oak tree"
+
+
+def test_case_and_punctuation_do_not_change_the_signature():
+    assert simhash("The quick, brown fox JUMPS over the lazy dog!") == simhash(
+        "the quick brown fox jumps over the lazy dog"
+    )
+
+
+def test_unrelated_texts_are_far_apart():
+    other = "Quarterly revenue grew by twelve percent driven by strong demand for cloud storage products"
+
+    assert hamming_distance(simhash(TEXT), simhash(other)) > 10
+
+
+def test_texts_with_too_few_words_are_not_signed():
+    assert simhash("") is simhash("!!! --- ***") is simhash("   \n\t") is None
+    assert simhash("only four words here") is None
+    assert simhash("five words are enough here") is not None
+
+
+def test_signatures_fit_a_signed_bigint():
+    signatures = [simhash(f"report {i} covers topic {i * 7} in region {i * 13}") for i in range(50)]
+
+    assert all(-(2**63) <= s < 2**63 for s in signatures)
+    assert any(s < 0 for s in signatures)
+
+
+def test_signatures_within_three_bits_share_a_band():
+    signature = simhash(TEXT)
+    neighbour = signature ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+
+    assert hamming_distance(signature, neighbour) == 3
+    assert any(a == b for a, b in zip(simhash_bands(signature), simhash_bands(neighbour)))
+    assert simhash_bands(-1) == (0xFFFF,) * 4
+
+
+def test_nearest_canonical_prefers_the_closest_then_the_oldest_chunk():
+    signature = simhash(TEXT)
+    candidates = [(7, signature ^ 0b11), (5, signature ^ 0b1), (3, signature ^ 0b10), (9, signature ^ 0b1111)]
+
+    assert nearest_canonical(
+        [signature, signature ^ 0b1111, simhash("something else entirely, about another topic")], candidates, 1
+    ) == [
+        3,
+        9,
+        None,
+    ]
+
+
+def test_max_distance_is_bounded_by_the_band_index():
+    check_max_distance(0)
+    check_max_distance(3)
+    with pytest.raises(ValueError):
+        check_max_distance(4)
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+from pgvector.utils import Vector
+
+from src.domain.document import DocumentChunk
+from src.domain.exceptions import EmbeddingEmptyException
+from src.domain.value_objects import Embedding
+
+
+def test_embedding_stores_a_read_only_float32_array():
+    values = [0.5, -1.0, 2.0]
+    embedding = Embedding(values)
+
+    assert embedding.values.dtype == np.float32
+    assert embedding.values.flags.c_contiguous
+    assert not embedding.values.flags.writeable
+    assert embedding.to_list() == values
+    assert Embedding(values, dtype=np.float64).values.dtype == np.float64
+
+
+@pytest.mark.parametrize("values", [[], None])
+def test_embedding_rejects_empty_values(values):
+    with pytest.raises(EmbeddingEmptyException):
+        Embedding(values)
+
+
+@pytest.mark.parametrize("values", [[1.0, "2"], [1.0, None], [[1.0, 2.0]], [1.0, math.nan], [math.inf]])
+def test_embedding_rejects_invalid_values(values):
+    with pytest.raises(ValueError):
+        Embedding(values)
+
+
+def test_cosine_similarity_matches_the_reference_and_caches_norms():
+    rng = np.random.default_rng(0)
+    a, b = rng.standard_normal(768), rng.standard_normal(768)
+    expected = float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+    first, second = Embedding(a.tolist()), Embedding(b)
+
+    assert first.cosine_similarity(second) == pytest.approx(expected, abs=1e-5)
+    assert "norm" in first.__dict__
+    assert Embedding([0.0, 0.0]).cosine_similarity(Embedding([1.0, 0.0])) == 0.0
+    with pytest.raises(ValueError):
+        first.dot(Embedding([1.0]))
+
+
+def test_pgvector_binary_round_trip_without_copies():
+    embedding = Embedding([0.25, -3.5, 1e-3])
+
+    data = bytes(embedding.to_pgvector_binary())
+    decoded = Embedding.from_pgvector_binary(data)
+
+    assert data == Vector([0.25, -3.5, 1e-3]).to_binary()
+    assert decoded == embedding
+    assert hash(decoded) == hash(embedding)
+    assert np.shares_memory(decoded.to_numpy(), np.frombuffer(data, dtype=np.uint8))
+
+
+def test_chunk_similarity_accepts_embeddings_loaded_as_arrays():
+    # pgvector hands embeddings back as float32 arrays
+    chunk = DocumentChunk(document_id=1, content="chunk", embedding=np.array([1.0, 0.0], dtype=np.float32))
+
+    assert chunk.similarity_to([1.0, 0.0]) == pytest.approx(1.0)
@@ -0,0 +1,193 @@
+import random
+import threading
+import time
+
+import pytest
+
+from src.application.bulk_ingest import BulkRecord
+from src.infrastructure.bulk_ingest import (
+    BulkIngestPipeline,
+    CommitTracker,
+    iter_lines,
+    parse_line_range,
+    parse_ndjson,
+)
+from src.infrastructure.postgresql.repositories import copy_buffer
+
+
+def result_for(batch: list[BulkRecord]) -> dict:
+    return {
+        "documents": len(batch),
+        "chunks": 2 * len(batch),
+        "reused_chunks": 0,
+        "duplicate_chunks": 0,
+        "rejected": [],
+        "stage_seconds": {"split": 0.0, "embed": 0.0, "write": 0.0},
+    }
+
+
+def records(count: int) -> list[BulkRecord]:
+    return [BulkRecord(line=i, title=f"Doc {i}", text="some text") for i in range(1, count + 1)]
+
+
+def test_iter_lines_reassembles_lines_split_across_chunks():
+    assert list(iter_lines([b'{"a":', b' 1}\n{"b"', b": 2}\n", b"tail"])) == [b'{"a": 1}', b'{"b": 2}', b"tail"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iter_lines_matches_splitting_the_whole_body(seed):
+    rng = random.Random(seed)
+    body = bytes(rng.choice(b"ab\n") for _ in range(rng.randint(0, 300)))
+    cuts = sorted(rng.sample(range(len(body) + 1), rng.randint(0, min(len(body) + 1, 30))))
+    chunks = [body[start:end] for start, end in zip([0, *cuts], [*cuts, len(body)])]
+
+    expected = body.split(b"\n")
+    assert list(iter_lines(chunks)) == (expected if expected[-1] else expected[:-1])
+
+
+def test_parse_ndjson_skips_resumed_lines_and_reports_bad_ones():
+    lines = [
+        b'{"title": "skipped", "text": "x"}',
+        b"",
+        b'{"title": "A", "text": "alpha"}',
+        b"not json",
+        b'{"title": 1, "text": "numeric title"}',
+    ]
+
+    parsed = list(parse_ndjson(lines, skip=1))
+
+    assert [(r.line, r.title) for r in parsed if not r.error] == [(3, "A")]
+    assert [r.line for r in parsed if r.error] == [4, 5]
+    assert [r.line for r in parse_ndjson(lines, skip_ranges=[(3, 4)])] == [1, 5]
+
+
+def test_parse_line_range_rejects_malformed_ranges():
+    assert parse_line_range("101-132") == (101, 132)
+    for value in ["101", "132-101", "a-b", "-5"]:
+        with pytest.raises(ValueError):
+            parse_line_range(value)
+
+
+def test_commit_tracker_only_advances_over_contiguous_batches():
+    tracker = CommitTracker(start_line=10)
+
+    assert tracker.finish(1, 21, 30) is False
+    assert (tracker.lines_committed, tracker.committed_ranges) == (10, [(21, 30)])
+    assert tracker.finish(0, 11, 20) is True
+    assert (tracker.lines_committed, tracker.committed_ranges) == (30, [])
+
+
+def test_commit_tracker_keeps_resumed_ranges_until_it_passes_them():
+    tracker = CommitTracker(start_line=10, committed_ranges=[(21, 30), (41, 50)])
+
+    tracker.finish(0, 11, 35)
+
+    assert (tracker.lines_committed, tracker.committed_ranges) == (35, [(41, 50)])
+
+
+def test_pipeline_ingests_everything_and_reports_each_stage():
+    committed = []
+    pipeline = BulkIngestPipeline(result_for, batch_size=4, workers=3)
+
+    report = pipeline.run(records(10), on_commit=lambda r: committed.append(r.lines_committed))
+    summary = report.to_dict()
+
+    assert summary["completed"] is True
+    assert (summary["documents"], summary["chunks"], summary["lines_committed"]) == (10, 20, 10)
+    assert committed == sorted(committed) and committed[-1] == 10
+    assert summary["stages"]["read"]["items"] == 10
+    assert summary["stages"]["write"]["items"] == 20
+
+
+def test_pipeline_reads_at_most_the_pending_batches_ahead_of_the_workers():
+    read, stored, lead = 0, 0, 0
+    lock = threading.Lock()
+
+    def slow_batch(batch: list[BulkRecord]) -> dict:
+        nonlocal stored
+        time.sleep(0.005)
+        with lock:
+            stored += len(batch)
+        return result_for(batch)
+
+    def lazy_records():
+        nonlocal read, lead
+        for record in records(200):
+            with lock:
+                read += 1
+                lead = max(lead, read - stored)
+            yield record
+
+    pipeline = BulkIngestPipeline(slow_batch, batch_size=2, workers=2, max_pending_batches=3)
+    report = pipeline.run(lazy_records())
+
+    assert report.error is None
+    assert report.documents == 200
+    # Three pending batches plus the one being filled
+    assert lead <= (3 + 1) * 2
+
+
+def test_pipeline_stops_at_the_first_failed_batch_with_a_resume_point():
+    def failing_batch(batch: list[BulkRecord]) -> dict:
+        if batch[0].line == 5:
+            raise RuntimeError("embedding provider down")
+        return result_for(batch)
+
+    pipeline = BulkIngestPipeline(failing_batch, batch_size=2, workers=1, max_pending_batches=1)
+    report = pipeline.run(records(20))
+
+    assert report.error == "embedding provider down"
+    assert report.lines_committed == 4
+    assert report.documents == 4
+
+
+def test_pipeline_drops_batches_queued_behind_a_failed_one():
+    stored = []
+
+    def failing_batch(batch: list[BulkRecord]) -> dict:
+        if batch[0].line == 3:
+            raise RuntimeError("embedding provider down")
+        stored.extend(record.line for record in batch)
+        return result_for(batch)
+
+    pipeline = BulkIngestPipeline(failing_batch, batch_size=2, workers=1, max_pending_batches=4)
+    report = pipeline.run(records(20))
+
+    assert stored == [1, 2]
+    assert (report.lines_committed, report.committed_ranges) == (2, [])
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_resuming_a_failed_run_stores_every_line_exactly_once(seed):
+    rng = random.Random(seed)
+    stored = []
+    failures = []
+    lock = threading.Lock()
+
+    def flaky_batch(batch: list[BulkRecord]) -> dict:
+        time.sleep(rng.random() / 500)
+        if batch[0].line == 13 and not failures:
+            failures.append(13)
+            raise RuntimeError("embedding provider down")
+        with lock:
+            stored.extend(record.line for record in batch)
+        return result_for(batch)
+
+    pipeline = BulkIngestPipeline(flaky_batch, batch_size=4, workers=4)
+    failed = pipeline.run(records(60))
+    ranges = failed.committed_ranges
+    assert failed.error and all(first > failed.lines_committed for first, _ in ranges)
+
+    resumed_records = [r for r in records(60) if r.line > failed.lines_committed]
+    resumed_records = [r for r in resumed_records if not any(a <= r.line <= b for a, b in ranges)]
+    resumed = pipeline.run(resumed_records, start_line=failed.lines_committed, committed_ranges=ranges)
+
+    assert resumed.error is None
+    assert sorted(stored) == list(range(1, 61))
+    assert (resumed.lines_committed, resumed.committed_ranges) == (60, [])
+
+
+def test_copy_rows_escape_text_and_encode_vectors():
+    buffer = copy_buffer([(7, "tab\there\nnew\\line", [0.5, -1.0]), (8, "plain", None)])
+
+    assert buffer.getvalue() == "7\ttab\\there\\nnew\\\\line\t[0.5,-1.0]\n8\tplain\t\\N\n"
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.infrastructure.embeddings.batch_engine import (
+    AsyncEmbeddingBatchEngine,
+    BatchLimits,
+    EmbeddingBatchEngine,
+    RetryPolicy,
+    plan_batches,
+)
+from src.infrastructure.embeddings.openai_generator import OpenAIEmbeddingGenerator
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def fake_embed(texts: list[str]) -> list[list[float]]:
+    return [[float(len(t))] for t in texts]
+
+
+def test_plan_batches_respects_input_and_token_budgets():
+    texts = ["a" * 3, "b" * 3, "c" * 3, "d" * 30, "e" * 3]
+
+    assert plan_batches(texts, max_inputs=2, max_tokens=100) == [[0, 1], [2, 3], [4]]
+    # ~3 characters per token: the 30-character input alone exceeds a 5-token budget and gets its own batch
+    assert plan_batches(texts, max_inputs=10, max_tokens=5) == [[0, 1, 2], [3], [4]]
+
+
+def test_results_are_reassembled_in_input_order():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_embed(texts: list[str]) -> list[list[float]]:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01 * (5 - len(texts[0])))  # later batches finish first
+        with lock:
+            active -= 1
+        return fake_embed(texts)
+
+    engine = EmbeddingBatchEngine(BatchLimits(max_inputs=1, max_tokens=1000, max_concurrency=2), NO_WAIT)
+    texts = ["a", "bb", "ccc", "dddd"]
+
+    assert engine.run(texts, slow_embed) == [[1.0], [2.0], [3.0], [4.0]]
+    assert peak <= 2
+
+
+def test_rate_limits_are_retried():
+    calls = 0
+
+    def flaky_embed(texts: list[str]) -> list[list[float]]:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise StatusError(429)
+        return fake_embed(texts)
+
+    engine = EmbeddingBatchEngine(BatchLimits(), NO_WAIT)
+
+    assert engine.run(["hello"], flaky_embed) == [[5.0]]
+    assert calls == 3
+
+
+def test_client_errors_are_not_retried():
+    calls = 0
+
+    def bad_request(texts: list[str]) -> list[list[float]]:
+        nonlocal calls
+        calls += 1
+        raise StatusError(400)
+
+    with pytest.raises(StatusError):
+        EmbeddingBatchEngine(BatchLimits(), NO_WAIT).run(["hello"], bad_request)
+    assert calls == 1
+
+
+def test_async_engine_batches_and_retries():
+    attempts: dict[str, int] = {}
+
+    async def flaky_embed(texts: list[str]) -> list[list[float]]:
+        attempts[texts[0]] = attempts.get(texts[0], 0) + 1
+        if texts[0] == "bb" and attempts["bb"] == 1:
+            raise StatusError(503)
+        await asyncio.sleep(0)
+        return fake_embed(texts)
+
+    engine = AsyncEmbeddingBatchEngine(BatchLimits(max_inputs=1, max_tokens=1000, max_concurrency=2), NO_WAIT)
+
+    assert asyncio.run(engine.run(["a", "bb", "ccc"], flaky_embed)) == [[1.0], [2.0], [3.0]]
+    assert attempts == {"a": 1, "bb": 2, "ccc": 1}
+
+
+def test_async_engine_is_reusable_across_event_loops():
+    async def slow_embed(texts: list[str]) -> list[list[float]]:
+        await asyncio.sleep(0.001)
+        return fake_embed(texts)
+
+    engine = AsyncEmbeddingBatchEngine(BatchLimits(max_inputs=1, max_tokens=1000, max_concurrency=1), NO_WAIT)
+
+    for _ in range(2):
+        assert asyncio.run(engine.run(["a", "bb", "ccc"], slow_embed)) == [[1.0], [2.0], [3.0]]
+
+
+def test_query_embeddings_do_not_wait_behind_ingest_requests():
+    release = threading.Event()
+
+    def embed_batch(texts: list[str]) -> list[list[float]]:
+        if texts != ["query"]:
+            release.wait(timeout=5)
+        return fake_embed(texts)
+
+    one_slot = BatchLimits(max_concurrency=1)
+    generator = OpenAIEmbeddingGenerator(
+        api_key="test", batch_engine=EmbeddingBatchEngine(one_slot), query_engine=EmbeddingBatchEngine(one_slot)
+    )
+    generator._embed_batch = embed_batch
+    with ThreadPoolExecutor(3) as callers:
+        ingest = [callers.submit(generator.embed, [f"document {i}"]) for i in range(2)]
+        try:
+            assert callers.submit(generator.embed_queries, ["query"]).result(timeout=1) == [[5.0]]
+        finally:
+            release.set()
+        assert [future.result() for future in ingest] == [[[10.0]], [[10.0]]]
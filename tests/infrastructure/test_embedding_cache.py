@@ -0,0 +1,127 @@
+from typing import Optional
+
+from src.domain.embeddings import EmbeddingGenerator
+from src.infrastructure.embeddings.cached_generator import CachingEmbeddingGenerator
+from src.infrastructure.embeddings.query_cache import QueryEmbeddingCache, SharedEmbeddingCache
+
+
+class CountingEmbeddings(EmbeddingGenerator):
+    def __init__(self):
+        self.query_calls: list[str] = []
+        self.batch_calls: list[list[str]] = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.batch_calls.append(texts)
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.query_calls.append(text)
+        return [float(len(text))]
+
+
+class DictSharedCache(SharedEmbeddingCache):
+    def __init__(self):
+        self.entries: dict[str, list[float]] = {}
+
+    def get(self, key: str) -> Optional[list[float]]:
+        return self.entries.get(key)
+
+    def set(self, key: str, embedding: list[float]) -> None:
+        self.entries[key] = embedding
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeated_queries_are_served_from_cache():
+    inner = CountingEmbeddings()
+    generator = CachingEmbeddingGenerator(inner, "model-a", QueryEmbeddingCache(maxsize=10))
+
+    first = generator.embed_query("vector  search")
+    second = generator.embed_query(" vector search ")
+
+    assert first == second
+    assert inner.query_calls == ["vector search"]
+    stats = generator.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_query_batches_embed_only_the_misses_in_one_call():
+    inner = CountingEmbeddings()
+    generator = CachingEmbeddingGenerator(inner, "model-a", QueryEmbeddingCache(maxsize=10))
+    generator.embed_query("cached")
+
+    embeddings = generator.embed_queries(["new one", "cached", " new  one", "other"])
+
+    assert embeddings == [[7.0], [6.0], [7.0], [5.0]]
+    assert inner.batch_calls == [["new one", "other"]]
+    assert generator.embed_query("other") == [5.0]
+    assert inner.query_calls == ["cached"]
+
+
+def test_cache_key_includes_model():
+    inner = CountingEmbeddings()
+    cache = QueryEmbeddingCache(maxsize=10)
+
+    CachingEmbeddingGenerator(inner, "model-a", cache).embed_query("hello")
+    CachingEmbeddingGenerator(inner, "model-b", cache).embed_query("hello")
+
+    assert len(inner.query_calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryEmbeddingCache(maxsize=2)
+    cache.set("a", [1.0])
+    cache.set("b", [2.0])
+    cache.get("a")
+    cache.set("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = QueryEmbeddingCache(maxsize=2, ttl_seconds=10, clock=clock)
+    cache.set("a", [1.0])
+
+    clock.now = 9.9
+    assert cache.get("a") == [1.0]
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_batched_cache_hits_keep_their_original_expiry():
+    clock = FakeClock()
+    inner = CountingEmbeddings()
+    generator = CachingEmbeddingGenerator(
+        inner, "model-a", QueryEmbeddingCache(maxsize=10, ttl_seconds=10, clock=clock)
+    )
+    generator.embed_query("cached")
+
+    clock.now = 9.0
+    generator.embed_queries(["cached", "fresh"])
+    clock.now = 10.0
+    generator.embed_queries(["cached", "fresh"])
+
+    assert inner.query_calls == ["cached"]
+    assert inner.batch_calls == [["fresh"], ["cached"]]
+
+
+def test_shared_cache_is_used_across_processes():
+    shared = DictSharedCache()
+    inner = CountingEmbeddings()
+    CachingEmbeddingGenerator(inner, "model-a", QueryEmbeddingCache(), shared).embed_query("hello")
+
+    # A second worker has an empty local cache but finds the embedding in the shared backend
+    other_worker = CachingEmbeddingGenerator(inner, "model-a", QueryEmbeddingCache(), shared)
+    assert other_worker.embed_query("hello") == [5.0]
+    assert len(inner.query_calls) == 1
+    assert other_worker.cache.stats()["shared_hits"] == 1
@@ -0,0 +1,46 @@
+import threading
+
+from src.infrastructure.ingest_workers import EmbeddingWorkerPool
+
+
+def test_workers_drain_until_idle_and_wake_on_notify():
+    pending = [3, 2, 0]
+    drained = threading.Event()
+    lock = threading.Lock()
+
+    def embed_batch() -> int:
+        with lock:
+            processed = pending.pop(0) if pending else 0
+            if not pending:
+                drained.set()
+            return processed
+
+    pool = EmbeddingWorkerPool(embed_batch, workers=1, poll_interval=60)
+    pool.start()
+    try:
+        assert drained.wait(5)
+
+        # A new job is picked up without waiting for the (long) poll interval
+        drained.clear()
+        with lock:
+            pending.extend([4, 0])
+        pool.notify()
+        assert drained.wait(5)
+    finally:
+        pool.stop()
+
+
+def test_failing_batches_do_not_kill_the_worker():
+    calls = threading.Semaphore(0)
+
+    def embed_batch() -> int:
+        calls.release()
+        raise RuntimeError("provider down")
+
+    pool = EmbeddingWorkerPool(embed_batch, workers=1, poll_interval=0.01)
+    pool.start()
+    try:
+        assert calls.acquire(timeout=5)
+        assert calls.acquire(timeout=5)
+    finally:
+        pool.stop()
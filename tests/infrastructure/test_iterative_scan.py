@@ -0,0 +1,75 @@
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from src.infrastructure.postgresql import repositories
+from src.infrastructure.postgresql.repositories import PostgresDocumentRepository
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Answers every search with `rows`; rejects hnsw.iterative_scan like pgvector < 0.8 when `old_pgvector`"""
+
+    def __init__(self, rows, old_pgvector=False):
+        self.rows = rows
+        self.old_pgvector = old_pgvector
+        self.searches = []
+        self.settings = []
+        self.rejections = 0
+
+    def execute(self, statement):
+        sql = str(statement)
+        if "set_config" in sql:
+            if "iterative_scan" in sql and self.old_pgvector:
+                self.rejections += 1
+                raise ProgrammingError(sql, {}, Exception('unrecognized configuration parameter "hnsw.iterative_scan"'))
+            self.settings.append(sql)
+            return FakeResult([])
+        self.searches.append(self.settings)
+        self.settings = []
+        return FakeResult(self.rows)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.settings = []
+
+
+@pytest.fixture(autouse=True)
+def iterative_scan_available(monkeypatch):
+    monkeypatch.setattr(repositories.settings, "vector_iterative_scan", True)
+    repositories._iterative_scan_unavailable.clear()
+    yield
+    repositories._iterative_scan_unavailable.clear()
+
+
+def test_short_results_are_searched_once_with_the_iterative_scan():
+    session = FakeSession([{"id": 1, "similarity": 0.9}])
+
+    results = PostgresDocumentRepository(session).search_similar([0.1] * 768, limit=5)
+
+    assert results == [{"id": 1, "similarity": 0.9}]
+    assert len(session.searches) == 1
+    assert any("hnsw.iterative_scan" in sql for sql in session.searches[0])
+
+
+def test_servers_without_iterative_scan_are_searched_without_it_from_then_on():
+    session = FakeSession([{"id": 1, "similarity": 0.9}], old_pgvector=True)
+    repository = PostgresDocumentRepository(session)
+
+    assert repository.search_similar([0.1] * 768, limit=5) == [{"id": 1, "similarity": 0.9}]
+    assert repository.search_similar([0.1] * 768, limit=5) == [{"id": 1, "similarity": 0.9}]
+
+    assert session.rejections == 1
+    assert len(session.searches) == 2
+    assert not any("iterative_scan" in sql for settings in session.searches for sql in settings)
@@ -0,0 +1,160 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.domain.value_objects import Embedding
+from src.infrastructure.memory_index.indexes import (
+    BruteForceVectorIndex,
+    HNSWVectorIndex,
+    build_vector_index,
+    normalize_rows,
+)
+from src.infrastructure.memory_index.repositories import embedding_batches, search_rows
+from src.infrastructure.memory_index.snapshot import latest_snapshot, open_snapshot, write_snapshot
+from src.infrastructure.memory_index.store import MemoryVectorStore
+
+
+def clustered_vectors(count: int, dims: int = 32, seed: int = 7) -> np.ndarray:
+    # Embeddings of real text live near a low-dimensional subspace, which is what graph indexes exploit
+    rng = np.random.default_rng(seed)
+    basis = rng.standard_normal((8, dims))
+    return (rng.standard_normal((count, 8)) @ basis + 0.05 * rng.standard_normal((count, dims))).astype(np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, query: np.ndarray, k: int) -> list[int]:
+    scores = normalize_rows(vectors) @ normalize_rows(query)[0]
+    return np.argsort(-scores, kind="stable")[:k].tolist()
+
+
+def test_brute_force_matches_exact_ranking_and_scores():
+    vectors = clustered_vectors(300)
+    index = BruteForceVectorIndex(32)
+    index.add(list(range(300)), vectors)
+
+    hits = index.search(vectors[10], 5)
+
+    assert [chunk_id for chunk_id, _ in hits] == exact_top_k(vectors, vectors[10], 5)
+    assert hits[0] == (10, pytest.approx(1.0, abs=1e-5))
+
+
+def test_brute_force_add_replaces_and_remove_keeps_the_rest_searchable():
+    index = BruteForceVectorIndex(2)
+    index.add([1, 2, 3], np.array([[1, 0], [0, 1], [1, 1]], dtype=np.float32))
+    index.add([1], np.array([[0, 1]], dtype=np.float32))
+    index.remove([2, 99])
+
+    assert len(index) == 2
+    assert index.search(np.array([0, 1], dtype=np.float32), 2)[0] == (1, pytest.approx(1.0))
+    assert [chunk_id for chunk_id, _ in index.search(np.array([1, 0], dtype=np.float32), 5)] == [3, 1]
+
+
+def test_hnsw_recall_against_exact_search():
+    vectors = clustered_vectors(2000)
+    index = HNSWVectorIndex(32, m=8, ef_construction=64, ef_search=48)
+    index.add(list(range(2000)), vectors)
+
+    queries = clustered_vectors(50, seed=11)
+    found = sum(
+        len({chunk_id for chunk_id, _ in index.search(query, 10)} & set(exact_top_k(vectors, query, 10)))
+        for query in queries
+    )
+
+    assert found / (10 * len(queries)) >= 0.9
+
+
+def test_hnsw_never_returns_removed_ids_and_rebuilds_when_mostly_deleted():
+    vectors = clustered_vectors(200)
+    index = HNSWVectorIndex(32, m=8, ef_construction=32)
+    index.add(list(range(200)), vectors)
+
+    index.remove(range(0, 200, 2))
+    assert all(chunk_id % 2 for chunk_id, _ in index.search(vectors[0], 20))
+
+    index.remove(range(1, 150, 2))
+    assert len(index) == 25
+    assert not index._deleted
+    assert {chunk_id for chunk_id, _ in index.search(vectors[199], 25)} == set(range(151, 200, 2))
+
+
+def test_build_vector_index_auto_picks_by_corpus_size():
+    assert isinstance(build_vector_index("auto", 8, 10, 100, 16, 100, 64), BruteForceVectorIndex)
+    assert isinstance(build_vector_index("auto", 8, 1000, 100, 16, 100, 64), HNSWVectorIndex)
+    assert isinstance(build_vector_index("auto", 8, 1000, 100, 16, 100, 64, mapped=True), BruteForceVectorIndex)
+    with pytest.raises(ValueError):
+        build_vector_index("ivf", 8, 10, 100, 16, 100, 64)
+
+
+def test_store_filters_by_min_similarity_and_tracks_writes():
+    store = MemoryVectorStore(lambda dims, size: BruteForceVectorIndex(dims))
+    assert not store.loaded
+
+    store.load([(1, [1.0, 0.0]), (2, [0.8, 0.6]), (3, [0.0, 1.0])], dims=2, size=3)
+
+    assert store.search([1.0, 0.0], limit=5, min_similarity=0.5) == [(1, pytest.approx(1.0)), (2, pytest.approx(0.8))]
+
+    store.upsert([4], [[1.0, 0.1]])
+    store.remove([1, 2])
+
+    assert [chunk_id for chunk_id, _ in store.search([1.0, 0.0], limit=5)] == [4, 3]
+    assert store.stats()["chunks"] == 2
+
+
+def test_search_rows_keep_hit_order_and_drop_missing_chunks():
+    rows = [
+        {"id": 2, "document_id": 10, "content": "beta", "title": "Doc A"},
+        {"id": 1, "document_id": 10, "content": "alpha", "title": "Doc A"},
+    ]
+
+    assert search_rows([(1, 0.9), (3, 0.8), (2, 0.7)], rows) == [
+        {"id": 1, "document_id": 10, "content": "alpha", "title": "Doc A", "similarity": 0.9},
+        {"id": 2, "document_id": 10, "content": "beta", "title": "Doc A", "similarity": 0.7},
+    ]
+
+
+def test_snapshot_round_trip_is_memory_mapped_and_versioned(tmp_path):
+    vectors = clustered_vectors(100)
+    batches = [(np.arange(0, 60), vectors[:60]), (np.arange(60, 100), vectors[60:])]
+
+    first = write_snapshot(tmp_path, batches, count=100, dims=32, high_water_mark=120)
+    second = write_snapshot(tmp_path, batches, count=100, dims=32, high_water_mark=130)
+    third = write_snapshot(tmp_path, batches, count=100, dims=32, high_water_mark=140)
+
+    assert latest_snapshot(tmp_path) == third
+    assert not first.exists() and second.exists()
+    snapshot = open_snapshot(third)
+    assert (snapshot.version, snapshot.high_water_mark, len(snapshot)) == (3, 140, 100)
+    assert isinstance(snapshot.vectors, np.memmap) and not snapshot.vectors.flags.writeable
+    assert snapshot.ids.tolist() == list(range(100))
+    np.testing.assert_allclose(snapshot.vectors, normalize_rows(vectors), rtol=1e-6)
+
+
+def test_snapshot_with_a_wrong_count_is_not_published(tmp_path):
+    with pytest.raises(ValueError):
+        write_snapshot(tmp_path, [(np.arange(3), np.ones((3, 4)))], count=5, dims=4, high_water_mark=0)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_brute_force_searches_a_snapshot_in_place_with_later_writes_on_top(tmp_path):
+    vectors = clustered_vectors(50)
+    path = write_snapshot(tmp_path, [(np.arange(50), vectors)], count=50, dims=32, high_water_mark=0)
+    store = MemoryVectorStore(lambda dims, size: BruteForceVectorIndex(dims))
+
+    store.load_snapshot(open_snapshot(path))
+    store.upsert([7, 100], [vectors[3], vectors[3]])
+    store.remove([3])
+
+    assert {chunk_id for chunk_id, _ in store.search(vectors[3], 2)} == {7, 100}
+    assert store.stats()["chunks"] == 50
+    assert store.stats()["snapshot_version"] == 1
+
+
+def test_embedding_batches_parse_pgvector_binary_rows():
+    vectors = clustered_vectors(5, dims=4)
+    rows = [SimpleNamespace(id=i, embedding=Embedding(vector).to_pgvector_binary()) for i, vector in enumerate(vectors)]
+
+    batches = list(embedding_batches(rows, dims=4, batch_size=3))
+
+    assert [ids.tolist() for ids, _ in batches] == [[0, 1, 2], [3, 4]]
+    np.testing.assert_array_equal(np.vstack([matrix for _, matrix in batches]), vectors)
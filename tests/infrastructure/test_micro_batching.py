@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.domain.embeddings import AsyncEmbeddingGenerator, EmbeddingGenerator
+from src.infrastructure.embeddings.batching_generator import (
+    AsyncMicroBatchingEmbeddingGenerator,
+    MicroBatchingEmbeddingGenerator,
+)
+
+
+class RecordingEmbeddings(EmbeddingGenerator):
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.fail = fail
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(t))] for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        raise AssertionError("queries must go through embed")
+
+
+class AsyncRecordingEmbeddings(AsyncEmbeddingGenerator):
+    def __init__(self):
+        self.batches: list[list[str]] = []
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(texts)
+        await asyncio.sleep(0)
+        return [[float(len(t))] for t in texts]
+
+    async def embed_query(self, text: str) -> list[float]:
+        raise AssertionError("queries must go through embed")
+
+
+def run_concurrently(generator: EmbeddingGenerator, queries: list[str]) -> dict[str, list[float]]:
+    results: dict[str, list[float]] = {}
+    barrier = threading.Barrier(len(queries))
+
+    def call(query: str) -> None:
+        barrier.wait()
+        results[query] = generator.embed_query(query)
+
+    threads = [threading.Thread(target=call, args=(q,)) for q in queries]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_queries_share_one_batch():
+    inner = RecordingEmbeddings()
+    generator = MicroBatchingEmbeddingGenerator(inner, window_ms=200, max_batch_size=64)
+    queries = [f"query {'x' * i}" for i in range(8)]
+
+    results = run_concurrently(generator, queries)
+
+    assert results == {q: [float(len(q))] for q in queries}
+    assert len(inner.batches) < len(queries)
+    assert sorted(sum(inner.batches, [])) == sorted(queries)
+
+
+def test_batches_take_the_query_path_of_the_provider():
+    class QueryPathEmbeddings(RecordingEmbeddings):
+        def embed(self, texts: list[str]) -> list[list[float]]:
+            raise AssertionError("queries must not take the ingest path")
+
+        def embed_queries(self, texts: list[str]) -> list[list[float]]:
+            return super().embed(texts)
+
+    generator = MicroBatchingEmbeddingGenerator(QueryPathEmbeddings(), window_ms=50)
+
+    assert run_concurrently(generator, ["a", "bb"]) == {"a": [1.0], "bb": [2.0]}
+
+
+def test_batch_is_sent_as_soon_as_it_is_full():
+    inner = RecordingEmbeddings()
+    # A window this long would time the test out if a full batch waited for it
+    generator = MicroBatchingEmbeddingGenerator(inner, window_ms=60_000, max_batch_size=4)
+
+    run_concurrently(generator, ["a", "bb", "ccc", "dddd"])
+
+    assert len(inner.batches) == 1
+    assert sorted(inner.batches[0]) == ["a", "bb", "ccc", "dddd"]
+
+
+def test_provider_errors_reach_every_caller():
+    generator = MicroBatchingEmbeddingGenerator(RecordingEmbeddings(fail=True), window_ms=1)
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        generator.embed_query("hello")
+
+
+def test_async_queries_share_one_batch():
+    inner = AsyncRecordingEmbeddings()
+    generator = AsyncMicroBatchingEmbeddingGenerator(inner, window_ms=5, max_batch_size=64)
+
+    async def scenario() -> list[list[float]]:
+        return await asyncio.gather(*(generator.embed_query(q) for q in ["a", "bb", "a", "ccc"]))
+
+    results = asyncio.run(scenario())
+
+    assert results == [[1.0], [2.0], [1.0], [3.0]]
+    assert inner.batches == [["a", "bb", "ccc"]]
@@ -0,0 +1,28 @@
+from sqlalchemy.dialects import postgresql
+
+from src.domain.near_duplicate_index import simhash_bands
+from src.infrastructure.postgresql.near_duplicate_index import (
+    CANDIDATES_PER_BAND_VALUE,
+    LOOKUP_BATCH_SIZE,
+    band_candidates_statements,
+)
+
+
+def test_lookup_binds_each_distinct_band_value_once_per_batch():
+    signatures = [(i % 7) * 0x0001_0001_0001_0001 for i in range(LOOKUP_BATCH_SIZE + 10)]
+
+    statements = band_candidates_statements(signatures)
+
+    assert len(statements) == 2
+    first = statements[0].compile(dialect=postgresql.dialect()).params
+    assert first.pop("per_value") == CANDIDATES_PER_BAND_VALUE
+    bands = zip(*map(simhash_bands, signatures[:LOOKUP_BATCH_SIZE]))
+    assert sorted(first.values()) == sorted(value for band in bands for value in set(band))
+    assert len(first) == 4 * 7
+
+
+def test_each_band_scans_its_own_index_expression_with_a_cap():
+    sql = str(band_candidates_statements([-1])[0])
+
+    assert sql.count("LIMIT :per_value") == 4
+    assert all(f"((simhash >> {band * 16}) & 65535) = q.value" in sql for band in range(4))
@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.infrastructure.pool import InstrumentedQueuePool, pool_metrics
+
+
+def make_pool() -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+
+
+def test_pool_metrics_track_checkouts_and_returns():
+    pool = make_pool()
+
+    conn = pool.connect()
+    busy = pool_metrics(pool)
+    conn.close()
+    idle = pool_metrics(pool)
+
+    assert busy["checked_out"] == 1
+    assert idle["checked_out"] == 0
+    assert idle["checked_in"] == 1
+    assert idle["checkouts"] == 1
+
+
+def test_pool_metrics_count_checkout_timeouts():
+    pool = make_pool()
+    held = pool.connect()
+
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+
+    metrics = pool_metrics(pool)
+    assert metrics["timeouts"] == 1
+    assert metrics["max_wait_ms"] >= 50
+    held.close()
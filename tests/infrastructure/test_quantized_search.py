@@ -0,0 +1,28 @@
+import pytest
+
+from src.infrastructure.postgresql.repositories import reranked_candidates_statement
+from src.infrastructure.postgresql.vector_index import create_quantized_index_sql, quantized_expression
+
+
+@pytest.mark.parametrize("quantization", ["halfvec", "binary"])
+def test_candidate_scan_orders_by_the_indexed_expression(quantization):
+    # The planner only uses an expression index when the query repeats the expression exactly
+    index_expression = quantized_expression(quantization, "embedding")
+    statement = str(reranked_candidates_statement([0.1] * 768, 5, quantization, rerank_factor=4))
+
+    assert f"({index_expression})" in create_quantized_index_sql(quantization)
+    assert f"ORDER BY {quantized_expression(quantization, 'c.embedding')}" in statement
+
+
+def test_rerank_reads_factor_times_limit_candidates():
+    statement = reranked_candidates_statement([0.1] * 768, 5, "binary", rerank_factor=8)
+
+    params = statement.compile().params
+
+    assert (params["limit"], params["candidates"]) == (5, 40)
+    assert "cand.embedding <=> :query" in str(statement)
+
+
+def test_unknown_quantization_is_rejected():
+    with pytest.raises(ValueError):
+        quantized_expression("pq", "embedding")
@@ -0,0 +1,45 @@
+from src.infrastructure.search_result_cache import InMemorySearchResultCache
+
+
+def test_hits_are_served_for_the_same_version_and_credit_saved_time():
+    cache = InMemorySearchResultCache(maxsize=10)
+    cache.set(3, "q", {"results": [1]}, cost_seconds=0.25)
+
+    assert cache.get(3, "q") == {"results": [1]}
+    assert cache.get(3, "q") == {"results": [1]}
+    assert cache.get(3, "other") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["saved_seconds"]) == (2, 1, 0.5)
+
+
+def test_a_newer_corpus_version_drops_every_entry():
+    cache = InMemorySearchResultCache(maxsize=10)
+    cache.set(1, "a", {"results": []}, cost_seconds=0.1)
+    cache.set(1, "b", {"results": []}, cost_seconds=0.1)
+
+    assert cache.get(2, "a") is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_results_computed_at_an_older_version_are_not_stored():
+    cache = InMemorySearchResultCache(maxsize=10)
+    cache.get(5, "a")
+
+    cache.set(4, "a", {"results": ["stale"]}, cost_seconds=0.1)
+
+    assert cache.get(4, "a") is None
+    assert cache.get(5, "a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InMemorySearchResultCache(maxsize=2)
+    cache.set(1, "a", {}, cost_seconds=0.0)
+    cache.set(1, "b", {}, cost_seconds=0.0)
+    cache.get(1, "a")
+    cache.set(1, "c", {}, cost_seconds=0.0)
+
+    assert cache.get(1, "b") is None
+    assert cache.get(1, "a") == {}
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,216 @@
+import json
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.domain.near_duplicate_index import simhash
+from src.infrastructure.embeddings.batch_engine import approximate_token_count
+from src.infrastructure.splitter.langchain_text_splitter import LangchainTextSplitter
+from src.infrastructure.splitter.native_text_splitter import NativeTextSplitter, build_text_splitter
+from src.infrastructure.splitter.parallel_text_splitter import ParallelTextSplitter, shard_bounds
+from src.infrastructure.splitter.sentence_text_splitter import SentenceTextSplitter
+
+EXAMPLES = Path(__file__).resolve().parents[2] / "text_examples.json"
+
+
+def langchain_chunks(text: str, chunk_size: int, overlap: int) -> list[str]:
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=overlap, separators=LangchainTextSplitter.SEPARATORS
+    )
+    return splitter.split_text(text)
+
+
+def random_text(rng: random.Random, chunk_size: int) -> str:
+    if rng.random() < 0.3:
+        # Lines around the chunk size: merged, windowed, or both
+        return "\n".join("w" * rng.randint(0, 3 * chunk_size) for _ in range(rng.randint(0, 8)))
+    alphabet = rng.choice(["ab \n", "abc  \n\n\t", "abcdefgh \n", "x\n", " \n", "lorem ipsum dolor\n "])
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "   ",
+        "\n\n\n",
+        "short text",
+        "\nstarts with a newline",
+        "ends with newlines\n\n",
+        "x" * 250,
+        "a" * 99 + "\n" + "b" * 100 + "\n" + "c" * 5,
+        " " * 120 + "trailing text after a run of spaces",
+        "line\n" * 60,
+    ],
+)
+def test_matches_langchain_on_edge_cases(text):
+    assert NativeTextSplitter().split(text) == langchain_chunks(text, 100, 10)
+
+
+@pytest.mark.parametrize("chunk_size, overlap", [(100, 10), (50, 0), (20, 20), (30, 29), (7, 3), (2, 1)])
+def test_matches_langchain_on_random_texts(chunk_size, overlap):
+    rng = random.Random(chunk_size * 31 + overlap)
+    splitter = NativeTextSplitter(chunk_size, overlap)
+
+    for _ in range(300):
+        text = random_text(rng, chunk_size)
+        assert splitter.split(text) == langchain_chunks(text, chunk_size, overlap), repr(text)
+
+
+def test_matches_langchain_on_the_examples():
+    for example in json.loads(EXAMPLES.read_text(encoding="utf-8")):
+        assert NativeTextSplitter().split(example["text"]) == LangchainTextSplitter().split(example["text"])
+
+
+def test_offsets_are_the_spans_of_the_chunks():
+    text = "  first line\nsecond line\n" + "z" * 30 + "\n\n  last  "
+    splitter = NativeTextSplitter(chunk_size=20, overlap=5)
+
+    offsets = splitter.split_offsets(text)
+
+    assert [text[start:end] for start, end in offsets] == splitter.split(text)
+    assert offsets[0] == (2, 12)
+    assert offsets[2:4] == [(25, 44), (39, 55)]
+
+
+def test_rejects_invalid_sizes_and_unknown_kinds():
+    with pytest.raises(ValueError):
+        NativeTextSplitter(chunk_size=1)
+    with pytest.raises(ValueError):
+        NativeTextSplitter(chunk_size=10, overlap=11)
+    with pytest.raises(ValueError):
+        build_text_splitter("regex")
+    assert isinstance(build_text_splitter("native").splitter, NativeTextSplitter)
+    assert isinstance(build_text_splitter("langchain").splitter, LangchainTextSplitter)
+
+
+def sentences(count: int, words: int = 8) -> str:
+    return " ".join(f"Sentence {i} has " + "word " * words + "in it." for i in range(count))
+
+
+def test_sentence_chunks_stay_within_the_token_budget_and_end_on_sentences():
+    text = "\n\n".join(sentences(7) for _ in range(6))
+    splitter = SentenceTextSplitter(max_tokens=120, min_tokens=60, overlap_tokens=0)
+
+    chunks = splitter.split(text)
+
+    assert len(chunks) > 1
+    assert all(approximate_token_count(chunk) <= 120 for chunk in chunks)
+    assert all(chunk.startswith("Sentence") and chunk.endswith("in it.") for chunk in chunks)
+
+
+def test_sentence_chunks_count_the_whitespace_between_sentences():
+    text = " ".join("s" * 95 + "." for _ in range(40))
+    splitter = SentenceTextSplitter(max_tokens=512, min_tokens=256, overlap_tokens=32)
+
+    assert all(approximate_token_count(chunk) <= 512 for chunk in splitter.split(text))
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_sentence_chunks_never_exceed_the_budget_on_random_texts(seed):
+    rng = random.Random(seed)
+    gaps = [" ", "  ", "\n", "\n\n", " \n\n  "]
+    text = "".join("x" * rng.randint(1, 120) + rng.choice(".!?") + rng.choice(gaps) for _ in range(rng.randint(0, 60)))
+    max_tokens = rng.randint(5, 200)
+    splitter = SentenceTextSplitter(max_tokens, rng.randint(0, max_tokens), rng.randint(0, max_tokens - 1))
+
+    assert all(approximate_token_count(chunk) <= max_tokens for chunk in splitter.split(text))
+
+
+def test_sentence_chunks_close_at_paragraph_breaks_once_past_the_minimum():
+    paragraphs = [sentences(2), sentences(2), sentences(1)]
+    splitter = SentenceTextSplitter(max_tokens=500, min_tokens=40, overlap_tokens=0)
+
+    assert splitter.split("\n\n".join(paragraphs)) == paragraphs
+
+
+def test_sentence_chunks_repeat_trailing_sentences_as_overlap():
+    text = sentences(12)
+    splitter = SentenceTextSplitter(max_tokens=100, min_tokens=100, overlap_tokens=30)
+
+    first, second = splitter.split(text)[:2]
+
+    assert second.split(" in it. ")[0] == first.split(" in it. ")[-1].removesuffix(" in it.")
+
+
+def test_sentence_longer_than_the_budget_is_cut_at_spaces():
+    text = "word " * 400
+    splitter = SentenceTextSplitter(max_tokens=50, min_tokens=0, overlap_tokens=0)
+
+    offsets = splitter.split_offsets(text)
+
+    assert all(approximate_token_count(text[start:end]) <= 50 for start, end in offsets)
+    assert all(text[start:end].split(" ") == ["word"] * len(text[start:end].split(" ")) for start, end in offsets)
+    assert " ".join(text[start:end] for start, end in offsets) == text.strip()
+
+
+def test_build_text_splitter_sentence_uses_the_token_settings():
+    splitter = build_text_splitter("sentence").splitter
+
+    assert isinstance(splitter, SentenceTextSplitter)
+    assert splitter.max_tokens >= splitter.min_tokens > splitter.overlap_tokens
+
+
+def test_shards_cover_the_text_and_end_at_the_best_boundary_available():
+    text = "para one. " * 30 + "\n\n" + "line\n" * 80 + "word " * 200 + "x" * 700
+
+    bounds = shard_bounds(text, 400)
+
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(text)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(bounds, bounds[1:]))
+    assert text[: bounds[0][1]].endswith(". \n\n")
+    assert text[bounds[1][0] : bounds[1][1]].endswith("line\n")
+    assert all(end - start <= 400 for start, end in bounds)
+
+
+def test_parallel_splitter_merges_shards_in_order_and_counts_words():
+    text = "\n\n".join(sentences(5, words=rng_words) for rng_words in range(3, 23))
+    inner = SentenceTextSplitter(max_tokens=60, min_tokens=30, overlap_tokens=0)
+    splitter = ParallelTextSplitter(inner, lambda: ThreadPoolExecutor(2), threshold_chars=1000, shard_chars=1000)
+
+    split = splitter.split_counted(text)
+
+    assert split.chunks == [chunk for start, end in shard_bounds(text, 1000) for chunk in inner.split(text[start:end])]
+    assert split.chunk_word_counts == [len(chunk.split()) for chunk in split.chunks]
+    assert split.word_count == len(text.split())
+    assert split.chunk_signatures is None
+
+
+def test_parallel_splitter_signs_the_chunks_in_the_shards():
+    text = "\n\n".join(sentences(5, words=rng_words) for rng_words in range(3, 23))
+    inner = SentenceTextSplitter(max_tokens=60, min_tokens=30, overlap_tokens=0)
+    splitter = ParallelTextSplitter(
+        inner, lambda: ThreadPoolExecutor(2), threshold_chars=1000, shard_chars=1000, sign_chunks=True
+    )
+
+    split = splitter.split_counted(text)
+
+    assert split.chunk_signatures == [simhash(chunk) for chunk in split.chunks]
+    assert splitter.split_counted("short text").chunk_signatures is None
+
+
+def test_parallel_splitter_keeps_small_texts_in_process():
+    def no_pool():
+        raise AssertionError("the pool must not be used below the threshold")
+
+    splitter = ParallelTextSplitter(NativeTextSplitter(), no_pool, threshold_chars=1000, shard_chars=500)
+
+    assert splitter.split("short\ntext") == ["short\ntext"]
+
+
+def test_parallel_splitter_runs_the_shards_in_worker_processes():
+    text = "\n".join(f"line {i} " + "word " * (i % 30) for i in range(3000))
+    executor = ProcessPoolExecutor(2, mp_context=multiprocessing.get_context("spawn"))
+    splitter = ParallelTextSplitter(NativeTextSplitter(), lambda: executor, threshold_chars=20_000, shard_chars=20_000)
+
+    try:
+        split = splitter.split_counted(text)
+    finally:
+        executor.shutdown()
+
+    assert len(split.chunks) > len(shard_bounds(text, 20_000))
+    assert split.word_count == len(text.split())